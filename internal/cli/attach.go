@@ -4,7 +4,6 @@ import (
 	"fmt"
 	"os"
 	"path/filepath"
-	"regexp"
 
 	"github.com/mensfeld/code-on-incus/internal/container"
 	"github.com/mensfeld/code-on-incus/internal/session"
@@ -65,12 +64,18 @@ func attachCommand(cmd *cobra.Command, args []string) error {
 
 		fmt.Printf("Attaching to %s (slot %d)...\n", targetContainer, attachSlot)
 	} else {
-		// List all running containers with configured prefix
-		prefix := regexp.QuoteMeta(session.GetContainerPrefix())
-		containers, err := container.ListContainers(prefix + ".*")
+		// List all running containers with configured prefix. Matching on the name prefix
+		// (not a regex search) keeps warm pool members (pool-<prefix>...) out of the list.
+		instances, err := container.ListInstancesWithPrefix(session.GetContainerPrefix())
 		if err != nil {
 			return fmt.Errorf("failed to list containers: %w", err)
 		}
+		var containers []string
+		for i := range instances {
+			if instances[i].Running() {
+				containers = append(containers, instances[i].Name)
+			}
+		}
 
 		// If container name provided, use it
 		if len(args) > 0 {
@@ -98,11 +103,6 @@ func attachCommand(cmd *cobra.Command, args []string) error {
 			// Multiple sessions - show list
 			fmt.Println("Active sessions:")
 			for i, c := range containers {
-				mgr := container.NewManager(c)
-				running, err := mgr.Running()
-				if err != nil || !running {
-					continue
-				}
 				fmt.Printf("  %d. %s\n", i+1, c)
 			}
 			fmt.Printf("\nUse: coi attach <container-name>\n")
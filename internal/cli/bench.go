@@ -0,0 +1,324 @@
+package cli
+
+import (
+	"context"
+	"encoding/json"
+	"fmt"
+	"io"
+	"math"
+	"os"
+	"path/filepath"
+	"sort"
+	"text/tabwriter"
+	"time"
+
+	"github.com/mensfeld/code-on-incus/internal/config"
+	"github.com/mensfeld/code-on-incus/internal/container"
+	"github.com/mensfeld/code-on-incus/internal/session"
+	"github.com/spf13/cobra"
+)
+
+// Phases timed by `coi bench` itself, after session setup
+const (
+	benchPhaseExec   = "exec"
+	benchPhaseTmux   = "tmux"
+	benchPhaseDelete = "delete"
+	benchTotal       = "total"
+)
+
+// benchPhases is the order phases are reported in
+var benchPhases = []string{
+	session.PhaseImageCheck,
+	session.PhaseCreate,
+	session.PhaseReady,
+	session.PhaseNetwork,
+	session.PhaseConfigPush,
+	benchPhaseExec,
+	benchPhaseTmux,
+	benchPhaseDelete,
+}
+
+var (
+	benchIterations int
+	benchFormat     string
+)
+
+var benchCmd = &cobra.Command{
+	Use:   "bench",
+	Short: "Measure container lifecycle latency",
+	Long: `Run N iterations of launch -> ready -> exec -> delete and report how long each phase took.
+
+Each iteration sets up a fresh container the way 'coi shell' does (image check, create,
+ready, network setup, config push), then runs a command, starts a tmux session and
+deletes the container. Per-run timings and p50/p90/p99 per phase are reported.
+
+Examples:
+  coi bench                              # 5 iterations with the default image
+  coi bench --iterations 20 --format json
+  coi bench --image coi-rust --network open
+`,
+	RunE: benchCommand,
+}
+
+func init() {
+	benchCmd.Flags().IntVarP(&benchIterations, "iterations", "n", 5, "Number of launch/delete cycles to run")
+	benchCmd.Flags().StringVar(&benchFormat, "format", "text", "Output format: text or json")
+}
+
+// benchRun is the timing of one iteration, in milliseconds per phase
+type benchRun struct {
+	Iteration int                `json:"iteration"`
+	Phases    map[string]float64 `json:"phases_ms"`
+	TotalMs   float64            `json:"total_ms"`
+}
+
+// benchStats summarizes one phase across iterations, in milliseconds
+type benchStats struct {
+	Count int     `json:"count"`
+	Min   float64 `json:"min"`
+	Mean  float64 `json:"mean"`
+	P50   float64 `json:"p50"`
+	P90   float64 `json:"p90"`
+	P99   float64 `json:"p99"`
+	Max   float64 `json:"max"`
+}
+
+// benchReport is the output of `coi bench`
+type benchReport struct {
+	Image      string                `json:"image"`
+	Iterations int                   `json:"iterations"`
+	Phases     []string              `json:"phases"`
+	Runs       []benchRun            `json:"runs"`
+	Summary    map[string]benchStats `json:"summary"`
+}
+
+func benchCommand(cmd *cobra.Command, args []string) error {
+	if benchFormat != "text" && benchFormat != "json" {
+		return fmt.Errorf("invalid format '%s': must be 'text' or 'json'", benchFormat)
+	}
+	if benchIterations < 1 {
+		return fmt.Errorf("--iterations must be at least 1")
+	}
+
+	if !container.Available() {
+		return fmt.Errorf("incus is not available - please install Incus and ensure you're in the incus-admin group")
+	}
+
+	image := imageName
+	if image == "" {
+		image = session.CoiImage
+	}
+
+	networkConfig := cfg.Network
+	if networkMode != "" {
+		networkConfig.Mode = config.NetworkMode(networkMode)
+	}
+
+	runs := make([]benchRun, 0, benchIterations)
+	for i := 1; i <= benchIterations; i++ {
+		fmt.Fprintf(os.Stderr, "Iteration %d/%d...\n", i, benchIterations)
+		run, err := runBenchIteration(i, image, networkConfig)
+		if err != nil {
+			return fmt.Errorf("iteration %d failed: %w", i, err)
+		}
+		runs = append(runs, run)
+	}
+
+	report := newBenchReport(image, runs)
+	if benchFormat == "json" {
+		data, err := json.MarshalIndent(report, "", "  ")
+		if err != nil {
+			return fmt.Errorf("failed to marshal JSON: %w", err)
+		}
+		fmt.Println(string(data))
+		return nil
+	}
+	return writeBenchText(os.Stdout, report)
+}
+
+// runBenchIteration sets up a container in a scratch workspace, runs a command and a tmux
+// session in it and deletes it, timing every phase
+func runBenchIteration(iteration int, image string, networkConfig config.NetworkConfig) (benchRun, error) {
+	run := benchRun{Iteration: iteration}
+
+	toolInstance, err := getConfiguredTool(cfg)
+	if err != nil {
+		return run, err
+	}
+
+	workspaceDir, err := os.MkdirTemp("", "coi-bench-*")
+	if err != nil {
+		return run, fmt.Errorf("failed to create workspace: %w", err)
+	}
+	defer os.RemoveAll(workspaceDir)
+
+	// A scratch tool config so the config push phase runs without touching the real one
+	var cliConfigPath string
+	if dirName := toolInstance.ConfigDirName(); dirName != "" {
+		cliConfigPath = filepath.Join(workspaceDir, ".bench-home", dirName)
+		if err := os.MkdirAll(cliConfigPath, 0o755); err != nil {
+			return run, fmt.Errorf("failed to create tool config directory: %w", err)
+		}
+	}
+
+	timer := session.NewPhaseTimer()
+	start := time.Now()
+
+	result, err := session.Setup(session.SetupOptions{
+		WorkspacePath: workspaceDir,
+		Image:         image,
+		Slot:          1,
+		CLIConfigPath: cliConfigPath,
+		Tool:          toolInstance,
+		NetworkConfig: &networkConfig,
+		DisableShift:  cfg.Incus.DisableShift,
+		UsePool:       cfg.Pool.Enabled,
+		Timer:         timer,
+		Logger:        func(string) {},
+	})
+	if err != nil {
+		// Setup may have created the container before failing
+		_ = container.NewManager(session.ContainerName(workspaceDir, 1)).Delete(true)
+		return run, err
+	}
+
+	user := container.CodeUID
+	if result.RunAsRoot {
+		user = 0
+	}
+	opts := container.ExecCommandOptions{Capture: true, User: &user, Cwd: "/workspace"}
+
+	endExec := timer.Start(benchPhaseExec)
+	_, execErr := result.Manager.ExecCommand("echo ready", opts)
+	endExec()
+
+	var tmuxErr error
+	if execErr == nil {
+		endTmux := timer.Start(benchPhaseTmux)
+		_, tmuxErr = result.Manager.ExecCommand(
+			fmt.Sprintf("tmux new-session -d -s coi-%s -c /workspace \"bash -c 'exec bash'\"", result.ContainerName),
+			opts,
+		)
+		endTmux()
+	}
+
+	endDelete := timer.Start(benchPhaseDelete)
+	if result.NetworkManager != nil {
+		_ = result.NetworkManager.Teardown(context.Background(), result.ContainerName)
+	}
+	deleteErr := result.Manager.Delete(true)
+	endDelete()
+
+	switch {
+	case execErr != nil:
+		return run, fmt.Errorf("exec failed: %w", execErr)
+	case tmuxErr != nil:
+		return run, fmt.Errorf("tmux start failed: %w", tmuxErr)
+	case deleteErr != nil:
+		return run, fmt.Errorf("delete failed: %w", deleteErr)
+	}
+
+	run.TotalMs = durationMs(time.Since(start))
+	run.Phases = make(map[string]float64)
+	for _, phase := range timer.Phases() {
+		run.Phases[phase.Name] += durationMs(phase.Duration)
+	}
+	return run, nil
+}
+
+// newBenchReport summarizes runs per phase and in total
+func newBenchReport(image string, runs []benchRun) benchReport {
+	samples := map[string][]float64{}
+	for _, run := range runs {
+		for name, ms := range run.Phases {
+			samples[name] = append(samples[name], ms)
+		}
+		samples[benchTotal] = append(samples[benchTotal], run.TotalMs)
+	}
+
+	summary := make(map[string]benchStats, len(samples))
+	for name, values := range samples {
+		summary[name] = summarize(values)
+	}
+
+	// Only report phases that ran (e.g. no network phase without network setup)
+	phases := []string{}
+	for _, name := range benchPhases {
+		if _, ok := samples[name]; ok {
+			phases = append(phases, name)
+		}
+	}
+
+	return benchReport{
+		Image:      image,
+		Iterations: len(runs),
+		Phases:     phases,
+		Runs:       runs,
+		Summary:    summary,
+	}
+}
+
+// summarize computes min, mean, max and nearest-rank percentiles of values
+func summarize(values []float64) benchStats {
+	if len(values) == 0 {
+		return benchStats{}
+	}
+	sorted := append([]float64(nil), values...)
+	sort.Float64s(sorted)
+
+	sum := 0.0
+	for _, v := range sorted {
+		sum += v
+	}
+	return benchStats{
+		Count: len(sorted),
+		Min:   sorted[0],
+		Mean:  roundMs(sum / float64(len(sorted))),
+		P50:   percentile(sorted, 50),
+		P90:   percentile(sorted, 90),
+		P99:   percentile(sorted, 99),
+		Max:   sorted[len(sorted)-1],
+	}
+}
+
+// percentile returns the nearest-rank p-th percentile of sorted values
+func percentile(sorted []float64, p float64) float64 {
+	if len(sorted) == 0 {
+		return 0
+	}
+	rank := int(math.Ceil(p / 100 * float64(len(sorted))))
+	if rank < 1 {
+		rank = 1
+	}
+	if rank > len(sorted) {
+		rank = len(sorted)
+	}
+	return sorted[rank-1]
+}
+
+// durationMs converts d to milliseconds with microsecond precision
+func durationMs(d time.Duration) float64 {
+	return roundMs(float64(d.Microseconds()) / 1000)
+}
+
+// roundMs rounds a millisecond value to microsecond precision
+func roundMs(ms float64) float64 {
+	return math.Round(ms*1000) / 1000
+}
+
+// writeBenchText renders the summary as a table, one row per phase
+func writeBenchText(out io.Writer, report benchReport) error {
+	fmt.Fprintf(out, "Image: %s, iterations: %d\n\n", report.Image, report.Iterations)
+
+	w := tabwriter.NewWriter(out, 0, 0, 2, ' ', 0)
+	fmt.Fprintln(w, "PHASE\tMIN\tP50\tP90\tP99\tMAX\t")
+	for _, name := range append(append([]string(nil), report.Phases...), benchTotal) {
+		s := report.Summary[name]
+		fmt.Fprintf(w, "%s\t%.1f\t%.1f\t%.1f\t%.1f\t%.1f\t\n", name, s.Min, s.P50, s.P90, s.P99, s.Max)
+	}
+	if err := w.Flush(); err != nil {
+		return err
+	}
+	fmt.Fprintln(out, "\n(milliseconds)")
+	return nil
+}
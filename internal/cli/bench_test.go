@@ -0,0 +1,80 @@
+package cli
+
+import (
+	"bytes"
+	"strings"
+	"testing"
+)
+
+func TestPercentile(t *testing.T) {
+	sorted := []float64{1, 2, 3, 4, 5, 6, 7, 8, 9, 10}
+
+	tests := []struct {
+		p    float64
+		want float64
+	}{
+		{0, 1},
+		{50, 5},
+		{90, 9},
+		{99, 10},
+		{100, 10},
+	}
+
+	for _, tt := range tests {
+		if got := percentile(sorted, tt.p); got != tt.want {
+			t.Errorf("percentile(%v) = %v, want %v", tt.p, got, tt.want)
+		}
+	}
+
+	if got := percentile(nil, 50); got != 0 {
+		t.Errorf("percentile(nil, 50) = %v, want 0", got)
+	}
+}
+
+func TestSummarize(t *testing.T) {
+	got := summarize([]float64{30, 10, 20})
+	want := benchStats{Count: 3, Min: 10, Mean: 20, P50: 20, P90: 30, P99: 30, Max: 30}
+	if got != want {
+		t.Errorf("summarize() = %+v, want %+v", got, want)
+	}
+}
+
+func TestNewBenchReport(t *testing.T) {
+	runs := []benchRun{
+		{Iteration: 1, Phases: map[string]float64{"create": 100, "ready": 50, "delete": 20}, TotalMs: 170},
+		{Iteration: 2, Phases: map[string]float64{"create": 300, "ready": 70, "delete": 40}, TotalMs: 410},
+	}
+
+	report := newBenchReport("coi", runs)
+
+	if got := strings.Join(report.Phases, ","); got != "create,ready,delete" {
+		t.Errorf("Phases = %s, want phases that ran in report order", got)
+	}
+	if report.Iterations != 2 {
+		t.Errorf("Iterations = %d, want 2", report.Iterations)
+	}
+	if s := report.Summary["create"]; s.Min != 100 || s.Max != 300 || s.Mean != 200 {
+		t.Errorf("Summary[create] = %+v, want min 100, max 300, mean 200", s)
+	}
+	if s := report.Summary[benchTotal]; s.Count != 2 || s.P99 != 410 {
+		t.Errorf("Summary[total] = %+v, want 2 samples with p99 410", s)
+	}
+}
+
+func TestWriteBenchText(t *testing.T) {
+	report := newBenchReport("coi", []benchRun{
+		{Iteration: 1, Phases: map[string]float64{"exec": 12.5}, TotalMs: 12.5},
+	})
+
+	var buf bytes.Buffer
+	if err := writeBenchText(&buf, report); err != nil {
+		t.Fatalf("writeBenchText() unexpected error: %v", err)
+	}
+
+	out := buf.String()
+	for _, want := range []string{"Image: coi, iterations: 1", "PHASE", "exec", "total", "12.5"} {
+		if !strings.Contains(out, want) {
+			t.Errorf("writeBenchText() output missing %q:\n%s", want, out)
+		}
+	}
+}
@@ -4,6 +4,7 @@ import (
 	"fmt"
 	"os"
 	"path/filepath"
+	"strings"
 
 	"github.com/mensfeld/code-on-incus/internal/config"
 	"github.com/mensfeld/code-on-incus/internal/container"
@@ -15,6 +16,7 @@ var (
 	cleanAll      bool
 	cleanForce    bool
 	cleanSessions bool
+	cleanParallel int
 )
 
 var cleanCmd = &cobra.Command{
@@ -37,6 +39,7 @@ func init() {
 	cleanCmd.Flags().BoolVar(&cleanAll, "all", false, "Clean all containers and sessions")
 	cleanCmd.Flags().BoolVar(&cleanForce, "force", false, "Skip confirmation prompts")
 	cleanCmd.Flags().BoolVar(&cleanSessions, "sessions", false, "Clean saved session data")
+	cleanCmd.Flags().IntVar(&cleanParallel, "parallel", defaultParallel, "Number of containers or sessions to delete at once")
 }
 
 func cleanCommand(cmd *cobra.Command, args []string) error {
@@ -93,15 +96,10 @@ func cleanCommand(cmd *cobra.Command, args []string) error {
 				}
 			}
 
-			for _, name := range stoppedContainers {
-				fmt.Printf("Deleting container %s...\n", name)
-				mgr := container.NewManager(name)
-				if err := mgr.Delete(true); err != nil {
-					fmt.Fprintf(os.Stderr, "Warning: Failed to delete %s: %v\n", name, err)
-				} else {
-					cleaned++
-				}
-			}
+			fmt.Printf("Deleting %d container(s)...\n", len(stoppedContainers))
+			cleaned += fanOut(stoppedContainers, cleanParallel, func(name string) (string, error) {
+				return "", container.NewManager(name).Delete(true)
+			}, reportDeleted)
 		} else {
 			fmt.Println("  (no stopped containers found)")
 		}
@@ -118,7 +116,8 @@ func cleanCommand(cmd *cobra.Command, args []string) error {
 
 		sessionDirs := []string{}
 		for _, entry := range entries {
-			if entry.IsDir() {
+			// Skip the shared session store (.store)
+			if entry.IsDir() && !strings.HasPrefix(entry.Name(), ".") {
 				sessionDirs = append(sessionDirs, entry.Name())
 			}
 		}
@@ -139,15 +138,10 @@ func cleanCommand(cmd *cobra.Command, args []string) error {
 				}
 			}
 
-			for _, name := range sessionDirs {
-				sessionPath := filepath.Join(sessionsDir, name)
-				fmt.Printf("Deleting session %s...\n", name)
-				if err := os.RemoveAll(sessionPath); err != nil {
-					fmt.Fprintf(os.Stderr, "Warning: Failed to delete %s: %v\n", name, err)
-				} else {
-					cleaned++
-				}
-			}
+			fmt.Printf("Deleting %d session(s)...\n", len(sessionDirs))
+			cleaned += fanOut(sessionDirs, cleanParallel, func(name string) (string, error) {
+				return "", session.RemoveSession(sessionsDir, name)
+			}, reportDeleted)
 		} else {
 			fmt.Println("  (no saved sessions found)")
 		}
@@ -161,3 +155,12 @@ func cleanCommand(cmd *cobra.Command, args []string) error {
 
 	return nil
 }
+
+// reportDeleted prints the outcome of deleting a single container or session
+func reportDeleted(r fanOutResult) {
+	if r.Err != nil {
+		fmt.Fprintf(os.Stderr, "Warning: Failed to delete %s: %v\n", r.Name, r.Err)
+		return
+	}
+	fmt.Printf("  ✓ Deleted %s\n", r.Name)
+}
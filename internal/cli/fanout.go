@@ -0,0 +1,99 @@
+package cli
+
+import (
+	"time"
+)
+
+// defaultParallel is how many containers kill, shutdown and clean work on at once
+const defaultParallel = 8
+
+// fanOutResult is the outcome of an operation on a single container (or session)
+type fanOutResult struct {
+	Name   string
+	Detail string // How the operation went, e.g. "graceful" (may be empty)
+	Err    error
+}
+
+// fanOut runs op for every name with at most parallel operations in flight.
+// report is called for each result as soon as it completes, always from the calling
+// goroutine, so it can print without interleaving. Returns the number of successes.
+func fanOut(names []string, parallel int, op func(name string) (string, error), report func(fanOutResult)) int {
+	succeeded, _ := fanOutUntil(names, parallel, time.Time{}, op, report)
+	return succeeded
+}
+
+// fanOutUntil is fanOut with one overall deadline (none if zero). Once it passes, no
+// further operations are started and it returns without waiting for those still
+// running. Returns the number of successes and, in input order, the names that had
+// not finished by the deadline.
+func fanOutUntil(names []string, parallel int, deadline time.Time, op func(name string) (string, error), report func(fanOutResult)) (int, []string) {
+	if parallel < 1 {
+		parallel = 1
+	}
+	if parallel > len(names) {
+		parallel = len(names)
+	}
+
+	jobs := make(chan string)
+	// Buffered so operations finishing after the deadline never block their worker
+	results := make(chan fanOutResult, len(names))
+	expired := make(chan struct{})
+
+	for i := 0; i < parallel; i++ {
+		go func() {
+			for name := range jobs {
+				detail, err := op(name)
+				results <- fanOutResult{Name: name, Detail: detail, Err: err}
+			}
+		}()
+	}
+
+	go func() {
+		defer close(jobs)
+		for _, name := range names {
+			select {
+			case jobs <- name:
+			case <-expired:
+				return
+			}
+		}
+	}()
+
+	var timeout <-chan time.Time
+	if !deadline.IsZero() {
+		timer := time.NewTimer(time.Until(deadline))
+		defer timer.Stop()
+		timeout = timer.C
+	}
+
+	finished := make(map[string]bool, len(names))
+	succeeded := 0
+	for done := 0; done < len(names); done++ {
+		select {
+		case result := <-results:
+			finished[result.Name] = true
+			if result.Err == nil {
+				succeeded++
+			}
+			report(result)
+		case <-timeout:
+			close(expired)
+			var pending []string
+			for _, name := range names {
+				if !finished[name] {
+					pending = append(pending, name)
+				}
+			}
+			return succeeded, pending
+		}
+	}
+	return succeeded, nil
+}
+
+// withDetail formats a result line suffix like " (graceful)"
+func withDetail(detail string) string {
+	if detail == "" {
+		return ""
+	}
+	return " (" + detail + ")"
+}
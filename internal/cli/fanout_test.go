@@ -0,0 +1,126 @@
+package cli
+
+import (
+	"fmt"
+	"sort"
+	"sync/atomic"
+	"testing"
+	"time"
+)
+
+func TestFanOutBoundsParallelism(t *testing.T) {
+	names := make([]string, 20)
+	for i := range names {
+		names[i] = fmt.Sprintf("c%d", i)
+	}
+
+	var inFlight, peak int32
+	op := func(name string) (string, error) {
+		n := atomic.AddInt32(&inFlight, 1)
+		for {
+			p := atomic.LoadInt32(&peak)
+			if n <= p || atomic.CompareAndSwapInt32(&peak, p, n) {
+				break
+			}
+		}
+		time.Sleep(5 * time.Millisecond)
+		atomic.AddInt32(&inFlight, -1)
+		return "", nil
+	}
+
+	var reported []string
+	succeeded := fanOut(names, 4, op, func(r fanOutResult) {
+		reported = append(reported, r.Name)
+	})
+
+	if succeeded != len(names) {
+		t.Errorf("fanOut() = %d, want %d", succeeded, len(names))
+	}
+	if peak > 4 {
+		t.Errorf("fanOut() ran %d operations at once, want at most 4", peak)
+	}
+	if peak < 2 {
+		t.Errorf("fanOut() ran %d operations at once, want parallel execution", peak)
+	}
+
+	sort.Strings(reported)
+	want := append([]string(nil), names...)
+	sort.Strings(want)
+	if fmt.Sprint(reported) != fmt.Sprint(want) {
+		t.Errorf("fanOut() reported %v, want every name once", reported)
+	}
+}
+
+func TestFanOutReportsFailures(t *testing.T) {
+	op := func(name string) (string, error) {
+		if name == "bad" {
+			return "", fmt.Errorf("boom")
+		}
+		return "ok", nil
+	}
+
+	results := map[string]fanOutResult{}
+	succeeded := fanOut([]string{"good", "bad", "other"}, 0, op, func(r fanOutResult) {
+		results[r.Name] = r
+	})
+
+	if succeeded != 2 {
+		t.Errorf("fanOut() = %d, want 2", succeeded)
+	}
+	if results["bad"].Err == nil {
+		t.Error("fanOut() should report the error for bad")
+	}
+	if results["good"].Detail != "ok" {
+		t.Errorf("fanOut() detail = %q, want %q", results["good"].Detail, "ok")
+	}
+}
+
+func TestFanOutEmpty(t *testing.T) {
+	called := false
+	if n := fanOut(nil, 4, func(string) (string, error) { return "", nil }, func(fanOutResult) { called = true }); n != 0 || called {
+		t.Errorf("fanOut(nil) = %d (reported: %v), want 0 without reports", n, called)
+	}
+}
+
+func TestFanOutUntilDeadline(t *testing.T) {
+	hung := make(chan struct{})
+	defer close(hung)
+	op := func(name string) (string, error) {
+		if name == "hung" {
+			<-hung
+		}
+		return "", nil
+	}
+
+	var reported []string
+	start := time.Now()
+	succeeded, pending := fanOutUntil([]string{"a", "hung", "b", "c"}, 2, time.Now().Add(50*time.Millisecond), op, func(r fanOutResult) {
+		reported = append(reported, r.Name)
+	})
+
+	if elapsed := time.Since(start); elapsed > time.Second {
+		t.Errorf("fanOutUntil() took %v, want it to return at the deadline", elapsed)
+	}
+	if succeeded != 3 {
+		t.Errorf("fanOutUntil() = %d, want 3 (reported %v)", succeeded, reported)
+	}
+	if fmt.Sprint(pending) != "[hung]" {
+		t.Errorf("fanOutUntil() pending = %v, want [hung]", pending)
+	}
+}
+
+func TestFanOutUntilDeadlineSkipsUnstarted(t *testing.T) {
+	hung := make(chan struct{})
+	defer close(hung)
+	op := func(name string) (string, error) {
+		<-hung
+		return "", nil
+	}
+
+	succeeded, pending := fanOutUntil([]string{"a", "b", "c"}, 1, time.Now().Add(20*time.Millisecond), op, func(fanOutResult) {})
+
+	// "a" hangs in the only worker, so "b" and "c" never start
+	if succeeded != 0 || fmt.Sprint(pending) != "[a b c]" {
+		t.Errorf("fanOutUntil() = %d, pending %v; want 0, [a b c]", succeeded, pending)
+	}
+}
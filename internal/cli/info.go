@@ -74,12 +74,8 @@ func infoCommand(cmd *cobra.Command, args []string) error {
 		fmt.Fprintf(os.Stderr, "Warning: No metadata found\n")
 	}
 
-	// Check if .claude directory exists
-	statePath := filepath.Join(sessionDir, ".claude")
-	claudeExists := false
-	if info, err := os.Stat(statePath); err == nil && info.IsDir() {
-		claudeExists = true
-	}
+	// Check if session data exists (.claude directory or compressed store)
+	claudeExists := session.SessionExists(sessionsDir, sessionID)
 
 	// Display information
 	fmt.Printf("Session Information\n")
@@ -95,16 +91,20 @@ func infoCommand(cmd *cobra.Command, args []string) error {
 	}
 
 	fmt.Printf("Session Data:   ")
-	if claudeExists {
+	if claudeExists && session.IsPackedSession(sessionDir) {
+		fmt.Printf("✓ Present (compressed store)\n")
+	} else if claudeExists {
 		fmt.Printf("✓ Present (.claude directory)\n")
 	} else {
 		fmt.Printf("✗ Missing\n")
 	}
 
-	// Show directory size
+	// Show data size (from the session manifest when available)
 	if claudeExists {
-		size, err := getDirSize(statePath)
-		if err == nil {
+		size, stored, err := session.SessionDataSize(sessionsDir, sessionID, toolInstance.ConfigDirName())
+		if err == nil && stored != size {
+			fmt.Printf("Data Size:      %s (%s on disk)\n", formatBytes(size), formatBytes(stored))
+		} else if err == nil {
 			fmt.Printf("Data Size:      %s\n", formatBytes(size))
 		}
 	}
@@ -117,21 +117,6 @@ func infoCommand(cmd *cobra.Command, args []string) error {
 	return nil
 }
 
-// getDirSize calculates the total size of a directory
-func getDirSize(path string) (int64, error) {
-	var size int64
-	err := filepath.Walk(path, func(_ string, info os.FileInfo, err error) error {
-		if err != nil {
-			return err
-		}
-		if !info.IsDir() {
-			size += info.Size()
-		}
-		return nil
-	})
-	return size, err
-}
-
 // formatBytes formats bytes into human-readable string
 func formatBytes(bytes int64) string {
 	const unit = 1024
@@ -3,14 +3,17 @@ package cli
 import (
 	"fmt"
 	"os"
+	"time"
 
 	"github.com/mensfeld/code-on-incus/internal/container"
 	"github.com/spf13/cobra"
 )
 
 var (
-	killForce bool
-	killAll   bool
+	killForce    bool
+	killAll      bool
+	killParallel int
+	killTimeout  int
 )
 
 var killCmd = &cobra.Command{
@@ -19,7 +22,9 @@ var killCmd = &cobra.Command{
 	Long: `Force stop and delete one or more containers by name.
 
 This immediately force-kills containers without waiting for graceful shutdown.
-For graceful shutdown, use 'coi shutdown' instead.
+For graceful shutdown, use 'coi shutdown' instead. Containers are killed in
+parallel and the timeout is a single deadline for the whole run: containers
+not killed by then are reported as still pending.
 
 Use 'coi list' to see active containers.
 
@@ -28,6 +33,8 @@ Examples:
   coi kill claude-abc12345-1 claude-xyz78901-2  # Force kill multiple containers
   coi kill --all                       # Force kill all containers (with confirmation)
   coi kill --all --force               # Force kill all without confirmation
+  coi kill --all --force --parallel=16 # Kill up to 16 containers at once
+  coi kill --all --force --timeout=30  # Give up on containers not killed within 30s
 `,
 	RunE: killCommand,
 }
@@ -35,6 +42,8 @@ Examples:
 func init() {
 	killCmd.Flags().BoolVar(&killForce, "force", false, "Skip confirmation prompts")
 	killCmd.Flags().BoolVar(&killAll, "all", false, "Kill all containers")
+	killCmd.Flags().IntVar(&killParallel, "parallel", defaultParallel, "Number of containers to kill at once")
+	killCmd.Flags().IntVar(&killTimeout, "timeout", 120, "Timeout in seconds for killing all containers; any not killed by then are reported as pending")
 }
 
 func killCommand(cmd *cobra.Command, args []string) error {
@@ -92,37 +101,21 @@ func killCommand(cmd *cobra.Command, args []string) error {
 		}
 	}
 
-	// Kill each container
-	killed := 0
-	for _, name := range containerNames {
-		fmt.Printf("Killing container %s...\n", name)
-		mgr := container.NewManager(name)
-
-		// Check if container exists first
-		exists, err := mgr.Exists()
-		if err != nil {
-			fmt.Fprintf(os.Stderr, "  Warning: Failed to check if %s exists: %v\n", name, err)
-			continue
-		}
-		if !exists {
-			fmt.Fprintf(os.Stderr, "  Warning: Container %s does not exist\n", name)
-			continue
+	// Kill containers in parallel against one deadline, reporting each as it finishes
+	fmt.Printf("Killing %d container(s)...\n", len(containerNames))
+	deadline := time.Now().Add(time.Duration(killTimeout) * time.Second)
+	killed, pending := fanOutUntil(containerNames, killParallel, deadline, killContainer, func(r fanOutResult) {
+		if r.Err != nil {
+			fmt.Fprintf(os.Stderr, "  Warning: Failed to kill %s: %v\n", r.Name, r.Err)
+			return
 		}
+		fmt.Printf("  ✓ Killed %s%s\n", r.Name, withDetail(r.Detail))
+	})
 
-		// Stop container (only if running - skip if already stopped)
-		running, err := mgr.Running()
-		if err == nil && running {
-			if err := mgr.Stop(true); err != nil {
-				fmt.Fprintf(os.Stderr, "  Warning: Failed to stop %s: %v\n", name, err)
-			}
-		}
-
-		// Delete container
-		if err := mgr.Delete(true); err != nil {
-			fmt.Fprintf(os.Stderr, "  Warning: Failed to delete %s: %v\n", name, err)
-		} else {
-			killed++
-			fmt.Printf("  ✓ Killed %s\n", name)
+	if len(pending) > 0 {
+		fmt.Fprintf(os.Stderr, "\nTimed out after %ds, still pending:\n", killTimeout)
+		for _, name := range pending {
+			fmt.Fprintf(os.Stderr, "  - %s\n", name)
 		}
 	}
 
@@ -136,5 +129,38 @@ func killCommand(cmd *cobra.Command, args []string) error {
 		}
 	}
 
+	if len(pending) > 0 {
+		return fmt.Errorf("timed out with %d container(s) still pending", len(pending))
+	}
 	return nil
 }
+
+// killContainer force stops (if running) and deletes a single container
+func killContainer(name string) (string, error) {
+	mgr := container.NewManager(name)
+
+	// Check if container exists first
+	exists, err := mgr.Exists()
+	if err != nil {
+		return "", fmt.Errorf("failed to check if it exists: %w", err)
+	}
+	if !exists {
+		return "", fmt.Errorf("container does not exist")
+	}
+
+	// Stop container (only if running - skip if already stopped).
+	// A failed stop is not fatal: the forced delete below still removes the container.
+	detail := ""
+	running, err := mgr.Running()
+	if err == nil && running {
+		if err := mgr.Stop(true); err != nil {
+			detail = fmt.Sprintf("stop failed: %v", err)
+		}
+	}
+
+	// Delete container
+	if err := mgr.Delete(true); err != nil {
+		return detail, fmt.Errorf("failed to delete: %w", err)
+	}
+	return detail, nil
+}
@@ -5,6 +5,7 @@ import (
 	"fmt"
 	"os"
 	"path/filepath"
+	"sort"
 	"time"
 
 	"github.com/mensfeld/code-on-incus/internal/config"
@@ -15,8 +16,10 @@ import (
 )
 
 var (
-	listAll    bool
-	listFormat string
+	listAll      bool
+	listFormat   string
+	listWithTmux bool
+	listWatch    bool
 )
 
 var listCmd = &cobra.Command{
@@ -29,13 +32,19 @@ By default, shows only active containers. Use --all to also show saved sessions.
 Examples:
   coi list
   coi list --all
+  coi list --with-tmux    # Also show whether each container's tmux session is up
+  coi list --format=jsonl # One JSON record per container
+  coi list --watch        # Keep running and print containers as they change
+  coi list --watch --format=jsonl
 `,
 	RunE: listCommand,
 }
 
 func init() {
 	listCmd.Flags().BoolVar(&listAll, "all", false, "Show saved sessions in addition to active containers")
-	listCmd.Flags().StringVar(&listFormat, "format", "text", "Output format: text or json")
+	listCmd.Flags().StringVar(&listFormat, "format", "text", "Output format: text, json or jsonl")
+	listCmd.Flags().BoolVar(&listWithTmux, "with-tmux", false, "Check each running container for its tmux session")
+	listCmd.Flags().BoolVar(&listWatch, "watch", false, "Keep running and report containers as they are added, changed or removed")
 }
 
 func listCommand(cmd *cobra.Command, args []string) error {
@@ -45,8 +54,19 @@ func listCommand(cmd *cobra.Command, args []string) error {
 	}
 
 	// Validate format value
-	if listFormat != "text" && listFormat != "json" {
-		return fmt.Errorf("invalid format '%s': must be 'text' or 'json'", listFormat)
+	if listFormat != "text" && listFormat != "json" && listFormat != "jsonl" {
+		return fmt.Errorf("invalid format '%s': must be 'text', 'json' or 'jsonl'", listFormat)
+	}
+	if listWatch {
+		if listFormat == "json" {
+			return fmt.Errorf("--watch supports the 'text' and 'jsonl' formats")
+		}
+		if listAll || listWithTmux {
+			return fmt.Errorf("--watch cannot be combined with --all or --with-tmux")
+		}
+	}
+	if listFormat == "jsonl" && listAll {
+		return fmt.Errorf("--format=jsonl lists containers only and cannot be combined with --all")
 	}
 
 	// Get configured tool to determine tool-specific sessions directory
@@ -63,33 +83,22 @@ func listCommand(cmd *cobra.Command, args []string) error {
 	baseDir := filepath.Join(homeDir, ".coi")
 	sessionsDir := session.GetSessionsDir(baseDir, toolInstance)
 
+	if listWatch {
+		return watchContainers(sessionsDir, listFormat)
+	}
+
 	// List active containers
 	containers, err := listActiveContainers()
 	if err != nil {
 		return fmt.Errorf("failed to list containers: %w", err)
 	}
 
-	// Build maps of container name -> workspace and container name -> persistent from saved sessions
-	// We search for metadata.json files directly (not using listSavedSessions which requires .claude dir)
-	// because metadata is saved early at session start, before .claude directory exists
-	containerWorkspaces := make(map[string]string)
-	containerPersistent := make(map[string]bool)
-	if entries, err := os.ReadDir(sessionsDir); err == nil {
-		for _, entry := range entries {
-			if !entry.IsDir() {
-				continue
-			}
-			metadataPath := filepath.Join(sessionsDir, entry.Name(), "metadata.json")
-			if data, err := os.ReadFile(metadataPath); err == nil {
-				var metadata session.SessionMetadata
-				if err := json.Unmarshal(data, &metadata); err == nil && metadata.ContainerName != "" {
-					containerWorkspaces[metadata.ContainerName] = metadata.Workspace
-					containerPersistent[metadata.ContainerName] = metadata.Persistent
-				}
-			}
-		}
+	if listWithTmux {
+		fillTmuxStates(containers)
 	}
 
+	containerWorkspaces, containerPersistent := containerMetadata(sessionsDir)
+
 	// Get saved sessions if --all
 	var sessions []SessionInfo
 	if listAll {
@@ -100,13 +109,34 @@ func listCommand(cmd *cobra.Command, args []string) error {
 	}
 
 	// Route to formatter
-	if listFormat == "json" {
+	switch listFormat {
+	case "json":
 		return outputJSON(containers, sessions, containerWorkspaces, containerPersistent)
+	case "jsonl":
+		return outputJSONL(containers, containerWorkspaces, containerPersistent)
 	}
 
 	return outputText(containers, sessions, containerWorkspaces, containerPersistent)
 }
 
+// containerMetadata builds maps of container name -> workspace and container name -> persistent
+// from the session index. It includes sessions without saved data yet, because metadata is saved
+// early at session start, before the .claude directory exists.
+// When several sessions used the same container name, the most recent one wins.
+func containerMetadata(sessionsDir string) (map[string]string, map[string]bool) {
+	containerWorkspaces := make(map[string]string)
+	containerPersistent := make(map[string]bool)
+	records, _ := session.LoadSessionIndex(sessionsDir)
+	sort.SliceStable(records, func(i, j int) bool { return records[i].SavedAt < records[j].SavedAt })
+	for _, record := range records {
+		if record.ContainerName != "" {
+			containerWorkspaces[record.ContainerName] = record.Workspace
+			containerPersistent[record.ContainerName] = record.Persistent
+		}
+	}
+	return containerWorkspaces, containerPersistent
+}
+
 // ContainerInfo holds information about a container
 type ContainerInfo struct {
 	Name      string
@@ -114,6 +144,7 @@ type ContainerInfo struct {
 	CreatedAt string
 	Image     string
 	IPv4      string
+	Tmux      string // tmux session state, only filled with --with-tmux
 }
 
 // SessionInfo holds information about a saved session
@@ -126,159 +157,90 @@ type SessionInfo struct {
 // listActiveContainers lists all active claude-on-incus containers
 func listActiveContainers() ([]ContainerInfo, error) {
 	// Use the configured container prefix (respects COI_CONTAINER_PREFIX env var)
-	prefix := session.GetContainerPrefix()
-	pattern := fmt.Sprintf("^%s", prefix)
-
-	output, err := container.IncusOutput("list", pattern, "--format=json")
+	instances, err := container.ListInstancesWithPrefix(session.GetContainerPrefix())
 	if err != nil {
 		return nil, err
 	}
 
-	var containers []map[string]interface{}
-	if err := json.Unmarshal([]byte(output), &containers); err != nil {
-		return nil, err
+	result := make([]ContainerInfo, 0, len(instances))
+	for i := range instances {
+		result = append(result, containerInfoFromInstance(&instances[i]))
 	}
 
-	var result []ContainerInfo
-	for _, c := range containers {
-		name, _ := c["name"].(string)            // Type assertion, default to "" if fails
-		status, _ := c["status"].(string)        // Type assertion, default to "" if fails
-		createdAt, _ := c["created_at"].(string) // Type assertion, default to "" if fails
-
-		// Get image info
-		config, _ := c["config"].(map[string]interface{}) // Type assertion
-		image, _ := config["image.description"].(string)  // Type assertion
-
-		// Parse created_at time
-		createdTime := ""
-		if t, err := time.Parse(time.RFC3339, createdAt); err == nil {
-			createdTime = t.Format("2006-01-02 15:04:05")
-		}
+	return result, nil
+}
 
-		// Extract IPv4 address from eth0 interface
-		ipv4 := extractEth0IPv4(c)
+// containerInfoFromInstance converts an Incus instance into its `coi list` representation
+func containerInfoFromInstance(inst *container.Instance) ContainerInfo {
+	// Parse created_at time
+	createdTime := ""
+	if t, err := time.Parse(time.RFC3339, inst.CreatedAt); err == nil {
+		createdTime = t.Format("2006-01-02 15:04:05")
+	}
 
-		result = append(result, ContainerInfo{
-			Name:      name,
-			Status:    status,
-			CreatedAt: createdTime,
-			Image:     image,
-			IPv4:      ipv4,
-		})
+	return ContainerInfo{
+		Name:      inst.Name,
+		Status:    inst.Status,
+		CreatedAt: createdTime,
+		Image:     inst.Config["image.description"],
+		IPv4:      inst.IPv4(),
 	}
+}
 
-	return result, nil
+// fillTmuxStates sets the tmux column of running containers in one concurrent sweep
+func fillTmuxStates(containers []ContainerInfo) {
+	var running []string
+	for _, c := range containers {
+		if c.Status == "Running" {
+			running = append(running, c.Name)
+		}
+	}
+
+	states := probeTmuxSessions(running, tmuxCheckTimeout, tmuxHasSession)
+	for i := range containers {
+		if state, ok := states[containers[i].Name]; ok {
+			containers[i].Tmux = state
+		} else {
+			containers[i].Tmux = tmuxStateNone
+		}
+	}
 }
 
 // listSavedSessions lists all saved sessions
 func listSavedSessions(sessionsDir string, toolInstance tool.Tool) ([]SessionInfo, error) {
-	entries, err := os.ReadDir(sessionsDir)
+	records, err := session.LoadSessionIndex(sessionsDir)
 	if err != nil {
-		if os.IsNotExist(err) {
-			return []SessionInfo{}, nil
-		}
 		return nil, err
 	}
 
 	// Initialize as empty slice instead of nil so the section always appears with --all
 	result := []SessionInfo{}
-	for _, entry := range entries {
-		if !entry.IsDir() {
+	for _, record := range records {
+		// Config-based tools (e.g., .claude, .aider, .cursor) need saved config data;
+		// for ENV-based tools (ConfigDirName returns "") indexed metadata is enough
+		if toolInstance.ConfigDirName() != "" && !record.HasData {
 			continue
 		}
 
-		sessionID := entry.Name()
-
-		// Check if it has the tool's config directory (e.g., .claude, .aider, .cursor)
-		// Skip if tool uses ENV-based auth (ConfigDirName returns "")
-		configDirName := toolInstance.ConfigDirName()
-		if configDirName == "" {
-			// For ENV-based tools, only check if metadata.json exists
-			metadataPath := filepath.Join(sessionsDir, sessionID, "metadata.json")
-			if _, err := os.Stat(metadataPath); err != nil {
-				continue
-			}
-		} else {
-			// For config-based tools, check if config directory exists
-			statePath := filepath.Join(sessionsDir, sessionID, configDirName)
-			if info, err := os.Stat(statePath); err != nil || !info.IsDir() {
-				continue
-			}
-		}
-
-		// Try to read metadata
-		metadataPath := filepath.Join(sessionsDir, sessionID, "metadata.json")
-		savedAt := ""
-		workspace := ""
-
-		if data, err := os.ReadFile(metadataPath); err == nil {
-			var metadata session.SessionMetadata
-			if err := json.Unmarshal(data, &metadata); err == nil {
-				savedAt = metadata.SavedAt
-				workspace = metadata.Workspace
-			}
-		}
+		savedAt := record.SavedAt
 
 		// Get directory modification time as fallback
 		if savedAt == "" {
-			if info, err := entry.Info(); err == nil {
+			if info, err := os.Stat(filepath.Join(sessionsDir, record.SessionID)); err == nil {
 				savedAt = info.ModTime().Format("2006-01-02 15:04:05")
 			}
 		}
 
 		result = append(result, SessionInfo{
-			ID:        sessionID,
+			ID:        record.SessionID,
 			SavedAt:   savedAt,
-			Workspace: workspace,
+			Workspace: record.Workspace,
 		})
 	}
 
 	return result, nil
 }
 
-// extractEth0IPv4 extracts the IPv4 address from the eth0 interface
-func extractEth0IPv4(container map[string]interface{}) string {
-	// Get state object
-	state, ok := container["state"].(map[string]interface{})
-	if !ok {
-		return ""
-	}
-
-	// Get network object - it's null for stopped containers
-	network, ok := state["network"].(map[string]interface{})
-	if !ok || network == nil {
-		return ""
-	}
-
-	// Get eth0 interface
-	eth0, ok := network["eth0"].(map[string]interface{})
-	if !ok {
-		return ""
-	}
-
-	// Get addresses array
-	addresses, ok := eth0["addresses"].([]interface{})
-	if !ok {
-		return ""
-	}
-
-	// Find the first inet (IPv4) address
-	for _, addr := range addresses {
-		addrMap, ok := addr.(map[string]interface{})
-		if !ok {
-			continue
-		}
-
-		family, _ := addrMap["family"].(string)
-		if family == "inet" {
-			ip, _ := addrMap["address"].(string)
-			return ip
-		}
-	}
-
-	return ""
-}
-
 // outputJSON formats container and session data as JSON
 func outputJSON(containers []ContainerInfo, sessions []SessionInfo,
 	workspaces map[string]string, persistent map[string]bool,
@@ -297,6 +259,9 @@ func outputJSON(containers []ContainerInfo, sessions []SessionInfo,
 		if ws, ok := workspaces[c.Name]; ok {
 			item["workspace"] = ws
 		}
+		if c.Tmux != "" {
+			item["tmux"] = c.Tmux
+		}
 		enrichedContainers = append(enrichedContainers, item)
 	}
 
@@ -339,6 +304,9 @@ func outputText(containers []ContainerInfo, sessions []SessionInfo,
 				fmt.Printf("  %s (ephemeral)\n", c.Name)
 			}
 			fmt.Printf("    Status: %s\n", c.Status)
+			if c.Tmux != "" {
+				fmt.Printf("    Tmux: %s\n", c.Tmux)
+			}
 			if c.IPv4 != "" {
 				fmt.Printf("    IPv4: %s\n", c.IPv4)
 			}
@@ -0,0 +1,319 @@
+package cli
+
+import (
+	"context"
+	"encoding/json"
+	"fmt"
+	"io"
+	"os"
+	"os/signal"
+	"sort"
+	"strings"
+	"syscall"
+	"time"
+
+	"github.com/mensfeld/code-on-incus/internal/container"
+	"github.com/mensfeld/code-on-incus/internal/session"
+)
+
+const (
+	// watchDebounce coalesces the burst of lifecycle events a single start or delete produces
+	watchDebounce = 100 * time.Millisecond
+	// watchResyncInterval is how often a full listing is compared while events are flowing,
+	// in case an event was missed
+	watchResyncInterval = time.Minute
+	// watchPollInterval is how often the listing is polled when the event stream is unavailable
+	watchPollInterval = 2 * time.Second
+)
+
+// Record events emitted by `coi list --format=jsonl` and `coi list --watch`
+const (
+	recordAdd    = "add"
+	recordUpdate = "update"
+	recordRemove = "remove"
+)
+
+// containerState is what `coi list` reports about a container, with session metadata joined in
+type containerState struct {
+	Status     string `json:"status"`
+	CreatedAt  string `json:"created_at"`
+	Image      string `json:"image"`
+	IPv4       string `json:"ipv4"`
+	Persistent bool   `json:"persistent"`
+	Workspace  string `json:"workspace,omitempty"`
+	Tmux       string `json:"tmux,omitempty"`
+}
+
+// containerRecord is one line of jsonl output. Remove records carry only the name.
+type containerRecord struct {
+	Event string `json:"event"`
+	Name  string `json:"name"`
+	*containerState
+}
+
+// newContainerState joins a listed container with its session metadata
+func newContainerState(c ContainerInfo, workspaces map[string]string, persistent map[string]bool) containerState {
+	return containerState{
+		Status:     c.Status,
+		CreatedAt:  c.CreatedAt,
+		Image:      c.Image,
+		IPv4:       c.IPv4,
+		Persistent: persistent[c.Name],
+		Workspace:  workspaces[c.Name],
+		Tmux:       c.Tmux,
+	}
+}
+
+// writeJSONLRecord writes a record as a single JSON line
+func writeJSONLRecord(w io.Writer, record containerRecord) error {
+	data, err := json.Marshal(record)
+	if err != nil {
+		return fmt.Errorf("failed to marshal JSON: %w", err)
+	}
+	_, err = fmt.Fprintln(w, string(data))
+	return err
+}
+
+// outputJSONL formats the active containers as one "add" record per line
+func outputJSONL(containers []ContainerInfo, workspaces map[string]string, persistent map[string]bool) error {
+	for _, c := range containers {
+		state := newContainerState(c, workspaces, persistent)
+		if err := writeJSONLRecord(os.Stdout, containerRecord{Event: recordAdd, Name: c.Name, containerState: &state}); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+// formatWatchText renders a record as a single line for `coi list --watch`
+func formatWatchText(record containerRecord, now time.Time) string {
+	stamp := now.Format("15:04:05")
+	if record.containerState == nil {
+		return fmt.Sprintf("%s - %s (removed)", stamp, record.Name)
+	}
+
+	mark := "+"
+	if record.Event == recordUpdate {
+		mark = "~"
+	}
+	mode := "ephemeral"
+	if record.Persistent {
+		mode = "persistent"
+	}
+
+	fields := []string{stamp, mark, record.Name, "(" + mode + ")", record.Status}
+	if record.IPv4 != "" {
+		fields = append(fields, record.IPv4)
+	}
+	if record.Workspace != "" {
+		fields = append(fields, record.Workspace)
+	}
+	return strings.Join(fields, " ")
+}
+
+// containerWatcher turns container listings into add/update/remove records
+type containerWatcher struct {
+	prefix string
+	list   func() ([]ContainerInfo, error)                           // All coi containers
+	fetch  func(name string) (*ContainerInfo, error)                 // One container, nil if it is gone
+	meta   func() (map[string]string, map[string]bool)               // Workspace and persistence by container
+	emit   func(containerRecord) error                               // Writes a record
+	events func(ctx context.Context) (<-chan container.Event, error) // Lifecycle event subscription
+	warn   func(err error)
+
+	known map[string]containerState
+}
+
+// newContainerWatcher creates a watcher for coi containers emitting records in format
+func newContainerWatcher(sessionsDir, format string) *containerWatcher {
+	emit := func(record containerRecord) error {
+		_, err := fmt.Println(formatWatchText(record, time.Now()))
+		return err
+	}
+	if format == "jsonl" {
+		emit = func(record containerRecord) error { return writeJSONLRecord(os.Stdout, record) }
+	}
+
+	return &containerWatcher{
+		prefix: session.GetContainerPrefix(),
+		list:   listActiveContainers,
+		fetch: func(name string) (*ContainerInfo, error) {
+			inst, err := container.FetchInstance(name)
+			if err != nil || inst == nil {
+				return nil, err
+			}
+			info := containerInfoFromInstance(inst)
+			return &info, nil
+		},
+		meta:   func() (map[string]string, map[string]bool) { return containerMetadata(sessionsDir) },
+		emit:   emit,
+		events: container.SubscribeLifecycle,
+		warn: func(err error) {
+			fmt.Fprintf(os.Stderr, "Warning: %v\n", err)
+		},
+		known: map[string]containerState{},
+	}
+}
+
+// watchContainers runs `coi list --watch` until interrupted
+func watchContainers(sessionsDir, format string) error {
+	ctx, stop := signal.NotifyContext(context.Background(), os.Interrupt, syscall.SIGTERM)
+	defer stop()
+	return newContainerWatcher(sessionsDir, format).run(ctx)
+}
+
+// run emits the current containers, then changes as lifecycle events arrive, until ctx is done.
+// Without an event stream (no usable Incus socket, or the connection dropped) it polls the
+// listing and tries to subscribe again on every poll.
+func (w *containerWatcher) run(ctx context.Context) error {
+	// Subscribe before the first listing so no change in between is missed
+	events, err := w.events(ctx)
+	if err != nil {
+		events = nil
+	}
+
+	if err := w.syncAll(); err != nil {
+		return fmt.Errorf("failed to list containers: %w", err)
+	}
+
+	resync := time.NewTicker(w.resyncInterval(events))
+	defer resync.Stop()
+
+	pending := map[string]bool{}
+	var flush <-chan time.Time
+
+	for {
+		select {
+		case <-ctx.Done():
+			return nil
+
+		case event, ok := <-events:
+			if !ok {
+				// The stream dropped: poll (resubscribing on each tick) and catch up on what was missed
+				events = nil
+				resync.Reset(w.resyncInterval(events))
+				if err := w.syncAll(); err != nil {
+					w.warn(err)
+				}
+				continue
+			}
+
+			lifecycle, ok := event.Lifecycle()
+			if !ok {
+				continue
+			}
+			if name := lifecycle.InstanceName(); strings.HasPrefix(name, w.prefix) {
+				pending[name] = true
+				if flush == nil {
+					flush = time.After(watchDebounce)
+				}
+			}
+
+		case <-flush:
+			flush = nil
+			names := make([]string, 0, len(pending))
+			for name := range pending {
+				names = append(names, name)
+			}
+			sort.Strings(names)
+			pending = map[string]bool{}
+			if err := w.refresh(names); err != nil {
+				w.warn(err)
+			}
+
+		case <-resync.C:
+			if events == nil {
+				if ch, err := w.events(ctx); err == nil {
+					events = ch
+					resync.Reset(w.resyncInterval(events))
+				}
+			}
+			if err := w.syncAll(); err != nil {
+				w.warn(err)
+			}
+		}
+	}
+}
+
+// resyncInterval returns how often to compare full listings for the given event stream
+func (w *containerWatcher) resyncInterval(events <-chan container.Event) time.Duration {
+	if events == nil {
+		return watchPollInterval
+	}
+	return watchResyncInterval
+}
+
+// syncAll compares a full listing with the known containers
+func (w *containerWatcher) syncAll() error {
+	containers, err := w.list()
+	if err != nil {
+		return err
+	}
+	workspaces, persistent := w.meta()
+
+	seen := make(map[string]bool, len(containers))
+	for _, c := range containers {
+		seen[c.Name] = true
+		if err := w.update(c.Name, newContainerState(c, workspaces, persistent)); err != nil {
+			return err
+		}
+	}
+
+	gone := []string{}
+	for name := range w.known {
+		if !seen[name] {
+			gone = append(gone, name)
+		}
+	}
+	sort.Strings(gone)
+	for _, name := range gone {
+		if err := w.remove(name); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+// refresh re-reads the named containers after lifecycle events
+func (w *containerWatcher) refresh(names []string) error {
+	workspaces, persistent := w.meta()
+	for _, name := range names {
+		c, err := w.fetch(name)
+		if err != nil {
+			return err
+		}
+		if c == nil {
+			err = w.remove(name)
+		} else {
+			err = w.update(name, newContainerState(*c, workspaces, persistent))
+		}
+		if err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+// update records the state of a container, emitting add or update if it changed
+func (w *containerWatcher) update(name string, state containerState) error {
+	previous, ok := w.known[name]
+	if ok && previous == state {
+		return nil
+	}
+	w.known[name] = state
+
+	event := recordAdd
+	if ok {
+		event = recordUpdate
+	}
+	return w.emit(containerRecord{Event: event, Name: name, containerState: &state})
+}
+
+// remove forgets a container, emitting remove if it was known
+func (w *containerWatcher) remove(name string) error {
+	if _, ok := w.known[name]; !ok {
+		return nil
+	}
+	delete(w.known, name)
+	return w.emit(containerRecord{Event: recordRemove, Name: name})
+}
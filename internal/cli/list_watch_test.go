@@ -0,0 +1,201 @@
+package cli
+
+import (
+	"bytes"
+	"context"
+	"encoding/json"
+	"strings"
+	"sync"
+	"testing"
+	"time"
+
+	"github.com/mensfeld/code-on-incus/internal/container"
+)
+
+// newTestWatcher returns a watcher over a mutable fake listing that records emitted events
+func newTestWatcher(containers *[]ContainerInfo, mu *sync.Mutex) (*containerWatcher, *[]string) {
+	var emitted []string
+	w := &containerWatcher{
+		prefix: "coi-",
+		list: func() ([]ContainerInfo, error) {
+			mu.Lock()
+			defer mu.Unlock()
+			return append([]ContainerInfo(nil), *containers...), nil
+		},
+		fetch: func(name string) (*ContainerInfo, error) {
+			mu.Lock()
+			defer mu.Unlock()
+			for _, c := range *containers {
+				if c.Name == name {
+					c := c
+					return &c, nil
+				}
+			}
+			return nil, nil
+		},
+		meta: func() (map[string]string, map[string]bool) {
+			return map[string]string{"coi-abcd1234-1": "/work"}, map[string]bool{"coi-abcd1234-1": true}
+		},
+		emit: func(record containerRecord) error {
+			mu.Lock()
+			defer mu.Unlock()
+			emitted = append(emitted, record.Event+" "+record.Name)
+			return nil
+		},
+		events: func(context.Context) (<-chan container.Event, error) {
+			return nil, container.ErrEventsUnavailable
+		},
+		warn:  func(error) {},
+		known: map[string]containerState{},
+	}
+	return w, &emitted
+}
+
+func TestContainerWatcherSyncAll(t *testing.T) {
+	var mu sync.Mutex
+	containers := []ContainerInfo{
+		{Name: "coi-abcd1234-1", Status: "Running"},
+		{Name: "coi-abcd1234-2", Status: "Running"},
+	}
+	w, emitted := newTestWatcher(&containers, &mu)
+
+	if err := w.syncAll(); err != nil {
+		t.Fatalf("syncAll() unexpected error: %v", err)
+	}
+
+	// Unchanged containers are not reported again
+	containers[1].Status = "Stopped"
+	containers = append(containers[:0], containers[1], ContainerInfo{Name: "coi-abcd1234-3", Status: "Running"})
+	if err := w.syncAll(); err != nil {
+		t.Fatalf("syncAll() unexpected error: %v", err)
+	}
+
+	want := []string{
+		"add coi-abcd1234-1",
+		"add coi-abcd1234-2",
+		"update coi-abcd1234-2",
+		"add coi-abcd1234-3",
+		"remove coi-abcd1234-1",
+	}
+	if strings.Join(*emitted, ",") != strings.Join(want, ",") {
+		t.Errorf("syncAll() emitted %v, want %v", *emitted, want)
+	}
+
+	if state := w.known["coi-abcd1234-2"]; state.Status != "Stopped" {
+		t.Errorf("known state = %+v, want Stopped", state)
+	}
+}
+
+func TestContainerWatcherRefresh(t *testing.T) {
+	var mu sync.Mutex
+	containers := []ContainerInfo{{Name: "coi-abcd1234-1", Status: "Running"}}
+	w, emitted := newTestWatcher(&containers, &mu)
+
+	if err := w.refresh([]string{"coi-abcd1234-1", "coi-abcd1234-9"}); err != nil {
+		t.Fatalf("refresh() unexpected error: %v", err)
+	}
+	containers = nil
+	if err := w.refresh([]string{"coi-abcd1234-1"}); err != nil {
+		t.Fatalf("refresh() unexpected error: %v", err)
+	}
+
+	want := "add coi-abcd1234-1,remove coi-abcd1234-1"
+	if got := strings.Join(*emitted, ","); got != want {
+		t.Errorf("refresh() emitted %v, want %v", got, want)
+	}
+}
+
+func TestContainerWatcherRunFollowsEvents(t *testing.T) {
+	var mu sync.Mutex
+	containers := []ContainerInfo{}
+	w, emitted := newTestWatcher(&containers, &mu)
+
+	events := make(chan container.Event, 4)
+	w.events = func(context.Context) (<-chan container.Event, error) { return events, nil }
+
+	ctx, cancel := context.WithCancel(context.Background())
+	done := make(chan error, 1)
+	go func() { done <- w.run(ctx) }()
+
+	mu.Lock()
+	containers = append(containers, ContainerInfo{Name: "coi-abcd1234-1", Status: "Running"})
+	mu.Unlock()
+
+	lifecycle := func(name string) container.Event {
+		meta, _ := json.Marshal(container.LifecycleEvent{Action: "instance-started", Source: "/1.0/instances/" + name})
+		return container.Event{Type: "lifecycle", Metadata: meta}
+	}
+	events <- lifecycle("other-container")
+	events <- lifecycle("coi-abcd1234-1")
+
+	deadline := time.Now().Add(2 * time.Second)
+	for {
+		mu.Lock()
+		n := len(*emitted)
+		mu.Unlock()
+		if n > 0 || time.Now().After(deadline) {
+			break
+		}
+		time.Sleep(10 * time.Millisecond)
+	}
+
+	cancel()
+	if err := <-done; err != nil {
+		t.Fatalf("run() unexpected error: %v", err)
+	}
+
+	mu.Lock()
+	defer mu.Unlock()
+	if got := strings.Join(*emitted, ","); got != "add coi-abcd1234-1" {
+		t.Errorf("run() emitted %v, want a single add", got)
+	}
+}
+
+func TestWriteJSONLRecord(t *testing.T) {
+	state := containerState{Status: "Running", Persistent: true, Workspace: "/work"}
+
+	var buf bytes.Buffer
+	if err := writeJSONLRecord(&buf, containerRecord{Event: recordAdd, Name: "coi-abcd1234-1", containerState: &state}); err != nil {
+		t.Fatalf("writeJSONLRecord() unexpected error: %v", err)
+	}
+	if err := writeJSONLRecord(&buf, containerRecord{Event: recordRemove, Name: "coi-abcd1234-1"}); err != nil {
+		t.Fatalf("writeJSONLRecord() unexpected error: %v", err)
+	}
+
+	lines := strings.Split(strings.TrimSpace(buf.String()), "\n")
+	if len(lines) != 2 {
+		t.Fatalf("writeJSONLRecord() wrote %d lines, want 2", len(lines))
+	}
+
+	var added map[string]interface{}
+	if err := json.Unmarshal([]byte(lines[0]), &added); err != nil {
+		t.Fatalf("add record is not valid JSON: %v", err)
+	}
+	if added["event"] != "add" || added["status"] != "Running" || added["persistent"] != true || added["workspace"] != "/work" {
+		t.Errorf("add record = %v, want status, persistence and workspace", added)
+	}
+
+	if want := `{"event":"remove","name":"coi-abcd1234-1"}`; lines[1] != want {
+		t.Errorf("remove record = %s, want %s", lines[1], want)
+	}
+}
+
+func TestFormatWatchText(t *testing.T) {
+	now := time.Date(2024, 1, 2, 3, 4, 5, 0, time.UTC)
+	state := containerState{Status: "Running", IPv4: "10.0.0.5", Workspace: "/work"}
+
+	tests := []struct {
+		record containerRecord
+		want   string
+	}{
+		{containerRecord{Event: recordAdd, Name: "coi-a-1", containerState: &state}, "03:04:05 + coi-a-1 (ephemeral) Running 10.0.0.5 /work"},
+		{containerRecord{Event: recordUpdate, Name: "coi-a-1", containerState: &state}, "03:04:05 ~ coi-a-1 (ephemeral) Running 10.0.0.5 /work"},
+		{containerRecord{Event: recordRemove, Name: "coi-a-1"}, "03:04:05 - coi-a-1 (removed)"},
+	}
+
+	for _, tt := range tests {
+		if got := formatWatchText(tt.record, now); got != tt.want {
+			t.Errorf("formatWatchText(%s) = %q, want %q", tt.record.Event, got, tt.want)
+		}
+	}
+}
@@ -169,30 +169,12 @@ func findSessionMetadata(sessionsDir, containerName string) (string, error) {
 		return "", fmt.Errorf("sessions directory not found: %s", sessionsDir)
 	}
 
-	// Scan all session directories
-	entries, err := os.ReadDir(sessionsDir)
+	record, err := session.FindSessionByContainer(sessionsDir, containerName)
 	if err != nil {
-		return "", fmt.Errorf("failed to read sessions directory: %w", err)
+		return "", err
 	}
 
-	for _, entry := range entries {
-		if !entry.IsDir() {
-			continue
-		}
-
-		metadataPath := filepath.Join(sessionsDir, entry.Name(), "metadata.json")
-		metadata, err := session.LoadSessionMetadata(metadataPath)
-		if err != nil {
-			// Skip invalid metadata files
-			continue
-		}
-
-		if metadata.ContainerName == containerName {
-			return metadataPath, nil
-		}
-	}
-
-	return "", fmt.Errorf("no session metadata found for container %s", containerName)
+	return filepath.Join(sessionsDir, record.SessionID, "metadata.json"), nil
 }
 
 // updatePersistentFlag updates the persistent field in a metadata file
@@ -211,16 +193,6 @@ func updatePersistentFlag(metadataPath string, persistent bool) error {
 	// Update persistent field
 	metadata.Persistent = persistent
 
-	// Write back using same format as cleanup.go:saveMetadata
-	content := fmt.Sprintf(`{
-  "session_id": "%s",
-  "container_name": "%s",
-  "persistent": %t,
-  "workspace": "%s",
-  "saved_at": "%s"
-}
-`, metadata.SessionID, metadata.ContainerName, metadata.Persistent,
-		metadata.Workspace, metadata.SavedAt)
-
-	return os.WriteFile(metadataPath, []byte(content), 0o644)
+	// Write back (also updates the session index)
+	return session.SaveSessionMetadata(metadataPath, *metadata)
 }
@@ -0,0 +1,116 @@
+package cli
+
+import (
+	"fmt"
+	"os"
+
+	"github.com/mensfeld/code-on-incus/internal/session"
+	"github.com/spf13/cobra"
+)
+
+var poolSize int
+
+var poolCmd = &cobra.Command{
+	Use:   "pool",
+	Short: "Manage the warm container pool",
+	Long: `Manage a pool of pre-created, stopped containers per image.
+
+When [pool] enabled = true, 'coi shell' claims a container from the pool instead of
+creating one, so only the workspace mount and start remain on the critical path.
+
+Examples:
+  coi pool fill                   # Keep pool.size containers ready for the default image
+  coi pool fill --size 4          # Keep 4 containers ready
+  coi pool fill --image coi-rust  # Pool for a custom image
+  coi pool status                 # Show pool containers
+  coi pool drain                  # Delete all pool containers
+`,
+}
+
+var poolFillCmd = &cobra.Command{
+	Use:   "fill",
+	Short: "Create pool containers up to the configured size",
+	RunE:  poolFillCommand,
+}
+
+var poolStatusCmd = &cobra.Command{
+	Use:   "status",
+	Short: "Show warm pool containers",
+	RunE:  poolStatusCommand,
+}
+
+var poolDrainCmd = &cobra.Command{
+	Use:   "drain",
+	Short: "Delete warm pool containers",
+	RunE:  poolDrainCommand,
+}
+
+func init() {
+	poolFillCmd.Flags().IntVar(&poolSize, "size", 0, "Number of containers to keep ready (default: pool.size from config)")
+
+	poolCmd.AddCommand(poolFillCmd)
+	poolCmd.AddCommand(poolStatusCmd)
+	poolCmd.AddCommand(poolDrainCmd)
+}
+
+// resolvePoolImage returns the image the pool command operates on
+func resolvePoolImage() string {
+	if imageName != "" {
+		return imageName
+	}
+	if cfg != nil && cfg.Defaults.Image != "" {
+		return cfg.Defaults.Image
+	}
+	return session.CoiImage
+}
+
+func poolFillCommand(cmd *cobra.Command, args []string) error {
+	image := resolvePoolImage()
+
+	size := poolSize
+	if size == 0 && cfg != nil {
+		size = cfg.Pool.Size
+	}
+	if size < 0 {
+		return fmt.Errorf("invalid pool size: %d", size)
+	}
+
+	created, err := session.FillPool(image, size, func(msg string) {
+		fmt.Fprintf(os.Stderr, "[pool] %s\n", msg)
+	})
+	if err != nil {
+		return err
+	}
+
+	fmt.Printf("Pool for %s: %d container(s) created, %d ready\n", image, created, size)
+	return nil
+}
+
+func poolStatusCommand(cmd *cobra.Command, args []string) error {
+	members, err := session.ListPool("")
+	if err != nil {
+		return fmt.Errorf("failed to list pool: %w", err)
+	}
+
+	if len(members) == 0 {
+		fmt.Println("Warm pool is empty (fill with: coi pool fill)")
+		return nil
+	}
+
+	fmt.Println("Warm pool containers:")
+	for _, member := range members {
+		stale := ""
+		if member.Stale {
+			stale = " (stale - image rebuilt)"
+		}
+		fmt.Printf("  %s  %s%s\n", member.Name, member.Image, stale)
+	}
+	return nil
+}
+
+func poolDrainCommand(cmd *cobra.Command, args []string) error {
+	// Without --image, drain the pools of all images
+	removed, err := session.DrainPool(imageName)
+	fmt.Printf("Removed %d pool container(s)\n", removed)
+	return err
+}
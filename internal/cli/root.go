@@ -111,6 +111,8 @@ func init() {
 	rootCmd.AddCommand(killCmd)
 	rootCmd.AddCommand(persistCmd)
 	rootCmd.AddCommand(tmuxCmd)
+	rootCmd.AddCommand(poolCmd)
+	rootCmd.AddCommand(benchCmd)
 	rootCmd.AddCommand(versionCmd)
 }
 
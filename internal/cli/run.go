@@ -5,6 +5,7 @@ import (
 	"os"
 	"path/filepath"
 	"strings"
+	"time"
 
 	"github.com/mensfeld/code-on-incus/internal/container"
 	"github.com/mensfeld/code-on-incus/internal/session"
@@ -55,7 +56,7 @@ func runCommand(cmd *cobra.Command, args []string) error {
 	// Allocate slot if not specified
 	slotNum := slot
 	if slotNum == 0 {
-		slotNum, err = session.AllocateSlot(absWorkspace, 10)
+		slotNum, err = session.AllocateSlot(absWorkspace, session.DefaultMaxSlots)
 		if err != nil {
 			return fmt.Errorf("failed to allocate slot: %w", err)
 		}
@@ -91,27 +92,29 @@ func runCommand(cmd *cobra.Command, args []string) error {
 		return fmt.Errorf("failed to check if container exists: %w", err)
 	}
 
-	if containerExists && persistent {
-		// Restart existing persistent container
+	// Restarting an existing persistent container keeps its workspace mount
+	wasRestarted := containerExists && persistent
+	if wasRestarted {
 		fmt.Fprintf(os.Stderr, "Restarting existing persistent container...\n")
 		if err := mgr.Start(); err != nil {
 			return fmt.Errorf("failed to start container: %w", err)
 		}
-	} else if containerExists {
-		// Ephemeral container with same name exists - delete and recreate
-		fmt.Fprintf(os.Stderr, "Removing existing container...\n")
-		if err := mgr.Delete(true); err != nil {
-			return fmt.Errorf("failed to delete existing container: %w", err)
+	} else {
+		if containerExists {
+			// Ephemeral container with same name exists - delete and recreate
+			fmt.Fprintf(os.Stderr, "Removing existing container...\n")
+			if err := mgr.Delete(true); err != nil {
+				return fmt.Errorf("failed to delete existing container: %w", err)
+			}
 		}
-		// Launch new container
-		ephemeral := !persistent
-		if err := mgr.Launch(img, ephemeral); err != nil {
-			return fmt.Errorf("failed to launch container: %w", err)
+
+		spec, err := runInstanceSpec(img, containerName, absWorkspace)
+		if err != nil {
+			return err
 		}
-	} else {
-		// Launch new container
-		ephemeral := !persistent
-		if err := mgr.Launch(img, ephemeral); err != nil {
+
+		// Launch new container with Docker support and all mounts in one request
+		if err := container.CreateInstance(spec, true); err != nil {
 			return fmt.Errorf("failed to launch container: %w", err)
 		}
 	}
@@ -132,46 +135,11 @@ func runCommand(cmd *cobra.Command, args []string) error {
 
 	// Wait for container to be ready
 	fmt.Fprintf(os.Stderr, "Waiting for container to be ready...\n")
-	if err := waitForContainer(mgr, 30); err != nil {
+	if err := waitForContainer(mgr, 30*time.Second); err != nil {
 		return err
 	}
 
-	// Mount workspace (skip if restarting existing persistent container)
-	wasRestarted := containerExists && persistent
-	useShift := !cfg.Incus.DisableShift
-	if !wasRestarted {
-		fmt.Fprintf(os.Stderr, "Mounting workspace %s...\n", absWorkspace)
-		if err := mgr.MountDisk("workspace", absWorkspace, "/workspace", useShift); err != nil {
-			return fmt.Errorf("failed to mount workspace: %w", err)
-		}
-
-		// Parse and validate mount configuration
-		mountConfig, err := ParseMountConfig(cfg, mountPairs)
-		if err != nil {
-			return fmt.Errorf("invalid mount configuration: %w", err)
-		}
-
-		// Validate no nested mounts
-		if err := session.ValidateMounts(mountConfig); err != nil {
-			return fmt.Errorf("mount validation failed: %w", err)
-		}
-
-		// Mount all configured directories
-		if mountConfig != nil && len(mountConfig.Mounts) > 0 {
-			for _, mount := range mountConfig.Mounts {
-				// Create host directory if it doesn't exist
-				if err := os.MkdirAll(mount.HostPath, 0o755); err != nil {
-					return fmt.Errorf("failed to create mount directory '%s': %w", mount.HostPath, err)
-				}
-
-				fmt.Fprintf(os.Stderr, "Adding mount: %s -> %s\n", mount.HostPath, mount.ContainerPath)
-
-				if err := mgr.MountDisk(mount.DeviceName, mount.HostPath, mount.ContainerPath, useShift); err != nil {
-					return fmt.Errorf("failed to add mount '%s': %w", mount.DeviceName, err)
-				}
-			}
-		}
-	} else {
+	if wasRestarted {
 		fmt.Fprintf(os.Stderr, "Reusing existing workspace mount...\n")
 	}
 
@@ -215,24 +183,52 @@ func runCommand(cmd *cobra.Command, args []string) error {
 	return nil
 }
 
-// waitForContainer waits for container to be ready
-func waitForContainer(mgr *container.Manager, maxRetries int) error {
-	for i := 0; i < maxRetries; i++ {
-		running, err := mgr.Running()
-		if err != nil {
-			return err
-		}
-		if running {
-			// Additional check: try to execute a simple command
-			_, err := mgr.ExecCommand("echo ready", container.ExecCommandOptions{Capture: true})
-			if err == nil {
-				return nil
+// runInstanceSpec builds the instance spec for 'coi run': Docker support plus the
+// workspace and all configured mounts, so no devices are hot-plugged after launch
+func runInstanceSpec(img, containerName, absWorkspace string) (*container.InstanceSpec, error) {
+	spec := container.NewInstanceSpec(img, containerName).EnableDockerSupport()
+	spec.Ephemeral = !persistent
+
+	useShift := !cfg.Incus.DisableShift
+	fmt.Fprintf(os.Stderr, "Mounting workspace %s...\n", absWorkspace)
+	spec.AddDisk("workspace", absWorkspace, "/workspace", useShift)
+
+	// Parse and validate mount configuration
+	mountConfig, err := ParseMountConfig(cfg, mountPairs)
+	if err != nil {
+		return nil, fmt.Errorf("invalid mount configuration: %w", err)
+	}
+
+	// Validate no nested mounts
+	if err := session.ValidateMounts(mountConfig); err != nil {
+		return nil, fmt.Errorf("mount validation failed: %w", err)
+	}
+
+	// Add all configured directories
+	if mountConfig != nil {
+		for _, mount := range mountConfig.Mounts {
+			// Create host directory if it doesn't exist
+			if err := os.MkdirAll(mount.HostPath, 0o755); err != nil {
+				return nil, fmt.Errorf("failed to create mount directory '%s': %w", mount.HostPath, err)
 			}
-		}
-		// Wait before retry
-		if i < maxRetries-1 {
-			fmt.Fprintf(os.Stderr, ".")
+
+			fmt.Fprintf(os.Stderr, "Adding mount: %s -> %s\n", mount.HostPath, mount.ContainerPath)
+			spec.AddDisk(mount.DeviceName, mount.HostPath, mount.ContainerPath, useShift)
 		}
 	}
-	return fmt.Errorf("container failed to become ready")
+
+	return spec, nil
+}
+
+// waitForContainer waits for container to be ready
+func waitForContainer(mgr *container.Manager, readyTimeout time.Duration) error {
+	elapsed, err := mgr.WaitReady(readyTimeout, func(time.Duration) {
+		fmt.Fprintf(os.Stderr, ".")
+	})
+	if err != nil {
+		return err
+	}
+
+	fmt.Fprintf(os.Stderr, "Container ready in %dms\n", elapsed.Milliseconds())
+	return nil
 }
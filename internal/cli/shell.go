@@ -143,7 +143,7 @@ func shellCommand(cmd *cobra.Command, args []string) error {
 	slotNum := slot
 	if slotNum == 0 {
 		// No slot specified, find first available
-		slotNum, err = session.AllocateSlot(absWorkspace, 10)
+		slotNum, err = session.AllocateSlot(absWorkspace, session.DefaultMaxSlots)
 		if err != nil {
 			return fmt.Errorf("failed to allocate slot: %w", err)
 		}
@@ -159,7 +159,7 @@ func shellCommand(cmd *cobra.Command, args []string) error {
 		if !available {
 			// Slot is occupied, find next available starting from slot+1
 			originalSlot := slotNum
-			slotNum, err = session.AllocateSlotFrom(absWorkspace, slotNum+1, 10)
+			slotNum, err = session.AllocateSlotFrom(absWorkspace, slotNum+1, session.DefaultMaxSlots)
 			if err != nil {
 				return fmt.Errorf("slot %d is occupied and failed to find next available slot: %w", originalSlot, err)
 			}
@@ -194,6 +194,7 @@ func shellCommand(cmd *cobra.Command, args []string) error {
 		Tool:          toolInstance,
 		NetworkConfig: &networkConfig,
 		DisableShift:  cfg.Incus.DisableShift,
+		UsePool:       cfg.Pool.Enabled,
 	}
 
 	// Parse and validate mount configuration
@@ -229,6 +230,7 @@ func shellCommand(cmd *cobra.Command, args []string) error {
 			Persistent:     persistent,
 			SessionsDir:    sessionsDir,
 			SaveSession:    true, // Always save session data
+			SessionStore:   cfg.Sessions.Store,
 			Workspace:      absWorkspace,
 			Tool:           toolInstance,
 			NetworkManager: result.NetworkManager,
@@ -351,14 +353,9 @@ func runCLI(result *session.SetupResult, sessionID string, useResumeFlag, restor
 			// Try to discover the tool's internal session ID from saved state
 			// The exact discovery mechanism is tool-specific (e.g. some tools read
 			// config files, others use environment variables) and may return ""
-			// if no previous session can be found (start fresh).
-			var sessionStatePath string
-			if configDir := t.ConfigDirName(); configDir != "" {
-				sessionStatePath = filepath.Join(sessionsDir, resumeID, configDir)
-			} else {
-				sessionStatePath = filepath.Join(sessionsDir, resumeID)
-			}
-			cliSessionID = t.DiscoverSessionID(sessionStatePath)
+			// if no previous session can be found (start fresh). Compressed
+			// sessions are looked up through the session store's manifest.
+			cliSessionID = session.DiscoverCLISessionID(t, sessionsDir, resumeID)
 		}
 
 		// Build command using tool abstraction
@@ -431,14 +428,9 @@ func runCLIInTmux(result *session.SetupResult, sessionID string, detached bool,
 			// Try to discover the tool's internal session ID from saved state
 			// The exact discovery mechanism is tool-specific (e.g. some tools read
 			// config files, others use environment variables) and may return ""
-			// if no previous session can be found (start fresh).
-			var sessionStatePath string
-			if configDir := t.ConfigDirName(); configDir != "" {
-				sessionStatePath = filepath.Join(sessionsDir, resumeID, configDir)
-			} else {
-				sessionStatePath = filepath.Join(sessionsDir, resumeID)
-			}
-			cliSessionID = t.DiscoverSessionID(sessionStatePath)
+			// if no previous session can be found (start fresh). Compressed
+			// sessions are looked up through the session store's manifest.
+			cliSessionID = session.DiscoverCLISessionID(t, sessionsDir, resumeID)
 		}
 
 		// Build command using tool abstraction
@@ -10,9 +10,10 @@ import (
 )
 
 var (
-	shutdownTimeout int
-	shutdownForce   bool
-	shutdownAll     bool
+	shutdownTimeout  int
+	shutdownForce    bool
+	shutdownAll      bool
+	shutdownParallel int
 )
 
 var shutdownCmd = &cobra.Command{
@@ -21,7 +22,9 @@ var shutdownCmd = &cobra.Command{
 	Long: `Gracefully stop and delete one or more containers by name.
 
 This attempts a graceful shutdown first, waiting for the timeout before
-force-killing if necessary.
+force-killing if necessary. Containers are shut down in parallel and the
+timeout is a single deadline for the whole run: containers still running
+when it passes are force-killed.
 
 Use 'coi list' to see active containers.
 
@@ -30,14 +33,16 @@ Examples:
   coi shutdown --timeout=30 claude-abc12345-1  # 30 second timeout
   coi shutdown --all                         # Shutdown all containers
   coi shutdown --all --force                 # Shutdown all without confirmation
+  coi shutdown --all --force --parallel=16   # Shutdown up to 16 containers at once
 `,
 	RunE: shutdownCommand,
 }
 
 func init() {
-	shutdownCmd.Flags().IntVar(&shutdownTimeout, "timeout", 60, "Timeout in seconds to wait for graceful shutdown before force-killing")
+	shutdownCmd.Flags().IntVar(&shutdownTimeout, "timeout", 60, "Timeout in seconds to wait for graceful shutdown (of all containers) before force-killing")
 	shutdownCmd.Flags().BoolVar(&shutdownForce, "force", false, "Skip confirmation prompts")
 	shutdownCmd.Flags().BoolVar(&shutdownAll, "all", false, "Shutdown all containers")
+	shutdownCmd.Flags().IntVar(&shutdownParallel, "parallel", defaultParallel, "Number of containers to shutdown at once")
 	rootCmd.AddCommand(shutdownCmd)
 }
 
@@ -96,56 +101,18 @@ func shutdownCommand(cmd *cobra.Command, args []string) error {
 		}
 	}
 
-	// Shutdown each container
-	shutdown := 0
-	for _, name := range containerNames {
-		fmt.Printf("Shutting down container %s (timeout: %ds)...\n", name, shutdownTimeout)
-		mgr := container.NewManager(name)
-
-		// Check if container is running
-		running, err := mgr.Running()
-		if err != nil {
-			fmt.Fprintf(os.Stderr, "  Warning: Failed to check status of %s: %v\n", name, err)
-			continue
-		}
-
-		if running {
-			// First attempt graceful stop
-			fmt.Printf("  Attempting graceful shutdown...\n")
-			gracefulDone := make(chan error, 1)
-			go func() {
-				gracefulDone <- mgr.Stop(false) // graceful stop
-			}()
-
-			// Wait for graceful stop or timeout
-			select {
-			case err := <-gracefulDone:
-				if err != nil {
-					fmt.Fprintf(os.Stderr, "  Warning: Graceful stop failed: %v\n", err)
-				} else {
-					fmt.Printf("  Graceful shutdown successful\n")
-				}
-			case <-time.After(time.Duration(shutdownTimeout) * time.Second):
-				// Check if container stopped during timeout (avoids spurious errors)
-				if stillRunning, _ := mgr.Running(); stillRunning {
-					fmt.Printf("  Timeout reached, force-killing...\n")
-					if err := mgr.Stop(true); err != nil {
-						fmt.Fprintf(os.Stderr, "  Warning: Force stop failed: %v\n", err)
-					}
-				} else {
-					fmt.Printf("  Container stopped during timeout\n")
-				}
-			}
-		}
-
-		// Delete container
-		if err := mgr.Delete(true); err != nil {
-			fmt.Fprintf(os.Stderr, "  Warning: Failed to delete %s: %v\n", name, err)
-		} else {
-			shutdown++
-			fmt.Printf("  ✓ Shutdown %s\n", name)
+	// Shutdown containers in parallel against one deadline, reporting each as it finishes
+	fmt.Printf("Shutting down %d container(s) (timeout: %ds)...\n", len(containerNames), shutdownTimeout)
+	deadline := time.Now().Add(time.Duration(shutdownTimeout) * time.Second)
+	shutdown := fanOut(containerNames, shutdownParallel, func(name string) (string, error) {
+		return shutdownContainer(name, deadline)
+	}, func(r fanOutResult) {
+		if r.Err != nil {
+			fmt.Fprintf(os.Stderr, "  Warning: Failed to shutdown %s: %v\n", r.Name, r.Err)
+			return
 		}
-	}
+		fmt.Printf("  ✓ Shutdown %s%s\n", r.Name, withDetail(r.Detail))
+	})
 
 	if shutdown > 0 {
 		fmt.Printf("\nShutdown %d container(s)\n", shutdown)
@@ -159,3 +126,60 @@ func shutdownCommand(cmd *cobra.Command, args []string) error {
 
 	return nil
 }
+
+// shutdownContainer stops a single container gracefully until deadline, force-killing it
+// afterwards, and deletes it. Returns how the container was stopped.
+func shutdownContainer(name string, deadline time.Time) (string, error) {
+	mgr := container.NewManager(name)
+
+	// Check if container is running
+	running, err := mgr.Running()
+	if err != nil {
+		return "", fmt.Errorf("failed to check status: %w", err)
+	}
+
+	detail := "already stopped"
+	if running {
+		detail = stopBefore(mgr, deadline)
+	}
+
+	// Delete container
+	if err := mgr.Delete(true); err != nil {
+		return detail, fmt.Errorf("failed to delete: %w", err)
+	}
+	return detail, nil
+}
+
+// stopBefore attempts a graceful stop that must finish by deadline, force-killing the
+// container if it is still running then. Returns a description of what happened.
+func stopBefore(mgr *container.Manager, deadline time.Time) string {
+	remaining := time.Until(deadline)
+	if remaining > 0 {
+		gracefulDone := make(chan error, 1)
+		go func() {
+			gracefulDone <- mgr.Stop(false) // graceful stop
+		}()
+
+		// Wait for graceful stop or the deadline
+		timer := time.NewTimer(remaining)
+		defer timer.Stop()
+		select {
+		case err := <-gracefulDone:
+			if err != nil {
+				return fmt.Sprintf("graceful stop failed: %v", err)
+			}
+			return "graceful"
+		case <-timer.C:
+		}
+	}
+
+	// Check if container stopped during timeout (avoids spurious errors)
+	container.InvalidateCache()
+	if stillRunning, _ := mgr.Running(); !stillRunning {
+		return "stopped during timeout"
+	}
+	if err := mgr.Stop(true); err != nil {
+		return fmt.Sprintf("timeout reached, force stop failed: %v", err)
+	}
+	return "timeout reached, force-killed"
+}
@@ -1,12 +1,28 @@
 package cli
 
 import (
+	"context"
 	"fmt"
+	"time"
 
 	"github.com/mensfeld/code-on-incus/internal/container"
+	"github.com/mensfeld/code-on-incus/internal/session"
 	"github.com/spf13/cobra"
 )
 
+// tmuxCheckTimeout bounds how long a single container may take to answer a tmux session check
+const tmuxCheckTimeout = 3 * time.Second
+
+// tmuxProbeParallel is how many containers are checked for a tmux session at once
+const tmuxProbeParallel = 16
+
+// tmux session states reported by probeTmuxSessions
+const (
+	tmuxStateActive  = "active"
+	tmuxStateNone    = "none"
+	tmuxStateUnknown = "unknown" // The check timed out
+)
+
 var tmuxCmd = &cobra.Command{
 	Use:   "tmux",
 	Short: "Interact with tmux sessions in containers",
@@ -61,7 +77,7 @@ func tmuxSendCommand(cmd *cobra.Command, args []string) error {
 	}
 
 	// Send command to tmux session
-	tmuxSession := fmt.Sprintf("coi-%s", containerName)
+	tmuxSession := tmuxSessionName(containerName)
 	tmuxCmd := fmt.Sprintf("tmux send-keys -t %s %q Enter", tmuxSession, command)
 
 	opts := container.ExecCommandOptions{
@@ -93,7 +109,7 @@ func tmuxCaptureCommand(cmd *cobra.Command, args []string) error {
 	}
 
 	// Capture tmux pane output
-	tmuxSession := fmt.Sprintf("coi-%s", containerName)
+	tmuxSession := tmuxSessionName(containerName)
 	tmuxCmd := fmt.Sprintf("tmux capture-pane -t %s -p", tmuxSession)
 
 	opts := container.ExecCommandOptions{
@@ -111,41 +127,66 @@ func tmuxCaptureCommand(cmd *cobra.Command, args []string) error {
 }
 
 func tmuxListCommand(cmd *cobra.Command, args []string) error {
-	// List all running containers with configured prefix
-	containers, err := container.ListContainers("coi-.*")
+	// List running containers with the configured prefix
+	instances, err := container.ListInstancesWithPrefix(session.GetContainerPrefix())
 	if err != nil {
 		return fmt.Errorf("failed to list containers: %w", err)
 	}
 
-	if len(containers) == 0 {
+	var running []string
+	for _, inst := range instances {
+		if inst.Running() {
+			running = append(running, inst.Name)
+		}
+	}
+
+	if len(running) == 0 {
 		fmt.Println("No active sessions")
 		return nil
 	}
 
-	fmt.Println("Active sessions:")
-	for _, c := range containers {
-		mgr := container.NewManager(c)
+	// Check all containers for their tmux session in one concurrent sweep
+	states := probeTmuxSessions(running, tmuxCheckTimeout, tmuxHasSession)
 
-		// Check if container is running
-		running, err := mgr.Running()
-		if err != nil || !running {
-			continue
+	fmt.Println("Active sessions:")
+	for _, name := range running {
+		if states[name] == tmuxStateActive {
+			fmt.Printf("  - %s (tmux session: %s)\n", name, tmuxSessionName(name))
 		}
+	}
 
-		// Check if tmux session exists
-		tmuxSession := fmt.Sprintf("coi-%s", c)
-		tmuxCmd := fmt.Sprintf("tmux has-session -t %s 2>/dev/null", tmuxSession)
+	return nil
+}
 
-		opts := container.ExecCommandOptions{
-			Interactive: false,
-			Capture:     false,
-		}
+// tmuxSessionName returns the name of the tmux session coi runs the tool in
+func tmuxSessionName(containerName string) string {
+	return fmt.Sprintf("coi-%s", containerName)
+}
 
-		_, err = mgr.ExecCommand(tmuxCmd, opts)
-		if err == nil {
-			fmt.Printf("  - %s (tmux session: %s)\n", c, tmuxSession)
-		}
-	}
+// tmuxHasSession returns nil if the coi tmux session exists in the container
+func tmuxHasSession(ctx context.Context, containerName string) error {
+	return container.IncusProbe(ctx, "exec", containerName, "--", "tmux", "has-session", "-t", tmuxSessionName(containerName))
+}
 
-	return nil
+// probeTmuxSessions checks containers for their tmux session concurrently, giving each
+// check at most timeout. Returns container name -> tmuxStateActive, tmuxStateNone or tmuxStateUnknown.
+func probeTmuxSessions(names []string, timeout time.Duration, hasSession func(ctx context.Context, name string) error) map[string]string {
+	states := make(map[string]string, len(names))
+	fanOut(names, tmuxProbeParallel, func(name string) (string, error) {
+		ctx, cancel := context.WithTimeout(context.Background(), timeout)
+		defer cancel()
+
+		err := hasSession(ctx, name)
+		switch {
+		case err == nil:
+			return tmuxStateActive, nil
+		case ctx.Err() != nil:
+			return tmuxStateUnknown, nil
+		default:
+			return tmuxStateNone, nil
+		}
+	}, func(r fanOutResult) {
+		states[r.Name] = r.Detail
+	})
+	return states
 }
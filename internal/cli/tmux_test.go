@@ -0,0 +1,61 @@
+package cli
+
+import (
+	"context"
+	"errors"
+	"fmt"
+	"testing"
+	"time"
+)
+
+func TestProbeTmuxSessions(t *testing.T) {
+	hasSession := func(ctx context.Context, name string) error {
+		switch name {
+		case "active":
+			return nil
+		case "hung":
+			<-ctx.Done()
+			return ctx.Err()
+		default:
+			return errors.New("exit status 1")
+		}
+	}
+
+	states := probeTmuxSessions([]string{"active", "none", "hung"}, 50*time.Millisecond, hasSession)
+
+	want := map[string]string{
+		"active": tmuxStateActive,
+		"none":   tmuxStateNone,
+		"hung":   tmuxStateUnknown,
+	}
+	for name, state := range want {
+		if states[name] != state {
+			t.Errorf("probeTmuxSessions()[%q] = %q, want %q", name, states[name], state)
+		}
+	}
+}
+
+func TestProbeTmuxSessionsConcurrent(t *testing.T) {
+	names := make([]string, 50)
+	for i := range names {
+		names[i] = fmt.Sprintf("coi-abcd1234-%d", i)
+	}
+
+	// Every check hits the timeout; run serially this would take 50 timeouts
+	timeout := 20 * time.Millisecond
+	hasSession := func(ctx context.Context, name string) error {
+		<-ctx.Done()
+		return ctx.Err()
+	}
+
+	start := time.Now()
+	states := probeTmuxSessions(names, timeout, hasSession)
+	elapsed := time.Since(start)
+
+	if len(states) != len(names) {
+		t.Errorf("probeTmuxSessions() returned %d states, want %d", len(states), len(names))
+	}
+	if limit := timeout * time.Duration(len(names)) / 2; elapsed > limit {
+		t.Errorf("probeTmuxSessions() took %v, want well under %v", elapsed, timeout*time.Duration(len(names)))
+	}
+}
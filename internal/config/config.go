@@ -13,6 +13,8 @@ type Config struct {
 	Network  NetworkConfig            `toml:"network"`
 	Tool     ToolConfig               `toml:"tool"`
 	Mounts   MountsConfig             `toml:"mounts"`
+	Pool     PoolConfig               `toml:"pool"`
+	Sessions SessionsConfig           `toml:"sessions"`
 	Profiles map[string]ProfileConfig `toml:"profiles"`
 }
 
@@ -92,6 +94,17 @@ type MountsConfig struct {
 	Default []MountEntry `toml:"default"` // Default mounts for all sessions
 }
 
+// PoolConfig contains warm container pool settings
+type PoolConfig struct {
+	Enabled bool `toml:"enabled"` // Claim pre-created containers from the pool in coi shell
+	Size    int  `toml:"size"`    // Number of stopped containers 'coi pool fill' keeps per image
+}
+
+// SessionsConfig contains saved session settings
+type SessionsConfig struct {
+	Store string `toml:"store"` // "directory" (plain copy per session) or "compressed" (shared, deduplicated chunks)
+}
+
 // GetDefaultConfig returns the default configuration
 func GetDefaultConfig() *Config {
 	homeDir, err := os.UserHomeDir()
@@ -144,6 +157,13 @@ func GetDefaultConfig() *Config {
 		Mounts: MountsConfig{
 			Default: []MountEntry{},
 		},
+		Sessions: SessionsConfig{
+			Store: "directory",
+		},
+		Pool: PoolConfig{
+			Enabled: false,
+			Size:    2,
+		},
 		Profiles: make(map[string]ProfileConfig),
 	}
 }
@@ -273,6 +293,19 @@ func (c *Config) Merge(other *Config) {
 		c.Mounts.Default = append(c.Mounts.Default, other.Mounts.Default...)
 	}
 
+	// Merge pool settings
+	if other.Pool.Enabled {
+		c.Pool.Enabled = true
+	}
+	if other.Pool.Size != 0 {
+		c.Pool.Size = other.Pool.Size
+	}
+
+	// Merge session store settings
+	if other.Sessions.Store != "" {
+		c.Sessions.Store = other.Sessions.Store
+	}
+
 	// Merge profiles
 	for name, profile := range other.Profiles {
 		c.Profiles[name] = profile
@@ -123,6 +123,18 @@ group = "incus-admin"
 code_uid = 1000
 code_user = "code"
 
+[pool]
+# Keep pre-created containers ready so 'coi shell' skips container creation
+# Fill with: coi pool fill
+enabled = false
+size = 2
+
+[sessions]
+# How saved sessions are stored under ~/.coi/sessions-<tool>:
+#   "directory"  - one plain copy of the tool config directory per session
+#   "compressed" - gzip-compressed chunks shared by all sessions (identical history is stored once)
+store = "directory"
+
 [mounts]
 # Default mounts applied to all sessions
 # These can be overridden by CLI flags
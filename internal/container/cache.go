@@ -0,0 +1,104 @@
+package container
+
+import (
+	"sync"
+	"time"
+)
+
+// SnapshotTTL is how long a parsed instance/image listing is reused.
+// It only needs to cover the burst of status checks a single CLI command does
+// (e.g. session.Setup calls ImageExists, Exists, Running and GetContainerIP).
+const SnapshotTTL = 2 * time.Second
+
+// snapshotCache holds the most recent instance and image listings.
+// Mutating operations call InvalidateCache so callers never see state that
+// coi itself has changed; loops that wait for an external state change
+// (DHCP, shutdown) invalidate before each re-check, and readiness looks the
+// instance up directly.
+type snapshotCache struct {
+	mu  sync.Mutex
+	ttl time.Duration
+	now func() time.Time
+
+	fetchInstances func() ([]Instance, error)
+	fetchImages    func() ([]Image, error)
+
+	instances   []Instance
+	instancesAt time.Time
+	images      []Image
+	imagesAt    time.Time
+}
+
+// newSnapshotCache creates a cache backed by the given fetch functions
+func newSnapshotCache(ttl time.Duration, fetchInstances func() ([]Instance, error), fetchImages func() ([]Image, error)) *snapshotCache {
+	return &snapshotCache{
+		ttl:            ttl,
+		now:            time.Now,
+		fetchInstances: fetchInstances,
+		fetchImages:    fetchImages,
+	}
+}
+
+// Instances returns the cached instance list, fetching it if missing or expired.
+// The lock is held during the fetch so concurrent callers share one request.
+func (c *snapshotCache) Instances() ([]Instance, error) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	if c.instances != nil && c.now().Sub(c.instancesAt) < c.ttl {
+		return c.instances, nil
+	}
+
+	instances, err := c.fetchInstances()
+	if err != nil {
+		return nil, err
+	}
+	if instances == nil {
+		instances = []Instance{}
+	}
+
+	c.instances = instances
+	c.instancesAt = c.now()
+	return instances, nil
+}
+
+// Images returns the cached image list, fetching it if missing or expired
+func (c *snapshotCache) Images() ([]Image, error) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	if c.images != nil && c.now().Sub(c.imagesAt) < c.ttl {
+		return c.images, nil
+	}
+
+	images, err := c.fetchImages()
+	if err != nil {
+		return nil, err
+	}
+	if images == nil {
+		images = []Image{}
+	}
+
+	c.images = images
+	c.imagesAt = c.now()
+	return images, nil
+}
+
+// Invalidate drops both cached listings
+func (c *snapshotCache) Invalidate() {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	c.instances = nil
+	c.images = nil
+}
+
+// snapshot is the process-wide cache used by the package-level helpers
+var snapshot = newSnapshotCache(SnapshotTTL, fetchInstances, fetchImages)
+
+// InvalidateCache drops the cached instance and image listings.
+// Called by every mutating operation in this package; callers polling for a
+// state change made outside coi should call it before re-checking.
+func InvalidateCache() {
+	snapshot.Invalidate()
+}
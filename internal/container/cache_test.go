@@ -0,0 +1,132 @@
+package container
+
+import (
+	"errors"
+	"sync"
+	"sync/atomic"
+	"testing"
+	"time"
+)
+
+// newCountingCache returns a cache whose fetchers count their calls and a controllable clock
+func newCountingCache(ttl time.Duration) (*snapshotCache, *int32, *int32, *time.Time) {
+	var instanceCalls, imageCalls int32
+	clock := time.Unix(1700000000, 0)
+
+	cache := newSnapshotCache(ttl,
+		func() ([]Instance, error) {
+			atomic.AddInt32(&instanceCalls, 1)
+			return []Instance{{Name: "coi-abc12345-1", Status: "Running"}}, nil
+		},
+		func() ([]Image, error) {
+			atomic.AddInt32(&imageCalls, 1)
+			return []Image{{Fingerprint: "aaa", Aliases: []ImageAlias{{Name: "coi"}}}}, nil
+		},
+	)
+	cache.now = func() time.Time { return clock }
+
+	return cache, &instanceCalls, &imageCalls, &clock
+}
+
+func TestSnapshotCacheReusesWithinTTL(t *testing.T) {
+	cache, instanceCalls, imageCalls, _ := newCountingCache(time.Second)
+
+	for i := 0; i < 5; i++ {
+		if _, err := cache.Instances(); err != nil {
+			t.Fatalf("Instances() unexpected error: %v", err)
+		}
+		if _, err := cache.Images(); err != nil {
+			t.Fatalf("Images() unexpected error: %v", err)
+		}
+	}
+
+	if *instanceCalls != 1 {
+		t.Errorf("fetchInstances called %d times, want 1", *instanceCalls)
+	}
+	if *imageCalls != 1 {
+		t.Errorf("fetchImages called %d times, want 1", *imageCalls)
+	}
+}
+
+func TestSnapshotCacheExpires(t *testing.T) {
+	cache, instanceCalls, _, clock := newCountingCache(time.Second)
+
+	_, _ = cache.Instances()
+	*clock = clock.Add(999 * time.Millisecond)
+	_, _ = cache.Instances()
+	if *instanceCalls != 1 {
+		t.Errorf("fetchInstances called %d times before expiry, want 1", *instanceCalls)
+	}
+
+	*clock = clock.Add(time.Millisecond)
+	_, _ = cache.Instances()
+	if *instanceCalls != 2 {
+		t.Errorf("fetchInstances called %d times after expiry, want 2", *instanceCalls)
+	}
+}
+
+func TestSnapshotCacheInvalidate(t *testing.T) {
+	cache, instanceCalls, imageCalls, _ := newCountingCache(time.Minute)
+
+	_, _ = cache.Instances()
+	_, _ = cache.Images()
+	cache.Invalidate()
+	_, _ = cache.Instances()
+	_, _ = cache.Images()
+
+	if *instanceCalls != 2 || *imageCalls != 2 {
+		t.Errorf("fetch calls after Invalidate() = (%d, %d), want (2, 2)", *instanceCalls, *imageCalls)
+	}
+}
+
+func TestSnapshotCacheDoesNotCacheErrors(t *testing.T) {
+	calls := 0
+	cache := newSnapshotCache(time.Minute,
+		func() ([]Instance, error) {
+			calls++
+			if calls == 1 {
+				return nil, errors.New("incus unavailable")
+			}
+			return nil, nil
+		},
+		func() ([]Image, error) { return nil, nil },
+	)
+
+	if _, err := cache.Instances(); err == nil {
+		t.Error("Instances() expected error from first fetch, got nil")
+	}
+
+	instances, err := cache.Instances()
+	if err != nil {
+		t.Fatalf("Instances() unexpected error on retry: %v", err)
+	}
+	if instances == nil || len(instances) != 0 {
+		t.Errorf("Instances() = %v, want empty non-nil slice", instances)
+	}
+
+	// An empty listing is still a cached result
+	_, _ = cache.Instances()
+	if calls != 2 {
+		t.Errorf("fetchInstances called %d times, want 2", calls)
+	}
+}
+
+func TestSnapshotCacheConcurrentCallersShareFetch(t *testing.T) {
+	cache, instanceCalls, _, _ := newCountingCache(time.Minute)
+
+	var wg sync.WaitGroup
+	for i := 0; i < 16; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			if _, err := cache.Instances(); err != nil {
+				t.Errorf("Instances() unexpected error: %v", err)
+			}
+		}()
+	}
+	wg.Wait()
+
+	if *instanceCalls != 1 {
+		t.Errorf("fetchInstances called %d times by concurrent callers, want 1", *instanceCalls)
+	}
+}
@@ -0,0 +1,339 @@
+package container
+
+import (
+	"bytes"
+	"context"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"net"
+	"net/http"
+	"net/url"
+	"os"
+	"path/filepath"
+	"strings"
+	"sync"
+	"time"
+)
+
+// DefaultIncusSocket is the local Incus daemon socket on Linux hosts
+const DefaultIncusSocket = "/var/lib/incus/unix.socket"
+
+// ErrNotFound is returned by the REST client when Incus reports a missing object
+var ErrNotFound = errors.New("not found")
+
+// Client talks to the Incus REST API over the local unix socket.
+//
+// A single pooled HTTP client is reused for every request, so repeated status
+// queries cost a socket round trip instead of forking sg, a shell and the
+// incus CLI. Operations that need an interactive stream (exec, file transfer)
+// still go through the CLI.
+type Client struct {
+	socketPath string
+	project    string
+	http       *http.Client
+}
+
+// APIError represents an error response returned by the Incus API
+type APIError struct {
+	StatusCode int
+	Message    string
+}
+
+func (e *APIError) Error() string {
+	return fmt.Sprintf("incus API error (%d): %s", e.StatusCode, e.Message)
+}
+
+// apiResponse is the standard Incus response envelope
+type apiResponse struct {
+	Type       string          `json:"type"`
+	Status     string          `json:"status"`
+	StatusCode int             `json:"status_code"`
+	Operation  string          `json:"operation"`
+	ErrorCode  int             `json:"error_code"`
+	Error      string          `json:"error"`
+	Metadata   json.RawMessage `json:"metadata"`
+}
+
+// apiOperation is the subset of an Incus background operation we inspect
+type apiOperation struct {
+	ID         string `json:"id"`
+	Status     string `json:"status"`
+	StatusCode int    `json:"status_code"`
+	Err        string `json:"err"`
+}
+
+// NewClient creates a REST client for the Incus socket at socketPath
+func NewClient(socketPath string) *Client {
+	transport := &http.Transport{
+		DialContext: func(ctx context.Context, _, _ string) (net.Conn, error) {
+			var d net.Dialer
+			return d.DialContext(ctx, "unix", socketPath)
+		},
+		MaxIdleConns:        8,
+		MaxIdleConnsPerHost: 8,
+		IdleConnTimeout:     30 * time.Second,
+	}
+
+	return &Client{
+		socketPath: socketPath,
+		project:    IncusProject,
+		http:       &http.Client{Transport: transport},
+	}
+}
+
+// SocketPath returns the unix socket path this client connects to
+func (c *Client) SocketPath() string {
+	return c.socketPath
+}
+
+// Ping verifies that the daemon answers on the socket
+func (c *Client) Ping() error {
+	ctx, cancel := context.WithTimeout(context.Background(), 2*time.Second)
+	defer cancel()
+	_, err := c.requestContext(ctx, http.MethodGet, "/1.0", nil, nil)
+	return err
+}
+
+// ListInstances returns all instances in the project, including their runtime state
+func (c *Client) ListInstances() ([]Instance, error) {
+	var instances []Instance
+	query := url.Values{"recursion": []string{"2"}}
+	if err := c.get("/1.0/instances", query, &instances); err != nil {
+		return nil, err
+	}
+	return instances, nil
+}
+
+// ListInstanceNames returns the names of all instances in the project
+func (c *Client) ListInstanceNames() ([]string, error) {
+	var urls []string
+	if err := c.get("/1.0/instances", nil, &urls); err != nil {
+		return nil, err
+	}
+
+	names := make([]string, 0, len(urls))
+	for _, u := range urls {
+		names = append(names, nameFromURL(u))
+	}
+	return names, nil
+}
+
+// GetInstance returns a single instance without its runtime state (cheap status lookup).
+// Returns ErrNotFound if the instance does not exist.
+func (c *Client) GetInstance(name string) (*Instance, error) {
+	var instance Instance
+	if err := c.get("/1.0/instances/"+url.PathEscape(name), nil, &instance); err != nil {
+		return nil, err
+	}
+	return &instance, nil
+}
+
+// GetInstanceFull returns a single instance including its runtime state (network addresses).
+// Returns ErrNotFound if the instance does not exist.
+func (c *Client) GetInstanceFull(name string) (*Instance, error) {
+	var instance Instance
+	query := url.Values{"recursion": []string{"1"}}
+	if err := c.get("/1.0/instances/"+url.PathEscape(name), query, &instance); err != nil {
+		return nil, err
+	}
+	return &instance, nil
+}
+
+// ListImages returns all images in the project
+func (c *Client) ListImages() ([]Image, error) {
+	var images []Image
+	query := url.Values{"recursion": []string{"1"}}
+	if err := c.get("/1.0/images", query, &images); err != nil {
+		return nil, err
+	}
+	return images, nil
+}
+
+// UpdateInstanceState changes the state of an instance (start, stop, restart)
+// and waits for the resulting operation to finish
+func (c *Client) UpdateInstanceState(name, action string, force bool, timeout int) error {
+	body := map[string]interface{}{
+		"action":  action,
+		"force":   force,
+		"timeout": timeout,
+	}
+	return c.operation(http.MethodPut, "/1.0/instances/"+url.PathEscape(name)+"/state", body)
+}
+
+// DeleteInstance deletes an instance. With force, a running instance is
+// stopped first, matching `incus delete --force`.
+func (c *Client) DeleteInstance(name string, force bool) error {
+	if force {
+		instance, err := c.GetInstance(name)
+		if err != nil {
+			return err
+		}
+		if instance.Status == "Running" {
+			if err := c.UpdateInstanceState(name, "stop", true, -1); err != nil {
+				return err
+			}
+		}
+	}
+
+	err := c.operation(http.MethodDelete, "/1.0/instances/"+url.PathEscape(name), nil)
+	// Ephemeral instances disappear on their own once stopped
+	if force && errors.Is(err, ErrNotFound) {
+		return nil
+	}
+	return err
+}
+
+// RenameInstance renames a stopped instance
+func (c *Client) RenameInstance(name, newName string) error {
+	body := map[string]interface{}{"name": newName}
+	return c.operation(http.MethodPost, "/1.0/instances/"+url.PathEscape(name), body)
+}
+
+// get performs a GET request and decodes the response metadata into target
+func (c *Client) get(path string, query url.Values, target interface{}) error {
+	resp, err := c.request(http.MethodGet, path, query, nil)
+	if err != nil {
+		return err
+	}
+	if target == nil || len(resp.Metadata) == 0 {
+		return nil
+	}
+	if err := json.Unmarshal(resp.Metadata, target); err != nil {
+		return fmt.Errorf("failed to decode %s: %w", path, err)
+	}
+	return nil
+}
+
+// operation performs a request and, for async responses, waits for the operation to complete
+func (c *Client) operation(method, path string, body interface{}) error {
+	resp, err := c.request(method, path, nil, body)
+	if err != nil {
+		return err
+	}
+	if resp.Type != "async" || resp.Operation == "" {
+		return nil
+	}
+	return c.waitOperation(resp.Operation)
+}
+
+// waitOperation blocks until the given operation finishes and returns its error, if any
+func (c *Client) waitOperation(operationURL string) error {
+	path := strings.SplitN(operationURL, "?", 2)[0] + "/wait"
+	query := url.Values{"timeout": []string{"-1"}}
+
+	var op apiOperation
+	if err := c.get(path, query, &op); err != nil {
+		return err
+	}
+	if op.StatusCode >= 400 || op.Status == "Failure" {
+		return &APIError{StatusCode: op.StatusCode, Message: op.Err}
+	}
+	return nil
+}
+
+// request performs an HTTP request against the socket without a deadline
+func (c *Client) request(method, path string, query url.Values, body interface{}) (*apiResponse, error) {
+	return c.requestContext(context.Background(), method, path, query, body)
+}
+
+// requestContext performs an HTTP request against the socket and decodes the response envelope
+func (c *Client) requestContext(ctx context.Context, method, path string, query url.Values, body interface{}) (*apiResponse, error) {
+	if query == nil {
+		query = url.Values{}
+	}
+	if c.project != "" && strings.HasPrefix(path, "/1.0/") {
+		query.Set("project", c.project)
+	}
+
+	u := url.URL{Scheme: "http", Host: "incus", Path: path, RawQuery: query.Encode()}
+
+	var reader io.Reader
+	if body != nil {
+		data, err := json.Marshal(body)
+		if err != nil {
+			return nil, fmt.Errorf("failed to encode request: %w", err)
+		}
+		reader = bytes.NewReader(data)
+	}
+
+	req, err := http.NewRequestWithContext(ctx, method, u.String(), reader)
+	if err != nil {
+		return nil, err
+	}
+	if body != nil {
+		req.Header.Set("Content-Type", "application/json")
+	}
+
+	httpResp, err := c.http.Do(req)
+	if err != nil {
+		return nil, err
+	}
+	defer httpResp.Body.Close()
+
+	var resp apiResponse
+	if err := json.NewDecoder(httpResp.Body).Decode(&resp); err != nil {
+		return nil, fmt.Errorf("failed to decode response from %s: %w", path, err)
+	}
+
+	if resp.Type == "error" || httpResp.StatusCode >= 400 {
+		code := resp.ErrorCode
+		if code == 0 {
+			code = httpResp.StatusCode
+		}
+		if code == http.StatusNotFound {
+			return nil, fmt.Errorf("%s: %w", resp.Error, ErrNotFound)
+		}
+		return nil, &APIError{StatusCode: code, Message: resp.Error}
+	}
+
+	return &resp, nil
+}
+
+// nameFromURL extracts the trailing object name from an Incus API URL
+func nameFromURL(u string) string {
+	u = strings.SplitN(u, "?", 2)[0]
+	name := u[strings.LastIndex(u, "/")+1:]
+	if unescaped, err := url.PathUnescape(name); err == nil {
+		return unescaped
+	}
+	return name
+}
+
+var (
+	restClientOnce sync.Once
+	restClientInst *Client
+)
+
+// IncusSocketPath returns the Incus unix socket to use.
+// INCUS_SOCKET takes precedence, then $INCUS_DIR/unix.socket, then the default path.
+func IncusSocketPath() string {
+	if path := os.Getenv("INCUS_SOCKET"); path != "" {
+		return path
+	}
+	if dir := os.Getenv("INCUS_DIR"); dir != "" {
+		return filepath.Join(dir, "unix.socket")
+	}
+	return DefaultIncusSocket
+}
+
+// restClient returns the shared REST client, or nil if the socket cannot be used.
+// The result is determined once per process. Set COI_INCUS_TRANSPORT=cli to
+// force the CLI path (e.g. when the socket is reachable but behaves differently).
+func restClient() *Client {
+	restClientOnce.Do(func() {
+		if os.Getenv("COI_INCUS_TRANSPORT") == "cli" {
+			return
+		}
+
+		client := NewClient(IncusSocketPath())
+		if err := client.Ping(); err != nil {
+			// Typically EACCES (group not active in this login session) or no
+			// local daemon (macOS/Colima) - fall back to sg + incus CLI
+			return
+		}
+		restClientInst = client
+	})
+	return restClientInst
+}
@@ -0,0 +1,359 @@
+package container
+
+import (
+	"encoding/json"
+	"errors"
+	"net"
+	"net/http"
+	"path/filepath"
+	"strings"
+	"sync"
+	"testing"
+)
+
+// fakeIncus is a minimal Incus API stand-in served over a unix socket
+type fakeIncus struct {
+	mu        sync.Mutex
+	instances map[string]*Instance
+	images    []Image
+	requests  []string
+	events    chan Event
+}
+
+func (f *fakeIncus) writeSync(w http.ResponseWriter, metadata interface{}) {
+	data, _ := json.Marshal(metadata)
+	_ = json.NewEncoder(w).Encode(apiResponse{Type: "sync", Status: "Success", StatusCode: 200, Metadata: data})
+}
+
+func (f *fakeIncus) writeAsync(w http.ResponseWriter, id string) {
+	w.WriteHeader(http.StatusAccepted)
+	_ = json.NewEncoder(w).Encode(apiResponse{Type: "async", StatusCode: 100, Operation: "/1.0/operations/" + id})
+}
+
+func (f *fakeIncus) writeError(w http.ResponseWriter, code int, msg string) {
+	w.WriteHeader(code)
+	_ = json.NewEncoder(w).Encode(apiResponse{Type: "error", ErrorCode: code, Error: msg})
+}
+
+func (f *fakeIncus) ServeHTTP(w http.ResponseWriter, r *http.Request) {
+	if r.URL.Path == "/1.0/events" {
+		f.serveEvents(w, r)
+		return
+	}
+
+	f.mu.Lock()
+	defer f.mu.Unlock()
+	f.requests = append(f.requests, r.Method+" "+r.URL.Path)
+
+	if r.URL.Path != "/1.0" && r.URL.Query().Get("project") != IncusProject {
+		f.writeError(w, http.StatusBadRequest, "missing project")
+		return
+	}
+
+	switch {
+	case r.URL.Path == "/1.0":
+		f.writeSync(w, map[string]string{"api_status": "stable"})
+
+	case r.URL.Path == "/1.0/instances" && r.Method == http.MethodPost:
+		var body instancesPost
+		_ = json.NewDecoder(r.Body).Decode(&body)
+		if _, exists := f.instances[body.Name]; exists {
+			f.writeError(w, http.StatusConflict, "Instance already exists")
+			return
+		}
+		status := "Stopped"
+		if body.Start {
+			status = "Running"
+		}
+		f.instances[body.Name] = &Instance{Name: body.Name, Status: status, Ephemeral: body.Ephemeral, Config: body.Config, Devices: body.Devices}
+		f.writeAsync(w, "ok")
+
+	case r.URL.Path == "/1.0/instances":
+		if r.URL.Query().Get("recursion") == "2" {
+			list := []Instance{}
+			for _, inst := range f.instances {
+				list = append(list, *inst)
+			}
+			f.writeSync(w, list)
+			return
+		}
+		urls := []string{}
+		for name := range f.instances {
+			urls = append(urls, "/1.0/instances/"+name)
+		}
+		f.writeSync(w, urls)
+
+	case r.URL.Path == "/1.0/images":
+		f.writeSync(w, f.images)
+
+	case strings.HasPrefix(r.URL.Path, "/1.0/operations/"):
+		id := strings.TrimSuffix(strings.TrimPrefix(r.URL.Path, "/1.0/operations/"), "/wait")
+		if id == "fail" {
+			f.writeSync(w, apiOperation{ID: id, Status: "Failure", StatusCode: 400, Err: "boom"})
+			return
+		}
+		f.writeSync(w, apiOperation{ID: id, Status: "Success", StatusCode: 200})
+
+	case strings.HasPrefix(r.URL.Path, "/1.0/instances/"):
+		rest := strings.TrimPrefix(r.URL.Path, "/1.0/instances/")
+		name := strings.TrimSuffix(rest, "/state")
+		inst, ok := f.instances[name]
+		if !ok {
+			f.writeError(w, http.StatusNotFound, "Instance not found")
+			return
+		}
+
+		switch {
+		case strings.HasSuffix(rest, "/state") && r.Method == http.MethodPut:
+			var body struct {
+				Action string `json:"action"`
+			}
+			_ = json.NewDecoder(r.Body).Decode(&body)
+			switch body.Action {
+			case "start":
+				inst.Status = "Running"
+			case "stop":
+				inst.Status = "Stopped"
+			}
+			f.writeAsync(w, "ok")
+		case r.Method == http.MethodPatch:
+			var body struct {
+				Config  map[string]string            `json:"config"`
+				Devices map[string]map[string]string `json:"devices"`
+			}
+			_ = json.NewDecoder(r.Body).Decode(&body)
+			if inst.Config == nil {
+				inst.Config = map[string]string{}
+			}
+			for k, v := range body.Config {
+				inst.Config[k] = v
+			}
+			if inst.Devices == nil {
+				inst.Devices = map[string]map[string]string{}
+			}
+			for k, v := range body.Devices {
+				inst.Devices[k] = v
+			}
+			f.writeAsync(w, "ok")
+		case r.Method == http.MethodPost:
+			var body struct {
+				Name string `json:"name"`
+			}
+			_ = json.NewDecoder(r.Body).Decode(&body)
+			if _, taken := f.instances[body.Name]; taken || inst.Status == "Running" {
+				f.writeAsync(w, "fail")
+				return
+			}
+			delete(f.instances, name)
+			inst.Name = body.Name
+			f.instances[body.Name] = inst
+			f.writeAsync(w, "ok")
+		case r.Method == http.MethodDelete:
+			if inst.Status == "Running" {
+				f.writeAsync(w, "fail")
+				return
+			}
+			delete(f.instances, name)
+			f.writeAsync(w, "ok")
+		default:
+			copied := *inst
+			if r.URL.Query().Get("recursion") != "1" {
+				copied.State = nil
+			}
+			f.writeSync(w, copied)
+		}
+
+	default:
+		f.writeError(w, http.StatusNotFound, "not found")
+	}
+}
+
+// startFakeIncus serves f on a unix socket inside a temp dir and returns a client for it
+func startFakeIncus(t *testing.T, f *fakeIncus) *Client {
+	t.Helper()
+
+	socketPath := filepath.Join(t.TempDir(), "unix.socket")
+	listener, err := net.Listen("unix", socketPath)
+	if err != nil {
+		t.Fatalf("Failed to listen on unix socket: %v", err)
+	}
+
+	server := &http.Server{Handler: f}
+	go func() { _ = server.Serve(listener) }()
+	t.Cleanup(func() { _ = server.Close() })
+
+	return NewClient(socketPath)
+}
+
+func newFakeIncus() *fakeIncus {
+	return &fakeIncus{
+		instances: map[string]*Instance{
+			"coi-abc12345-1": {
+				Name:   "coi-abc12345-1",
+				Status: "Running",
+				State: &InstanceState{
+					Status: "Running",
+					Network: map[string]InstanceNetwork{
+						"lo":   {Addresses: []InstanceAddress{{Family: "inet", Address: "127.0.0.1"}}},
+						"eth0": {Addresses: []InstanceAddress{{Family: "inet6", Address: "fd42::1"}, {Family: "inet", Address: "10.0.0.5"}}},
+					},
+				},
+			},
+			"coi-abc12345-2": {Name: "coi-abc12345-2", Status: "Stopped"},
+		},
+		images: []Image{
+			{Fingerprint: "aaa", Aliases: []ImageAlias{{Name: "coi"}}},
+			{Fingerprint: "bbb", Aliases: []ImageAlias{{Name: "coi-rust"}}},
+		},
+	}
+}
+
+func TestClientPing(t *testing.T) {
+	client := startFakeIncus(t, newFakeIncus())
+	if err := client.Ping(); err != nil {
+		t.Fatalf("Ping() unexpected error: %v", err)
+	}
+}
+
+func TestClientPingUnavailableSocket(t *testing.T) {
+	client := NewClient(filepath.Join(t.TempDir(), "missing.socket"))
+	if err := client.Ping(); err == nil {
+		t.Error("Ping() expected error for missing socket, got nil")
+	}
+}
+
+func TestClientListInstances(t *testing.T) {
+	client := startFakeIncus(t, newFakeIncus())
+
+	instances, err := client.ListInstances()
+	if err != nil {
+		t.Fatalf("ListInstances() unexpected error: %v", err)
+	}
+	if len(instances) != 2 {
+		t.Fatalf("ListInstances() returned %d instances, want 2", len(instances))
+	}
+
+	names, err := client.ListInstanceNames()
+	if err != nil {
+		t.Fatalf("ListInstanceNames() unexpected error: %v", err)
+	}
+	if len(names) != 2 {
+		t.Errorf("ListInstanceNames() returned %v, want 2 names", names)
+	}
+	for _, name := range names {
+		if !strings.HasPrefix(name, "coi-abc12345-") {
+			t.Errorf("ListInstanceNames() returned unexpected name %q", name)
+		}
+	}
+}
+
+func TestClientGetInstance(t *testing.T) {
+	client := startFakeIncus(t, newFakeIncus())
+
+	instance, err := client.GetInstanceFull("coi-abc12345-1")
+	if err != nil {
+		t.Fatalf("GetInstanceFull() unexpected error: %v", err)
+	}
+	if !instance.Running() {
+		t.Error("Expected instance to be running")
+	}
+	if ip := instance.IPv4(); ip != "10.0.0.5" {
+		t.Errorf("IPv4() = %q, want %q", ip, "10.0.0.5")
+	}
+
+	_, err = client.GetInstance("does-not-exist")
+	if !errors.Is(err, ErrNotFound) {
+		t.Errorf("GetInstance() for missing instance returned %v, want ErrNotFound", err)
+	}
+}
+
+func TestClientListImages(t *testing.T) {
+	client := startFakeIncus(t, newFakeIncus())
+
+	images, err := client.ListImages()
+	if err != nil {
+		t.Fatalf("ListImages() unexpected error: %v", err)
+	}
+	if len(images) != 2 || !images[0].HasAlias("coi") {
+		t.Errorf("ListImages() = %+v, want 2 images with 'coi' first", images)
+	}
+}
+
+func TestClientStateChangesWaitForOperations(t *testing.T) {
+	fake := newFakeIncus()
+	client := startFakeIncus(t, fake)
+
+	if err := client.UpdateInstanceState("coi-abc12345-2", "start", false, -1); err != nil {
+		t.Fatalf("UpdateInstanceState(start) unexpected error: %v", err)
+	}
+	if fake.instances["coi-abc12345-2"].Status != "Running" {
+		t.Error("Expected instance to be running after start")
+	}
+
+	// Non-force delete of a running instance fails inside the operation
+	err := client.DeleteInstance("coi-abc12345-2", false)
+	var apiErr *APIError
+	if !errors.As(err, &apiErr) || apiErr.Message != "boom" {
+		t.Errorf("DeleteInstance(force=false) returned %v, want operation failure", err)
+	}
+
+	// Force delete stops the instance first
+	if err := client.DeleteInstance("coi-abc12345-2", true); err != nil {
+		t.Fatalf("DeleteInstance(force=true) unexpected error: %v", err)
+	}
+	if _, ok := fake.instances["coi-abc12345-2"]; ok {
+		t.Error("Expected instance to be deleted")
+	}
+
+	foundWait := false
+	for _, req := range fake.requests {
+		if strings.HasSuffix(req, "/wait") {
+			foundWait = true
+		}
+	}
+	if !foundWait {
+		t.Error("Expected client to wait on async operations")
+	}
+}
+
+func TestClientRenameInstance(t *testing.T) {
+	fake := newFakeIncus()
+	client := startFakeIncus(t, fake)
+
+	if err := client.RenameInstance("coi-abc12345-2", "coi-abc12345-3"); err != nil {
+		t.Fatalf("RenameInstance() unexpected error: %v", err)
+	}
+	if _, ok := fake.instances["coi-abc12345-3"]; !ok {
+		t.Error("Expected instance to exist under the new name")
+	}
+	if _, ok := fake.instances["coi-abc12345-2"]; ok {
+		t.Error("Expected old name to be gone after rename")
+	}
+
+	// Renaming onto an existing instance (a concurrent claim) must fail
+	if err := client.RenameInstance("coi-abc12345-3", "coi-abc12345-1"); err == nil {
+		t.Error("RenameInstance() onto an existing name expected error, got nil")
+	}
+
+	if err := client.RenameInstance("does-not-exist", "x"); !errors.Is(err, ErrNotFound) {
+		t.Errorf("RenameInstance() for missing instance returned %v, want ErrNotFound", err)
+	}
+}
+
+func TestIncusSocketPath(t *testing.T) {
+	t.Setenv("INCUS_SOCKET", "")
+	t.Setenv("INCUS_DIR", "")
+	if got := IncusSocketPath(); got != DefaultIncusSocket {
+		t.Errorf("IncusSocketPath() = %q, want %q", got, DefaultIncusSocket)
+	}
+
+	t.Setenv("INCUS_DIR", "/srv/incus")
+	if got := IncusSocketPath(); got != "/srv/incus/unix.socket" {
+		t.Errorf("IncusSocketPath() with INCUS_DIR = %q", got)
+	}
+
+	t.Setenv("INCUS_SOCKET", "/tmp/custom.socket")
+	if got := IncusSocketPath(); got != "/tmp/custom.socket" {
+		t.Errorf("IncusSocketPath() with INCUS_SOCKET = %q", got)
+	}
+}
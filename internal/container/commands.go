@@ -2,8 +2,9 @@ package container
 
 import (
 	"bytes"
-	"encoding/json"
+	"context"
 	"fmt"
+	"io"
 	"os"
 	"os/exec"
 	"regexp"
@@ -23,19 +24,25 @@ const (
 // On Linux, it wraps the command with sg for group permissions.
 // On macOS, it runs incus directly (no incus-admin group).
 func execIncusCommand(cmdArgs []string) *exec.Cmd {
+	return execIncusCommandContext(context.Background(), cmdArgs)
+}
+
+// execIncusCommandContext is execIncusCommand for a command that is killed when ctx is done
+func execIncusCommandContext(ctx context.Context, cmdArgs []string) *exec.Cmd {
 	if runtime.GOOS == "darwin" {
 		// macOS: run incus directly without sg wrapper
 		// cmdArgs is in format: [IncusGroup, "-c", "incus --project ... command"]
 		// Extract the actual incus command from the third element
 		incusCmd := cmdArgs[2] // "incus --project ... command"
-		return exec.Command("sh", "-c", incusCmd)
+		return exec.CommandContext(ctx, "sh", "-c", incusCmd)
 	}
 	// Linux: use sg for group permissions
-	return exec.Command("sg", cmdArgs...)
+	return exec.CommandContext(ctx, "sg", cmdArgs...)
 }
 
 // IncusExec executes an Incus command via sg wrapper for group permissions (Linux) or directly (macOS)
 func IncusExec(args ...string) error {
+	defer InvalidateCache()
 	cmdArgs := buildIncusCommand(args...)
 	cmd := execIncusCommand(cmdArgs)
 	cmd.Stdout = os.Stderr // Send stdout to stderr so it's visible
@@ -45,6 +52,7 @@ func IncusExec(args ...string) error {
 
 // IncusExecInteractive executes an Incus command with stdin/stdout/stderr attached
 func IncusExecInteractive(args ...string) error {
+	defer InvalidateCache()
 	cmdArgs := buildIncusCommand(args...)
 	cmd := execIncusCommand(cmdArgs)
 	cmd.Stdin = os.Stdin
@@ -55,6 +63,7 @@ func IncusExecInteractive(args ...string) error {
 
 // IncusExecQuiet executes an Incus command silently (suppress stdout/stderr)
 func IncusExecQuiet(args ...string) error {
+	defer InvalidateCache()
 	cmdArgs := buildIncusCommand(args...)
 	cmd := execIncusCommand(cmdArgs)
 	cmd.Stdout = nil
@@ -62,6 +71,42 @@ func IncusExecQuiet(args ...string) error {
 	return cmd.Run()
 }
 
+// IncusProbe runs a read-only Incus command silently (e.g. `exec ... -- tmux has-session`),
+// killing it when ctx is done. Unlike IncusExecQuiet it leaves the instance snapshot alone.
+func IncusProbe(ctx context.Context, args ...string) error {
+	cmdArgs := buildIncusCommand(args...)
+	cmd := execIncusCommandContext(ctx, cmdArgs)
+	cmd.Stdout = nil
+	cmd.Stderr = nil
+	if err := cmd.Run(); err != nil {
+		if ctxErr := ctx.Err(); ctxErr != nil {
+			return ctxErr
+		}
+		return err
+	}
+	return nil
+}
+
+// IncusPipe executes an Incus command with stdin read from r and stdout streamed to w.
+// Stderr is captured and included in the returned error.
+func IncusPipe(r io.Reader, w io.Writer, args ...string) error {
+	cmdArgs := buildIncusCommand(args...)
+	cmd := execIncusCommand(cmdArgs)
+
+	var stderr bytes.Buffer
+	cmd.Stdin = r
+	cmd.Stdout = w
+	cmd.Stderr = &stderr
+
+	if err := cmd.Run(); err != nil {
+		if msg := strings.TrimSpace(stderr.String()); msg != "" {
+			return fmt.Errorf("%w: %s", err, msg)
+		}
+		return err
+	}
+	return nil
+}
+
 // IncusOutput executes an Incus command and returns the output (trimmed)
 func IncusOutput(args ...string) (string, error) {
 	cmdArgs := buildIncusCommand(args...)
@@ -226,86 +271,53 @@ func ContainerExec(containerName, command string, opts ContainerExecOptions) (st
 	return "", cmd.Run()
 }
 
-// LaunchContainer launches an ephemeral container
+// LaunchContainer launches an ephemeral container with Docker support enabled
 func LaunchContainer(imageAlias, containerName string) error {
-	args := []string{"launch", imageAlias, containerName, "--ephemeral"}
-	if err := IncusExec(args...); err != nil {
-		return err
-	}
-	return enableDockerSupport(containerName)
+	spec := NewInstanceSpec(imageAlias, containerName).EnableDockerSupport()
+	spec.Ephemeral = true
+	return CreateInstance(spec, true)
 }
 
-// LaunchContainerPersistent launches a non-ephemeral container
+// LaunchContainerPersistent launches a non-ephemeral container with Docker support enabled
 func LaunchContainerPersistent(imageAlias, containerName string) error {
-	args := []string{"launch", imageAlias, containerName}
-	if err := IncusExec(args...); err != nil {
-		return err
-	}
-	return enableDockerSupport(containerName)
-}
-
-// enableDockerSupport configures the container to support Docker/nested containers.
-//
-// This function sets three security flags required for Docker to work properly:
-// - security.nesting=true: Enables nested containerization
-// - security.syscalls.intercept.mknod=true: Safe device node creation
-// - security.syscalls.intercept.setxattr=true: Safe filesystem attribute handling
-//
-// Note: If an error occurs during configuration, the container may be left in a
-// partially configured state with some but not all flags set. Future troubleshooting
-// should verify all three flags are properly configured if Docker isn't working.
-func enableDockerSupport(containerName string) error {
-	// Enable container nesting for Docker support
-	if err := IncusExec("config", "set", containerName, "security.nesting=true"); err != nil {
-		return err
-	}
-
-	// Enable syscall interception for mknod (device node creation)
-	if err := IncusExec("config", "set", containerName, "security.syscalls.intercept.mknod=true"); err != nil {
-		return err
-	}
-
-	// Enable syscall interception for setxattr (filesystem attributes)
-	if err := IncusExec("config", "set", containerName, "security.syscalls.intercept.setxattr=true"); err != nil {
-		return err
-	}
-
-	return nil
+	spec := NewInstanceSpec(imageAlias, containerName).EnableDockerSupport()
+	return CreateInstance(spec, true)
 }
 
 // StopContainer stops a container
 func StopContainer(containerName string) error {
+	if client := restClient(); client != nil {
+		defer InvalidateCache()
+		return client.UpdateInstanceState(containerName, "stop", true, -1)
+	}
 	return IncusExec("stop", containerName, "--force")
 }
 
 // DeleteContainer deletes a container forcefully
 func DeleteContainer(containerName string) error {
+	if client := restClient(); client != nil {
+		defer InvalidateCache()
+		return client.DeleteInstance(containerName, true)
+	}
 	return IncusExecQuiet("delete", containerName, "--force")
 }
 
+// RenameContainer renames a stopped container
+func RenameContainer(containerName, newName string) error {
+	if client := restClient(); client != nil {
+		defer InvalidateCache()
+		return client.RenameInstance(containerName, newName)
+	}
+	return IncusExec("rename", containerName, newName)
+}
+
 // ContainerRunning checks if a container is running
 func ContainerRunning(containerName string) (bool, error) {
-	output, err := IncusOutput("list", containerName, "--format=json")
+	instance, err := GetInstance(containerName)
 	if err != nil {
 		return false, err
 	}
-
-	var containers []struct {
-		Name   string `json:"name"`
-		Status string `json:"status"`
-	}
-
-	if err := json.Unmarshal([]byte(output), &containers); err != nil {
-		return false, err
-	}
-
-	for _, c := range containers {
-		if c.Name == containerName && c.Status == "Running" {
-			return true, nil
-		}
-	}
-
-	return false, nil
+	return instance != nil && instance.Running(), nil
 }
 
 // PublishContainer publishes a stopped container as an image
@@ -339,6 +351,9 @@ func PublishContainer(containerName, aliasName, description string) (string, err
 
 	fingerprint := matches[1]
 
+	// A new image alias exists now
+	InvalidateCache()
+
 	// Cleanup container after successful publish
 	if err := DeleteContainer(containerName); err != nil {
 		return fingerprint, err // Return fingerprint even if cleanup fails
@@ -354,26 +369,14 @@ func DeleteImage(aliasName string) error {
 
 // ImageExists checks if an image with the given alias exists
 func ImageExists(aliasName string) (bool, error) {
-	output, err := IncusOutput("image", "list", "--format=json")
+	images, err := ListImages()
 	if err != nil {
 		return false, err
 	}
 
-	var images []struct {
-		Aliases []struct {
-			Name string `json:"name"`
-		} `json:"aliases"`
-	}
-
-	if err := json.Unmarshal([]byte(output), &images); err != nil {
-		return false, err
-	}
-
 	for _, img := range images {
-		for _, alias := range img.Aliases {
-			if alias.Name == aliasName {
-				return true, nil
-			}
+		if img.HasAlias(aliasName) {
+			return true, nil
 		}
 	}
 
@@ -382,21 +385,11 @@ func ImageExists(aliasName string) (bool, error) {
 
 // ListImagesByPrefix lists images by alias prefix
 func ListImagesByPrefix(prefix string) ([]string, error) {
-	output, err := IncusOutput("image", "list", "--format=json")
+	images, err := ListImages()
 	if err != nil {
 		return nil, err
 	}
 
-	var images []struct {
-		Aliases []struct {
-			Name string `json:"name"`
-		} `json:"aliases"`
-	}
-
-	if err := json.Unmarshal([]byte(output), &images); err != nil {
-		return nil, err
-	}
-
 	var matching []string
 	for _, img := range images {
 		for _, alias := range img.Aliases {
@@ -411,35 +404,41 @@ func ListImagesByPrefix(prefix string) ([]string, error) {
 
 // ListContainers lists all containers matching a name pattern
 func ListContainers(pattern string) ([]string, error) {
-	output, err := IncusOutput("list", "--format=json")
-	if err != nil {
-		return nil, err
-	}
-
-	var containers []struct {
-		Name string `json:"name"`
-	}
-
-	if err := json.Unmarshal([]byte(output), &containers); err != nil {
-		return nil, err
-	}
-
 	// Compile pattern as regex
 	re, err := regexp.Compile(pattern)
 	if err != nil {
 		return nil, fmt.Errorf("invalid pattern: %w", err)
 	}
 
+	names, err := listContainerNames()
+	if err != nil {
+		return nil, err
+	}
+
 	var matching []string
-	for _, c := range containers {
-		if re.MatchString(c.Name) {
-			matching = append(matching, c.Name)
+	for _, name := range names {
+		if re.MatchString(name) {
+			matching = append(matching, name)
 		}
 	}
 
 	return matching, nil
 }
 
+// listContainerNames returns the names of all containers
+func listContainerNames() ([]string, error) {
+	instances, err := ListInstances()
+	if err != nil {
+		return nil, err
+	}
+
+	names := make([]string, 0, len(instances))
+	for _, instance := range instances {
+		names = append(names, instance.Name)
+	}
+	return names, nil
+}
+
 // buildIncusCommand builds the full incus command with project flag
 func buildIncusCommand(args ...string) []string {
 	incusArgs := append([]string{"--project", IncusProject}, args...)
@@ -0,0 +1,285 @@
+package container
+
+import (
+	"bufio"
+	"context"
+	"crypto/rand"
+	"crypto/sha1" //nolint:gosec // SHA-1 is mandated by the websocket handshake (RFC 6455)
+	"encoding/base64"
+	"encoding/binary"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"net"
+	"net/http"
+	"net/url"
+	"strings"
+)
+
+// ErrEventsUnavailable is returned by SubscribeLifecycle when the Incus socket cannot be used
+// (e.g. access only through the incus-admin group via sg)
+var ErrEventsUnavailable = errors.New("incus event stream not available")
+
+// Event is a single message from the Incus /1.0/events stream
+type Event struct {
+	Type      string          `json:"type"`
+	Timestamp string          `json:"timestamp"`
+	Project   string          `json:"project"`
+	Metadata  json.RawMessage `json:"metadata"`
+}
+
+// LifecycleEvent is the metadata of a "lifecycle" event
+// (e.g. action "instance-started", source "/1.0/instances/coi-abc12345-1")
+type LifecycleEvent struct {
+	Action string `json:"action"`
+	Source string `json:"source"`
+}
+
+// Lifecycle decodes the event metadata if this is a lifecycle event
+func (e *Event) Lifecycle() (*LifecycleEvent, bool) {
+	if e.Type != "lifecycle" {
+		return nil, false
+	}
+	var lifecycle LifecycleEvent
+	if err := json.Unmarshal(e.Metadata, &lifecycle); err != nil {
+		return nil, false
+	}
+	return &lifecycle, true
+}
+
+// InstanceName returns the instance the lifecycle event refers to, or "" for other sources
+func (l *LifecycleEvent) InstanceName() string {
+	const prefix = "/1.0/instances/"
+	if !strings.HasPrefix(l.Source, prefix) {
+		return ""
+	}
+	return nameFromURL(strings.SplitN(l.Source[len(prefix):], "/", 2)[0])
+}
+
+// websocketGUID is the fixed key suffix from RFC 6455 section 1.3
+const websocketGUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+// websocket opcodes used by the event stream
+const (
+	wsOpContinuation = 0x0
+	wsOpText         = 0x1
+	wsOpClose        = 0x8
+	wsOpPing         = 0x9
+	wsOpPong         = 0xA
+)
+
+// Events subscribes to the Incus event stream for the given event types
+// (e.g. "lifecycle", "operation"). Events are delivered on the returned channel
+// until ctx is cancelled or the connection drops, after which it is closed.
+//
+// The events endpoint is websocket-only. Incus sends one small JSON text
+// message per event, so a minimal frame reader is enough here and avoids
+// pulling in a websocket dependency.
+func (c *Client) Events(ctx context.Context, types ...string) (<-chan Event, error) {
+	var d net.Dialer
+	conn, err := d.DialContext(ctx, "unix", c.socketPath)
+	if err != nil {
+		return nil, err
+	}
+
+	reader, err := c.eventsHandshake(conn, types)
+	if err != nil {
+		conn.Close()
+		return nil, err
+	}
+
+	events := make(chan Event, 16)
+
+	go func() {
+		<-ctx.Done()
+		conn.Close()
+	}()
+
+	go func() {
+		defer close(events)
+		defer conn.Close()
+
+		for {
+			payload, err := readWebsocketMessage(reader, conn)
+			if err != nil {
+				return
+			}
+
+			var event Event
+			if err := json.Unmarshal(payload, &event); err != nil {
+				continue
+			}
+
+			select {
+			case events <- event:
+			case <-ctx.Done():
+				return
+			}
+		}
+	}()
+
+	return events, nil
+}
+
+// SubscribeLifecycle subscribes to instance lifecycle events through the Incus socket.
+// The channel is closed when ctx is cancelled or the connection drops.
+func SubscribeLifecycle(ctx context.Context) (<-chan Event, error) {
+	client := restClient()
+	if client == nil {
+		return nil, ErrEventsUnavailable
+	}
+	return client.Events(ctx, "lifecycle")
+}
+
+// eventsHandshake upgrades conn to a websocket on /1.0/events
+func (c *Client) eventsHandshake(conn net.Conn, types []string) (*bufio.Reader, error) {
+	nonce := make([]byte, 16)
+	if _, err := rand.Read(nonce); err != nil {
+		return nil, err
+	}
+	key := base64.StdEncoding.EncodeToString(nonce)
+
+	query := url.Values{}
+	if len(types) > 0 {
+		query.Set("type", strings.Join(types, ","))
+	}
+	if c.project != "" {
+		query.Set("project", c.project)
+	}
+
+	req, err := http.NewRequest(http.MethodGet, (&url.URL{Scheme: "http", Host: "incus", Path: "/1.0/events", RawQuery: query.Encode()}).String(), nil)
+	if err != nil {
+		return nil, err
+	}
+	req.Header.Set("Connection", "Upgrade")
+	req.Header.Set("Upgrade", "websocket")
+	req.Header.Set("Sec-WebSocket-Version", "13")
+	req.Header.Set("Sec-WebSocket-Key", key)
+
+	if err := req.Write(conn); err != nil {
+		return nil, err
+	}
+
+	reader := bufio.NewReader(conn)
+	resp, err := http.ReadResponse(reader, req)
+	if err != nil {
+		return nil, err
+	}
+	resp.Body.Close()
+
+	if resp.StatusCode != http.StatusSwitchingProtocols {
+		return nil, &APIError{StatusCode: resp.StatusCode, Message: "events websocket upgrade refused"}
+	}
+	if resp.Header.Get("Sec-WebSocket-Accept") != websocketAccept(key) {
+		return nil, fmt.Errorf("events websocket: invalid Sec-WebSocket-Accept")
+	}
+	return reader, nil
+}
+
+// websocketAccept computes the expected Sec-WebSocket-Accept value for key
+func websocketAccept(key string) string {
+	sum := sha1.Sum([]byte(key + websocketGUID)) //nolint:gosec // not used for security
+	return base64.StdEncoding.EncodeToString(sum[:])
+}
+
+// readWebsocketMessage reads frames until a complete text message is available.
+// Pings are answered on w; a close frame ends the stream with io.EOF.
+func readWebsocketMessage(r *bufio.Reader, w io.Writer) ([]byte, error) {
+	var message []byte
+	for {
+		fin, opcode, payload, err := readWebsocketFrame(r)
+		if err != nil {
+			return nil, err
+		}
+
+		switch opcode {
+		case wsOpText, wsOpContinuation:
+			message = append(message, payload...)
+			if fin {
+				return message, nil
+			}
+		case wsOpPing:
+			// A failed pong means the peer is gone; the next read reports it
+			// after any messages that are already buffered
+			_ = writeWebsocketFrame(w, wsOpPong, payload)
+		case wsOpClose:
+			_ = writeWebsocketFrame(w, wsOpClose, nil)
+			return nil, io.EOF
+		}
+	}
+}
+
+// readWebsocketFrame reads a single frame and returns its payload (unmasked)
+func readWebsocketFrame(r *bufio.Reader) (bool, byte, []byte, error) {
+	var header [2]byte
+	if _, err := io.ReadFull(r, header[:]); err != nil {
+		return false, 0, nil, err
+	}
+
+	fin := header[0]&0x80 != 0
+	opcode := header[0] & 0x0F
+	masked := header[1]&0x80 != 0
+	length := uint64(header[1] & 0x7F)
+
+	switch length {
+	case 126:
+		var ext [2]byte
+		if _, err := io.ReadFull(r, ext[:]); err != nil {
+			return false, 0, nil, err
+		}
+		length = uint64(binary.BigEndian.Uint16(ext[:]))
+	case 127:
+		var ext [8]byte
+		if _, err := io.ReadFull(r, ext[:]); err != nil {
+			return false, 0, nil, err
+		}
+		length = binary.BigEndian.Uint64(ext[:])
+	}
+
+	// Events are small; anything this large is a protocol error
+	if length > 16<<20 {
+		return false, 0, nil, fmt.Errorf("events websocket: frame too large (%d bytes)", length)
+	}
+
+	var mask [4]byte
+	if masked {
+		if _, err := io.ReadFull(r, mask[:]); err != nil {
+			return false, 0, nil, err
+		}
+	}
+
+	payload := make([]byte, length)
+	if _, err := io.ReadFull(r, payload); err != nil {
+		return false, 0, nil, err
+	}
+	if masked {
+		for i := range payload {
+			payload[i] ^= mask[i%4]
+		}
+	}
+
+	return fin, opcode, payload, nil
+}
+
+// writeWebsocketFrame writes a single masked control frame (clients must mask)
+func writeWebsocketFrame(w io.Writer, opcode byte, payload []byte) error {
+	if len(payload) > 125 {
+		payload = payload[:125]
+	}
+
+	var mask [4]byte
+	if _, err := rand.Read(mask[:]); err != nil {
+		return err
+	}
+
+	frame := make([]byte, 0, 6+len(payload))
+	frame = append(frame, 0x80|opcode, 0x80|byte(len(payload)))
+	frame = append(frame, mask[:]...)
+	for i, b := range payload {
+		frame = append(frame, b^mask[i%4])
+	}
+
+	_, err := w.Write(frame)
+	return err
+}
@@ -0,0 +1,127 @@
+package container
+
+import (
+	"context"
+	"encoding/binary"
+	"encoding/json"
+	"net/http"
+	"strings"
+	"testing"
+	"time"
+)
+
+// serveEvents upgrades the request to a websocket and streams f.events as text frames
+func (f *fakeIncus) serveEvents(w http.ResponseWriter, r *http.Request) {
+	if r.Header.Get("Upgrade") != "websocket" {
+		f.writeError(w, http.StatusBadRequest, "websocket required")
+		return
+	}
+
+	hijacker, ok := w.(http.Hijacker)
+	if !ok {
+		f.writeError(w, http.StatusInternalServerError, "hijack unsupported")
+		return
+	}
+	conn, buf, err := hijacker.Hijack()
+	if err != nil {
+		return
+	}
+	defer conn.Close()
+
+	_, _ = buf.WriteString("HTTP/1.1 101 Switching Protocols\r\n" +
+		"Upgrade: websocket\r\nConnection: Upgrade\r\n" +
+		"Sec-WebSocket-Accept: " + websocketAccept(r.Header.Get("Sec-WebSocket-Key")) + "\r\n\r\n")
+	_ = buf.Flush()
+
+	// A ping first, to exercise the pong path
+	_, _ = conn.Write([]byte{0x80 | wsOpPing, 0})
+
+	for event := range f.events {
+		data, _ := json.Marshal(event)
+		header := []byte{0x80 | wsOpText}
+		if len(data) < 126 {
+			header = append(header, byte(len(data)))
+		} else {
+			header = append(header, 126, 0, 0)
+			binary.BigEndian.PutUint16(header[2:], uint16(len(data)))
+		}
+		if _, err := conn.Write(append(header, data...)); err != nil {
+			return
+		}
+	}
+
+	_, _ = conn.Write([]byte{0x80 | wsOpClose, 0})
+}
+
+func lifecycleEvent(action, source string) Event {
+	metadata, _ := json.Marshal(LifecycleEvent{Action: action, Source: source})
+	return Event{Type: "lifecycle", Metadata: metadata}
+}
+
+func TestClientEvents(t *testing.T) {
+	fake := newFakeIncus()
+	fake.events = make(chan Event, 2)
+	client := startFakeIncus(t, fake)
+
+	ctx, cancel := context.WithTimeout(context.Background(), 5*time.Second)
+	defer cancel()
+
+	events, err := client.Events(ctx, "lifecycle")
+	if err != nil {
+		t.Fatalf("Events() unexpected error: %v", err)
+	}
+
+	fake.events <- lifecycleEvent("instance-started", "/1.0/instances/coi-abc12345-1")
+	fake.events <- Event{Type: "logging", Metadata: json.RawMessage(`{"message":"` + strings.Repeat("x", 200) + `"}`)}
+	close(fake.events)
+
+	first, ok := <-events
+	if !ok {
+		t.Fatal("Events() channel closed before first event")
+	}
+	lifecycle, ok := first.Lifecycle()
+	if !ok {
+		t.Fatalf("Lifecycle() on %+v returned false", first)
+	}
+	if lifecycle.Action != "instance-started" || lifecycle.InstanceName() != "coi-abc12345-1" {
+		t.Errorf("Lifecycle() = %+v, want instance-started for coi-abc12345-1", lifecycle)
+	}
+
+	second, ok := <-events
+	if !ok || second.Type != "logging" {
+		t.Errorf("second event = %+v, want extended-length logging event", second)
+	}
+	if _, ok := second.Lifecycle(); ok {
+		t.Error("Lifecycle() on logging event returned true")
+	}
+
+	if _, ok := <-events; ok {
+		t.Error("Events() channel not closed after server close frame")
+	}
+}
+
+func TestLifecycleEventInstanceName(t *testing.T) {
+	tests := []struct {
+		source string
+		want   string
+	}{
+		{"/1.0/instances/coi-abc12345-1", "coi-abc12345-1"},
+		{"/1.0/instances/coi-abc12345-1/snapshots/snap0", "coi-abc12345-1"},
+		{"/1.0/instances/coi-abc12345-1?project=default", "coi-abc12345-1"},
+		{"/1.0/images/abcdef", ""},
+	}
+
+	for _, tt := range tests {
+		l := &LifecycleEvent{Source: tt.source}
+		if got := l.InstanceName(); got != tt.want {
+			t.Errorf("InstanceName(%q) = %q, want %q", tt.source, got, tt.want)
+		}
+	}
+}
+
+func TestWebsocketAccept(t *testing.T) {
+	// Example from RFC 6455 section 1.3
+	if got := websocketAccept("dGhlIHNhbXBsZSBub25jZQ=="); got != "s3pPLMBiTxaQ9kYGzzhZRbK+xOo=" {
+		t.Errorf("websocketAccept() = %q, want %q", got, "s3pPLMBiTxaQ9kYGzzhZRbK+xOo=")
+	}
+}
@@ -0,0 +1,287 @@
+package container
+
+import (
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"strings"
+)
+
+// Instance is the subset of the Incus instance representation used by coi.
+// It matches both the REST API objects and `incus list --format=json` output.
+type Instance struct {
+	Name      string                       `json:"name"`
+	Status    string                       `json:"status"`
+	CreatedAt string                       `json:"created_at"`
+	Ephemeral bool                         `json:"ephemeral"`
+	Config    map[string]string            `json:"config"`
+	Devices   map[string]map[string]string `json:"devices"`
+	State     *InstanceState               `json:"state"`
+}
+
+// InstanceState holds the runtime state of an instance
+type InstanceState struct {
+	Status  string                     `json:"status"`
+	Network map[string]InstanceNetwork `json:"network"`
+}
+
+// InstanceNetwork holds the addresses of a single network interface
+type InstanceNetwork struct {
+	Addresses []InstanceAddress `json:"addresses"`
+}
+
+// InstanceAddress is a single address assigned to an interface
+type InstanceAddress struct {
+	Family  string `json:"family"`
+	Address string `json:"address"`
+}
+
+// Image is the subset of the Incus image representation used by coi
+type Image struct {
+	Fingerprint string       `json:"fingerprint"`
+	Aliases     []ImageAlias `json:"aliases"`
+}
+
+// ImageAlias is a single alias pointing at an image
+type ImageAlias struct {
+	Name string `json:"name"`
+}
+
+// Running reports whether the instance is running
+func (i *Instance) Running() bool {
+	return i.Status == "Running"
+}
+
+// IPv4 returns the first IPv4 address of eth0, or "" if none is assigned
+func (i *Instance) IPv4() string {
+	if i.State == nil {
+		return ""
+	}
+	eth0, ok := i.State.Network["eth0"]
+	if !ok {
+		return ""
+	}
+	for _, addr := range eth0.Addresses {
+		if addr.Family == "inet" {
+			return addr.Address
+		}
+	}
+	return ""
+}
+
+// HasAlias reports whether the image carries the given alias
+func (img *Image) HasAlias(name string) bool {
+	for _, alias := range img.Aliases {
+		if alias.Name == name {
+			return true
+		}
+	}
+	return false
+}
+
+// ListInstances returns all instances with their runtime state.
+// The parsed listing is shared across callers for SnapshotTTL (see InvalidateCache).
+func ListInstances() ([]Instance, error) {
+	return snapshot.Instances()
+}
+
+// GetInstance returns a single instance with its runtime state, or nil if it does not exist.
+// Served from the shared instance snapshot.
+func GetInstance(name string) (*Instance, error) {
+	instances, err := snapshot.Instances()
+	if err != nil {
+		return nil, err
+	}
+
+	for i := range instances {
+		if instances[i].Name == name {
+			instance := instances[i]
+			return &instance, nil
+		}
+	}
+	return nil, nil
+}
+
+// ListInstanceNamesWithPrefix returns the names of instances whose name starts with prefix.
+// Only names are fetched, and the shared snapshot is bypassed, so callers picking a name
+// for a new instance always see instances created moments ago by other coi processes.
+func ListInstanceNamesWithPrefix(prefix string) ([]string, error) {
+	var names []string
+	if client := restClient(); client != nil {
+		all, err := client.ListInstanceNames()
+		if err != nil {
+			return nil, err
+		}
+		names = all
+	} else {
+		// A bare filter argument makes incus list only instances whose name starts with it
+		output, err := IncusOutput("list", prefix, "--format=csv", "--columns=n")
+		if err != nil {
+			return nil, err
+		}
+		names = strings.Split(output, "\n")
+	}
+
+	matching := []string{}
+	for _, name := range names {
+		name = strings.TrimSpace(name)
+		if strings.HasPrefix(name, prefix) {
+			matching = append(matching, name)
+		}
+	}
+	return matching, nil
+}
+
+// ListImages returns all images.
+// The parsed listing is shared across callers for SnapshotTTL (see InvalidateCache).
+func ListImages() ([]Image, error) {
+	return snapshot.Images()
+}
+
+// fetchInstances lists instances via the REST API when available,
+// falling back to `incus list --format=json`
+func fetchInstances() ([]Instance, error) {
+	if client := restClient(); client != nil {
+		return client.ListInstances()
+	}
+
+	instances := []Instance{}
+	err := streamInstances(func(instance *Instance) error {
+		instances = append(instances, *instance)
+		return nil
+	}, "list", "--format=json")
+	if err != nil {
+		return nil, err
+	}
+	return instances, nil
+}
+
+// FetchInstance returns a single instance with its runtime state straight from Incus
+// (bypassing the shared snapshot), or nil if it does not exist
+func FetchInstance(name string) (*Instance, error) {
+	if client := restClient(); client != nil {
+		instance, err := client.GetInstanceFull(name)
+		if errors.Is(err, ErrNotFound) {
+			return nil, nil
+		}
+		return instance, err
+	}
+
+	instances, err := ListInstancesWithPrefix(name)
+	if err != nil {
+		return nil, err
+	}
+	for i := range instances {
+		if instances[i].Name == name {
+			return &instances[i], nil
+		}
+	}
+	return nil, nil
+}
+
+// ListInstancesWithPrefix returns the instances (with runtime state) whose name starts with prefix.
+// The CLI fallback asks incus to filter by name and decodes its output as it streams in.
+func ListInstancesWithPrefix(prefix string) ([]Instance, error) {
+	matching := []Instance{}
+	keep := func(instance *Instance) error {
+		if strings.HasPrefix(instance.Name, prefix) {
+			matching = append(matching, *instance)
+		}
+		return nil
+	}
+
+	if client := restClient(); client != nil {
+		instances, err := client.ListInstances()
+		if err != nil {
+			return nil, err
+		}
+		for i := range instances {
+			_ = keep(&instances[i])
+		}
+		return matching, nil
+	}
+
+	// A bare filter argument makes incus list only instances whose name starts with it
+	if err := streamInstances(keep, "list", prefix, "--format=json"); err != nil {
+		return nil, err
+	}
+	return matching, nil
+}
+
+// streamInstances runs an `incus list --format=json` command and calls fn for each
+// instance as it is decoded from the command's output
+func streamInstances(fn func(*Instance) error, args ...string) error {
+	pr, pw := io.Pipe()
+	done := make(chan error, 1)
+	go func() {
+		err := IncusPipe(nil, pw, args...)
+		pw.CloseWithError(err)
+		done <- err
+	}()
+
+	decodeErr := decodeInstances(pr, fn)
+	if decodeErr == nil {
+		// Let the command finish writing (trailing newline) so it exits cleanly
+		_, _ = io.Copy(io.Discard, pr)
+	}
+	pr.Close() // Unblocks the command if decoding stopped early
+	runErr := <-done
+
+	// A failed command also breaks decoding; its error (with stderr) is the useful one
+	if runErr != nil && !errors.Is(runErr, io.ErrClosedPipe) {
+		return runErr
+	}
+	return decodeErr
+}
+
+// decodeInstances decodes a JSON array of instances from r one element at a time,
+// calling fn for each, so the whole listing is never held as raw JSON or generic maps
+func decodeInstances(r io.Reader, fn func(*Instance) error) error {
+	dec := json.NewDecoder(r)
+
+	tok, err := dec.Token()
+	if err != nil {
+		return fmt.Errorf("failed to parse instance list: %w", err)
+	}
+	if tok == nil {
+		return nil // `null` is an empty listing
+	}
+	if delim, ok := tok.(json.Delim); !ok || delim != '[' {
+		return fmt.Errorf("failed to parse instance list: expected array, got %v", tok)
+	}
+
+	for dec.More() {
+		var instance Instance
+		if err := dec.Decode(&instance); err != nil {
+			return fmt.Errorf("failed to parse instance list: %w", err)
+		}
+		if err := fn(&instance); err != nil {
+			return err
+		}
+	}
+
+	if _, err := dec.Token(); err != nil {
+		return fmt.Errorf("failed to parse instance list: %w", err)
+	}
+	return nil
+}
+
+// fetchImages lists images via the REST API when available,
+// falling back to `incus image list --format=json`
+func fetchImages() ([]Image, error) {
+	if client := restClient(); client != nil {
+		return client.ListImages()
+	}
+
+	output, err := IncusOutput("image", "list", "--format=json")
+	if err != nil {
+		return nil, err
+	}
+
+	var images []Image
+	if err := json.Unmarshal([]byte(output), &images); err != nil {
+		return nil, fmt.Errorf("failed to parse image list: %w", err)
+	}
+	return images, nil
+}
@@ -0,0 +1,95 @@
+package container
+
+import (
+	"errors"
+	"strings"
+	"testing"
+)
+
+const instanceListJSON = `[
+  {
+    "name": "coi-abcd1234-1",
+    "status": "Running",
+    "created_at": "2024-01-02T03:04:05Z",
+    "config": {"image.description": "coi image"},
+    "state": {
+      "status": "Running",
+      "network": {
+        "eth0": {"addresses": [
+          {"family": "inet6", "address": "fd42::1"},
+          {"family": "inet", "address": "10.0.0.5"}
+        ]}
+      }
+    }
+  },
+  {"name": "coi-abcd1234-2", "status": "Stopped", "state": {"status": "Stopped", "network": null}}
+]
+`
+
+func TestDecodeInstances(t *testing.T) {
+	var instances []Instance
+	err := decodeInstances(strings.NewReader(instanceListJSON), func(instance *Instance) error {
+		instances = append(instances, *instance)
+		return nil
+	})
+	if err != nil {
+		t.Fatalf("decodeInstances() unexpected error: %v", err)
+	}
+
+	if len(instances) != 2 {
+		t.Fatalf("decodeInstances() decoded %d instances, want 2", len(instances))
+	}
+	if got := instances[0].IPv4(); got != "10.0.0.5" {
+		t.Errorf("IPv4() = %q, want %q", got, "10.0.0.5")
+	}
+	if got := instances[0].Config["image.description"]; got != "coi image" {
+		t.Errorf("image.description = %q, want %q", got, "coi image")
+	}
+	if instances[1].Running() || instances[1].IPv4() != "" {
+		t.Errorf("stopped instance = %+v, want not running without IPv4", instances[1])
+	}
+}
+
+func TestDecodeInstancesEmpty(t *testing.T) {
+	for _, input := range []string{"[]", "null", "[]\n"} {
+		called := false
+		err := decodeInstances(strings.NewReader(input), func(*Instance) error {
+			called = true
+			return nil
+		})
+		if err != nil || called {
+			t.Errorf("decodeInstances(%q) = %v (called: %v), want nil without calls", input, err, called)
+		}
+	}
+}
+
+func TestDecodeInstancesInvalid(t *testing.T) {
+	tests := []string{
+		"",
+		`{"name": "x"}`,
+		`[{"name": "x"},`,
+		`[{"name": 1}]`,
+	}
+
+	for _, input := range tests {
+		err := decodeInstances(strings.NewReader(input), func(*Instance) error { return nil })
+		if err == nil {
+			t.Errorf("decodeInstances(%q) expected error", input)
+		}
+	}
+}
+
+func TestDecodeInstancesStopsOnCallbackError(t *testing.T) {
+	stop := errors.New("stop")
+	calls := 0
+	err := decodeInstances(strings.NewReader(instanceListJSON), func(*Instance) error {
+		calls++
+		return stop
+	})
+	if !errors.Is(err, stop) {
+		t.Errorf("decodeInstances() error = %v, want %v", err, stop)
+	}
+	if calls != 1 {
+		t.Errorf("decodeInstances() called fn %d times, want 1", calls)
+	}
+}
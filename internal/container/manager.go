@@ -2,6 +2,7 @@ package container
 
 import (
 	"fmt"
+	"io"
 	"os"
 	"os/exec"
 	"path/filepath"
@@ -44,6 +45,10 @@ func (m *Manager) Stop(force bool) error {
 	if force {
 		return StopContainer(m.ContainerName)
 	}
+	if client := restClient(); client != nil {
+		defer InvalidateCache()
+		return client.UpdateInstanceState(m.ContainerName, "stop", false, -1)
+	}
 	return IncusExec("stop", m.ContainerName)
 }
 
@@ -52,6 +57,10 @@ func (m *Manager) Delete(force bool) error {
 	if force {
 		return DeleteContainer(m.ContainerName)
 	}
+	if client := restClient(); client != nil {
+		defer InvalidateCache()
+		return client.DeleteInstance(m.ContainerName, false)
+	}
 	return IncusExec("delete", m.ContainerName)
 }
 
@@ -62,15 +71,19 @@ func (m *Manager) Running() (bool, error) {
 
 // Exists checks if container exists (running or stopped)
 func (m *Manager) Exists() (bool, error) {
-	output, err := IncusOutput("list", "^"+m.ContainerName+"$", "--format=csv", "--columns=n")
+	instance, err := GetInstance(m.ContainerName)
 	if err != nil {
 		return false, err
 	}
-	return len(output) > 0 && output != "\n", nil
+	return instance != nil, nil
 }
 
 // Start starts a stopped container
 func (m *Manager) Start() error {
+	if client := restClient(); client != nil {
+		defer InvalidateCache()
+		return client.UpdateInstanceState(m.ContainerName, "start", false, -1)
+	}
 	return IncusExec("start", m.ContainerName)
 }
 
@@ -167,6 +180,33 @@ func (m *Manager) ExecArgsCapture(commandArgs []string, opts ExecCommandOptions)
 	return IncusOutputRaw(args...)
 }
 
+// ExecPipe executes a command with raw arguments, streaming stdin from r and stdout to w.
+// Use it for bulk data (archives, file lists) that should not be buffered as a string.
+func (m *Manager) ExecPipe(commandArgs []string, opts ExecCommandOptions, r io.Reader, w io.Writer) error {
+	args := []string{"exec", m.ContainerName}
+
+	// Add working directory
+	if opts.Cwd != "" {
+		args = append(args, "--cwd", opts.Cwd)
+	}
+
+	// Add user/group
+	if opts.User != nil {
+		args = append(args, "--user", fmt.Sprintf("%d", *opts.User))
+		group := opts.User // default to same as user
+		if opts.Group != nil {
+			group = opts.Group
+		}
+		args = append(args, "--group", fmt.Sprintf("%d", *group))
+	}
+
+	// Add command arguments
+	args = append(args, "--")
+	args = append(args, commandArgs...)
+
+	return IncusPipe(r, w, args...)
+}
+
 // ExecCommandOptions holds options for executing commands
 type ExecCommandOptions struct {
 	User        *int
@@ -286,6 +326,15 @@ func (m *Manager) PushDirectory(localPath, containerPath string) error {
 	return IncusExec("file", "push", "-r", localPath, dest)
 }
 
+// ExtractArchive streams a tar archive into the container and extracts it under destination.
+// Ownership and permissions are taken from the archive headers (numeric IDs).
+func (m *Manager) ExtractArchive(archive io.Reader, destination string) error {
+	return incusExecStdin(archive,
+		"exec", m.ContainerName, "--",
+		"tar", "-x", "-f", "-", "--numeric-owner", "--same-owner", "--same-permissions", "-C", destination,
+	)
+}
+
 // Chown changes ownership of a path in the container
 func (m *Manager) Chown(path string, uid, gid int) error {
 	cmd := fmt.Sprintf("chown -R %d:%d %s", uid, gid, path)
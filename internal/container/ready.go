@@ -0,0 +1,145 @@
+package container
+
+import (
+	"context"
+	"errors"
+	"fmt"
+	"time"
+)
+
+const (
+	// readyBackoffMin is the first delay between readiness checks
+	readyBackoffMin = 10 * time.Millisecond
+	// readyBackoffMax caps the delay between readiness checks, so a container
+	// that becomes ready between checks is noticed within this window
+	readyBackoffMax = 80 * time.Millisecond
+	// readyEventSafetyPoll bounds the wait for a lifecycle event in case one is missed
+	readyEventSafetyPoll = time.Second
+	// readyProgressInterval is how often onWait is called while still waiting
+	readyProgressInterval = 5 * time.Second
+)
+
+// WaitReady blocks until the container is running and accepts exec, or timeout elapses.
+// It returns how long it waited.
+//
+// When the Incus socket is usable, lifecycle events wake the wait as soon as the
+// instance changes state, and a single `echo ready` exec confirms readiness.
+// Otherwise (or while exec is not accepted yet) it re-checks with a short
+// exponential backoff capped at readyBackoffMax. The status is looked up for
+// this instance alone, and only until it is seen running; after that only the
+// exec probe is retried. onWait, if set, is called
+// every few seconds with the elapsed time.
+func (m *Manager) WaitReady(timeout time.Duration, onWait func(elapsed time.Duration)) (time.Duration, error) {
+	ctx, cancel := context.WithTimeout(context.Background(), timeout)
+	defer cancel()
+
+	// Subscribe before the first status check so a start that completes
+	// in between is not missed
+	var events <-chan Event
+	if client := restClient(); client != nil {
+		if ch, err := client.Events(ctx, "lifecycle"); err == nil {
+			events = ch
+		}
+	}
+
+	running := func() (bool, error) {
+		// Status changes come from Incus itself, so look this one instance up directly
+		// instead of invalidating and re-listing every instance on each check
+		if client := restClient(); client != nil {
+			instance, err := client.GetInstance(m.ContainerName)
+			if errors.Is(err, ErrNotFound) {
+				return false, nil
+			}
+			if err != nil {
+				return false, err
+			}
+			return instance.Running(), nil
+		}
+		instance, err := FetchInstance(m.ContainerName)
+		if err != nil {
+			return false, err
+		}
+		return instance != nil && instance.Running(), nil
+	}
+	probe := func() error {
+		_, err := m.ExecCommand("echo ready", ExecCommandOptions{Capture: true})
+		return err
+	}
+
+	elapsed, err := waitReady(ctx, m.ContainerName, events, running, probe, onWait)
+	if err == nil {
+		// The shared listing may still describe the instance as it was before it started
+		InvalidateCache()
+	}
+	return elapsed, err
+}
+
+// waitReady is the readiness loop behind Manager.WaitReady.
+// events may be nil when the event stream is unavailable.
+func waitReady(ctx context.Context, name string, events <-chan Event, running func() (bool, error), probe func() error, onWait func(time.Duration)) (time.Duration, error) {
+	start := time.Now()
+	backoff := readyBackoffMin
+	lastProgress := start
+
+	// Once a lookup or an instance-started event has shown the instance running,
+	// only the exec probe is repeated
+	isRunning := false
+	for {
+		if !isRunning {
+			var err error
+			if isRunning, err = running(); err != nil {
+				return time.Since(start), fmt.Errorf("failed to check container status: %w", err)
+			}
+		}
+		if isRunning {
+			if err := probe(); err == nil {
+				return time.Since(start), nil
+			}
+		}
+
+		if onWait != nil && time.Since(lastProgress) >= readyProgressInterval {
+			lastProgress = time.Now()
+			onWait(time.Since(start))
+		}
+
+		// While stopped, a lifecycle event for this instance is the wake-up signal,
+		// with a slow safety poll in case an event is missed. Once running, only
+		// the exec probe is pending, so retry it on the short backoff.
+		var wake <-chan Event
+		delay := backoff
+		if !isRunning && events != nil {
+			wake = events
+			delay = readyEventSafetyPoll
+		}
+
+		timer := time.NewTimer(delay)
+	wait:
+		for {
+			select {
+			case <-ctx.Done():
+				timer.Stop()
+				return time.Since(start), fmt.Errorf("container failed to become ready after %s", time.Since(start).Round(time.Second))
+			case <-timer.C:
+				break wait
+			case event, ok := <-wake:
+				if !ok {
+					// Stream dropped - fall back to polling
+					events = nil
+					timer.Stop()
+					break wait
+				}
+				if lifecycle, ok := event.Lifecycle(); ok && lifecycle.InstanceName() == name {
+					isRunning = lifecycle.Action == "instance-started"
+					timer.Stop()
+					break wait
+				}
+			}
+		}
+
+		if wake == nil {
+			if backoff *= 2; backoff > readyBackoffMax {
+				backoff = readyBackoffMax
+			}
+		}
+	}
+}
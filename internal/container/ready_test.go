@@ -0,0 +1,156 @@
+package container
+
+import (
+	"context"
+	"errors"
+	"sync/atomic"
+	"testing"
+	"time"
+)
+
+func TestWaitReadyImmediate(t *testing.T) {
+	probes := 0
+	elapsed, err := waitReady(context.Background(), "c1", nil,
+		func() (bool, error) { return true, nil },
+		func() error { probes++; return nil },
+		nil,
+	)
+	if err != nil {
+		t.Fatalf("waitReady() unexpected error: %v", err)
+	}
+	if probes != 1 {
+		t.Errorf("probe called %d times, want 1", probes)
+	}
+	if elapsed > readyBackoffMax {
+		t.Errorf("waitReady() took %v for an already-ready container", elapsed)
+	}
+}
+
+func TestWaitReadyBackoffWithoutEvents(t *testing.T) {
+	checks := 0
+	elapsed, err := waitReady(context.Background(), "c1", nil,
+		func() (bool, error) { checks++; return checks >= 4, nil },
+		func() error { return nil },
+		nil,
+	)
+	if err != nil {
+		t.Fatalf("waitReady() unexpected error: %v", err)
+	}
+	// 10ms + 20ms + 40ms of backoff, nowhere near the old 1s poll interval
+	if elapsed < 70*time.Millisecond || elapsed > 500*time.Millisecond {
+		t.Errorf("waitReady() took %v, want roughly 70ms of backoff", elapsed)
+	}
+}
+
+func TestWaitReadyRetriesProbe(t *testing.T) {
+	probes := 0
+	_, err := waitReady(context.Background(), "c1", nil,
+		func() (bool, error) { return true, nil },
+		func() error {
+			probes++
+			if probes < 3 {
+				return errors.New("exec not ready")
+			}
+			return nil
+		},
+		nil,
+	)
+	if err != nil {
+		t.Fatalf("waitReady() unexpected error: %v", err)
+	}
+	if probes != 3 {
+		t.Errorf("probe called %d times, want 3", probes)
+	}
+}
+
+func TestWaitReadyWakesOnLifecycleEvent(t *testing.T) {
+	events := make(chan Event, 2)
+	var started atomic.Bool
+
+	go func() {
+		time.Sleep(20 * time.Millisecond)
+		// Events for other instances must not end the wait early
+		events <- lifecycleEvent("instance-started", "/1.0/instances/other")
+		started.Store(true)
+		events <- lifecycleEvent("instance-started", "/1.0/instances/c1")
+	}()
+
+	elapsed, err := waitReady(context.Background(), "c1", events,
+		func() (bool, error) { return started.Load(), nil },
+		func() error { return nil },
+		nil,
+	)
+	if err != nil {
+		t.Fatalf("waitReady() unexpected error: %v", err)
+	}
+	// Without the event the next check would be after readyEventSafetyPoll
+	if elapsed >= readyEventSafetyPoll {
+		t.Errorf("waitReady() took %v, want it to wake on the lifecycle event", elapsed)
+	}
+}
+
+func TestWaitReadyTimeout(t *testing.T) {
+	ctx, cancel := context.WithTimeout(context.Background(), 50*time.Millisecond)
+	defer cancel()
+
+	_, err := waitReady(ctx, "c1", nil,
+		func() (bool, error) { return false, nil },
+		func() error { return nil },
+		nil,
+	)
+	if err == nil {
+		t.Error("waitReady() expected timeout error, got nil")
+	}
+}
+
+func TestWaitReadyStatusError(t *testing.T) {
+	_, err := waitReady(context.Background(), "c1", nil,
+		func() (bool, error) { return false, errors.New("incus unavailable") },
+		func() error { return nil },
+		nil,
+	)
+	if err == nil {
+		t.Error("waitReady() expected error when status check fails, got nil")
+	}
+}
+
+func TestWaitReadyChecksStatusOnceRunning(t *testing.T) {
+	checks, probes := 0, 0
+	_, err := waitReady(context.Background(), "c1", nil,
+		func() (bool, error) { checks++; return true, nil },
+		func() error {
+			probes++
+			if probes < 4 {
+				return errors.New("exec not ready")
+			}
+			return nil
+		},
+		nil,
+	)
+	if err != nil {
+		t.Fatalf("waitReady() unexpected error: %v", err)
+	}
+	// Only the exec probe is retried once the instance is known to be running
+	if checks != 1 {
+		t.Errorf("status checked %d times, want 1", checks)
+	}
+}
+
+func TestWaitReadyTrustsStartedEvent(t *testing.T) {
+	events := make(chan Event, 1)
+	events <- lifecycleEvent("instance-started", "/1.0/instances/c1")
+
+	checks := 0
+	_, err := waitReady(context.Background(), "c1", events,
+		func() (bool, error) { checks++; return false, nil },
+		func() error { return nil },
+		nil,
+	)
+	if err != nil {
+		t.Fatalf("waitReady() unexpected error: %v", err)
+	}
+	// The instance-started event stands in for a second status lookup
+	if checks != 1 {
+		t.Errorf("status checked %d times, want 1", checks)
+	}
+}
@@ -0,0 +1,197 @@
+package container
+
+import (
+	"bytes"
+	"encoding/json"
+	"fmt"
+	"io"
+	"net/http"
+	"net/url"
+	"os"
+	"sort"
+	"strings"
+)
+
+// InstanceSpec declares everything about a new instance that is known before it is created.
+// Applying it in one create request replaces the launch + `config set` + `config device add`
+// sequence, so the instance never exists in a half-configured state.
+type InstanceSpec struct {
+	Name      string
+	Image     string
+	Ephemeral bool
+	Profiles  []string                     // Empty means the default profile
+	Config    map[string]string            // Instance config keys (e.g. security.nesting)
+	Devices   map[string]map[string]string // Device name -> device config (must include "type")
+}
+
+// NewInstanceSpec creates an empty spec for a container named name from image
+func NewInstanceSpec(image, name string) *InstanceSpec {
+	return &InstanceSpec{
+		Name:    name,
+		Image:   image,
+		Config:  map[string]string{},
+		Devices: map[string]map[string]string{},
+	}
+}
+
+// EnableDockerSupport configures the container to support Docker/nested containers.
+//
+// This sets three security flags required for Docker to work properly:
+// - security.nesting=true: Enables nested containerization
+// - security.syscalls.intercept.mknod=true: Safe device node creation
+// - security.syscalls.intercept.setxattr=true: Safe filesystem attribute handling
+func (s *InstanceSpec) EnableDockerSupport() *InstanceSpec {
+	s.Config["security.nesting"] = "true"
+	s.Config["security.syscalls.intercept.mknod"] = "true"
+	s.Config["security.syscalls.intercept.setxattr"] = "true"
+	return s
+}
+
+// AddDisk adds a disk device mounting source (on the host) at path (in the container)
+func (s *InstanceSpec) AddDisk(name, source, path string, shift bool) *InstanceSpec {
+	device := map[string]string{
+		"type":   "disk",
+		"source": source,
+		"path":   path,
+	}
+	if shift {
+		device["shift"] = "true"
+	}
+	s.Devices[name] = device
+	return s
+}
+
+// instancesPost is the body of POST /1.0/instances
+type instancesPost struct {
+	Name      string                       `json:"name"`
+	Type      string                       `json:"type"`
+	Ephemeral bool                         `json:"ephemeral"`
+	Profiles  []string                     `json:"profiles,omitempty"`
+	Config    map[string]string            `json:"config"`
+	Devices   map[string]map[string]string `json:"devices"`
+	Start     bool                         `json:"start"`
+	Source    instanceSource               `json:"source"`
+}
+
+// instanceSource selects the image an instance is created from
+type instanceSource struct {
+	Type  string `json:"type"`
+	Alias string `json:"alias"`
+}
+
+// CreateInstance creates an instance with all config and devices applied in one request
+func (c *Client) CreateInstance(spec *InstanceSpec, start bool) error {
+	body := instancesPost{
+		Name:      spec.Name,
+		Type:      "container",
+		Ephemeral: spec.Ephemeral,
+		Profiles:  spec.Profiles,
+		Config:    spec.Config,
+		Devices:   spec.Devices,
+		Start:     start,
+		Source:    instanceSource{Type: "image", Alias: spec.Image},
+	}
+	return c.operation(http.MethodPost, "/1.0/instances", body)
+}
+
+// UpdateInstance merges config keys and devices into an existing instance (PATCH)
+func (c *Client) UpdateInstance(name string, config map[string]string, devices map[string]map[string]string) error {
+	body := map[string]interface{}{
+		"config":  config,
+		"devices": devices,
+	}
+	return c.operation(http.MethodPatch, "/1.0/instances/"+url.PathEscape(name), body)
+}
+
+// isLocalImage reports whether image refers to an image in the local store
+// (remote images like "images:ubuntu/22.04" need the CLI's remote configuration)
+func isLocalImage(image string) bool {
+	return !strings.Contains(image, ":")
+}
+
+// CreateInstance creates an instance from spec in a single request and optionally starts it.
+// Uses one REST call when possible; otherwise a single `incus init`/`incus launch` with the
+// config and devices passed as YAML on stdin (JSON is valid YAML).
+func CreateInstance(spec *InstanceSpec, start bool) error {
+	if client := restClient(); client != nil && isLocalImage(spec.Image) {
+		defer InvalidateCache()
+		return client.CreateInstance(spec, start)
+	}
+
+	verb := "init"
+	if start {
+		verb = "launch"
+	}
+	args := []string{verb, spec.Image, spec.Name}
+	if spec.Ephemeral {
+		args = append(args, "--ephemeral")
+	}
+	for _, profile := range spec.Profiles {
+		args = append(args, "--profile", profile)
+	}
+
+	data, err := json.Marshal(map[string]interface{}{
+		"config":  spec.Config,
+		"devices": spec.Devices,
+	})
+	if err != nil {
+		return fmt.Errorf("failed to encode instance spec: %w", err)
+	}
+
+	return incusExecStdin(bytes.NewReader(data), args...)
+}
+
+// ApplyInstanceSpec applies the config and devices of spec to an existing (stopped) instance.
+// Used when the instance was created ahead of time (e.g. claimed from the warm pool).
+func ApplyInstanceSpec(spec *InstanceSpec) error {
+	if client := restClient(); client != nil {
+		defer InvalidateCache()
+		return client.UpdateInstance(spec.Name, spec.Config, spec.Devices)
+	}
+
+	if len(spec.Config) > 0 {
+		args := []string{"config", "set", spec.Name}
+		for _, key := range sortedKeys(spec.Config) {
+			args = append(args, key+"="+spec.Config[key])
+		}
+		if err := IncusExec(args...); err != nil {
+			return err
+		}
+	}
+
+	for _, name := range sortedKeys(spec.Devices) {
+		device := spec.Devices[name]
+		args := []string{"config", "device", "add", spec.Name, name, device["type"]}
+		for _, key := range sortedKeys(device) {
+			if key != "type" {
+				args = append(args, key+"="+device[key])
+			}
+		}
+		if err := IncusExec(args...); err != nil {
+			return err
+		}
+	}
+
+	return nil
+}
+
+// incusExecStdin executes an Incus command with stdin connected to r
+func incusExecStdin(r io.Reader, args ...string) error {
+	defer InvalidateCache()
+	cmdArgs := buildIncusCommand(args...)
+	cmd := execIncusCommand(cmdArgs)
+	cmd.Stdin = r
+	cmd.Stdout = os.Stderr // Send stdout to stderr so it's visible
+	cmd.Stderr = os.Stderr
+	return cmd.Run()
+}
+
+// sortedKeys returns the keys of m in sorted order (stable CLI argument order)
+func sortedKeys[V any](m map[string]V) []string {
+	keys := make([]string, 0, len(m))
+	for key := range m {
+		keys = append(keys, key)
+	}
+	sort.Strings(keys)
+	return keys
+}
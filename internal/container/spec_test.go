@@ -0,0 +1,102 @@
+package container
+
+import (
+	"reflect"
+	"testing"
+)
+
+func TestInstanceSpecBuilders(t *testing.T) {
+	spec := NewInstanceSpec("coi", "coi-abc12345-1").EnableDockerSupport()
+	spec.AddDisk("workspace", "/home/user/project", "/workspace", true)
+	spec.AddDisk("data", "/srv/data", "/data", false)
+
+	wantConfig := map[string]string{
+		"security.nesting":                     "true",
+		"security.syscalls.intercept.mknod":    "true",
+		"security.syscalls.intercept.setxattr": "true",
+	}
+	if !reflect.DeepEqual(spec.Config, wantConfig) {
+		t.Errorf("EnableDockerSupport() config = %v, want %v", spec.Config, wantConfig)
+	}
+
+	wantWorkspace := map[string]string{"type": "disk", "source": "/home/user/project", "path": "/workspace", "shift": "true"}
+	if !reflect.DeepEqual(spec.Devices["workspace"], wantWorkspace) {
+		t.Errorf("AddDisk(shift=true) = %v, want %v", spec.Devices["workspace"], wantWorkspace)
+	}
+	if _, ok := spec.Devices["data"]["shift"]; ok {
+		t.Errorf("AddDisk(shift=false) should not set shift, got %v", spec.Devices["data"])
+	}
+}
+
+func TestIsLocalImage(t *testing.T) {
+	tests := []struct {
+		image string
+		want  bool
+	}{
+		{"coi", true},
+		{"coi-rust", true},
+		{"images:ubuntu/22.04", false},
+		{"local:coi", false},
+	}
+
+	for _, tt := range tests {
+		if got := isLocalImage(tt.image); got != tt.want {
+			t.Errorf("isLocalImage(%q) = %v, want %v", tt.image, got, tt.want)
+		}
+	}
+}
+
+func TestClientCreateInstance(t *testing.T) {
+	fake := newFakeIncus()
+	client := startFakeIncus(t, fake)
+
+	spec := NewInstanceSpec("coi", "coi-abc12345-3").EnableDockerSupport()
+	spec.AddDisk("workspace", "/home/user/project", "/workspace", true)
+
+	if err := client.CreateInstance(spec, true); err != nil {
+		t.Fatalf("CreateInstance() unexpected error: %v", err)
+	}
+
+	inst, ok := fake.instances["coi-abc12345-3"]
+	if !ok {
+		t.Fatal("Expected instance to be created")
+	}
+	if !inst.Running() {
+		t.Error("Expected instance created with start=true to be running")
+	}
+	if inst.Config["security.nesting"] != "true" || inst.Devices["workspace"]["path"] != "/workspace" {
+		t.Errorf("CreateInstance() sent config=%v devices=%v, want spec applied in one request", inst.Config, inst.Devices)
+	}
+
+	creates := 0
+	for _, req := range fake.requests {
+		if req == "POST /1.0/instances" {
+			creates++
+		}
+	}
+	if creates != 1 {
+		t.Errorf("CreateInstance() made %d create requests, want 1", creates)
+	}
+
+	if err := client.CreateInstance(spec, true); err == nil {
+		t.Error("CreateInstance() for an existing name expected error, got nil")
+	}
+}
+
+func TestClientUpdateInstance(t *testing.T) {
+	fake := newFakeIncus()
+	client := startFakeIncus(t, fake)
+
+	spec := NewInstanceSpec("coi", "coi-abc12345-2")
+	spec.Config["raw.idmap"] = "both 1001 1000"
+	spec.AddDisk("workspace", "/home/user/project", "/workspace", false)
+
+	if err := client.UpdateInstance(spec.Name, spec.Config, spec.Devices); err != nil {
+		t.Fatalf("UpdateInstance() unexpected error: %v", err)
+	}
+
+	inst := fake.instances["coi-abc12345-2"]
+	if inst.Config["raw.idmap"] != "both 1001 1000" || inst.Devices["workspace"]["source"] != "/home/user/project" {
+		t.Errorf("UpdateInstance() left config=%v devices=%v", inst.Config, inst.Devices)
+	}
+}
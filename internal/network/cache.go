@@ -5,13 +5,32 @@ import (
 	"fmt"
 	"os"
 	"path/filepath"
+	"sort"
+	"strings"
 	"time"
 )
 
-// IPCache stores resolved domain IPs with timestamp
+const (
+	// sharedCacheName is the host-wide domain cache shared by all containers
+	sharedCacheName = "domains"
+	// refresherLockName is held by the single process refreshing the shared cache
+	refresherLockName = "refresher.lock"
+)
+
+// IPCache stores resolved domain IPs with timestamp.
+// Expiry records per domain until when its IPs can be used without resolving it again;
+// domains without an entry (e.g. caches written by older versions) are treated as expired.
+//
+// The same format is used for the host-wide domain cache and for the per-container views,
+// which record the IPs currently applied to a container's firewall rules, along with the
+// container IP and ipset those rules use so the refresher can update them.
 type IPCache struct {
-	Domains    map[string][]string `json:"domains"`
-	LastUpdate time.Time           `json:"last_update"`
+	Domains    map[string][]string  `json:"domains"`
+	Expiry     map[string]time.Time `json:"expiry,omitempty"`
+	LastUpdate time.Time            `json:"last_update"`
+
+	ContainerIP string `json:"container_ip,omitempty"` // Per-container views only
+	AllowedSet  string `json:"allowed_set,omitempty"`  // Per-container views only, empty without ipset
 }
 
 // CacheManager handles persistent IP cache storage
@@ -26,10 +45,18 @@ func NewCacheManager(baseDir string) *CacheManager {
 	}
 }
 
-// Load reads the IP cache for a container
+// path returns the cache file for name
+func (c *CacheManager) path(name string) string {
+	return filepath.Join(c.cacheDir, fmt.Sprintf("%s.json", name))
+}
+
+// Load reads the IP cache (applied IPs) for a container
 func (c *CacheManager) Load(containerName string) (*IPCache, error) {
-	cachePath := filepath.Join(c.cacheDir, fmt.Sprintf("%s.json", containerName))
+	return c.read(c.path(containerName))
+}
 
+// read parses a cache file, returning an empty cache if it does not exist
+func (c *CacheManager) read(cachePath string) (*IPCache, error) {
 	data, err := os.ReadFile(cachePath)
 	if err != nil {
 		if os.IsNotExist(err) {
@@ -55,21 +82,40 @@ func (c *CacheManager) Load(containerName string) (*IPCache, error) {
 	return &cache, nil
 }
 
-// Save writes the IP cache for a container
+// Save writes the IP cache (applied IPs) for a container
 func (c *CacheManager) Save(containerName string, cache *IPCache) error {
+	return c.write(c.path(containerName), cache)
+}
+
+// write stores a cache file atomically, so concurrent readers never see a partial file
+func (c *CacheManager) write(cachePath string, cache *IPCache) error {
 	// Ensure cache directory exists
 	if err := os.MkdirAll(c.cacheDir, 0o755); err != nil {
 		return fmt.Errorf("failed to create cache directory: %w", err)
 	}
 
-	cachePath := filepath.Join(c.cacheDir, fmt.Sprintf("%s.json", containerName))
-
 	data, err := json.MarshalIndent(cache, "", "  ")
 	if err != nil {
 		return fmt.Errorf("failed to marshal cache: %w", err)
 	}
 
-	if err := os.WriteFile(cachePath, data, 0o644); err != nil {
+	tmp, err := os.CreateTemp(c.cacheDir, filepath.Base(cachePath)+".*.tmp")
+	if err != nil {
+		return fmt.Errorf("failed to write cache file: %w", err)
+	}
+	defer os.Remove(tmp.Name())
+
+	if _, err := tmp.Write(data); err != nil {
+		tmp.Close()
+		return fmt.Errorf("failed to write cache file: %w", err)
+	}
+	if err := tmp.Close(); err != nil {
+		return fmt.Errorf("failed to write cache file: %w", err)
+	}
+	if err := os.Chmod(tmp.Name(), 0o644); err != nil {
+		return fmt.Errorf("failed to write cache file: %w", err)
+	}
+	if err := os.Rename(tmp.Name(), cachePath); err != nil {
 		return fmt.Errorf("failed to write cache file: %w", err)
 	}
 
@@ -78,7 +124,7 @@ func (c *CacheManager) Save(containerName string, cache *IPCache) error {
 
 // Delete removes the cache file for a container
 func (c *CacheManager) Delete(containerName string) error {
-	cachePath := filepath.Join(c.cacheDir, fmt.Sprintf("%s.json", containerName))
+	cachePath := c.path(containerName)
 
 	if err := os.Remove(cachePath); err != nil {
 		if os.IsNotExist(err) {
@@ -89,3 +135,124 @@ func (c *CacheManager) Delete(containerName string) error {
 
 	return nil
 }
+
+// LoadShared reads the host-wide domain cache
+func (c *CacheManager) LoadShared() (*IPCache, error) {
+	return c.read(c.path(sharedCacheName))
+}
+
+// MergeShared merges update into the host-wide domain cache under its lock and returns
+// the merged cache. Per domain, the entry resolved most recently (latest expiry) wins;
+// entries of update without an expiry only fill in domains the shared cache lacks.
+func (c *CacheManager) MergeShared(update *IPCache) (*IPCache, error) {
+	sharedPath := c.path(sharedCacheName)
+	unlock, err := lockFile(sharedPath + ".lock")
+	if err != nil {
+		return nil, fmt.Errorf("failed to lock shared cache: %w", err)
+	}
+	defer unlock()
+
+	shared, err := c.read(sharedPath)
+	if err != nil {
+		// A corrupt shared cache is rebuilt rather than blocking every container
+		shared = &IPCache{Domains: make(map[string][]string)}
+	}
+	mergeCache(shared, update)
+
+	if err := c.write(sharedPath, shared); err != nil {
+		return nil, err
+	}
+	return shared, nil
+}
+
+// mergeCache merges update into dst (see MergeShared)
+func mergeCache(dst, update *IPCache) {
+	if dst.Expiry == nil {
+		dst.Expiry = make(map[string]time.Time)
+	}
+
+	for domain, ips := range update.Domains {
+		if len(ips) == 0 {
+			continue
+		}
+		expiry, hasExpiry := update.Expiry[domain]
+		current, hasCurrent := dst.Expiry[domain]
+		switch {
+		case hasExpiry && (!hasCurrent || expiry.After(current)):
+			dst.Domains[domain] = ips
+			dst.Expiry[domain] = expiry
+		case len(dst.Domains[domain]) == 0:
+			dst.Domains[domain] = ips
+		}
+	}
+
+	if update.LastUpdate.After(dst.LastUpdate) {
+		dst.LastUpdate = update.LastUpdate
+	}
+}
+
+// TryRefresherLock takes the host-wide refresher lock without blocking. ok is false if
+// another process (or manager) is already refreshing the shared cache.
+func (c *CacheManager) TryRefresherLock() (release func(), ok bool, err error) {
+	return tryLockFile(filepath.Join(c.cacheDir, refresherLockName))
+}
+
+// WaitRefresherLock takes the host-wide refresher lock, blocking until its holder releases it
+func (c *CacheManager) WaitRefresherLock() (release func(), err error) {
+	return lockFile(filepath.Join(c.cacheDir, refresherLockName))
+}
+
+// LockContainer takes the lock of a container's view, held while its rules are updated
+// or torn down so the refresher never re-adds rules for a container being removed
+func (c *CacheManager) LockContainer(containerName string) (release func(), err error) {
+	return lockFile(c.path(containerName) + ".lock")
+}
+
+// Containers returns the names of the containers with a per-container view, sorted
+func (c *CacheManager) Containers() ([]string, error) {
+	entries, err := os.ReadDir(c.cacheDir)
+	if err != nil {
+		if os.IsNotExist(err) {
+			return nil, nil
+		}
+		return nil, fmt.Errorf("failed to read cache directory: %w", err)
+	}
+
+	var names []string
+	for _, entry := range entries {
+		name := entry.Name()
+		if entry.IsDir() || !strings.HasSuffix(name, ".json") || name == sharedCacheName+".json" {
+			continue
+		}
+		names = append(names, strings.TrimSuffix(name, ".json"))
+	}
+	sort.Strings(names)
+	return names, nil
+}
+
+// ContainerDomains returns the domains applied to any container, read from the
+// per-container views. The refresher resolves these on behalf of every container.
+func (c *CacheManager) ContainerDomains() ([]string, error) {
+	names, err := c.Containers()
+	if err != nil {
+		return nil, err
+	}
+
+	seen := make(map[string]bool)
+	for _, name := range names {
+		view, err := c.Load(name)
+		if err != nil {
+			continue
+		}
+		for domain := range view.Domains {
+			seen[domain] = true
+		}
+	}
+
+	domains := make([]string, 0, len(seen))
+	for domain := range seen {
+		domains = append(domains, domain)
+	}
+	sort.Strings(domains)
+	return domains, nil
+}
@@ -0,0 +1,131 @@
+package network
+
+import (
+	"reflect"
+	"sync"
+	"testing"
+	"time"
+)
+
+func TestMergeShared(t *testing.T) {
+	cm := NewCacheManager(t.TempDir())
+	now := time.Now()
+
+	first := &IPCache{
+		Domains: map[string][]string{"a.coi.test": {"10.0.0.1"}, "b.coi.test": {"10.0.0.2"}},
+		Expiry:  map[string]time.Time{"a.coi.test": now.Add(time.Minute), "b.coi.test": now.Add(time.Minute)},
+	}
+	if _, err := cm.MergeShared(first); err != nil {
+		t.Fatalf("MergeShared() unexpected error: %v", err)
+	}
+
+	// A newer lookup wins, an older one and an entry without expiry do not
+	second := &IPCache{
+		Domains: map[string][]string{
+			"a.coi.test": {"10.0.1.1"},
+			"b.coi.test": {"10.0.1.2"},
+			"c.coi.test": {"10.0.1.3"},
+		},
+		Expiry: map[string]time.Time{"a.coi.test": now.Add(time.Hour), "b.coi.test": now},
+	}
+	merged, err := cm.MergeShared(second)
+	if err != nil {
+		t.Fatalf("MergeShared() unexpected error: %v", err)
+	}
+
+	want := map[string][]string{
+		"a.coi.test": {"10.0.1.1"},
+		"b.coi.test": {"10.0.0.2"},
+		"c.coi.test": {"10.0.1.3"},
+	}
+	if !reflect.DeepEqual(merged.Domains, want) {
+		t.Errorf("MergeShared() = %v, want %v", merged.Domains, want)
+	}
+
+	loaded, err := cm.LoadShared()
+	if err != nil {
+		t.Fatalf("LoadShared() unexpected error: %v", err)
+	}
+	if !reflect.DeepEqual(loaded.Domains, want) {
+		t.Errorf("LoadShared() = %v, want %v", loaded.Domains, want)
+	}
+}
+
+func TestMergeSharedConcurrent(t *testing.T) {
+	cm := NewCacheManager(t.TempDir())
+	domains := []string{"a.coi.test", "b.coi.test", "c.coi.test", "d.coi.test", "e.coi.test"}
+
+	var wg sync.WaitGroup
+	for _, domain := range domains {
+		wg.Add(1)
+		go func(domain string) {
+			defer wg.Done()
+			update := &IPCache{
+				Domains: map[string][]string{domain: {"10.0.0.1"}},
+				Expiry:  map[string]time.Time{domain: time.Now().Add(time.Minute)},
+			}
+			if _, err := cm.MergeShared(update); err != nil {
+				t.Errorf("MergeShared() unexpected error: %v", err)
+			}
+		}(domain)
+	}
+	wg.Wait()
+
+	shared, err := cm.LoadShared()
+	if err != nil {
+		t.Fatalf("LoadShared() unexpected error: %v", err)
+	}
+	if len(shared.Domains) != len(domains) {
+		t.Errorf("shared cache has %d domains, want %d (lost updates)", len(shared.Domains), len(domains))
+	}
+}
+
+func TestTryRefresherLock(t *testing.T) {
+	cm := NewCacheManager(t.TempDir())
+
+	release, ok, err := cm.TryRefresherLock()
+	if err != nil || !ok {
+		t.Fatalf("TryRefresherLock() = %v, %v, want lock", ok, err)
+	}
+
+	if _, ok, err := cm.TryRefresherLock(); err != nil || ok {
+		t.Errorf("second TryRefresherLock() = %v, %v, want held elsewhere", ok, err)
+	}
+
+	release()
+	release, ok, err = cm.TryRefresherLock()
+	if err != nil || !ok {
+		t.Fatalf("TryRefresherLock() after release = %v, %v, want lock", ok, err)
+	}
+	release()
+}
+
+func TestContainerDomains(t *testing.T) {
+	cm := NewCacheManager(t.TempDir())
+
+	if domains, err := cm.ContainerDomains(); err != nil || len(domains) != 0 {
+		t.Errorf("ContainerDomains() without cache = %v, %v, want none", domains, err)
+	}
+
+	views := map[string]map[string][]string{
+		"coi-abcd1234-1": {"a.coi.test": {"10.0.0.1"}, "b.coi.test": {"10.0.0.2"}},
+		"coi-abcd1234-2": {"b.coi.test": {"10.0.0.2"}, "c.coi.test": {"10.0.0.3"}},
+	}
+	for name, domainIPs := range views {
+		if err := cm.Save(name, &IPCache{Domains: domainIPs}); err != nil {
+			t.Fatalf("Save() unexpected error: %v", err)
+		}
+	}
+	// Domains only in the shared cache are not applied to any container
+	if _, err := cm.MergeShared(&IPCache{Domains: map[string][]string{"old.coi.test": {"10.0.0.9"}}}); err != nil {
+		t.Fatalf("MergeShared() unexpected error: %v", err)
+	}
+
+	domains, err := cm.ContainerDomains()
+	if err != nil {
+		t.Fatalf("ContainerDomains() unexpected error: %v", err)
+	}
+	if want := []string{"a.coi.test", "b.coi.test", "c.coi.test"}; !reflect.DeepEqual(domains, want) {
+		t.Errorf("ContainerDomains() = %v, want %v", domains, want)
+	}
+}
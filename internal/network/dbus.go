@@ -0,0 +1,834 @@
+package network
+
+import (
+	"bufio"
+	"bytes"
+	"encoding/binary"
+	"encoding/hex"
+	"errors"
+	"fmt"
+	"io"
+	"net"
+	"os"
+	"strconv"
+	"strings"
+	"sync"
+	"time"
+)
+
+const (
+	// defaultSystemBus is the system bus address when DBUS_SYSTEM_BUS_ADDRESS is unset
+	defaultSystemBus = "unix:path=/var/run/dbus/system_bus_socket"
+	// dbusTimeout bounds connecting and each batch of calls
+	dbusTimeout = 10 * time.Second
+	// dbusMaxMessage caps the size of a received message (the protocol maximum is 128 MiB)
+	dbusMaxMessage = 64 << 20
+)
+
+// D-Bus message types
+const (
+	dbusMethodCall   = 1
+	dbusMethodReturn = 2
+	dbusError        = 3
+)
+
+// D-Bus header field codes
+const (
+	dbusFieldPath        = 1
+	dbusFieldInterface   = 2
+	dbusFieldMember      = 3
+	dbusFieldErrorName   = 4
+	dbusFieldReplySerial = 5
+	dbusFieldDestination = 6
+	dbusFieldSignature   = 8
+)
+
+// dbusVariant is a D-Bus variant value with its signature
+type dbusVariant struct {
+	sig   string
+	value interface{}
+}
+
+// dbusCall is a method call
+type dbusCall struct {
+	dest   string
+	path   string
+	iface  string
+	member string
+	sig    string
+	args   []interface{}
+}
+
+// busError is an error reply to a method call
+type busError struct {
+	Name    string
+	Message string
+}
+
+func (e *busError) Error() string {
+	return fmt.Sprintf("%s: %s", e.Name, e.Message)
+}
+
+// dbusReply is the outcome of one call: its return values, or a *busError
+type dbusReply struct {
+	body []interface{}
+	err  error
+}
+
+// dbusConn is a minimal D-Bus client connection.
+//
+// It implements just enough of the wire protocol (EXTERNAL authentication and
+// method calls with basic types) to talk to firewalld without a D-Bus library.
+// Calls are pipelined: a batch is written at once and the replies are collected
+// afterwards, so a batch costs one round trip instead of one per call.
+type dbusConn struct {
+	mu     sync.Mutex
+	conn   net.Conn
+	r      *bufio.Reader
+	serial uint32
+}
+
+// systemBusAddress returns the system bus address
+func systemBusAddress() string {
+	if address := os.Getenv("DBUS_SYSTEM_BUS_ADDRESS"); address != "" {
+		return address
+	}
+	return defaultSystemBus
+}
+
+// busSocketPath extracts the socket path of a unix:path= bus address
+func busSocketPath(address string) (string, error) {
+	for _, candidate := range strings.Split(address, ";") {
+		if !strings.HasPrefix(candidate, "unix:") {
+			continue
+		}
+		for _, kv := range strings.Split(strings.TrimPrefix(candidate, "unix:"), ",") {
+			if path, ok := strings.CutPrefix(kv, "path="); ok {
+				return path, nil
+			}
+		}
+	}
+	return "", fmt.Errorf("unsupported D-Bus address: %s", address)
+}
+
+// dialBus connects and authenticates to the bus at address
+func dialBus(address string) (*dbusConn, error) {
+	path, err := busSocketPath(address)
+	if err != nil {
+		return nil, err
+	}
+	conn, err := net.DialTimeout("unix", path, dbusTimeout)
+	if err != nil {
+		return nil, fmt.Errorf("failed to connect to D-Bus: %w", err)
+	}
+	return newDBusConn(conn)
+}
+
+// newDBusConn authenticates on conn and registers with the bus
+func newDBusConn(conn net.Conn) (*dbusConn, error) {
+	c := &dbusConn{conn: conn, r: bufio.NewReader(conn)}
+	_ = conn.SetDeadline(time.Now().Add(dbusTimeout))
+
+	if err := c.auth(); err != nil {
+		conn.Close()
+		return nil, err
+	}
+
+	replies, err := c.callAll([]dbusCall{{
+		dest:   "org.freedesktop.DBus",
+		path:   "/org/freedesktop/DBus",
+		iface:  "org.freedesktop.DBus",
+		member: "Hello",
+	}})
+	if err == nil {
+		err = replies[0].err
+	}
+	if err != nil {
+		conn.Close()
+		return nil, fmt.Errorf("D-Bus Hello failed: %w", err)
+	}
+	return c, nil
+}
+
+// auth performs EXTERNAL authentication with the current uid
+func (c *dbusConn) auth() error {
+	uid := hex.EncodeToString([]byte(strconv.Itoa(os.Getuid())))
+	if _, err := fmt.Fprintf(c.conn, "\x00AUTH EXTERNAL %s\r\n", uid); err != nil {
+		return fmt.Errorf("D-Bus authentication failed: %w", err)
+	}
+	line, err := c.r.ReadString('\n')
+	if err != nil {
+		return fmt.Errorf("D-Bus authentication failed: %w", err)
+	}
+	if !strings.HasPrefix(line, "OK ") {
+		return fmt.Errorf("D-Bus authentication rejected: %s", strings.TrimSpace(line))
+	}
+	if _, err := io.WriteString(c.conn, "BEGIN\r\n"); err != nil {
+		return fmt.Errorf("D-Bus authentication failed: %w", err)
+	}
+	return nil
+}
+
+// Close closes the connection
+func (c *dbusConn) Close() error {
+	return c.conn.Close()
+}
+
+// callAll sends calls in one write and returns their replies in order. The error is
+// only set when the connection failed; error replies are in the dbusReply.
+func (c *dbusConn) callAll(calls []dbusCall) ([]dbusReply, error) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	if len(calls) == 0 {
+		return nil, nil
+	}
+	_ = c.conn.SetDeadline(time.Now().Add(dbusTimeout))
+
+	var out bytes.Buffer
+	pending := make(map[uint32]int, len(calls))
+	for i, call := range calls {
+		c.serial++
+		msg, err := encodeCall(call, c.serial)
+		if err != nil {
+			return nil, err
+		}
+		out.Write(msg)
+		pending[c.serial] = i
+	}
+	if _, err := c.conn.Write(out.Bytes()); err != nil {
+		return nil, fmt.Errorf("D-Bus write failed: %w", err)
+	}
+
+	replies := make([]dbusReply, len(calls))
+	for len(pending) > 0 {
+		msg, err := readMessage(c.r)
+		if err != nil {
+			return nil, fmt.Errorf("D-Bus read failed: %w", err)
+		}
+		i, ok := pending[msg.replySerial]
+		if !ok || (msg.msgType != dbusMethodReturn && msg.msgType != dbusError) {
+			continue // Signals and unrelated messages
+		}
+		delete(pending, msg.replySerial)
+
+		if msg.msgType == dbusError {
+			dbusErr := &busError{Name: msg.errorName}
+			if len(msg.body) > 0 {
+				dbusErr.Message, _ = msg.body[0].(string)
+			}
+			replies[i].err = dbusErr
+			continue
+		}
+		replies[i].body = msg.body
+	}
+	return replies, nil
+}
+
+// encodeCall marshals a method call message
+func encodeCall(call dbusCall, serial uint32) ([]byte, error) {
+	fields := []interface{}{
+		[]interface{}{byte(dbusFieldPath), dbusVariant{"o", call.path}},
+		[]interface{}{byte(dbusFieldMember), dbusVariant{"s", call.member}},
+	}
+	if call.iface != "" {
+		fields = append(fields, []interface{}{byte(dbusFieldInterface), dbusVariant{"s", call.iface}})
+	}
+	if call.dest != "" {
+		fields = append(fields, []interface{}{byte(dbusFieldDestination), dbusVariant{"s", call.dest}})
+	}
+	msg, err := encodeMessage(dbusMethodCall, serial, fields, call.sig, call.args)
+	if err != nil {
+		return nil, fmt.Errorf("D-Bus call %s: %w", call.member, err)
+	}
+	return msg, nil
+}
+
+// encodeMessage marshals a message with the given header fields and body
+func encodeMessage(msgType byte, serial uint32, fields []interface{}, sig string, args []interface{}) ([]byte, error) {
+	types, err := splitSignature(sig)
+	if err != nil {
+		return nil, err
+	}
+	if len(types) != len(args) {
+		return nil, fmt.Errorf("signature %q does not match %d arguments", sig, len(args))
+	}
+
+	body := &dbusEncoder{}
+	for i, t := range types {
+		if err := body.value(t, args[i]); err != nil {
+			return nil, err
+		}
+	}
+
+	if sig != "" {
+		fields = append(fields, []interface{}{byte(dbusFieldSignature), dbusVariant{"g", sig}})
+	}
+
+	msg := &dbusEncoder{}
+	msg.buf = append(msg.buf, 'l', msgType, 0, 1)
+	msg.uint32(uint32(len(body.buf)))
+	msg.uint32(serial)
+	if err := msg.value("a(yv)", fields); err != nil {
+		return nil, err
+	}
+	msg.align(8)
+	return append(msg.buf, body.buf...), nil
+}
+
+// dbusMessage is a received message
+type dbusMessage struct {
+	msgType     byte
+	serial      uint32
+	member      string
+	replySerial uint32
+	errorName   string
+	body        []interface{}
+}
+
+// readMessage reads and decodes one message
+func readMessage(r io.Reader) (*dbusMessage, error) {
+	fixed := make([]byte, 16)
+	if _, err := io.ReadFull(r, fixed); err != nil {
+		return nil, err
+	}
+
+	var order binary.ByteOrder
+	switch fixed[0] {
+	case 'l':
+		order = binary.LittleEndian
+	case 'B':
+		order = binary.BigEndian
+	default:
+		return nil, fmt.Errorf("invalid D-Bus message endianness %q", fixed[0])
+	}
+
+	bodyLen := order.Uint32(fixed[4:8])
+	fieldsLen := order.Uint32(fixed[12:16])
+	headerLen := alignTo(16+int(fieldsLen), 8)
+	if uint64(headerLen)+uint64(bodyLen) > dbusMaxMessage {
+		return nil, fmt.Errorf("D-Bus message too large")
+	}
+
+	data := make([]byte, headerLen+int(bodyLen))
+	copy(data, fixed)
+	if _, err := io.ReadFull(r, data[16:]); err != nil {
+		return nil, err
+	}
+
+	d := &dbusDecoder{buf: data, pos: 12, order: order}
+	fieldsValue, err := d.value("a(yv)")
+	if err != nil {
+		return nil, fmt.Errorf("invalid D-Bus header: %w", err)
+	}
+
+	msg := &dbusMessage{msgType: fixed[1], serial: order.Uint32(fixed[8:12])}
+	bodySig := ""
+	for _, f := range fieldsValue.([]interface{}) {
+		field := f.([]interface{})
+		value := field[1].(dbusVariant).value
+		switch field[0].(byte) {
+		case dbusFieldMember:
+			msg.member, _ = value.(string)
+		case dbusFieldReplySerial:
+			msg.replySerial, _ = value.(uint32)
+		case dbusFieldErrorName:
+			msg.errorName, _ = value.(string)
+		case dbusFieldSignature:
+			bodySig, _ = value.(string)
+		}
+	}
+
+	types, err := splitSignature(bodySig)
+	if err != nil {
+		return nil, err
+	}
+	d.pos = headerLen
+	for _, t := range types {
+		v, err := d.value(t)
+		if err != nil {
+			return nil, fmt.Errorf("invalid D-Bus body: %w", err)
+		}
+		msg.body = append(msg.body, v)
+	}
+	return msg, nil
+}
+
+// alignTo rounds n up to a multiple of a
+func alignTo(n, a int) int {
+	return (n + a - 1) / a * a
+}
+
+// splitSignature splits a signature into single complete types
+func splitSignature(sig string) ([]string, error) {
+	var types []string
+	for len(sig) > 0 {
+		n, err := completeTypeLen(sig)
+		if err != nil {
+			return nil, err
+		}
+		types = append(types, sig[:n])
+		sig = sig[n:]
+	}
+	return types, nil
+}
+
+// completeTypeLen returns the length of the first complete type in sig
+func completeTypeLen(sig string) (int, error) {
+	if sig == "" {
+		return 0, fmt.Errorf("incomplete D-Bus signature")
+	}
+	switch sig[0] {
+	case 'y', 'b', 'n', 'q', 'i', 'u', 'x', 't', 'd', 's', 'o', 'g', 'v', 'h':
+		return 1, nil
+	case 'a':
+		n, err := completeTypeLen(sig[1:])
+		return n + 1, err
+	case '(', '{':
+		closing := byte(')')
+		if sig[0] == '{' {
+			closing = '}'
+		}
+		i := 1
+		for i < len(sig) && sig[i] != closing {
+			n, err := completeTypeLen(sig[i:])
+			if err != nil {
+				return 0, err
+			}
+			i += n
+		}
+		if i >= len(sig) {
+			return 0, fmt.Errorf("unterminated D-Bus signature %q", sig)
+		}
+		return i + 1, nil
+	default:
+		return 0, fmt.Errorf("unsupported D-Bus type %q", sig[0])
+	}
+}
+
+// typeAlignment returns the alignment of the type starting sig
+func typeAlignment(sig string) int {
+	switch sig[0] {
+	case 'y', 'g', 'v':
+		return 1
+	case 'n', 'q':
+		return 2
+	case 'x', 't', 'd', '(', '{':
+		return 8
+	default:
+		return 4
+	}
+}
+
+// dbusEncoder marshals values in little-endian wire format
+type dbusEncoder struct {
+	buf []byte
+}
+
+func (e *dbusEncoder) align(n int) {
+	for len(e.buf)%n != 0 {
+		e.buf = append(e.buf, 0)
+	}
+}
+
+func (e *dbusEncoder) uint32(v uint32) {
+	e.align(4)
+	e.buf = binary.LittleEndian.AppendUint32(e.buf, v)
+}
+
+// value marshals v as the single complete type t
+func (e *dbusEncoder) value(t string, v interface{}) error {
+	switch t[0] {
+	case 'y':
+		b, ok := v.(byte)
+		if !ok {
+			return fmt.Errorf("expected byte for %q, got %T", t, v)
+		}
+		e.buf = append(e.buf, b)
+	case 'b':
+		b, ok := v.(bool)
+		if !ok {
+			return fmt.Errorf("expected bool for %q, got %T", t, v)
+		}
+		value := uint32(0)
+		if b {
+			value = 1
+		}
+		e.uint32(value)
+	case 'i':
+		switch n := v.(type) {
+		case int32:
+			e.uint32(uint32(n))
+		case int:
+			e.uint32(uint32(int32(n)))
+		default:
+			return fmt.Errorf("expected int32 for %q, got %T", t, v)
+		}
+	case 'u':
+		n, ok := v.(uint32)
+		if !ok {
+			return fmt.Errorf("expected uint32 for %q, got %T", t, v)
+		}
+		e.uint32(n)
+	case 's', 'o':
+		s, ok := v.(string)
+		if !ok {
+			return fmt.Errorf("expected string for %q, got %T", t, v)
+		}
+		e.uint32(uint32(len(s)))
+		e.buf = append(e.buf, s...)
+		e.buf = append(e.buf, 0)
+	case 'g':
+		s, ok := v.(string)
+		if !ok || len(s) > 255 {
+			return fmt.Errorf("invalid signature value %v", v)
+		}
+		e.buf = append(e.buf, byte(len(s)))
+		e.buf = append(e.buf, s...)
+		e.buf = append(e.buf, 0)
+	case 'v':
+		variant, ok := v.(dbusVariant)
+		if !ok {
+			return fmt.Errorf("expected variant for %q, got %T", t, v)
+		}
+		if err := e.value("g", variant.sig); err != nil {
+			return err
+		}
+		return e.value(variant.sig, variant.value)
+	case 'a':
+		return e.array(t[1:], v)
+	case '(':
+		fields, ok := v.([]interface{})
+		if !ok {
+			return fmt.Errorf("expected struct for %q, got %T", t, v)
+		}
+		types, err := splitSignature(t[1 : len(t)-1])
+		if err != nil {
+			return err
+		}
+		if len(types) != len(fields) {
+			return fmt.Errorf("struct %q has %d fields, got %d", t, len(types), len(fields))
+		}
+		e.align(8)
+		for i, ft := range types {
+			if err := e.value(ft, fields[i]); err != nil {
+				return err
+			}
+		}
+	default:
+		return fmt.Errorf("cannot encode D-Bus type %q", t)
+	}
+	return nil
+}
+
+// array marshals an array of elem; v is []string or []interface{}
+func (e *dbusEncoder) array(elem string, v interface{}) error {
+	var items []interface{}
+	switch list := v.(type) {
+	case []string:
+		for _, s := range list {
+			items = append(items, s)
+		}
+	case []interface{}:
+		items = list
+	default:
+		return fmt.Errorf("expected array of %q, got %T", elem, v)
+	}
+
+	e.uint32(0) // Length placeholder
+	lengthAt := len(e.buf) - 4
+	e.align(typeAlignment(elem))
+	start := len(e.buf)
+	for _, item := range items {
+		if err := e.value(elem, item); err != nil {
+			return err
+		}
+	}
+	binary.LittleEndian.PutUint32(e.buf[lengthAt:], uint32(len(e.buf)-start))
+	return nil
+}
+
+// dbusDecoder unmarshals values; alignment is relative to the start of buf
+type dbusDecoder struct {
+	buf   []byte
+	pos   int
+	order binary.ByteOrder
+}
+
+var errDBusShort = errors.New("D-Bus message truncated")
+
+func (d *dbusDecoder) align(n int) error {
+	pos := alignTo(d.pos, n)
+	if pos > len(d.buf) {
+		return errDBusShort
+	}
+	d.pos = pos
+	return nil
+}
+
+func (d *dbusDecoder) take(n int) ([]byte, error) {
+	if n < 0 || d.pos+n > len(d.buf) {
+		return nil, errDBusShort
+	}
+	b := d.buf[d.pos : d.pos+n]
+	d.pos += n
+	return b, nil
+}
+
+func (d *dbusDecoder) uint32() (uint32, error) {
+	if err := d.align(4); err != nil {
+		return 0, err
+	}
+	b, err := d.take(4)
+	if err != nil {
+		return 0, err
+	}
+	return d.order.Uint32(b), nil
+}
+
+// value unmarshals the single complete type t. Integers decode to their Go type, strings,
+// object paths and signatures to string, arrays and structs to []interface{}, and
+// variants to dbusVariant.
+func (d *dbusDecoder) value(t string) (interface{}, error) {
+	switch t[0] {
+	case 'y':
+		b, err := d.take(1)
+		if err != nil {
+			return nil, err
+		}
+		return b[0], nil
+	case 'b':
+		n, err := d.uint32()
+		return n != 0, err
+	case 'i':
+		n, err := d.uint32()
+		return int32(n), err
+	case 'u':
+		return d.uint32()
+	case 'x', 't':
+		if err := d.align(8); err != nil {
+			return nil, err
+		}
+		b, err := d.take(8)
+		if err != nil {
+			return nil, err
+		}
+		if t[0] == 'x' {
+			return int64(d.order.Uint64(b)), nil
+		}
+		return d.order.Uint64(b), nil
+	case 's', 'o':
+		n, err := d.uint32()
+		if err != nil {
+			return nil, err
+		}
+		b, err := d.take(int(n) + 1)
+		if err != nil {
+			return nil, err
+		}
+		return string(b[:n]), nil
+	case 'g':
+		b, err := d.take(1)
+		if err != nil {
+			return nil, err
+		}
+		s, err := d.take(int(b[0]) + 1)
+		if err != nil {
+			return nil, err
+		}
+		return string(s[:b[0]]), nil
+	case 'v':
+		sig, err := d.value("g")
+		if err != nil {
+			return nil, err
+		}
+		if _, err := completeTypeLen(sig.(string)); err != nil {
+			return nil, err
+		}
+		v, err := d.value(sig.(string))
+		return dbusVariant{sig: sig.(string), value: v}, err
+	case 'a':
+		n, err := d.uint32()
+		if err != nil {
+			return nil, err
+		}
+		if err := d.align(typeAlignment(t[1:])); err != nil {
+			return nil, err
+		}
+		end := d.pos + int(n)
+		if end > len(d.buf) {
+			return nil, errDBusShort
+		}
+		items := []interface{}{}
+		for d.pos < end {
+			start := d.pos
+			item, err := d.value(t[1:])
+			if err != nil {
+				return nil, err
+			}
+			if d.pos == start {
+				return nil, fmt.Errorf("invalid D-Bus array of %q", t[1:])
+			}
+			items = append(items, item)
+		}
+		return items, nil
+	case '(', '{':
+		if err := d.align(8); err != nil {
+			return nil, err
+		}
+		types, err := splitSignature(t[1 : len(t)-1])
+		if err != nil {
+			return nil, err
+		}
+		fields := make([]interface{}, 0, len(types))
+		for _, ft := range types {
+			field, err := d.value(ft)
+			if err != nil {
+				return nil, err
+			}
+			fields = append(fields, field)
+		}
+		return fields, nil
+	default:
+		return nil, fmt.Errorf("cannot decode D-Bus type %q", t)
+	}
+}
+
+const (
+	firewalldName   = "org.fedoraproject.FirewallD1"
+	firewalldPath   = "/org/fedoraproject/FirewallD1"
+	firewalldDirect = firewalldName + ".direct"
+)
+
+// dbusFirewall manages firewalld direct rules over a single D-Bus connection.
+// A batch of rules is sent as pipelined calls. The connection is opened on first
+// use and reopened after it fails.
+type dbusFirewall struct {
+	mu      sync.Mutex
+	address string
+	conn    *dbusConn
+	dial    func(address string) (*dbusConn, error)
+}
+
+// newDBusFirewall creates a firewalld client for the bus at address
+func newDBusFirewall(address string) *dbusFirewall {
+	return &dbusFirewall{address: address, dial: dialBus}
+}
+
+// callAll runs calls on the shared connection, connecting first if needed
+func (f *dbusFirewall) callAll(calls []dbusCall) ([]dbusReply, error) {
+	f.mu.Lock()
+	defer f.mu.Unlock()
+
+	if f.conn == nil {
+		conn, err := f.dial(f.address)
+		if err != nil {
+			return nil, err
+		}
+		f.conn = conn
+	}
+
+	replies, err := f.conn.callAll(calls)
+	if err != nil {
+		f.conn.Close()
+		f.conn = nil
+	}
+	return replies, err
+}
+
+func (f *dbusFirewall) running() bool {
+	replies, err := f.callAll([]dbusCall{{
+		dest:   firewalldName,
+		path:   firewalldPath,
+		iface:  "org.freedesktop.DBus.Properties",
+		member: "Get",
+		sig:    "ss",
+		args:   []interface{}{firewalldName, "state"},
+	}})
+	if err != nil || replies[0].err != nil || len(replies[0].body) == 0 {
+		return false
+	}
+	state, _ := replies[0].body[0].(dbusVariant)
+	return state.value == "RUNNING"
+}
+
+func (f *dbusFirewall) addRules(rules ruleBatch) error {
+	return f.applyRules("addRule", rules)
+}
+
+func (f *dbusFirewall) removeRules(rules ruleBatch) error {
+	return f.applyRules("removeRule", rules)
+}
+
+// applyRules calls member (addRule or removeRule) for every rule in one batch
+func (f *dbusFirewall) applyRules(member string, rules ruleBatch) error {
+	calls := make([]dbusCall, len(rules))
+	for i, rule := range rules {
+		calls[i] = dbusCall{
+			dest:   firewalldName,
+			path:   firewalldPath,
+			iface:  firewalldDirect,
+			member: member,
+			sig:    "sssias",
+			args:   []interface{}{"ipv4", "filter", "FORWARD", int32(rule.Priority), rule.Args},
+		}
+	}
+
+	replies, err := f.callAll(calls)
+	if err != nil {
+		return err
+	}
+
+	var errs []error
+	for i, reply := range replies {
+		var dbusErr *busError
+		if errors.As(reply.err, &dbusErr) && ignoredFirewallError(dbusErr.Message) {
+			continue
+		}
+		if reply.err != nil {
+			errs = append(errs, fmt.Errorf("%s %s: %w", member, rules[i], reply.err))
+		}
+	}
+	return errors.Join(errs...)
+}
+
+func (f *dbusFirewall) listRules() ([]directRule, error) {
+	replies, err := f.callAll([]dbusCall{{
+		dest:   firewalldName,
+		path:   firewalldPath,
+		iface:  firewalldDirect,
+		member: "getAllRules",
+	}})
+	if err != nil {
+		return nil, err
+	}
+	if replies[0].err != nil {
+		return nil, fmt.Errorf("failed to list rules: %w", replies[0].err)
+	}
+	if len(replies[0].body) == 0 {
+		return nil, nil
+	}
+
+	// a(sssias): ipv, table, chain, priority, args
+	list, _ := replies[0].body[0].([]interface{})
+	var rules []directRule
+	for _, item := range list {
+		fields, ok := item.([]interface{})
+		if !ok || len(fields) != 5 {
+			continue
+		}
+		if fields[0] != "ipv4" || fields[1] != "filter" || fields[2] != "FORWARD" {
+			continue
+		}
+		priority, _ := fields[3].(int32)
+		rule := directRule{Priority: int(priority)}
+		args, _ := fields[4].([]interface{})
+		for _, arg := range args {
+			if s, ok := arg.(string); ok {
+				rule.Args = append(rule.Args, s)
+			}
+		}
+		rules = append(rules, rule)
+	}
+	return rules, nil
+}
@@ -0,0 +1,229 @@
+package network
+
+import (
+	"bufio"
+	"encoding/binary"
+	"net"
+	"path/filepath"
+	"reflect"
+	"strings"
+	"sync"
+	"sync/atomic"
+	"testing"
+)
+
+// fakeFirewalld is a D-Bus peer on a unix socket answering firewalld's direct API
+type fakeFirewalld struct {
+	address string
+	conns   int32
+
+	mu    sync.Mutex
+	rules []directRule
+}
+
+func newFakeFirewalld(t *testing.T) *fakeFirewalld {
+	t.Helper()
+	path := filepath.Join(t.TempDir(), "bus.sock")
+	listener, err := net.Listen("unix", path)
+	if err != nil {
+		t.Fatalf("failed to listen: %v", err)
+	}
+	t.Cleanup(func() { listener.Close() })
+
+	f := &fakeFirewalld{address: "unix:path=" + path}
+	go func() {
+		for {
+			conn, err := listener.Accept()
+			if err != nil {
+				return
+			}
+			atomic.AddInt32(&f.conns, 1)
+			go f.serve(conn)
+		}
+	}()
+	return f
+}
+
+func (f *fakeFirewalld) serve(conn net.Conn) {
+	defer conn.Close()
+	r := bufio.NewReader(conn)
+
+	if line, err := r.ReadString('\n'); err != nil || !strings.HasPrefix(line, "\x00AUTH EXTERNAL ") {
+		return
+	}
+	if _, err := conn.Write([]byte("OK 0123456789abcdef\r\n")); err != nil {
+		return
+	}
+	if line, err := r.ReadString('\n'); err != nil || line != "BEGIN\r\n" {
+		return
+	}
+
+	for {
+		msg, err := readMessage(r)
+		if err != nil {
+			return
+		}
+		reply := f.handle(msg)
+		if _, err := conn.Write(reply); err != nil {
+			return
+		}
+	}
+}
+
+// handle answers a method call
+func (f *fakeFirewalld) handle(msg *dbusMessage) []byte {
+	f.mu.Lock()
+	defer f.mu.Unlock()
+
+	ret := func(sig string, args ...interface{}) []byte {
+		fields := []interface{}{[]interface{}{byte(dbusFieldReplySerial), dbusVariant{"u", msg.serial}}}
+		data, _ := encodeMessage(dbusMethodReturn, 1000+msg.serial, fields, sig, args)
+		return data
+	}
+	fail := func(message string) []byte {
+		fields := []interface{}{
+			[]interface{}{byte(dbusFieldReplySerial), dbusVariant{"u", msg.serial}},
+			[]interface{}{byte(dbusFieldErrorName), dbusVariant{"s", firewalldName + ".Exception"}},
+		}
+		data, _ := encodeMessage(dbusError, 1000+msg.serial, fields, "s", []interface{}{message})
+		return data
+	}
+
+	switch msg.member {
+	case "Hello":
+		// A signal before the reply, as the bus sends NameAcquired
+		signal, _ := encodeMessage(4, 1, []interface{}{
+			[]interface{}{byte(dbusFieldPath), dbusVariant{"o", "/org/freedesktop/DBus"}},
+			[]interface{}{byte(dbusFieldMember), dbusVariant{"s", "NameAcquired"}},
+		}, "s", []interface{}{":1.42"})
+		return append(signal, ret("s", ":1.42")...)
+
+	case "Get":
+		return ret("v", dbusVariant{"s", "RUNNING"})
+
+	case "addRule", "removeRule":
+		rule := directRule{Priority: int(msg.body[3].(int32))}
+		for _, arg := range msg.body[4].([]interface{}) {
+			rule.Args = append(rule.Args, arg.(string))
+		}
+		for i, existing := range f.rules {
+			if existing.String() == rule.String() {
+				if msg.member == "addRule" {
+					return fail("ALREADY_ENABLED: rule exists")
+				}
+				f.rules = append(f.rules[:i], f.rules[i+1:]...)
+				return ret("")
+			}
+		}
+		if msg.member == "removeRule" {
+			return fail("NOT_ENABLED: no such rule")
+		}
+		f.rules = append(f.rules, rule)
+		return ret("")
+
+	case "getAllRules":
+		list := make([]interface{}, 0, len(f.rules)+1)
+		list = append(list, []interface{}{"ipv6", "filter", "FORWARD", int32(0), []string{"-j", "ACCEPT"}})
+		for _, rule := range f.rules {
+			list = append(list, []interface{}{"ipv4", "filter", "FORWARD", int32(rule.Priority), rule.Args})
+		}
+		return ret("a(sssias)", list)
+
+	default:
+		return fail("UNKNOWN_METHOD: " + msg.member)
+	}
+}
+
+func TestDBusFirewall(t *testing.T) {
+	bus := newFakeFirewalld(t)
+	backend := newDBusFirewall(bus.address)
+
+	if !backend.running() {
+		t.Fatal("running() = false, want true")
+	}
+
+	var rules ruleBatch
+	rules.add(0, "10.0.0.5", "10.0.0.1/32", "ACCEPT")
+	rules.add(99, "10.0.0.5", "0.0.0.0/0", "REJECT")
+	rules.add(0, "10.0.0.5", "10.0.0.1/32", "ACCEPT") // Already enabled is not an error
+	if err := backend.addRules(rules); err != nil {
+		t.Fatalf("addRules() unexpected error: %v", err)
+	}
+
+	listed, err := backend.listRules()
+	if err != nil {
+		t.Fatalf("listRules() unexpected error: %v", err)
+	}
+	if !reflect.DeepEqual(listed, []directRule(rules[:2])) {
+		t.Errorf("listRules() = %v, want %v", listed, rules[:2])
+	}
+
+	// Removing a missing rule is not an error either
+	if err := backend.removeRules(ruleBatch{rules[0], rules[0]}); err != nil {
+		t.Fatalf("removeRules() unexpected error: %v", err)
+	}
+	if listed, _ := backend.listRules(); len(listed) != 1 || listed[0].Priority != 99 {
+		t.Errorf("listRules() after remove = %v, want the default deny rule", listed)
+	}
+
+	if n := atomic.LoadInt32(&bus.conns); n != 1 {
+		t.Errorf("D-Bus connections = %d, want 1 shared connection", n)
+	}
+}
+
+func TestDBusFirewallUnreachable(t *testing.T) {
+	backend := newDBusFirewall("unix:path=" + filepath.Join(t.TempDir(), "missing.sock"))
+	if backend.running() {
+		t.Error("running() = true for a missing bus, want false")
+	}
+}
+
+func TestDBusValueRoundTrip(t *testing.T) {
+	value := []interface{}{
+		[]interface{}{"ipv4", "filter", "FORWARD", int32(-1), []interface{}{"-m", "conntrack"}},
+		[]interface{}{"ipv4", "filter", "FORWARD", int32(10), []interface{}{}},
+	}
+
+	e := &dbusEncoder{}
+	e.buf = append(e.buf, 1) // Misalign, so padding is exercised
+	if err := e.value("a(sssias)", value); err != nil {
+		t.Fatalf("encode unexpected error: %v", err)
+	}
+
+	d := &dbusDecoder{buf: e.buf, pos: 1, order: binary.LittleEndian}
+	got, err := d.value("a(sssias)")
+	if err != nil {
+		t.Fatalf("decode unexpected error: %v", err)
+	}
+	if !reflect.DeepEqual(got, value) {
+		t.Errorf("round trip = %v, want %v", got, value)
+	}
+	if d.pos != len(e.buf) {
+		t.Errorf("decoder consumed %d of %d bytes", d.pos, len(e.buf))
+	}
+}
+
+func TestSplitSignature(t *testing.T) {
+	types, err := splitSignature("sssias")
+	if err != nil || strings.Join(types, ",") != "s,s,s,i,as" {
+		t.Errorf("splitSignature(sssias) = %v, %v", types, err)
+	}
+	if types, err := splitSignature("a(yv)a{sv}"); err != nil || len(types) != 2 {
+		t.Errorf("splitSignature(a(yv)a{sv}) = %v, %v", types, err)
+	}
+	for _, sig := range []string{"(ss", "a", "z"} {
+		if _, err := splitSignature(sig); err == nil {
+			t.Errorf("splitSignature(%q) expected error", sig)
+		}
+	}
+}
+
+func TestBusSocketPath(t *testing.T) {
+	path, err := busSocketPath("unix:path=/run/dbus/system_bus_socket")
+	if err != nil || path != "/run/dbus/system_bus_socket" {
+		t.Errorf("busSocketPath() = %q, %v", path, err)
+	}
+	if _, err := busSocketPath("tcp:host=localhost,port=1234"); err == nil {
+		t.Error("busSocketPath(tcp) expected error")
+	}
+}
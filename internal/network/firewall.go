@@ -1,22 +1,29 @@
 package network
 
 import (
-	"encoding/json"
 	"fmt"
 	"log"
 	"os/exec"
 	"sort"
 	"strings"
+	"sync"
 	"time"
 
 	"github.com/mensfeld/code-on-incus/internal/config"
 	"github.com/mensfeld/code-on-incus/internal/container"
 )
 
+// allowedSetPrefix names the ipset holding a container's allowed IPs in allowlist mode
+const allowedSetPrefix = "coi-allow-"
+
 // FirewallManager manages firewalld direct rules for container network isolation
 type FirewallManager struct {
 	containerIP string
 	gatewayIP   string
+	allowedSet  string // ipset referenced by the allowlist rules, empty when one rule per IP is used
+
+	backend firewallBackend
+	ipset   func() bool // Whether allowed IPs can be kept in an ipset
 }
 
 // NewFirewallManager creates a new firewall manager for a container
@@ -24,134 +31,176 @@ func NewFirewallManager(containerIP, gatewayIP string) *FirewallManager {
 	return &FirewallManager{
 		containerIP: containerIP,
 		gatewayIP:   gatewayIP,
+		backend:     firewall(),
+		ipset:       IPSetAvailable,
 	}
 }
 
 // ApplyRestricted applies restricted mode rules (block RFC1918, allow internet)
 func (f *FirewallManager) ApplyRestricted(cfg *config.NetworkConfig) error {
 	// Ensure base rules for return traffic are in place
-	if err := EnsureBaseRules(); err != nil {
+	if err := ensureBaseRules(f.backend); err != nil {
 		log.Printf("Warning: failed to ensure base rules: %v", err)
 	}
 
+	var rules ruleBatch
+
 	// Priority 0: Allow gateway (for host communication)
 	if f.gatewayIP != "" {
-		if err := f.addRule(0, f.containerIP, f.gatewayIP+"/32", "ACCEPT"); err != nil {
-			return fmt.Errorf("failed to add gateway allow rule: %w", err)
-		}
+		rules.add(0, f.containerIP, f.gatewayIP+"/32", "ACCEPT")
 	}
 
 	// Handle local network access
 	if cfg.AllowLocalNetworkAccess {
 		// Allow all RFC1918 when local network access is enabled
-		if err := f.addRule(1, f.containerIP, "10.0.0.0/8", "ACCEPT"); err != nil {
-			return fmt.Errorf("failed to add RFC1918 allow rule: %w", err)
-		}
-		if err := f.addRule(1, f.containerIP, "172.16.0.0/12", "ACCEPT"); err != nil {
-			return fmt.Errorf("failed to add RFC1918 allow rule: %w", err)
-		}
-		if err := f.addRule(1, f.containerIP, "192.168.0.0/16", "ACCEPT"); err != nil {
-			return fmt.Errorf("failed to add RFC1918 allow rule: %w", err)
-		}
+		rules.add(1, f.containerIP, "10.0.0.0/8", "ACCEPT")
+		rules.add(1, f.containerIP, "172.16.0.0/12", "ACCEPT")
+		rules.add(1, f.containerIP, "192.168.0.0/16", "ACCEPT")
 	} else if cfg.BlockPrivateNetworks {
 		// Block RFC1918 ranges
-		if err := f.addRule(10, f.containerIP, "10.0.0.0/8", "REJECT"); err != nil {
-			return fmt.Errorf("failed to add RFC1918 block rule: %w", err)
-		}
-		if err := f.addRule(10, f.containerIP, "172.16.0.0/12", "REJECT"); err != nil {
-			return fmt.Errorf("failed to add RFC1918 block rule: %w", err)
-		}
-		if err := f.addRule(10, f.containerIP, "192.168.0.0/16", "REJECT"); err != nil {
-			return fmt.Errorf("failed to add RFC1918 block rule: %w", err)
-		}
+		rules.add(10, f.containerIP, "10.0.0.0/8", "REJECT")
+		rules.add(10, f.containerIP, "172.16.0.0/12", "REJECT")
+		rules.add(10, f.containerIP, "192.168.0.0/16", "REJECT")
 	}
 
 	// Block metadata endpoints
 	if cfg.BlockMetadataEndpoint {
-		if err := f.addRule(10, f.containerIP, "169.254.0.0/16", "REJECT"); err != nil {
-			return fmt.Errorf("failed to add metadata block rule: %w", err)
-		}
+		rules.add(10, f.containerIP, "169.254.0.0/16", "REJECT")
 	}
 
 	// Explicitly allow all other traffic (internet)
 	// Needed because FORWARD chain policy might be DROP with firewalld
-	if err := f.addRule(50, f.containerIP, "0.0.0.0/0", "ACCEPT"); err != nil {
-		return fmt.Errorf("failed to add default allow rule: %w", err)
-	}
+	rules.add(50, f.containerIP, "0.0.0.0/0", "ACCEPT")
 
+	if err := f.backend.addRules(rules); err != nil {
+		return fmt.Errorf("failed to add restricted mode rules: %w", err)
+	}
 	return nil
 }
 
 // ApplyAllowlist applies allowlist mode rules (allow specific IPs, block all else)
 func (f *FirewallManager) ApplyAllowlist(cfg *config.NetworkConfig, allowedIPs []string) error {
 	// Ensure base rules for return traffic are in place
-	if err := EnsureBaseRules(); err != nil {
+	if err := ensureBaseRules(f.backend); err != nil {
 		log.Printf("Warning: failed to ensure base rules: %v", err)
 	}
 
+	var rules ruleBatch
+
 	// Priority 0: Allow gateway (for host communication and DNS via dnsmasq)
 	// DNS works through the bridge's dnsmasq - no public DNS servers allowed
 	// to prevent DNS exfiltration attacks
 	if f.gatewayIP != "" {
-		if err := f.addRule(0, f.containerIP, f.gatewayIP+"/32", "ACCEPT"); err != nil {
-			return fmt.Errorf("failed to add gateway allow rule: %w", err)
-		}
+		rules.add(0, f.containerIP, f.gatewayIP+"/32", "ACCEPT")
 	}
 
 	// Handle local network access
 	if cfg.AllowLocalNetworkAccess {
 		// Allow all RFC1918 when local network access is enabled
-		if err := f.addRule(1, f.containerIP, "10.0.0.0/8", "ACCEPT"); err != nil {
-			return fmt.Errorf("failed to add RFC1918 allow rule: %w", err)
-		}
-		if err := f.addRule(1, f.containerIP, "172.16.0.0/12", "ACCEPT"); err != nil {
-			return fmt.Errorf("failed to add RFC1918 allow rule: %w", err)
-		}
-		if err := f.addRule(1, f.containerIP, "192.168.0.0/16", "ACCEPT"); err != nil {
-			return fmt.Errorf("failed to add RFC1918 allow rule: %w", err)
-		}
+		rules.add(1, f.containerIP, "10.0.0.0/8", "ACCEPT")
+		rules.add(1, f.containerIP, "172.16.0.0/12", "ACCEPT")
+		rules.add(1, f.containerIP, "192.168.0.0/16", "ACCEPT")
 	}
 
-	// Priority 1: Allow specific IPs (from resolved domains)
-	// Sort for deterministic ordering
-	sortedIPs := make([]string, len(allowedIPs))
-	copy(sortedIPs, allowedIPs)
-	sort.Strings(sortedIPs)
-
-	for _, ip := range sortedIPs {
-		dest := ip
-		if !strings.Contains(ip, "/") {
-			dest = ip + "/32"
+	// Priority 1: Allow specific IPs (from resolved domains).
+	// With ipset, a single rule matches the container's set of allowed IPs.
+	if f.ipset() {
+		setName := allowedSetName(f.containerIP)
+		if err := loadAllowedSet(setName, allowedIPs); err != nil {
+			return fmt.Errorf("failed to load allowed IPs: %w", err)
 		}
-		if err := f.addRule(1, f.containerIP, dest, "ACCEPT"); err != nil {
-			return fmt.Errorf("failed to add allowlist rule for %s: %w", ip, err)
+		f.allowedSet = setName
+		rules = append(rules, directRule{Priority: 1, Args: []string{
+			"-s", f.containerIP, "-m", "set", "--match-set", setName, "dst", "-j", "ACCEPT",
+		}})
+	} else {
+		// Sort for deterministic ordering
+		sortedIPs := make([]string, len(allowedIPs))
+		copy(sortedIPs, allowedIPs)
+		sort.Strings(sortedIPs)
+
+		for _, ip := range sortedIPs {
+			rules.add(1, f.containerIP, hostCIDR(ip), "ACCEPT")
 		}
 	}
 
 	// Block RFC1918 and metadata (unless local network access is enabled)
 	if !cfg.AllowLocalNetworkAccess {
-		if err := f.addRule(10, f.containerIP, "10.0.0.0/8", "REJECT"); err != nil {
-			return fmt.Errorf("failed to add RFC1918 block rule: %w", err)
-		}
-		if err := f.addRule(10, f.containerIP, "172.16.0.0/12", "REJECT"); err != nil {
-			return fmt.Errorf("failed to add RFC1918 block rule: %w", err)
-		}
-		if err := f.addRule(10, f.containerIP, "192.168.0.0/16", "REJECT"); err != nil {
-			return fmt.Errorf("failed to add RFC1918 block rule: %w", err)
-		}
-		if err := f.addRule(10, f.containerIP, "169.254.0.0/16", "REJECT"); err != nil {
-			return fmt.Errorf("failed to add metadata block rule: %w", err)
-		}
+		rules.add(10, f.containerIP, "10.0.0.0/8", "REJECT")
+		rules.add(10, f.containerIP, "172.16.0.0/12", "REJECT")
+		rules.add(10, f.containerIP, "192.168.0.0/16", "REJECT")
+		rules.add(10, f.containerIP, "169.254.0.0/16", "REJECT")
 	}
 
 	// Priority 99: Default deny for allowlist mode
-	if err := f.addRule(99, f.containerIP, "0.0.0.0/0", "REJECT"); err != nil {
-		return fmt.Errorf("failed to add default deny rule: %w", err)
-	}
+	rules.add(99, f.containerIP, "0.0.0.0/0", "REJECT")
 
+	if err := f.backend.addRules(rules); err != nil {
+		return fmt.Errorf("failed to add allowlist mode rules: %w", err)
+	}
 	return nil
 }
 
+// UpdateAllowlist moves rules applied by ApplyAllowlist from the previous allowed IPs to
+// allowedIPs, touching only the IPs that changed. New IPs are allowed before removed ones
+// are dropped, so the container never loses access to an IP that stays allowed.
+// With ipset the whole delta is applied in a single ipset call.
+func (f *FirewallManager) UpdateAllowlist(previous, allowedIPs []string) (added, removed int, err error) {
+	addIPs, removeIPs := diffIPs(previous, allowedIPs)
+	if len(addIPs) == 0 && len(removeIPs) == 0 {
+		return 0, 0, nil
+	}
+
+	if f.allowedSet != "" {
+		if err := restoreAllowedSet(allowedSetDeltaScript(f.allowedSet, addIPs, removeIPs)); err != nil {
+			return 0, 0, err
+		}
+		return len(addIPs), len(removeIPs), nil
+	}
+
+	var addRules, removeRules ruleBatch
+	for _, ip := range addIPs {
+		addRules.add(1, f.containerIP, hostCIDR(ip), "ACCEPT")
+	}
+	for _, ip := range removeIPs {
+		removeRules.add(1, f.containerIP, hostCIDR(ip), "ACCEPT")
+	}
+
+	if err := f.backend.addRules(addRules); err != nil {
+		return 0, 0, fmt.Errorf("failed to add allowlist rules: %w", err)
+	}
+	if err := f.backend.removeRules(removeRules); err != nil {
+		return len(addIPs), 0, fmt.Errorf("failed to remove allowlist rules: %w", err)
+	}
+	return len(addIPs), len(removeIPs), nil
+}
+
+// diffIPs returns the IPs only in current (added) and only in previous (removed), sorted
+func diffIPs(previous, current []string) (added, removed []string) {
+	inPrevious := make(map[string]bool, len(previous))
+	for _, ip := range previous {
+		inPrevious[ip] = true
+	}
+	inCurrent := make(map[string]bool, len(current))
+	for _, ip := range current {
+		inCurrent[ip] = true
+	}
+
+	for ip := range inCurrent {
+		if !inPrevious[ip] {
+			added = append(added, ip)
+		}
+	}
+	for ip := range inPrevious {
+		if !inCurrent[ip] {
+			removed = append(removed, ip)
+		}
+	}
+	sort.Strings(added)
+	sort.Strings(removed)
+	return added, removed
+}
+
 // RemoveRules removes all firewall rules for this container's IP
 func (f *FirewallManager) RemoveRules() error {
 	if f.containerIP == "" {
@@ -159,114 +208,155 @@ func (f *FirewallManager) RemoveRules() error {
 	}
 
 	// List all direct rules
-	rules, err := f.listDirectRules()
+	rules, err := f.backend.listRules()
 	if err != nil {
 		return fmt.Errorf("failed to list firewall rules: %w", err)
 	}
 
 	// Remove rules that match this container's IP
+	var matching ruleBatch
+	usesSet := false
 	for _, rule := range rules {
-		if strings.Contains(rule, f.containerIP) {
-			if err := f.removeRule(rule); err != nil {
-				log.Printf("Warning: failed to remove firewall rule: %v", err)
-			}
+		if rule.matchesSource(f.containerIP) {
+			usesSet = usesSet || rule.usesSet()
+			matching = append(matching, rule)
 		}
 	}
+	if err := f.backend.removeRules(matching); err != nil {
+		log.Printf("Warning: failed to remove firewall rules: %v", err)
+	}
 
-	return nil
-}
-
-// EnsureBaseRules adds the base rules needed for container networking
-// These rules allow return traffic and must be in place before container-specific rules
-func EnsureBaseRules() error {
-	// Add conntrack rule for return traffic via firewalld direct rules
-	// Priority -1 ensures this runs before all other rules (including our container rules at 0+)
-	cmd := exec.Command("sudo", "-n", "firewall-cmd", "--direct", "--add-rule",
-		"ipv4", "filter", "FORWARD", "-1",
-		"-m", "conntrack", "--ctstate", "RELATED,ESTABLISHED", "-j", "ACCEPT")
-	output, err := cmd.CombinedOutput()
-	if err != nil {
-		// Rule might already exist, that's OK
-		if !strings.Contains(string(output), "ALREADY_ENABLED") {
-			log.Printf("Warning: failed to add conntrack rule via firewalld: %s", strings.TrimSpace(string(output)))
+	// The allowed IPs set can only be destroyed once no rule references it
+	if usesSet || f.allowedSet != "" {
+		if err := destroyAllowedSet(allowedSetName(f.containerIP)); err != nil {
+			log.Printf("Warning: failed to remove allowed IPs set: %v", err)
 		}
+		f.allowedSet = ""
 	}
 
 	return nil
 }
 
-// EnsureOpenModeRules adds rules to allow all traffic for a container in open mode
-// This is needed because FORWARD chain policy may be DROP
-func EnsureOpenModeRules(containerIP string) error {
-	// Ensure base conntrack rule exists
-	if err := EnsureBaseRules(); err != nil {
-		log.Printf("Warning: failed to ensure base rules: %v", err)
+// hostCIDR returns ip as a CIDR, adding /32 to plain addresses
+func hostCIDR(ip string) string {
+	if strings.Contains(ip, "/") {
+		return ip
 	}
+	return ip + "/32"
+}
 
-	// Add ACCEPT rule for all traffic from this container
-	cmd := exec.Command("sudo", "-n", "firewall-cmd", "--direct", "--add-rule",
-		"ipv4", "filter", "FORWARD", "0",
-		"-s", containerIP, "-j", "ACCEPT")
-	output, err := cmd.CombinedOutput()
-	if err != nil {
-		if !strings.Contains(string(output), "ALREADY_ENABLED") {
-			return fmt.Errorf("failed to add open mode rule: %s: %w", strings.TrimSpace(string(output)), err)
-		}
+// allowedSetName returns the ipset name for a container's allowed IPs.
+// ipset names are limited to 31 characters, which fits the prefix, any IPv4 address and a suffix.
+func allowedSetName(containerIP string) string {
+	return allowedSetPrefix + strings.ReplaceAll(containerIP, ".", "-")
+}
+
+// allowedSetScript returns the `ipset restore` input that fills setName with ips.
+// The IPs are loaded into a temporary set which is then swapped in, so the
+// container never sees a partially filled set.
+func allowedSetScript(setName string, ips []string) string {
+	tmpName := setName + "-n"
+
+	sortedIPs := make([]string, len(ips))
+	copy(sortedIPs, ips)
+	sort.Strings(sortedIPs)
+
+	var b strings.Builder
+	fmt.Fprintf(&b, "create %s hash:net family inet\n", setName)
+	fmt.Fprintf(&b, "create %s hash:net family inet\n", tmpName)
+	fmt.Fprintf(&b, "flush %s\n", tmpName)
+	for _, ip := range sortedIPs {
+		fmt.Fprintf(&b, "add %s %s\n", tmpName, hostCIDR(ip))
 	}
+	fmt.Fprintf(&b, "swap %s %s\n", tmpName, setName)
+	fmt.Fprintf(&b, "destroy %s\n", tmpName)
+	return b.String()
+}
 
-	return nil
+// allowedSetDeltaScript returns the `ipset restore` input that adds and removes IPs of setName
+func allowedSetDeltaScript(setName string, added, removed []string) string {
+	var b strings.Builder
+	for _, ip := range added {
+		fmt.Fprintf(&b, "add %s %s\n", setName, hostCIDR(ip))
+	}
+	for _, ip := range removed {
+		fmt.Fprintf(&b, "del %s %s\n", setName, hostCIDR(ip))
+	}
+	return b.String()
 }
 
-// addRule adds a firewall direct rule using firewall-cmd
-func (f *FirewallManager) addRule(priority int, source, destination, action string) error {
-	// firewall-cmd --direct --add-rule ipv4 filter FORWARD <priority> -s <src> -d <dst> -j <action>
-	cmd := exec.Command("sudo", "-n", "firewall-cmd", "--direct", "--add-rule",
-		"ipv4", "filter", "FORWARD", fmt.Sprintf("%d", priority),
-		"-s", source, "-d", destination, "-j", action)
+// loadAllowedSet creates or atomically replaces the contents of setName in a single ipset call
+func loadAllowedSet(setName string, ips []string) error {
+	return restoreAllowedSet(allowedSetScript(setName, ips))
+}
 
+// restoreAllowedSet runs an `ipset restore` script in a single ipset call
+func restoreAllowedSet(script string) error {
+	cmd := exec.Command("sudo", "-n", "ipset", "-exist", "restore")
+	cmd.Stdin = strings.NewReader(script)
 	output, err := cmd.CombinedOutput()
 	if err != nil {
-		return fmt.Errorf("firewall-cmd failed: %s: %w", strings.TrimSpace(string(output)), err)
+		return fmt.Errorf("ipset restore failed: %s: %w", strings.TrimSpace(string(output)), err)
 	}
-
 	return nil
 }
 
-// listDirectRules lists all direct rules in the FORWARD chain
-func (f *FirewallManager) listDirectRules() ([]string, error) {
-	cmd := exec.Command("sudo", "-n", "firewall-cmd", "--direct", "--get-all-rules")
+// destroyAllowedSet removes setName; a set that does not exist is not an error
+func destroyAllowedSet(setName string) error {
+	cmd := exec.Command("sudo", "-n", "ipset", "destroy", setName)
 	output, err := cmd.CombinedOutput()
-	if err != nil {
-		return nil, fmt.Errorf("failed to list rules: %w", err)
+	if err != nil && !strings.Contains(string(output), "does not exist") {
+		return fmt.Errorf("ipset destroy failed: %s: %w", strings.TrimSpace(string(output)), err)
 	}
+	return nil
+}
 
-	var rules []string
-	for _, line := range strings.Split(string(output), "\n") {
-		line = strings.TrimSpace(line)
-		if line != "" && strings.Contains(line, "FORWARD") {
-			rules = append(rules, line)
-		}
-	}
+var (
+	ipsetOnce      sync.Once
+	ipsetSupported bool
+)
+
+// IPSetAvailable checks (once per process) whether ipset can be used via passwordless sudo.
+// Without it, allowlist mode falls back to one firewall rule per allowed IP.
+func IPSetAvailable() bool {
+	ipsetOnce.Do(func() {
+		ipsetSupported = exec.Command("sudo", "-n", "ipset", "list", "-n").Run() == nil
+	})
+	return ipsetSupported
+}
 
-	return rules, nil
+// EnsureBaseRules adds the base rules needed for container networking
+// These rules allow return traffic and must be in place before container-specific rules
+func EnsureBaseRules() error {
+	return ensureBaseRules(firewall())
 }
 
-// removeRule removes a specific firewall direct rule
-func (f *FirewallManager) removeRule(rule string) error {
-	// Parse rule: "ipv4 filter FORWARD 10 -s 10.47.62.50 -d 10.0.0.0/8 -j REJECT"
-	parts := strings.Fields(rule)
-	if len(parts) < 4 {
-		return fmt.Errorf("invalid rule format: %s", rule)
+// ensureBaseRules is EnsureBaseRules on a given backend
+func ensureBaseRules(backend firewallBackend) error {
+	// Add conntrack rule for return traffic via firewalld direct rules
+	// Priority -1 ensures this runs before all other rules (including our container rules at 0+)
+	rule := directRule{Priority: -1, Args: []string{
+		"-m", "conntrack", "--ctstate", "RELATED,ESTABLISHED", "-j", "ACCEPT",
+	}}
+	if err := backend.addRules(ruleBatch{rule}); err != nil {
+		log.Printf("Warning: failed to add conntrack rule via firewalld: %v", err)
 	}
 
-	// Build remove command
-	args := []string{"-n", "firewall-cmd", "--direct", "--remove-rule"}
-	args = append(args, parts...)
+	return nil
+}
+
+// EnsureOpenModeRules adds rules to allow all traffic for a container in open mode
+// This is needed because FORWARD chain policy may be DROP
+func EnsureOpenModeRules(containerIP string) error {
+	// Ensure base conntrack rule exists
+	if err := EnsureBaseRules(); err != nil {
+		log.Printf("Warning: failed to ensure base rules: %v", err)
+	}
 
-	cmd := exec.Command("sudo", args...)
-	output, err := cmd.CombinedOutput()
-	if err != nil {
-		return fmt.Errorf("failed to remove rule: %s: %w", strings.TrimSpace(string(output)), err)
+	// Add ACCEPT rule for all traffic from this container
+	rule := directRule{Priority: 0, Args: []string{"-s", containerIP, "-j", "ACCEPT"}}
+	if err := firewall().addRules(ruleBatch{rule}); err != nil {
+		return fmt.Errorf("failed to add open mode rule: %w", err)
 	}
 
 	return nil
@@ -287,9 +377,11 @@ func GetContainerIP(containerName string) (string, error) {
 		}
 		lastErr = err
 
-		// Wait before retrying
+		// Wait before retrying; drop the cached listing so the next
+		// attempt sees the address once DHCP assigns it
 		if i < maxRetries-1 {
 			time.Sleep(retryDelay)
+			container.InvalidateCache()
 		}
 	}
 
@@ -298,46 +390,31 @@ func GetContainerIP(containerName string) (string, error) {
 
 // getContainerIPOnce attempts to get the container IP once without retrying
 func getContainerIPOnce(containerName string) (string, error) {
-	output, err := container.IncusOutput("list", containerName, "--format=json")
+	instance, err := container.GetInstance(containerName)
 	if err != nil {
 		return "", fmt.Errorf("failed to get container info: %w", err)
 	}
 
-	var containers []struct {
-		Name  string `json:"name"`
-		State struct {
-			Network map[string]struct {
-				Addresses []struct {
-					Family  string `json:"family"`
-					Address string `json:"address"`
-				} `json:"addresses"`
-			} `json:"network"`
-		} `json:"state"`
-	}
-
-	if err := json.Unmarshal([]byte(output), &containers); err != nil {
-		return "", fmt.Errorf("failed to parse container info: %w", err)
-	}
-
-	for _, c := range containers {
-		if c.Name == containerName {
-			// Look for eth0 IPv4 address
-			if eth0, ok := c.State.Network["eth0"]; ok {
-				for _, addr := range eth0.Addresses {
-					if addr.Family == "inet" {
-						return addr.Address, nil
-					}
-				}
-			}
+	// Look for eth0 IPv4 address
+	if instance != nil {
+		if ip := instance.IPv4(); ip != "" {
+			return ip, nil
 		}
 	}
 
 	return "", fmt.Errorf("no IPv4 address found for container %s", containerName)
 }
 
-// FirewallAvailable checks if firewalld is available and running
+var (
+	firewallOnce      sync.Once
+	firewallAvailable bool
+)
+
+// FirewallAvailable checks if firewalld is available and running.
+// The result is determined once per process.
 func FirewallAvailable() bool {
-	cmd := exec.Command("sudo", "-n", "firewall-cmd", "--state")
-	err := cmd.Run()
-	return err == nil
+	firewallOnce.Do(func() {
+		firewallAvailable = firewall().running()
+	})
+	return firewallAvailable
 }
@@ -0,0 +1,73 @@
+package network
+
+import (
+	"strings"
+	"testing"
+)
+
+func TestAllowedSetName(t *testing.T) {
+	if got := allowedSetName("10.47.62.50"); got != "coi-allow-10-47-62-50" {
+		t.Errorf("allowedSetName() = %q, want %q", got, "coi-allow-10-47-62-50")
+	}
+
+	// ipset names are limited to 31 characters, including the temporary swap set
+	if got := allowedSetName("255.255.255.255") + "-n"; len(got) > 31 {
+		t.Errorf("allowedSetName() temporary set %q is %d characters, want at most 31", got, len(got))
+	}
+}
+
+func TestAllowedSetScript(t *testing.T) {
+	script := allowedSetScript("coi-allow-10-0-0-5", []string{"192.0.2.2", "192.0.2.1", "198.51.100.0/24"})
+
+	want := strings.Join([]string{
+		"create coi-allow-10-0-0-5 hash:net family inet",
+		"create coi-allow-10-0-0-5-n hash:net family inet",
+		"flush coi-allow-10-0-0-5-n",
+		"add coi-allow-10-0-0-5-n 192.0.2.1/32",
+		"add coi-allow-10-0-0-5-n 192.0.2.2/32",
+		"add coi-allow-10-0-0-5-n 198.51.100.0/24",
+		"swap coi-allow-10-0-0-5-n coi-allow-10-0-0-5",
+		"destroy coi-allow-10-0-0-5-n",
+	}, "\n") + "\n"
+
+	if script != want {
+		t.Errorf("allowedSetScript() =\n%s\nwant\n%s", script, want)
+	}
+}
+
+func TestDiffIPs(t *testing.T) {
+	added, removed := diffIPs(
+		[]string{"192.0.2.1", "192.0.2.2", "192.0.2.3"},
+		[]string{"192.0.2.3", "192.0.2.4", "192.0.2.2", "192.0.2.4"},
+	)
+
+	if strings.Join(added, ",") != "192.0.2.4" {
+		t.Errorf("diffIPs() added = %v, want [192.0.2.4]", added)
+	}
+	if strings.Join(removed, ",") != "192.0.2.1" {
+		t.Errorf("diffIPs() removed = %v, want [192.0.2.1]", removed)
+	}
+
+	if added, removed := diffIPs([]string{"192.0.2.1"}, []string{"192.0.2.1"}); len(added)+len(removed) != 0 {
+		t.Errorf("diffIPs() of equal lists = %v, %v, want no changes", added, removed)
+	}
+}
+
+func TestAllowedSetDeltaScript(t *testing.T) {
+	script := allowedSetDeltaScript("coi-allow-10-0-0-5", []string{"192.0.2.4"}, []string{"192.0.2.1"})
+
+	// New IPs are added before old ones are removed
+	want := "add coi-allow-10-0-0-5 192.0.2.4/32\ndel coi-allow-10-0-0-5 192.0.2.1/32\n"
+	if script != want {
+		t.Errorf("allowedSetDeltaScript() = %q, want %q", script, want)
+	}
+}
+
+func TestUpdateAllowlistWithoutChanges(t *testing.T) {
+	// No firewall call is made when the allowed IPs did not change
+	f := NewFirewallManager("10.0.0.5", "10.0.0.1")
+	added, removed, err := f.UpdateAllowlist([]string{"192.0.2.1", "192.0.2.2"}, []string{"192.0.2.2", "192.0.2.1"})
+	if err != nil || added != 0 || removed != 0 {
+		t.Errorf("UpdateAllowlist() = %d, %d, %v, want no changes", added, removed, err)
+	}
+}
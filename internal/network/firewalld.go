@@ -0,0 +1,157 @@
+package network
+
+import (
+	"errors"
+	"fmt"
+	"log"
+	"os"
+	"os/exec"
+	"strconv"
+	"strings"
+	"sync"
+)
+
+// directRule is a firewalld direct rule in the ipv4 filter FORWARD chain
+type directRule struct {
+	Priority int
+	Args     []string
+}
+
+// String formats the rule the way `firewall-cmd --direct --get-all-rules` lists it
+func (r directRule) String() string {
+	return strings.Join(append([]string{"ipv4", "filter", "FORWARD", strconv.Itoa(r.Priority)}, r.Args...), " ")
+}
+
+// matchesSource reports whether the rule matches traffic from ip (-s ip)
+func (r directRule) matchesSource(ip string) bool {
+	for i := 0; i+1 < len(r.Args); i++ {
+		if r.Args[i] == "-s" && (r.Args[i+1] == ip || r.Args[i+1] == ip+"/32") {
+			return true
+		}
+	}
+	return false
+}
+
+// usesSet reports whether the rule matches an ipset
+func (r directRule) usesSet() bool {
+	for _, arg := range r.Args {
+		if arg == "--match-set" {
+			return true
+		}
+	}
+	return false
+}
+
+// parseDirectRule parses a rule as listed by firewalld: "ipv4 filter FORWARD 10 -s ... -j REJECT".
+// ok is false for rules outside the ipv4 filter FORWARD chain.
+func parseDirectRule(line string) (directRule, bool) {
+	parts := strings.Fields(line)
+	if len(parts) < 4 || parts[0] != "ipv4" || parts[1] != "filter" || parts[2] != "FORWARD" {
+		return directRule{}, false
+	}
+	priority, err := strconv.Atoi(parts[3])
+	if err != nil {
+		return directRule{}, false
+	}
+	return directRule{Priority: priority, Args: parts[4:]}, true
+}
+
+// ruleBatch collects rules to be applied together
+type ruleBatch []directRule
+
+// add appends a rule for traffic from source to destination
+func (b *ruleBatch) add(priority int, source, destination, action string) {
+	*b = append(*b, directRule{Priority: priority, Args: []string{"-s", source, "-d", destination, "-j", action}})
+}
+
+// firewallBackend applies firewalld direct rules.
+// Adding a rule that exists or removing one that does not is not an error.
+type firewallBackend interface {
+	running() bool
+	addRules(rules ruleBatch) error
+	removeRules(rules ruleBatch) error
+	listRules() ([]directRule, error)
+}
+
+var (
+	firewallBackendOnce sync.Once
+	firewallBackendInst firewallBackend
+)
+
+// firewall returns the firewalld backend, chosen once per process.
+// firewall-cmd via sudo is the default. Set COI_FIREWALL_TRANSPORT=dbus to talk to
+// firewalld over the system D-Bus with one connection instead; this needs coi to be
+// authorized for firewalld's D-Bus API (root, or a polkit rule).
+func firewall() firewallBackend {
+	firewallBackendOnce.Do(func() {
+		firewallBackendInst = cmdFirewall{}
+		if os.Getenv("COI_FIREWALL_TRANSPORT") != "dbus" {
+			return
+		}
+
+		backend := newDBusFirewall(systemBusAddress())
+		if !backend.running() {
+			log.Println("Warning: firewalld is not reachable over D-Bus, using firewall-cmd")
+			return
+		}
+		firewallBackendInst = backend
+	})
+	return firewallBackendInst
+}
+
+// ignoredFirewallError reports whether a firewalld error only says the change was already made
+func ignoredFirewallError(message string) bool {
+	return strings.Contains(message, "ALREADY_ENABLED") || strings.Contains(message, "NOT_ENABLED")
+}
+
+// cmdFirewall runs `sudo -n firewall-cmd` for each operation
+type cmdFirewall struct{}
+
+func (cmdFirewall) running() bool {
+	return exec.Command("sudo", "-n", "firewall-cmd", "--state").Run() == nil
+}
+
+func (c cmdFirewall) addRules(rules ruleBatch) error {
+	for _, rule := range rules {
+		if err := c.run("--add-rule", rule); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+func (c cmdFirewall) removeRules(rules ruleBatch) error {
+	var errs []error
+	for _, rule := range rules {
+		if err := c.run("--remove-rule", rule); err != nil {
+			errs = append(errs, err)
+		}
+	}
+	return errors.Join(errs...)
+}
+
+// run applies a single --add-rule or --remove-rule
+func (cmdFirewall) run(op string, rule directRule) error {
+	// firewall-cmd --direct <op> ipv4 filter FORWARD <priority> <args>
+	args := append([]string{"-n", "firewall-cmd", "--direct", op}, strings.Fields(rule.String())...)
+	output, err := exec.Command("sudo", args...).CombinedOutput()
+	if err != nil && !ignoredFirewallError(string(output)) {
+		return fmt.Errorf("firewall-cmd failed: %s: %w", strings.TrimSpace(string(output)), err)
+	}
+	return nil
+}
+
+func (cmdFirewall) listRules() ([]directRule, error) {
+	output, err := exec.Command("sudo", "-n", "firewall-cmd", "--direct", "--get-all-rules").CombinedOutput()
+	if err != nil {
+		return nil, fmt.Errorf("failed to list rules: %w", err)
+	}
+
+	var rules []directRule
+	for _, line := range strings.Split(string(output), "\n") {
+		if rule, ok := parseDirectRule(line); ok {
+			rules = append(rules, rule)
+		}
+	}
+	return rules, nil
+}
@@ -0,0 +1,92 @@
+package network
+
+import (
+	"testing"
+
+	"github.com/mensfeld/code-on-incus/internal/config"
+)
+
+// fakeBackend records rules in memory
+type fakeBackend struct {
+	rules   []directRule
+	batches int
+}
+
+func (b *fakeBackend) running() bool { return true }
+
+func (b *fakeBackend) addRules(rules ruleBatch) error {
+	b.batches++
+	b.rules = append(b.rules, rules...)
+	return nil
+}
+
+func (b *fakeBackend) removeRules(rules ruleBatch) error {
+	b.batches++
+	for _, rule := range rules {
+		for i, existing := range b.rules {
+			if existing.String() == rule.String() {
+				b.rules = append(b.rules[:i], b.rules[i+1:]...)
+				break
+			}
+		}
+	}
+	return nil
+}
+
+func (b *fakeBackend) listRules() ([]directRule, error) {
+	return append([]directRule(nil), b.rules...), nil
+}
+
+func TestApplyAllowlistBatchesRules(t *testing.T) {
+	backend := &fakeBackend{}
+	f := &FirewallManager{containerIP: "10.0.0.5", gatewayIP: "10.0.0.1", backend: backend, ipset: func() bool { return false }}
+
+	if err := f.ApplyAllowlist(&config.NetworkConfig{}, []string{"192.0.2.2", "192.0.2.1"}); err != nil {
+		t.Fatalf("ApplyAllowlist() unexpected error: %v", err)
+	}
+
+	// Base rule, then one batch: gateway, 2 IPs, 4 blocks and the default deny
+	if backend.batches != 2 {
+		t.Errorf("ApplyAllowlist() used %d batches, want 2", backend.batches)
+	}
+	if len(backend.rules) != 9 {
+		t.Fatalf("ApplyAllowlist() added %d rules, want 9: %v", len(backend.rules), backend.rules)
+	}
+	if got := backend.rules[2].String(); got != "ipv4 filter FORWARD 1 -s 10.0.0.5 -d 192.0.2.1/32 -j ACCEPT" {
+		t.Errorf("first allowlist rule = %q", got)
+	}
+}
+
+func TestRemoveRulesMatchesContainerIP(t *testing.T) {
+	backend := &fakeBackend{}
+	var rules ruleBatch
+	rules.add(0, "10.0.0.5", "10.0.0.1/32", "ACCEPT")
+	rules.add(0, "10.0.0.50", "10.0.0.1/32", "ACCEPT")
+	rules.add(10, "10.0.0.5", "10.0.0.0/8", "REJECT")
+	backend.rules = rules
+
+	f := &FirewallManager{containerIP: "10.0.0.5", backend: backend}
+	if err := f.RemoveRules(); err != nil {
+		t.Fatalf("RemoveRules() unexpected error: %v", err)
+	}
+
+	if len(backend.rules) != 1 || !backend.rules[0].matchesSource("10.0.0.50") {
+		t.Errorf("RemoveRules() left %v, want only the rule of 10.0.0.50", backend.rules)
+	}
+}
+
+func TestParseDirectRule(t *testing.T) {
+	rule, ok := parseDirectRule("ipv4 filter FORWARD -1 -m conntrack --ctstate RELATED,ESTABLISHED -j ACCEPT")
+	if !ok || rule.Priority != -1 || len(rule.Args) != 6 {
+		t.Errorf("parseDirectRule() = %+v, %v", rule, ok)
+	}
+	if got := rule.String(); got != "ipv4 filter FORWARD -1 -m conntrack --ctstate RELATED,ESTABLISHED -j ACCEPT" {
+		t.Errorf("String() = %q", got)
+	}
+
+	for _, line := range []string{"", "ipv6 filter FORWARD 0 -j ACCEPT", "ipv4 filter INPUT 0 -j ACCEPT", "ipv4 filter FORWARD x"} {
+		if _, ok := parseDirectRule(line); ok {
+			t.Errorf("parseDirectRule(%q) ok, want skipped", line)
+		}
+	}
+}
@@ -0,0 +1,45 @@
+package network
+
+import (
+	"errors"
+	"os"
+	"path/filepath"
+	"syscall"
+)
+
+// lockFile takes an exclusive advisory lock on path (created if missing), blocking until
+// it is available. The lock is released by the returned function or when the process exits.
+func lockFile(path string) (func(), error) {
+	release, _, err := flock(path, syscall.LOCK_EX)
+	return release, err
+}
+
+// tryLockFile is lockFile without blocking: ok is false if another holder has the lock
+func tryLockFile(path string) (release func(), ok bool, err error) {
+	return flock(path, syscall.LOCK_EX|syscall.LOCK_NB)
+}
+
+// flock opens path and applies how to it
+func flock(path string, how int) (func(), bool, error) {
+	if err := os.MkdirAll(filepath.Dir(path), 0o755); err != nil {
+		return nil, false, err
+	}
+
+	f, err := os.OpenFile(path, os.O_CREATE|os.O_RDWR, 0o644)
+	if err != nil {
+		return nil, false, err
+	}
+
+	if err := syscall.Flock(int(f.Fd()), how); err != nil {
+		f.Close()
+		if errors.Is(err, syscall.EWOULDBLOCK) {
+			return nil, false, nil
+		}
+		return nil, false, err
+	}
+
+	return func() {
+		_ = syscall.Flock(int(f.Fd()), syscall.LOCK_UN)
+		f.Close()
+	}, true, nil
+}
@@ -6,6 +6,7 @@ import (
 	"log"
 	"net"
 	"os"
+	"path/filepath"
 	"strings"
 	"time"
 
@@ -38,6 +39,9 @@ type Manager struct {
 	// Refresher lifecycle (for allowlist mode)
 	refreshCtx    context.Context
 	refreshCancel context.CancelFunc
+
+	// viewFirewall returns the firewall manager for the rules recorded in a container's view
+	viewFirewall func(containerIP, allowedSet string) *FirewallManager
 }
 
 // NewManager creates a new network manager with the specified configuration
@@ -50,6 +54,11 @@ func NewManager(cfg *config.NetworkConfig) *Manager {
 	return &Manager{
 		config:       cfg,
 		cacheManager: NewCacheManager(homeDir),
+		viewFirewall: func(containerIP, allowedSet string) *FirewallManager {
+			f := NewFirewallManager(containerIP, "")
+			f.allowedSet = allowedSet
+			return f
+		},
 	}
 }
 
@@ -167,8 +176,8 @@ func (m *Manager) setupAllowlist(ctx context.Context, containerName string) erro
 	// Create firewall manager
 	m.firewall = NewFirewallManager(containerIP, gatewayIP)
 
-	// Load IP cache
-	cache, err := m.cacheManager.Load(containerName)
+	// Load the host-wide IP cache, shared with every other container
+	cache, err := m.cacheManager.LoadShared()
 	if err != nil {
 		log.Printf("Warning: Failed to load cache: %v", err)
 		cache = &IPCache{
@@ -180,8 +189,9 @@ func (m *Manager) setupAllowlist(ctx context.Context, containerName string) erro
 	// Initialize resolver with cache
 	m.resolver = NewResolver(cache)
 
-	// Resolve domains
-	log.Printf("Resolving %d allowed domains...", len(m.config.AllowedDomains))
+	// Resolve domains (unexpired cached IPs are used as-is and refreshed in the background)
+	fromCache := m.resolver.FreshDomains(m.config.AllowedDomains)
+	log.Printf("Resolving %d allowed domains (%d cached)...", len(m.config.AllowedDomains), fromCache)
 	domainIPs, err := m.resolver.ResolveAll(m.config.AllowedDomains)
 	if err != nil && len(domainIPs) == 0 {
 		return fmt.Errorf("failed to resolve any allowed domains: %w", err)
@@ -194,11 +204,9 @@ func (m *Manager) setupAllowlist(ctx context.Context, containerName string) erro
 		log.Printf("  %s -> %d IPs", domain, len(ips))
 	}
 
-	// Save resolved IPs to cache
+	// Save resolved IPs to the shared cache
 	m.resolver.UpdateCache(domainIPs)
-	if err := m.cacheManager.Save(containerName, m.resolver.GetCache()); err != nil {
-		log.Printf("Warning: Failed to save cache: %v", err)
-	}
+	m.syncSharedCache()
 
 	// Collect all unique IPs from resolved domains
 	allowedIPs := collectUniqueIPs(domainIPs)
@@ -207,6 +215,7 @@ func (m *Manager) setupAllowlist(ctx context.Context, containerName string) erro
 	if err := m.firewall.ApplyAllowlist(m.config, allowedIPs); err != nil {
 		return fmt.Errorf("failed to apply firewall rules: %w", err)
 	}
+	m.saveApplied(domainIPs)
 
 	log.Printf("Firewall rules applied for container %s", containerName)
 	log.Println("  Allowing only specified domains")
@@ -214,7 +223,7 @@ func (m *Manager) setupAllowlist(ctx context.Context, containerName string) erro
 	log.Println("  Blocking cloud metadata endpoints")
 
 	// Start background refresher
-	m.startRefresher(ctx)
+	m.startRefresher(ctx, fromCache > 0)
 
 	return nil
 }
@@ -235,40 +244,123 @@ func collectUniqueIPs(domainIPs map[string][]string) []string {
 	return result
 }
 
-// startRefresher starts the background IP refresh goroutine
-func (m *Manager) startRefresher(ctx context.Context) {
+// syncSharedCache merges the resolver's cache into the host-wide cache and continues
+// from the merged result, which includes what other containers resolved meanwhile
+func (m *Manager) syncSharedCache() {
+	merged, err := m.cacheManager.MergeShared(m.resolver.GetCache())
+	if err != nil {
+		log.Printf("Warning: Failed to save cache: %v", err)
+		return
+	}
+	m.resolver.SetCache(merged)
+}
+
+// saveApplied records the IPs applied to this container's rules, and what the refresher
+// needs to update them. Domains that did not resolve are kept without IPs, so the
+// refresher still resolves them.
+func (m *Manager) saveApplied(domainIPs map[string][]string) {
+	view := &IPCache{
+		Domains:     make(map[string][]string, len(m.config.AllowedDomains)),
+		LastUpdate:  time.Now(),
+		ContainerIP: m.containerIP,
+		AllowedSet:  m.firewall.allowedSet,
+	}
+	for _, domain := range m.config.AllowedDomains {
+		view.Domains[domain] = domainIPs[domain]
+	}
+	for domain, ips := range domainIPs {
+		view.Domains[domain] = ips
+	}
+	if err := m.cacheManager.Save(m.containerName, view); err != nil {
+		log.Printf("Warning: Failed to save cache: %v", err)
+	}
+}
+
+// startRefresher starts the host-wide IP refresher, unless another session runs it.
+// With refreshNow, this container's rules were built from cached IPs, so its domains
+// are re-resolved once right away.
+//
+// Only one refresher runs on the host: the session holding the refresher lock
+// re-resolves the domains of every container into the shared cache and updates the
+// rules of every container from its view. The other sessions start no ticker; they
+// wait for the lock, and the first to get it takes over when its holder exits.
+func (m *Manager) startRefresher(ctx context.Context, refreshNow bool) {
 	if m.config.RefreshIntervalMinutes <= 0 {
 		log.Println("IP refresh disabled (refresh_interval_minutes <= 0)")
 		return
 	}
 
 	m.refreshCtx, m.refreshCancel = context.WithCancel(ctx)
-
+	refreshCtx := m.refreshCtx
 	interval := time.Duration(m.config.RefreshIntervalMinutes) * time.Minute
-	ticker := time.NewTicker(interval)
 
-	log.Printf("Starting IP refresh every %d minutes", m.config.RefreshIntervalMinutes)
+	release, ok, err := m.cacheManager.TryRefresherLock()
+	if err != nil {
+		log.Printf("Warning: Failed to take refresher lock: %v", err)
+		return
+	}
+	if ok {
+		log.Printf("Starting IP refresh every %d minutes for all containers", m.config.RefreshIntervalMinutes)
+		go m.runRefresher(refreshCtx, release, interval, refreshNow)
+		return
+	}
 
+	log.Println("IP refresh: handled by the refresher of another session")
 	go func() {
-		defer ticker.Stop()
-
-		for {
-			select {
-			case <-ticker.C:
-				log.Println("IP refresh: checking for updated IPs...")
-				if err := m.refreshAllowedIPs(); err != nil {
-					log.Printf("Warning: IP refresh failed: %v", err)
-				}
-
-			case <-m.refreshCtx.Done():
-				log.Println("IP refresher stopped")
-				return
+		if refreshNow {
+			log.Println("IP refresh: re-resolving domains served from cache...")
+			if err := m.refreshOwn(); err != nil {
+				log.Printf("Warning: IP refresh failed: %v", err)
 			}
 		}
+
+		// Blocks until the current refresher exits. The wait cannot be cancelled,
+		// so a lock obtained after this session was torn down is released right away.
+		release, err := m.cacheManager.WaitRefresherLock()
+		if err != nil {
+			log.Printf("Warning: Failed to take refresher lock: %v", err)
+			return
+		}
+		if refreshCtx.Err() != nil {
+			release()
+			return
+		}
+		log.Println("IP refresh: taking over refreshing for all containers")
+		m.runRefresher(refreshCtx, release, interval, false)
 	}()
 }
 
-// stopRefresher stops the background refresher goroutine
+// runRefresher refreshes every container on each tick until ctx is done, then
+// releases the refresher lock
+func (m *Manager) runRefresher(ctx context.Context, release func(), interval time.Duration, refreshNow bool) {
+	defer release()
+
+	ticker := time.NewTicker(interval)
+	defer ticker.Stop()
+
+	if refreshNow {
+		log.Println("IP refresh: re-resolving domains served from cache...")
+		if err := m.refreshAll(); err != nil {
+			log.Printf("Warning: IP refresh failed: %v", err)
+		}
+	}
+
+	for {
+		select {
+		case <-ticker.C:
+			log.Println("IP refresh: checking for updated IPs...")
+			if err := m.refreshAll(); err != nil {
+				log.Printf("Warning: IP refresh failed: %v", err)
+			}
+
+		case <-ctx.Done():
+			log.Println("IP refresher stopped")
+			return
+		}
+	}
+}
+
+// stopRefresher stops the background refresher, releasing the refresher lock if held
 func (m *Manager) stopRefresher() {
 	if m.refreshCancel != nil {
 		m.refreshCancel()
@@ -276,44 +368,128 @@ func (m *Manager) stopRefresher() {
 	}
 }
 
-// refreshAllowedIPs refreshes domain IPs and updates firewall rules if changed
-func (m *Manager) refreshAllowedIPs() error {
-	// Resolve all domains again
-	newIPs, err := m.resolver.ResolveAll(m.config.AllowedDomains)
-	if err != nil && len(newIPs) == 0 {
+// refreshAll re-resolves the domains of every container into the shared cache and
+// updates the rules of every container whose IPs changed
+func (m *Manager) refreshAll() error {
+	domains, err := m.cacheManager.ContainerDomains()
+	if err != nil {
+		log.Printf("Warning: Failed to list container domains: %v", err)
+	}
+	domains = append(domains, m.config.AllowedDomains...)
+
+	resolved, err := m.resolver.RefreshAll(domains)
+	if err != nil && len(resolved) == 0 {
+		return fmt.Errorf("failed to resolve any domains")
+	}
+	m.resolver.UpdateCache(resolved)
+	m.syncSharedCache()
+
+	names, err := m.cacheManager.Containers()
+	if err != nil {
+		return fmt.Errorf("failed to list containers: %w", err)
+	}
+	for _, name := range names {
+		if err := m.refreshContainer(name); err != nil {
+			log.Printf("Warning: IP refresh of %s failed: %v", name, err)
+		}
+	}
+	return nil
+}
+
+// refreshOwn re-resolves this container's domains once and updates its rules
+func (m *Manager) refreshOwn() error {
+	resolved, err := m.resolver.RefreshAll(m.config.AllowedDomains)
+	if err != nil && len(resolved) == 0 {
 		return fmt.Errorf("failed to resolve any domains")
 	}
+	m.resolver.UpdateCache(resolved)
+	m.syncSharedCache()
+	return m.refreshContainer(m.containerName)
+}
 
-	// Check if anything changed
-	if m.resolver.IPsUnchanged(newIPs) {
-		log.Println("IP refresh: no changes detected")
-		return nil
+// refreshContainer moves a container's rules to the IPs its domains have in the resolver
+// cache, touching only the IPs that changed. Domains without cached IPs keep the IPs
+// applied to them. A container torn down meanwhile (its view is gone) is skipped.
+func (m *Manager) refreshContainer(containerName string) error {
+	unlock, err := m.cacheManager.LockContainer(containerName)
+	if err != nil {
+		return fmt.Errorf("failed to lock cache: %w", err)
 	}
+	defer unlock()
 
-	// Update firewall rules with new IPs
-	totalIPs := countIPs(newIPs)
-	log.Printf("IP refresh: updating firewall with %d IPs", totalIPs)
+	view, err := m.cacheManager.Load(containerName)
+	if err != nil {
+		return err
+	}
+	if view.ContainerIP == "" {
+		// Torn down, or recorded by a version that did not save the container IP
+		return nil
+	}
 
-	// Remove old rules and apply new ones
-	if err := m.firewall.RemoveRules(); err != nil {
-		log.Printf("Warning: failed to remove old rules: %v", err)
+	domains := make([]string, 0, len(view.Domains))
+	for domain := range view.Domains {
+		domains = append(domains, domain)
+	}
+	newIPs, missing := m.resolver.Cached(domains)
+	for _, domain := range missing {
+		newIPs[domain] = view.Domains[domain]
 	}
 
+	// Check if anything changed
 	allowedIPs := collectUniqueIPs(newIPs)
-	if err := m.firewall.ApplyAllowlist(m.config, allowedIPs); err != nil {
+	if domainIPsEqual(newIPs, view.Domains) {
+		log.Printf("IP refresh: no changes detected for %s", containerName)
+		m.logNetwork("refresh container=%s added=0 removed=0 total=%d", containerName, len(allowedIPs))
+		return nil
+	}
+
+	// Apply only the IPs that changed
+	start := time.Now()
+	f := m.viewFirewall(view.ContainerIP, view.AllowedSet)
+	added, removed, err := f.UpdateAllowlist(collectUniqueIPs(view.Domains), allowedIPs)
+	duration := time.Since(start)
+	if err != nil {
+		m.logNetwork("refresh container=%s failed added=%d removed=%d duration=%s: %v",
+			containerName, added, removed, duration.Round(time.Millisecond), err)
 		return fmt.Errorf("failed to update firewall rules: %w", err)
 	}
 
-	// Update cache
-	m.resolver.UpdateCache(newIPs)
-	if err := m.cacheManager.Save(m.containerName, m.resolver.GetCache()); err != nil {
+	view.Domains = newIPs
+	view.LastUpdate = time.Now()
+	if err := m.cacheManager.Save(containerName, view); err != nil {
 		log.Printf("Warning: Failed to save cache: %v", err)
 	}
 
-	log.Printf("IP refresh: successfully updated firewall rules")
+	log.Printf("IP refresh: %s: %d IPs added, %d removed in %s", containerName, added, removed, duration.Round(time.Millisecond))
+	m.logNetwork("refresh container=%s added=%d removed=%d total=%d duration=%s",
+		containerName, added, removed, len(allowedIPs), duration.Round(time.Millisecond))
 	return nil
 }
 
+// logNetwork appends a timestamped line to the network log, if enabled
+func (m *Manager) logNetwork(format string, args ...interface{}) {
+	logging := m.config.Logging
+	if !logging.Enabled || logging.Path == "" {
+		return
+	}
+
+	if err := os.MkdirAll(filepath.Dir(logging.Path), 0o755); err != nil {
+		log.Printf("Warning: Failed to write network log: %v", err)
+		return
+	}
+	f, err := os.OpenFile(logging.Path, os.O_CREATE|os.O_WRONLY|os.O_APPEND, 0o644)
+	if err != nil {
+		log.Printf("Warning: Failed to write network log: %v", err)
+		return
+	}
+	defer f.Close()
+
+	line := fmt.Sprintf(format, args...)
+	if _, err := fmt.Fprintf(f, "%s %s\n", time.Now().Format(time.RFC3339), line); err != nil {
+		log.Printf("Warning: Failed to write network log: %v", err)
+	}
+}
+
 // countIPs counts total IPs across all domains
 func countIPs(domainIPs map[string][]string) int {
 	count := 0
@@ -333,6 +509,19 @@ func (m *Manager) Teardown(ctx context.Context, containerName string) error {
 		return nil
 	}
 
+	// Drop the container's view first (resolved IPs stay in the shared cache), under its
+	// lock, so the refresher cannot update rules that are being removed
+	if m.config.Mode == config.NetworkModeAllowlist {
+		if unlock, err := m.cacheManager.LockContainer(containerName); err != nil {
+			log.Printf("Warning: Failed to lock cache: %v", err)
+		} else {
+			defer unlock()
+		}
+		if err := m.cacheManager.Delete(containerName); err != nil {
+			log.Printf("Warning: Failed to delete cache: %v", err)
+		}
+	}
+
 	// Remove firewall rules
 	if m.firewall != nil {
 		if err := m.firewall.RemoveRules(); err != nil {
@@ -0,0 +1,116 @@
+package network
+
+import (
+	"os"
+	"path/filepath"
+	"reflect"
+	"strings"
+	"testing"
+
+	"github.com/mensfeld/code-on-incus/internal/config"
+)
+
+func TestLogNetwork(t *testing.T) {
+	path := filepath.Join(t.TempDir(), "logs", "network.log")
+	m := NewManager(&config.NetworkConfig{
+		Logging: config.NetworkLoggingConfig{Enabled: true, Path: path},
+	})
+
+	m.logNetwork("refresh container=%s added=%d removed=%d", "coi-abcd1234-1", 2, 1)
+	m.logNetwork("refresh container=%s added=%d removed=%d", "coi-abcd1234-1", 0, 0)
+
+	data, err := os.ReadFile(path)
+	if err != nil {
+		t.Fatalf("network log not written: %v", err)
+	}
+	lines := strings.Split(strings.TrimSpace(string(data)), "\n")
+	if len(lines) != 2 || !strings.HasSuffix(lines[0], "refresh container=coi-abcd1234-1 added=2 removed=1") {
+		t.Errorf("network log = %q, want two refresh lines", string(data))
+	}
+
+	// Disabled logging writes nothing
+	disabled := filepath.Join(t.TempDir(), "network.log")
+	m = NewManager(&config.NetworkConfig{Logging: config.NetworkLoggingConfig{Path: disabled}})
+	m.logNetwork("refresh")
+	if _, err := os.Stat(disabled); !os.IsNotExist(err) {
+		t.Errorf("disabled network log was written")
+	}
+}
+
+func TestRefreshAllUpdatesEveryContainer(t *testing.T) {
+	backend := &fakeBackend{}
+	var rules ruleBatch
+	rules.add(1, "10.0.0.5", "192.0.2.9/32", "ACCEPT")
+	rules.add(1, "10.0.0.6", "192.0.2.2/32", "ACCEPT")
+	backend.rules = rules
+
+	cm := NewCacheManager(t.TempDir())
+	m := &Manager{
+		config:       &config.NetworkConfig{},
+		cacheManager: cm,
+		resolver:     NewResolver(&IPCache{Domains: make(map[string][]string)}),
+		viewFirewall: func(containerIP, allowedSet string) *FirewallManager {
+			return &FirewallManager{containerIP: containerIP, allowedSet: allowedSet, backend: backend}
+		},
+	}
+
+	// Raw IPv4 "domains" resolve to themselves: the first container's IP changed,
+	// the second one's did not, and the third view predates recorded container IPs
+	views := map[string]*IPCache{
+		"coi-abcd1234-1": {ContainerIP: "10.0.0.5", Domains: map[string][]string{"192.0.2.1": {"192.0.2.9"}}},
+		"coi-abcd1234-2": {ContainerIP: "10.0.0.6", Domains: map[string][]string{"192.0.2.2": {"192.0.2.2"}}},
+		"coi-abcd1234-3": {Domains: map[string][]string{"192.0.2.3": {"192.0.2.8"}}},
+	}
+	for name, view := range views {
+		if err := cm.Save(name, view); err != nil {
+			t.Fatalf("Save() unexpected error: %v", err)
+		}
+	}
+
+	if err := m.refreshAll(); err != nil {
+		t.Fatalf("refreshAll() unexpected error: %v", err)
+	}
+
+	var got []string
+	for _, rule := range backend.rules {
+		got = append(got, rule.String())
+	}
+	want := []string{
+		"ipv4 filter FORWARD 1 -s 10.0.0.6 -d 192.0.2.2/32 -j ACCEPT",
+		"ipv4 filter FORWARD 1 -s 10.0.0.5 -d 192.0.2.1/32 -j ACCEPT",
+	}
+	if !reflect.DeepEqual(got, want) {
+		t.Errorf("rules after refreshAll() = %v, want %v", got, want)
+	}
+
+	view, err := cm.Load("coi-abcd1234-1")
+	if err != nil || !reflect.DeepEqual(view.Domains["192.0.2.1"], []string{"192.0.2.1"}) {
+		t.Errorf("view after refreshAll() = %v, %v, want the refreshed IPs", view, err)
+	}
+
+	// Every domain of every container went into the shared cache
+	shared, err := cm.LoadShared()
+	if err != nil || len(shared.Domains) != 3 {
+		t.Errorf("shared cache after refreshAll() = %v, %v, want 3 domains", shared, err)
+	}
+}
+
+func TestRefreshContainerSkipsTornDown(t *testing.T) {
+	backend := &fakeBackend{}
+	m := &Manager{
+		config:       &config.NetworkConfig{},
+		cacheManager: NewCacheManager(t.TempDir()),
+		resolver:     NewResolver(&IPCache{Domains: map[string][]string{"192.0.2.1": {"192.0.2.1"}}}),
+		viewFirewall: func(containerIP, allowedSet string) *FirewallManager {
+			return &FirewallManager{containerIP: containerIP, allowedSet: allowedSet, backend: backend}
+		},
+	}
+
+	// No view: the container was torn down after the refresher listed it
+	if err := m.refreshContainer("coi-abcd1234-1"); err != nil {
+		t.Fatalf("refreshContainer() unexpected error: %v", err)
+	}
+	if backend.batches != 0 {
+		t.Errorf("refreshContainer() touched the firewall for a torn down container")
+	}
+}
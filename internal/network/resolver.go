@@ -7,17 +7,38 @@ import (
 	"net"
 	"reflect"
 	"sort"
+	"sync"
 	"time"
 )
 
+const (
+	// DefaultDomainTTL is how long the resolved IPs of a domain are used without resolving it again
+	DefaultDomainTTL = 10 * time.Minute
+	// maxConcurrentLookups bounds the number of DNS lookups in flight
+	maxConcurrentLookups = 8
+	// lookupTimeout bounds a single domain lookup
+	lookupTimeout = 5 * time.Second
+)
+
 // Resolver handles DNS resolution with caching and fallback
 type Resolver struct {
-	cache *IPCache
+	mu      sync.Mutex
+	cache   *IPCache
+	lookups map[string]time.Time // Successful lookups not yet committed by UpdateCache
+	dns     *net.Resolver
+	ttl     time.Duration
+	now     func() time.Time
 }
 
 // NewResolver creates a new resolver with a cache
 func NewResolver(cache *IPCache) *Resolver {
-	return &Resolver{cache: cache}
+	return &Resolver{
+		cache:   cache,
+		lookups: make(map[string]time.Time),
+		dns:     net.DefaultResolver,
+		ttl:     DefaultDomainTTL,
+		now:     time.Now,
+	}
 }
 
 // ResolveDomain resolves a single domain to IPv4 addresses
@@ -32,10 +53,10 @@ func (r *Resolver) ResolveDomain(domain string) ([]string, error) {
 	}
 
 	// Resolve domain name to IPs
-	ctx, cancel := context.WithTimeout(context.Background(), 5*time.Second)
+	ctx, cancel := context.WithTimeout(context.Background(), lookupTimeout)
 	defer cancel()
 
-	addrs, err := net.DefaultResolver.LookupIP(ctx, "ip4", domain)
+	addrs, err := r.dns.LookupIP(ctx, "ip4", domain)
 	if err != nil {
 		return nil, fmt.Errorf("failed to resolve %s: %w", domain, err)
 	}
@@ -54,37 +75,134 @@ func (r *Resolver) ResolveDomain(domain string) ([]string, error) {
 	return ips, nil
 }
 
-// ResolveAll resolves all domains to IPs with caching fallback
+// ResolveAll resolves all domains to IPs with caching fallback.
+// Domains whose cached IPs have not expired are served from the cache without a lookup;
+// the rest are resolved concurrently, falling back to (expired) cached IPs on failure.
 func (r *Resolver) ResolveAll(domains []string) (map[string][]string, error) {
+	return r.resolve(domains, false)
+}
+
+// RefreshAll resolves every domain again, even those with unexpired cached IPs
+func (r *Resolver) RefreshAll(domains []string) (map[string][]string, error) {
+	return r.resolve(domains, true)
+}
+
+// FreshDomains returns how many of domains have cached IPs that have not expired yet
+func (r *Resolver) FreshDomains(domains []string) int {
+	r.mu.Lock()
+	defer r.mu.Unlock()
+
+	now := r.now()
+	count := 0
+	for _, domain := range domains {
+		if _, ok := r.freshLocked(domain, now); ok {
+			count++
+		}
+	}
+	return count
+}
+
+// freshLocked returns the cached IPs of domain if they have not expired (caller holds mu)
+func (r *Resolver) freshLocked(domain string, now time.Time) ([]string, bool) {
+	ips := r.cache.Domains[domain]
+	expiry, ok := r.cache.Expiry[domain]
+	if !ok || len(ips) == 0 || !now.Before(expiry) {
+		return nil, false
+	}
+	return ips, true
+}
+
+// Cached returns the cached IPs of domains regardless of expiry, and the domains
+// without any cached IPs
+func (r *Resolver) Cached(domains []string) (map[string][]string, []string) {
+	r.mu.Lock()
+	defer r.mu.Unlock()
+
 	results := make(map[string][]string)
-	hasError := false
-	resolvedCount := 0
+	var missing []string
+	for _, domain := range domains {
+		if ips := r.cache.Domains[domain]; len(ips) > 0 {
+			results[domain] = ips
+		} else {
+			missing = append(missing, domain)
+		}
+	}
+	return results, missing
+}
+
+// lookupResult is the outcome of resolving a single domain
+type lookupResult struct {
+	domain string
+	ips    []string
+	err    error
+}
+
+// resolve is ResolveAll/RefreshAll; force skips the unexpired cache entries
+func (r *Resolver) resolve(domains []string, force bool) (map[string][]string, error) {
+	results := make(map[string][]string)
+	now := r.now()
 
+	// Serve unexpired entries straight from the cache
+	var pending []string
+	seen := make(map[string]bool, len(domains))
+	r.mu.Lock()
 	for _, domain := range domains {
-		ips, err := r.ResolveDomain(domain)
-		if err != nil {
-			log.Printf("Warning: Failed to resolve %s: %v", domain, err)
+		if seen[domain] {
+			continue
+		}
+		seen[domain] = true
+		if !force {
+			if ips, ok := r.freshLocked(domain, now); ok {
+				results[domain] = ips
+				continue
+			}
+		}
+		pending = append(pending, domain)
+	}
+	r.mu.Unlock()
+
+	// Resolve the rest concurrently, so slow or dead domains do not add up
+	lookups := make([]lookupResult, len(pending))
+	sem := make(chan struct{}, maxConcurrentLookups)
+	var wg sync.WaitGroup
+	for i, domain := range pending {
+		wg.Add(1)
+		go func(i int, domain string) {
+			defer wg.Done()
+			sem <- struct{}{}
+			defer func() { <-sem }()
+			ips, err := r.ResolveDomain(domain)
+			lookups[i] = lookupResult{domain: domain, ips: ips, err: err}
+		}(i, domain)
+	}
+	wg.Wait()
+
+	hasError := false
+	r.mu.Lock()
+	for _, lookup := range lookups {
+		if lookup.err != nil {
+			log.Printf("Warning: Failed to resolve %s: %v", lookup.domain, lookup.err)
 			hasError = true
 
 			// Use cached IPs if available
-			if cached, ok := r.cache.Domains[domain]; ok && len(cached) > 0 {
-				log.Printf("Using cached IPs for %s: %v", domain, cached)
-				results[domain] = cached
-				resolvedCount++
+			if cached, ok := r.cache.Domains[lookup.domain]; ok && len(cached) > 0 {
+				log.Printf("Using cached IPs for %s: %v", lookup.domain, cached)
+				results[lookup.domain] = cached
 				continue
 			}
 
 			// Skip domain if no cache available
-			log.Printf("Warning: No cached IPs available for %s, skipping", domain)
+			log.Printf("Warning: No cached IPs available for %s, skipping", lookup.domain)
 			continue
 		}
 
-		results[domain] = ips
-		resolvedCount++
+		results[lookup.domain] = lookup.ips
+		r.lookups[lookup.domain] = now
 	}
+	r.mu.Unlock()
 
 	// If we couldn't resolve any domains and have no cache, return error
-	if resolvedCount == 0 {
+	if len(results) == 0 {
 		return nil, fmt.Errorf("failed to resolve any domains")
 	}
 
@@ -96,31 +214,31 @@ func (r *Resolver) ResolveAll(domains []string) (map[string][]string, error) {
 	return results, nil
 }
 
-// IPsUnchanged checks if resolved IPs differ from cache
-func (r *Resolver) IPsUnchanged(newIPs map[string][]string) bool {
+// domainIPsEqual reports whether two domain→IPs maps hold the same IPs per domain, in any order
+func domainIPsEqual(a, b map[string][]string) bool {
 	// Quick check: different number of domains
-	if len(newIPs) != len(r.cache.Domains) {
+	if len(a) != len(b) {
 		return false
 	}
 
 	// Check each domain
-	for domain, newDomainIPs := range newIPs {
-		cachedIPs, exists := r.cache.Domains[domain]
+	for domain, aIPs := range a {
+		bIPs, exists := b[domain]
 		if !exists {
 			return false // New domain
 		}
 
 		// Sort both slices for comparison
-		sortedNew := make([]string, len(newDomainIPs))
-		copy(sortedNew, newDomainIPs)
-		sort.Strings(sortedNew)
+		sortedA := make([]string, len(aIPs))
+		copy(sortedA, aIPs)
+		sort.Strings(sortedA)
 
-		sortedCached := make([]string, len(cachedIPs))
-		copy(sortedCached, cachedIPs)
-		sort.Strings(sortedCached)
+		sortedB := make([]string, len(bIPs))
+		copy(sortedB, bIPs)
+		sort.Strings(sortedB)
 
 		// Compare sorted slices
-		if !reflect.DeepEqual(sortedNew, sortedCached) {
+		if !reflect.DeepEqual(sortedA, sortedB) {
 			return false
 		}
 	}
@@ -128,13 +246,57 @@ func (r *Resolver) IPsUnchanged(newIPs map[string][]string) bool {
 	return true
 }
 
-// UpdateCache updates the cache with new IPs
+// UpdateCache merges new IPs into the cache; domains not in newIPs are kept, since the
+// cache is shared with containers using other allowlists.
+// Domains looked up since the last update get a fresh expiry; IPs that only came
+// from the cache keep theirs, so a failing domain is retried on the next resolve.
 func (r *Resolver) UpdateCache(newIPs map[string][]string) {
-	r.cache.Domains = newIPs
-	r.cache.LastUpdate = time.Now()
+	r.mu.Lock()
+	defer r.mu.Unlock()
+
+	if r.cache.Domains == nil {
+		r.cache.Domains = make(map[string][]string)
+	}
+	if r.cache.Expiry == nil {
+		r.cache.Expiry = make(map[string]time.Time)
+	}
+	for domain, ips := range newIPs {
+		r.cache.Domains[domain] = ips
+		if resolvedAt, ok := r.lookups[domain]; ok {
+			r.cache.Expiry[domain] = resolvedAt.Add(r.ttl)
+		}
+	}
+
+	r.cache.LastUpdate = r.now()
+	r.lookups = make(map[string]time.Time)
+}
+
+// SetCache replaces the cache, e.g. with the merged host-wide cache after UpdateCache
+func (r *Resolver) SetCache(cache *IPCache) {
+	r.mu.Lock()
+	defer r.mu.Unlock()
+
+	if cache.Domains == nil {
+		cache.Domains = make(map[string][]string)
+	}
+	r.cache = cache
 }
 
-// GetCache returns the current cache
+// GetCache returns a copy of the current cache
 func (r *Resolver) GetCache() *IPCache {
-	return r.cache
+	r.mu.Lock()
+	defer r.mu.Unlock()
+
+	cache := &IPCache{
+		Domains:    make(map[string][]string, len(r.cache.Domains)),
+		Expiry:     make(map[string]time.Time, len(r.cache.Expiry)),
+		LastUpdate: r.cache.LastUpdate,
+	}
+	for domain, ips := range r.cache.Domains {
+		cache.Domains[domain] = ips
+	}
+	for domain, expiry := range r.cache.Expiry {
+		cache.Expiry[domain] = expiry
+	}
+	return cache
 }
@@ -1,7 +1,14 @@
 package network
 
 import (
+	"context"
+	"encoding/binary"
+	"fmt"
+	"net"
+	"strings"
+	"sync/atomic"
 	"testing"
+	"time"
 )
 
 func TestResolveDomain_RawIPv4(t *testing.T) {
@@ -82,3 +89,241 @@ func TestResolveDomain_DomainName(t *testing.T) {
 		}
 	}
 }
+
+// stubDNS is a minimal local DNS server answering A queries from a fixed table
+type stubDNS struct {
+	conn    net.PacketConn
+	records map[string][]string      // FQDN (with trailing dot) -> IPv4 addresses
+	delays  map[string]time.Duration // FQDN -> delay before answering
+	queries int32
+}
+
+// newStubDNS starts a stub DNS server on a random local UDP port
+func newStubDNS(t *testing.T, records map[string][]string, delays map[string]time.Duration) *stubDNS {
+	t.Helper()
+	conn, err := net.ListenPacket("udp4", "127.0.0.1:0")
+	if err != nil {
+		t.Skipf("cannot listen on UDP: %v", err)
+	}
+	s := &stubDNS{conn: conn, records: records, delays: delays}
+	t.Cleanup(func() { conn.Close() })
+
+	go func() {
+		buf := make([]byte, 512)
+		for {
+			n, addr, err := conn.ReadFrom(buf)
+			if err != nil {
+				return
+			}
+			query := append([]byte(nil), buf[:n]...)
+			go s.answer(query, addr)
+		}
+	}()
+	return s
+}
+
+// resolver returns a resolver whose lookups go to the stub server
+func (s *stubDNS) resolver(cache *IPCache) *Resolver {
+	r := NewResolver(cache)
+	r.dns = &net.Resolver{
+		PreferGo: true,
+		Dial: func(ctx context.Context, _, _ string) (net.Conn, error) {
+			var d net.Dialer
+			return d.DialContext(ctx, "udp4", s.conn.LocalAddr().String())
+		},
+	}
+	return r
+}
+
+// answer replies to a single query packet
+func (s *stubDNS) answer(query []byte, addr net.Addr) {
+	atomic.AddInt32(&s.queries, 1)
+	if len(query) < 12 {
+		return
+	}
+
+	// Question: labels, then qtype and qclass
+	var labels []string
+	i := 12
+	for i < len(query) && query[i] != 0 {
+		l := int(query[i])
+		if i+1+l > len(query) {
+			return
+		}
+		labels = append(labels, string(query[i+1:i+1+l]))
+		i += 1 + l
+	}
+	if i+5 > len(query) {
+		return
+	}
+	questionEnd := i + 5
+	qtype := binary.BigEndian.Uint16(query[i+1 : i+3])
+	name := strings.ToLower(strings.Join(labels, ".")) + "."
+
+	if delay := s.delays[name]; delay > 0 {
+		time.Sleep(delay)
+	}
+
+	ips, known := s.records[name]
+	flags := uint16(0x8180) // Response, recursion desired and available
+	if !known {
+		flags |= 3 // NXDOMAIN
+	}
+	if qtype != 1 {
+		ips = nil
+	}
+
+	resp := make([]byte, 12, 512)
+	binary.BigEndian.PutUint16(resp[0:], binary.BigEndian.Uint16(query[0:2]))
+	binary.BigEndian.PutUint16(resp[2:], flags)
+	binary.BigEndian.PutUint16(resp[4:], 1)
+	binary.BigEndian.PutUint16(resp[6:], uint16(len(ips)))
+	resp = append(resp, query[12:questionEnd]...)
+	for _, ip := range ips {
+		resp = append(resp, 0xC0, 0x0C, 0, 1, 0, 1, 0, 0, 0, 60, 0, 4)
+		resp = append(resp, net.ParseIP(ip).To4()...)
+	}
+	_, _ = s.conn.WriteTo(resp, addr)
+}
+
+func TestResolveAll_Concurrent(t *testing.T) {
+	records := map[string][]string{}
+	delays := map[string]time.Duration{}
+	var domains []string
+	for i := 0; i < 8; i++ {
+		name := fmt.Sprintf("slow%d.coi.test", i)
+		records[name+"."] = []string{fmt.Sprintf("10.0.0.%d", i+1)}
+		delays[name+"."] = 300 * time.Millisecond
+		domains = append(domains, name)
+	}
+	stub := newStubDNS(t, records, delays)
+	resolver := stub.resolver(&IPCache{Domains: make(map[string][]string)})
+
+	start := time.Now()
+	results, err := resolver.ResolveAll(domains)
+	elapsed := time.Since(start)
+
+	if err != nil {
+		t.Fatalf("ResolveAll() unexpected error: %v", err)
+	}
+	if len(results) != len(domains) {
+		t.Errorf("ResolveAll() resolved %d domains, want %d", len(results), len(domains))
+	}
+	// Sequentially this takes 8 x 300ms
+	if elapsed > 1500*time.Millisecond {
+		t.Errorf("ResolveAll() took %v, want concurrent lookups", elapsed)
+	}
+}
+
+func TestResolveAll_FallsBackToCache(t *testing.T) {
+	stub := newStubDNS(t, map[string][]string{"up.coi.test.": {"10.0.0.1"}}, nil)
+	cache := &IPCache{Domains: map[string][]string{"down.coi.test": {"10.9.9.9"}}}
+	resolver := stub.resolver(cache)
+
+	results, err := resolver.ResolveAll([]string{"up.coi.test", "down.coi.test", "gone.coi.test"})
+	if err == nil {
+		t.Error("ResolveAll() expected partial error")
+	}
+
+	if got := results["up.coi.test"]; len(got) != 1 || got[0] != "10.0.0.1" {
+		t.Errorf("ResolveAll()[up] = %v, want [10.0.0.1]", got)
+	}
+	if got := results["down.coi.test"]; len(got) != 1 || got[0] != "10.9.9.9" {
+		t.Errorf("ResolveAll()[down] = %v, want cached [10.9.9.9]", got)
+	}
+	if _, ok := results["gone.coi.test"]; ok {
+		t.Error("ResolveAll() should skip domains without cache")
+	}
+}
+
+func TestResolveAll_UsesFreshCache(t *testing.T) {
+	stub := newStubDNS(t, map[string][]string{"a.coi.test.": {"10.0.0.1"}}, nil)
+	resolver := stub.resolver(&IPCache{Domains: make(map[string][]string)})
+
+	results, err := resolver.ResolveAll([]string{"a.coi.test"})
+	if err != nil {
+		t.Fatalf("ResolveAll() unexpected error: %v", err)
+	}
+	resolver.UpdateCache(results)
+	queries := atomic.LoadInt32(&stub.queries)
+
+	if n := resolver.FreshDomains([]string{"a.coi.test", "b.coi.test"}); n != 1 {
+		t.Errorf("FreshDomains() = %d, want 1", n)
+	}
+
+	// Within the TTL no lookup is made
+	if _, err := resolver.ResolveAll([]string{"a.coi.test"}); err != nil {
+		t.Fatalf("ResolveAll() unexpected error: %v", err)
+	}
+	if got := atomic.LoadInt32(&stub.queries); got != queries {
+		t.Errorf("ResolveAll() made %d queries for a fresh domain, want 0", got-queries)
+	}
+
+	// RefreshAll ignores the TTL
+	if _, err := resolver.RefreshAll([]string{"a.coi.test"}); err != nil {
+		t.Fatalf("RefreshAll() unexpected error: %v", err)
+	}
+	if got := atomic.LoadInt32(&stub.queries); got == queries {
+		t.Error("RefreshAll() should resolve fresh domains again")
+	}
+
+	// After the TTL the domain is resolved again
+	resolver.now = func() time.Time { return time.Now().Add(DefaultDomainTTL + time.Minute) }
+	if n := resolver.FreshDomains([]string{"a.coi.test"}); n != 0 {
+		t.Errorf("FreshDomains() after TTL = %d, want 0", n)
+	}
+}
+
+func TestUpdateCache_KeepsExpiryOfCachedFallbacks(t *testing.T) {
+	stub := newStubDNS(t, map[string][]string{"up.coi.test.": {"10.0.0.1"}}, nil)
+	expired := time.Now().Add(-time.Minute)
+	cache := &IPCache{
+		Domains: map[string][]string{"down.coi.test": {"10.9.9.9"}},
+		Expiry:  map[string]time.Time{"down.coi.test": expired},
+	}
+	resolver := stub.resolver(cache)
+
+	results, _ := resolver.ResolveAll([]string{"up.coi.test", "down.coi.test"})
+	resolver.UpdateCache(results)
+
+	saved := resolver.GetCache()
+	if !saved.Expiry["up.coi.test"].After(time.Now()) {
+		t.Errorf("expiry of resolved domain = %v, want in the future", saved.Expiry["up.coi.test"])
+	}
+	if !saved.Expiry["down.coi.test"].Equal(expired) {
+		t.Errorf("expiry of cached fallback = %v, want unchanged %v", saved.Expiry["down.coi.test"], expired)
+	}
+}
+
+func TestUpdateCache_KeepsOtherDomains(t *testing.T) {
+	resolver := NewResolver(&IPCache{Domains: map[string][]string{"other.coi.test": {"10.9.9.9"}}})
+
+	resolver.UpdateCache(map[string][]string{"mine.coi.test": {"10.0.0.1"}})
+
+	cached, missing := resolver.Cached([]string{"other.coi.test", "mine.coi.test", "new.coi.test"})
+	if len(cached) != 2 {
+		t.Errorf("Cached() = %v, want both updated and shared domains", cached)
+	}
+	if len(missing) != 1 || missing[0] != "new.coi.test" {
+		t.Errorf("Cached() missing = %v, want [new.coi.test]", missing)
+	}
+}
+
+func TestDomainIPsEqual(t *testing.T) {
+	tests := []struct {
+		a, b map[string][]string
+		want bool
+	}{
+		{map[string][]string{"a": {"1", "2"}}, map[string][]string{"a": {"2", "1"}}, true},
+		{map[string][]string{"a": {"1"}}, map[string][]string{"a": {"2"}}, false},
+		{map[string][]string{"a": {"1"}}, map[string][]string{"b": {"1"}}, false},
+		{map[string][]string{"a": {"1"}}, nil, false},
+		{nil, map[string][]string{}, true},
+	}
+
+	for _, tt := range tests {
+		if got := domainIPsEqual(tt.a, tt.b); got != tt.want {
+			t.Errorf("domainIPsEqual(%v, %v) = %v, want %v", tt.a, tt.b, got, tt.want)
+		}
+	}
+}
@@ -4,6 +4,7 @@ import (
 	"context"
 	"fmt"
 	"os"
+	"path"
 	"path/filepath"
 	"strings"
 	"time"
@@ -20,6 +21,7 @@ type CleanupOptions struct {
 	Persistent     bool      // If true, stop but don't delete container
 	SessionsDir    string    // e.g., ~/.coi/sessions-claude
 	SaveSession    bool      // Whether to save tool config directory
+	SessionStore   string    // StoreDirectory (default) or StoreCompressed
 	Workspace      string    // Workspace directory path
 	Tool           tool.Tool // AI coding tool being used
 	NetworkManager *network.Manager
@@ -53,7 +55,7 @@ func Cleanup(opts CleanupOptions) error {
 	// This ensures --resume works regardless of how the user exited (including sudo shutdown 0)
 	// Skip if tool uses ENV-based auth (no config directory to save)
 	if opts.SaveSession && exists && opts.SessionID != "" && opts.SessionsDir != "" && opts.Tool != nil && opts.Tool.ConfigDirName() != "" {
-		if err := saveSessionData(mgr, opts.SessionID, opts.Persistent, opts.Workspace, opts.SessionsDir, opts.Tool, opts.Logger); err != nil {
+		if err := saveSessionData(mgr, opts.SessionID, opts.Persistent, opts.Workspace, opts.SessionsDir, opts.SessionStore, opts.Tool, opts.Logger); err != nil {
 			opts.Logger(fmt.Sprintf("Warning: Failed to save session data: %v", err))
 		}
 	}
@@ -76,6 +78,7 @@ func Cleanup(opts CleanupOptions) error {
 			running := true
 			for i := 0; i < 10; i++ {
 				time.Sleep(500 * time.Millisecond)
+				container.InvalidateCache()
 				running, _ = mgr.Running()
 				if !running {
 					break
@@ -112,7 +115,7 @@ func Cleanup(opts CleanupOptions) error {
 }
 
 // saveSessionData saves the tool config directory from the container
-func saveSessionData(mgr *container.Manager, sessionID string, persistent bool, workspace string, sessionsDir string, t tool.Tool, logger func(string)) error {
+func saveSessionData(mgr *container.Manager, sessionID string, persistent bool, workspace string, sessionsDir, store string, t tool.Tool, logger func(string)) error {
 	// Determine home directory
 	// For coi images, we always use /home/code
 	// For other images, we use /root
@@ -130,25 +133,44 @@ func saveSessionData(mgr *container.Manager, sessionID string, persistent bool,
 
 	logger(fmt.Sprintf("Saving session data to %s", localSessionDir))
 
-	// Remove old config directory if it exists (when resuming)
 	localConfigDir := filepath.Join(localSessionDir, configDirName)
-	if _, err := os.Stat(localConfigDir); err == nil {
-		logger("Removing old session data before saving new state")
-		if err := os.RemoveAll(localConfigDir); err != nil {
-			return fmt.Errorf("failed to remove old %s directory: %w", configDirName, err)
+	manifestPath := filepath.Join(localSessionDir, ManifestFilename)
+	previous := LoadManifest(manifestPath)
+	packedSync := store == StoreCompressed && previous.Packed
+
+	// A running container is synced incrementally: only files that changed since the
+	// previous save are copied, unchanged ones are reused from the previous snapshot
+	var manifest *SessionManifest
+	if running, _ := mgr.Running(); running {
+		var stats SyncStats
+		var err error
+		if packedSync {
+			manifest, stats, err = syncPackedSnapshot(containerSource{mgr: mgr}, stateDir, openBlobStore(sessionsDir), localConfigDir+".sync", previous)
+		} else {
+			manifest, stats, err = syncSnapshot(containerSource{mgr: mgr}, stateDir, localConfigDir, previous)
+		}
+		if err != nil {
+			logger(fmt.Sprintf("Incremental save unavailable, pulling full %s directory: %v", configDirName, err))
+			manifest = nil
+		} else {
+			logger(fmt.Sprintf("Saved %d files (%d copied, %d bytes; %d unchanged)", stats.Files, stats.Transferred, stats.Bytes, stats.Linked))
 		}
 	}
 
-	// Pull config directory from container
-	// Note: incus file pull works on stopped containers, so we don't need to check if running
-	// If config dir doesn't exist, PullDirectory will fail and we handle it gracefully
-	if err := mgr.PullDirectory(stateDir, localConfigDir); err != nil {
-		// Check if it's a "not found" error - this is expected if config dir doesn't exist
-		if strings.Contains(err.Error(), "not found") || strings.Contains(err.Error(), "No such file") {
+	if manifest == nil {
+		pulled, err := pullSessionData(mgr, stateDir, localConfigDir, logger)
+		if err != nil {
+			return fmt.Errorf("failed to pull %s directory: %w", configDirName, err)
+		}
+		if pulled == nil {
 			logger(fmt.Sprintf("No %s directory found in container", configDirName))
 			return nil
 		}
-		return fmt.Errorf("failed to pull %s directory: %w", configDirName, err)
+		manifest = pulled
+	}
+
+	if err := storeSessionSnapshot(sessionsDir, localConfigDir, manifestPath, store, manifest, previous, logger); err != nil {
+		logger(fmt.Sprintf("Warning: Failed to save manifest: %v", err))
 	}
 
 	// Save metadata
@@ -170,6 +192,74 @@ func saveSessionData(mgr *container.Manager, sessionID string, persistent bool,
 	return nil
 }
 
+// pullSessionData copies the whole config directory with `incus file pull`, which also works
+// on stopped containers. Returns the manifest of the pulled snapshot, or nil if the directory
+// does not exist in the container.
+func pullSessionData(mgr *container.Manager, stateDir, localConfigDir string, logger func(string)) (*SessionManifest, error) {
+	// Remove old config directory if it exists (when resuming)
+	if _, err := os.Stat(localConfigDir); err == nil {
+		logger("Removing old session data before saving new state")
+		if err := os.RemoveAll(localConfigDir); err != nil {
+			return nil, err
+		}
+	}
+
+	// Pull config directory from container
+	// Note: incus file pull works on stopped containers, so we don't need to check if running
+	// If config dir doesn't exist, PullDirectory will fail and we handle it gracefully
+	if err := mgr.PullDirectory(stateDir, localConfigDir); err != nil {
+		// Check if it's a "not found" error - this is expected if config dir doesn't exist
+		if strings.Contains(err.Error(), "not found") || strings.Contains(err.Error(), "No such file") {
+			return nil, nil
+		}
+		return nil, err
+	}
+
+	// Container mtimes are unknown after a full pull; record hashes so the next
+	// incremental save can still skip unchanged files
+	manifest, err := buildLocalManifest(localConfigDir)
+	if err != nil {
+		logger(fmt.Sprintf("Warning: Failed to index session data: %v", err))
+		return &SessionManifest{Version: manifestVersion, Files: map[string]ManifestEntry{}}, nil
+	}
+	return manifest, nil
+}
+
+// storeSessionSnapshot records a freshly saved snapshot: with the compressed store a plain
+// snapshot directory is packed into shared chunks and removed, and the chunks of the
+// previous snapshot are released. The manifest is written last.
+func storeSessionSnapshot(sessionsDir, localConfigDir, manifestPath, store string, manifest, previous *SessionManifest, logger func(string)) error {
+	if manifest.Packed {
+		// Synced straight into the store (references already swapped)
+		return saveManifestOrRemove(manifest, manifestPath)
+	}
+
+	if store == StoreCompressed {
+		packed, err := packSession(sessionsDir, localConfigDir, manifest, previous)
+		if err == nil {
+			if err := saveManifestOrRemove(packed, manifestPath); err != nil {
+				// Keep the plain copy, the session stays resumable without the manifest
+				return err
+			}
+			return os.RemoveAll(localConfigDir)
+		}
+		logger(fmt.Sprintf("Warning: Failed to compress session data, keeping plain copy: %v", err))
+	} else if err := releaseSession(sessionsDir, previous); err != nil {
+		logger(fmt.Sprintf("Warning: Failed to release session store references: %v", err))
+	}
+
+	return saveManifestOrRemove(manifest, manifestPath)
+}
+
+// saveManifestOrRemove writes a manifest, removing a stale one if that fails
+func saveManifestOrRemove(manifest *SessionManifest, manifestPath string) error {
+	if err := manifest.Save(manifestPath); err != nil {
+		os.Remove(manifestPath)
+		return err
+	}
+	return nil
+}
+
 // SessionMetadata contains information about a saved session
 type SessionMetadata struct {
 	SessionID     string `json:"session_id"`
@@ -179,7 +269,7 @@ type SessionMetadata struct {
 	SavedAt       string `json:"saved_at"`
 }
 
-// saveMetadata saves session metadata to a JSON file
+// saveMetadata saves session metadata to a JSON file and records it in the session index
 func saveMetadata(path string, metadata SessionMetadata) error {
 	// Simple JSON marshaling
 	content := fmt.Sprintf(`{
@@ -191,7 +281,16 @@ func saveMetadata(path string, metadata SessionMetadata) error {
 }
 `, metadata.SessionID, metadata.ContainerName, metadata.Persistent, metadata.Workspace, metadata.SavedAt)
 
-	return os.WriteFile(path, []byte(content), 0o644)
+	if err := os.WriteFile(path, []byte(content), 0o644); err != nil {
+		return err
+	}
+	indexSessionMetadata(path, metadata)
+	return nil
+}
+
+// SaveSessionMetadata writes an updated metadata.json (e.g. after 'coi persist')
+func SaveSessionMetadata(path string, metadata SessionMetadata) error {
+	return saveMetadata(path, metadata)
 }
 
 // getCurrentTime returns current time in RFC3339 format
@@ -221,29 +320,30 @@ func SaveMetadataEarly(sessionsDir, sessionID, containerName, workspace string,
 
 // SessionExists checks if a session with the given ID exists and is valid
 func SessionExists(sessionsDir, sessionID string) bool {
-	statePath := filepath.Join(sessionsDir, sessionID, ".claude")
-	info, err := os.Stat(statePath)
-	return err == nil && info.IsDir()
+	return hasSessionData(filepath.Join(sessionsDir, sessionID))
+}
+
+// hasSessionData reports whether a session directory holds saved tool config data,
+// either as a plain .claude directory or packed in the compressed store
+func hasSessionData(sessionDir string) bool {
+	statePath := filepath.Join(sessionDir, ".claude")
+	if info, err := os.Stat(statePath); err == nil && info.IsDir() {
+		return true
+	}
+	return IsPackedSession(sessionDir)
 }
 
 // ListSavedSessions lists all saved sessions in the sessions directory
 func ListSavedSessions(sessionsDir string) ([]string, error) {
-	entries, err := os.ReadDir(sessionsDir)
+	records, err := LoadSessionIndex(sessionsDir)
 	if err != nil {
-		if os.IsNotExist(err) {
-			return []string{}, nil
-		}
 		return nil, err
 	}
 
 	var sessions []string
-	for _, entry := range entries {
-		if entry.IsDir() {
-			// Check if it contains a .claude directory
-			statePath := filepath.Join(sessionsDir, entry.Name(), ".claude")
-			if info, err := os.Stat(statePath); err == nil && info.IsDir() {
-				sessions = append(sessions, entry.Name())
-			}
+	for _, record := range records {
+		if record.HasData {
+			sessions = append(sessions, record.SessionID)
 		}
 	}
 
@@ -252,92 +352,32 @@ func ListSavedSessions(sessionsDir string) ([]string, error) {
 
 // GetLatestSession returns the most recently saved session ID
 func GetLatestSession(sessionsDir string) (string, error) {
-	sessions, err := ListSavedSessions(sessionsDir)
+	records, err := LoadSessionIndex(sessionsDir)
 	if err != nil {
 		return "", err
 	}
 
-	if len(sessions) == 0 {
+	latestSession, ok := latestRecord(sessionsDir, records, func(SessionRecord) bool { return true })
+	if !ok {
 		return "", fmt.Errorf("no saved sessions found")
 	}
 
-	// Find the most recent session by reading metadata
-	var latestSession string
-	var latestTime time.Time
-
-	for _, sessionID := range sessions {
-		metadataPath := filepath.Join(sessionsDir, sessionID, "metadata.json")
-		metadata, err := LoadSessionMetadata(metadataPath)
-		if err != nil {
-			continue // Skip sessions without valid metadata
-		}
-
-		savedTime, err := time.Parse(time.RFC3339, metadata.SavedAt)
-		if err != nil {
-			continue
-		}
-
-		if latestSession == "" || savedTime.After(latestTime) {
-			latestSession = sessionID
-			latestTime = savedTime
-		}
-	}
-
-	if latestSession == "" {
-		return "", fmt.Errorf("no valid sessions found")
-	}
-
 	return latestSession, nil
 }
 
 // GetLatestSessionForWorkspace returns the most recent session ID for a specific workspace
 func GetLatestSessionForWorkspace(sessionsDir, workspacePath string) (string, error) {
-	sessions, err := ListSavedSessions(sessionsDir)
+	records, err := LoadSessionIndex(sessionsDir)
 	if err != nil {
 		return "", err
 	}
 
-	if len(sessions) == 0 {
-		return "", fmt.Errorf("no saved sessions found")
-	}
-
-	// Get the workspace hash to match against
+	// Only consider sessions from the same workspace
 	workspaceHash := WorkspaceHash(workspacePath)
-
-	// Find the most recent session for this workspace
-	var latestSession string
-	var latestTime time.Time
-
-	for _, sessionID := range sessions {
-		metadataPath := filepath.Join(sessionsDir, sessionID, "metadata.json")
-		metadata, err := LoadSessionMetadata(metadataPath)
-		if err != nil {
-			continue // Skip sessions without valid metadata
-		}
-
-		// Extract workspace hash from container name (format: claude-<hash>-<slot>)
-		sessionHash, _, err := ParseContainerName(metadata.ContainerName)
-		if err != nil {
-			continue
-		}
-
-		// Only consider sessions from the same workspace
-		if sessionHash != workspaceHash {
-			continue
-		}
-
-		savedTime, err := time.Parse(time.RFC3339, metadata.SavedAt)
-		if err != nil {
-			continue
-		}
-
-		if latestSession == "" || savedTime.After(latestTime) {
-			latestSession = sessionID
-			latestTime = savedTime
-		}
-	}
-
-	if latestSession == "" {
+	latestSession, ok := latestRecord(sessionsDir, records, func(record SessionRecord) bool {
+		return record.WorkspaceHash == workspaceHash
+	})
+	if !ok {
 		return "", fmt.Errorf("no saved sessions found for workspace %s", workspacePath)
 	}
 
@@ -389,11 +429,37 @@ func extractJSONValue(line string) string {
 	return value
 }
 
+// DiscoverCLISessionID returns the tool's session ID for a saved coi session, or "" if
+// none is found. Packed sessions have no config directory on disk, so their ID is read
+// from the manifest instead of asking the tool.
+func DiscoverCLISessionID(t tool.Tool, sessionsDir, coiSessionID string) string {
+	sessionDir := filepath.Join(sessionsDir, coiSessionID)
+	if IsPackedSession(sessionDir) {
+		return GetCLISessionID(sessionsDir, coiSessionID)
+	}
+	if configDir := t.ConfigDirName(); configDir != "" {
+		return t.DiscoverSessionID(filepath.Join(sessionDir, configDir))
+	}
+	return t.DiscoverSessionID(sessionDir)
+}
+
 // GetCLISessionID extracts the CLI tool's session ID from a saved coi session.
 // CLI tools store sessions in .claude/projects/-workspace/<session-id>.jsonl
 // Returns empty string if no session found.
 func GetCLISessionID(sessionsDir, coiSessionID string) string {
-	projectsDir := filepath.Join(sessionsDir, coiSessionID, ".claude", "projects", "-workspace")
+	sessionDir := filepath.Join(sessionsDir, coiSessionID)
+	if IsPackedSession(sessionDir) {
+		manifest := LoadManifest(filepath.Join(sessionDir, ManifestFilename))
+		for _, name := range sortedKeys(manifest.Files) {
+			dir, file := path.Split(name)
+			if dir == "projects/-workspace/" && strings.HasSuffix(file, ".jsonl") {
+				return strings.TrimSuffix(file, ".jsonl")
+			}
+		}
+		return ""
+	}
+
+	projectsDir := filepath.Join(sessionDir, ".claude", "projects", "-workspace")
 
 	entries, err := os.ReadDir(projectsDir)
 	if err != nil {
@@ -0,0 +1,322 @@
+package session
+
+import (
+	"bufio"
+	"bytes"
+	"encoding/json"
+	"fmt"
+	"os"
+	"path/filepath"
+	"sort"
+	"strings"
+	"time"
+)
+
+// IndexFilename is the session index kept at the top of a sessions directory.
+// It is append-only JSON lines: the last record for a session ID wins, and a
+// record with "removed" set deletes the session from the index.
+const IndexFilename = "index.jsonl"
+
+// indexCompactSlack is how many superseded records the index may accumulate
+// (beyond the number of live ones) before it is rewritten
+const indexCompactSlack = 256
+
+// SessionRecord is one session in the index
+type SessionRecord struct {
+	SessionID     string `json:"session_id"`
+	ContainerName string `json:"container_name,omitempty"`
+	Workspace     string `json:"workspace,omitempty"`
+	WorkspaceHash string `json:"workspace_hash,omitempty"`
+	Persistent    bool   `json:"persistent,omitempty"`
+	SavedAt       string `json:"saved_at,omitempty"`
+	HasData       bool   `json:"has_data,omitempty"` // Tool config data saved (resumable)
+	Removed       bool   `json:"removed,omitempty"`
+}
+
+// savedTime parses SavedAt, returning false for records without a valid timestamp
+func (r SessionRecord) savedTime() (time.Time, bool) {
+	t, err := time.Parse(time.RFC3339, r.SavedAt)
+	return t, err == nil
+}
+
+// newSessionRecord builds the index record for a session's metadata
+func newSessionRecord(metadata SessionMetadata, hasData bool) SessionRecord {
+	// Same key GetLatestSessionForWorkspace always matched on: the hash in the container name
+	hash, _, err := ParseContainerName(metadata.ContainerName)
+	if err != nil && metadata.Workspace != "" {
+		hash = WorkspaceHash(metadata.Workspace)
+	}
+
+	return SessionRecord{
+		SessionID:     metadata.SessionID,
+		ContainerName: metadata.ContainerName,
+		Workspace:     metadata.Workspace,
+		WorkspaceHash: hash,
+		Persistent:    metadata.Persistent,
+		SavedAt:       metadata.SavedAt,
+		HasData:       hasData,
+	}
+}
+
+// indexPath returns the index file of a sessions directory
+func indexPath(sessionsDir string) string {
+	return filepath.Join(sessionsDir, IndexFilename)
+}
+
+// lockIndex serializes index writers across coi processes
+func lockIndex(sessionsDir string) (func(), error) {
+	return lockFile(filepath.Join(sessionsDir, ".index.lock"))
+}
+
+// updateSessionIndex records a session in the index. A missing index is rebuilt from
+// disk instead, so it never covers only the sessions saved since it was created.
+func updateSessionIndex(sessionsDir string, record SessionRecord) error {
+	unlock, err := lockIndex(sessionsDir)
+	if err != nil {
+		return err
+	}
+	defer unlock()
+
+	if _, err := os.Stat(indexPath(sessionsDir)); os.IsNotExist(err) {
+		_, err := rebuildSessionIndex(sessionsDir)
+		return err
+	}
+
+	line, err := json.Marshal(record)
+	if err != nil {
+		return err
+	}
+
+	f, err := os.OpenFile(indexPath(sessionsDir), os.O_APPEND|os.O_WRONLY, 0o644)
+	if err != nil {
+		return err
+	}
+	_, writeErr := f.Write(append(line, '\n'))
+	closeErr := f.Close()
+	if writeErr != nil {
+		// A partially written record would hide later ones; start over from disk next time
+		os.Remove(indexPath(sessionsDir))
+		return writeErr
+	}
+	return closeErr
+}
+
+// indexSessionMetadata updates the index after metadata.json at metadataPath was written.
+// Failures only cost a rebuild on the next read, so they are not reported.
+func indexSessionMetadata(metadataPath string, metadata SessionMetadata) {
+	sessionDir := filepath.Dir(metadataPath)
+	record := newSessionRecord(metadata, hasSessionData(sessionDir))
+	if err := updateSessionIndex(filepath.Dir(sessionDir), record); err != nil {
+		os.Remove(indexPath(filepath.Dir(sessionDir)))
+	}
+}
+
+// LoadSessionIndex returns the indexed sessions, rebuilding the index from the session
+// directories if it is missing or unreadable
+func LoadSessionIndex(sessionsDir string) ([]SessionRecord, error) {
+	data, err := os.ReadFile(indexPath(sessionsDir))
+	if err == nil {
+		records, total, parseErr := parseSessionIndex(data)
+		if parseErr == nil {
+			if total > 2*len(records)+indexCompactSlack {
+				compactSessionIndex(sessionsDir)
+			}
+			return records, nil
+		}
+	} else if !os.IsNotExist(err) {
+		return nil, err
+	}
+
+	if _, err := os.Stat(sessionsDir); os.IsNotExist(err) {
+		return []SessionRecord{}, nil
+	}
+
+	unlock, err := lockIndex(sessionsDir)
+	if err != nil {
+		return nil, err
+	}
+	defer unlock()
+	return rebuildSessionIndex(sessionsDir)
+}
+
+// parseSessionIndex folds index lines into the live records (sorted by session ID)
+// and returns them with the total number of lines
+func parseSessionIndex(data []byte) ([]SessionRecord, int, error) {
+	latest := map[string]SessionRecord{}
+	total := 0
+
+	scanner := bufio.NewScanner(bytes.NewReader(data))
+	scanner.Buffer(make([]byte, 0, 64*1024), 1024*1024)
+	for scanner.Scan() {
+		line := bytes.TrimSpace(scanner.Bytes())
+		if len(line) == 0 {
+			continue
+		}
+		var record SessionRecord
+		if err := json.Unmarshal(line, &record); err != nil || record.SessionID == "" {
+			return nil, 0, fmt.Errorf("corrupt session index line %d", total+1)
+		}
+		total++
+		if record.Removed {
+			delete(latest, record.SessionID)
+			continue
+		}
+		latest[record.SessionID] = record
+	}
+	if err := scanner.Err(); err != nil {
+		return nil, 0, err
+	}
+
+	records := make([]SessionRecord, 0, len(latest))
+	for _, id := range sortedKeys(latest) {
+		records = append(records, latest[id])
+	}
+	return records, total, nil
+}
+
+// RebuildSessionIndex recreates the index from the session directories on disk
+func RebuildSessionIndex(sessionsDir string) ([]SessionRecord, error) {
+	if err := os.MkdirAll(sessionsDir, 0o755); err != nil {
+		return nil, err
+	}
+	unlock, err := lockIndex(sessionsDir)
+	if err != nil {
+		return nil, err
+	}
+	defer unlock()
+	return rebuildSessionIndex(sessionsDir)
+}
+
+// rebuildSessionIndex scans the session directories and writes a fresh index (caller holds the lock)
+func rebuildSessionIndex(sessionsDir string) ([]SessionRecord, error) {
+	entries, err := os.ReadDir(sessionsDir)
+	if err != nil {
+		if os.IsNotExist(err) {
+			return []SessionRecord{}, nil
+		}
+		return nil, err
+	}
+
+	records := []SessionRecord{}
+	for _, entry := range entries {
+		if !entry.IsDir() || strings.HasPrefix(entry.Name(), ".") {
+			continue
+		}
+		sessionDir := filepath.Join(sessionsDir, entry.Name())
+		hasData := hasSessionData(sessionDir)
+
+		metadata, err := LoadSessionMetadata(filepath.Join(sessionDir, "metadata.json"))
+		if err != nil {
+			if !hasData {
+				continue
+			}
+			// Saved data without metadata: resumable by ID, but has no timestamp or workspace
+			metadata = &SessionMetadata{SessionID: entry.Name()}
+		}
+		record := newSessionRecord(*metadata, hasData)
+		record.SessionID = entry.Name()
+		records = append(records, record)
+	}
+
+	return records, writeSessionIndex(sessionsDir, records)
+}
+
+// compactSessionIndex rewrites the index with only the live records (best effort)
+func compactSessionIndex(sessionsDir string) {
+	unlock, err := lockIndex(sessionsDir)
+	if err != nil {
+		return
+	}
+	defer unlock()
+
+	data, err := os.ReadFile(indexPath(sessionsDir))
+	if err != nil {
+		return
+	}
+	if records, _, err := parseSessionIndex(data); err == nil {
+		_ = writeSessionIndex(sessionsDir, records)
+	}
+}
+
+// writeSessionIndex atomically replaces the index with records (caller holds the lock)
+func writeSessionIndex(sessionsDir string, records []SessionRecord) error {
+	var buf bytes.Buffer
+	for _, record := range records {
+		line, err := json.Marshal(record)
+		if err != nil {
+			return err
+		}
+		buf.Write(line)
+		buf.WriteByte('\n')
+	}
+
+	tmpPath := indexPath(sessionsDir) + ".tmp"
+	if err := os.WriteFile(tmpPath, buf.Bytes(), 0o644); err != nil {
+		return err
+	}
+	return os.Rename(tmpPath, indexPath(sessionsDir))
+}
+
+// removeFromSessionIndex records that a session was deleted (best effort)
+func removeFromSessionIndex(sessionsDir, sessionID string) {
+	if _, err := os.Stat(indexPath(sessionsDir)); err != nil {
+		return
+	}
+	if err := updateSessionIndex(sessionsDir, SessionRecord{SessionID: sessionID, Removed: true}); err != nil {
+		os.Remove(indexPath(sessionsDir))
+	}
+}
+
+// latestRecord returns the most recently saved resumable session accepted by match.
+// Candidates are checked against the disk, so sessions deleted behind coi's back are skipped.
+func latestRecord(sessionsDir string, records []SessionRecord, match func(SessionRecord) bool) (string, bool) {
+	type candidate struct {
+		id    string
+		saved time.Time
+	}
+	var candidates []candidate
+	for _, record := range records {
+		if !record.HasData || !match(record) {
+			continue
+		}
+		if saved, ok := record.savedTime(); ok {
+			candidates = append(candidates, candidate{record.SessionID, saved})
+		}
+	}
+
+	sort.SliceStable(candidates, func(i, j int) bool { return candidates[i].saved.After(candidates[j].saved) })
+	for _, c := range candidates {
+		if SessionExists(sessionsDir, c.id) {
+			return c.id, true
+		}
+	}
+	return "", false
+}
+
+// FindSessionByContainer returns the most recently saved indexed session that ran in containerName
+func FindSessionByContainer(sessionsDir, containerName string) (*SessionRecord, error) {
+	records, err := LoadSessionIndex(sessionsDir)
+	if err != nil {
+		return nil, err
+	}
+
+	var found *SessionRecord
+	var foundTime time.Time
+	for i := range records {
+		if records[i].ContainerName != containerName {
+			continue
+		}
+		if _, err := os.Stat(filepath.Join(sessionsDir, records[i].SessionID, "metadata.json")); err != nil {
+			continue
+		}
+		saved, _ := records[i].savedTime()
+		if found == nil || saved.After(foundTime) {
+			found = &records[i]
+			foundTime = saved
+		}
+	}
+	if found == nil {
+		return nil, fmt.Errorf("no session metadata found for container %s", containerName)
+	}
+	return found, nil
+}
@@ -0,0 +1,159 @@
+package session
+
+import (
+	"os"
+	"path/filepath"
+	"strings"
+	"testing"
+)
+
+// saveTestSession writes metadata (and optionally saved data) the way coi does during a session
+func saveTestSession(t *testing.T, sessionsDir, sessionID, workspace, savedAt string, withData bool) {
+	t.Helper()
+	if withData {
+		if err := os.MkdirAll(filepath.Join(sessionsDir, sessionID, ".claude"), 0o755); err != nil {
+			t.Fatal(err)
+		}
+	}
+	if err := os.MkdirAll(filepath.Join(sessionsDir, sessionID), 0o755); err != nil {
+		t.Fatal(err)
+	}
+	metadata := SessionMetadata{
+		SessionID:     sessionID,
+		ContainerName: ContainerName(workspace, 1),
+		Workspace:     workspace,
+		SavedAt:       savedAt,
+	}
+	if err := saveMetadata(filepath.Join(sessionsDir, sessionID, "metadata.json"), metadata); err != nil {
+		t.Fatal(err)
+	}
+}
+
+func TestSessionIndexTracksMetadata(t *testing.T) {
+	sessionsDir := t.TempDir()
+
+	if err := SaveMetadataEarly(sessionsDir, "s1", ContainerName("/work/a", 1), "/work/a", false); err != nil {
+		t.Fatalf("SaveMetadataEarly() unexpected error: %v", err)
+	}
+	saveTestSession(t, sessionsDir, "s2", "/work/b", "2026-01-02T10:00:00Z", true)
+
+	records, err := LoadSessionIndex(sessionsDir)
+	if err != nil {
+		t.Fatalf("LoadSessionIndex() unexpected error: %v", err)
+	}
+	if len(records) != 2 {
+		t.Fatalf("LoadSessionIndex() returned %d records, want 2", len(records))
+	}
+	if records[0].HasData || !records[1].HasData {
+		t.Errorf("LoadSessionIndex() HasData = %v/%v, want false/true", records[0].HasData, records[1].HasData)
+	}
+	if records[1].WorkspaceHash != WorkspaceHash("/work/b") {
+		t.Errorf("WorkspaceHash = %q, want %q", records[1].WorkspaceHash, WorkspaceHash("/work/b"))
+	}
+
+	// Saving data for s1 later updates its record
+	saveTestSession(t, sessionsDir, "s1", "/work/a", "2026-01-03T10:00:00Z", true)
+	sessions, err := ListSavedSessions(sessionsDir)
+	if err != nil || strings.Join(sessions, ",") != "s1,s2" {
+		t.Errorf("ListSavedSessions() = %v, %v, want [s1 s2]", sessions, err)
+	}
+}
+
+func TestGetLatestSessionForWorkspaceFromIndex(t *testing.T) {
+	sessionsDir := t.TempDir()
+	saveTestSession(t, sessionsDir, "old", "/work/a", "2026-01-01T10:00:00Z", true)
+	saveTestSession(t, sessionsDir, "new", "/work/a", "2026-01-05T10:00:00Z", true)
+	saveTestSession(t, sessionsDir, "other", "/work/b", "2026-01-09T10:00:00Z", true)
+	saveTestSession(t, sessionsDir, "nodata", "/work/a", "2026-01-10T10:00:00Z", false)
+
+	got, err := GetLatestSessionForWorkspace(sessionsDir, "/work/a")
+	if err != nil || got != "new" {
+		t.Errorf("GetLatestSessionForWorkspace() = %q, %v, want new", got, err)
+	}
+
+	// Deleted behind coi's back: the index entry is skipped
+	if err := os.RemoveAll(filepath.Join(sessionsDir, "new")); err != nil {
+		t.Fatal(err)
+	}
+	got, err = GetLatestSessionForWorkspace(sessionsDir, "/work/a")
+	if err != nil || got != "old" {
+		t.Errorf("GetLatestSessionForWorkspace() = %q, %v, want old", got, err)
+	}
+
+	latest, err := GetLatestSession(sessionsDir)
+	if err != nil || latest != "other" {
+		t.Errorf("GetLatestSession() = %q, %v, want other", latest, err)
+	}
+
+	if _, err := GetLatestSessionForWorkspace(sessionsDir, "/work/none"); err == nil {
+		t.Error("GetLatestSessionForWorkspace() expected error for unknown workspace, got nil")
+	}
+}
+
+func TestSessionIndexRebuild(t *testing.T) {
+	sessionsDir := t.TempDir()
+	saveTestSession(t, sessionsDir, "s1", "/work/a", "2026-01-01T10:00:00Z", true)
+
+	// Corrupt index is rebuilt from the session directories
+	if err := os.WriteFile(indexPath(sessionsDir), []byte("{not json\n"), 0o644); err != nil {
+		t.Fatal(err)
+	}
+	// A session saved only as data (no metadata) is still listed
+	if err := os.MkdirAll(filepath.Join(sessionsDir, "legacy", ".claude"), 0o755); err != nil {
+		t.Fatal(err)
+	}
+
+	records, err := LoadSessionIndex(sessionsDir)
+	if err != nil {
+		t.Fatalf("LoadSessionIndex() unexpected error: %v", err)
+	}
+	if len(records) != 2 || records[0].SessionID != "legacy" || records[1].SessionID != "s1" {
+		t.Errorf("LoadSessionIndex() = %+v, want legacy and s1", records)
+	}
+
+	data, _ := os.ReadFile(indexPath(sessionsDir))
+	if strings.Contains(string(data), "not json") {
+		t.Error("corrupt index was not rewritten")
+	}
+}
+
+func TestSessionIndexRemoveAndCompact(t *testing.T) {
+	sessionsDir := t.TempDir()
+	saveTestSession(t, sessionsDir, "keep", "/work/a", "2026-01-01T10:00:00Z", true)
+	saveTestSession(t, sessionsDir, "drop", "/work/a", "2026-01-02T10:00:00Z", true)
+
+	if err := RemoveSession(sessionsDir, "drop"); err != nil {
+		t.Fatalf("RemoveSession() unexpected error: %v", err)
+	}
+	records, _ := LoadSessionIndex(sessionsDir)
+	if len(records) != 1 || records[0].SessionID != "keep" {
+		t.Errorf("LoadSessionIndex() after removal = %+v, want only keep", records)
+	}
+
+	// Many updates of the same session are folded into one line on the next read
+	for i := 0; i < indexCompactSlack+10; i++ {
+		saveTestSession(t, sessionsDir, "keep", "/work/a", "2026-01-01T10:00:00Z", true)
+	}
+	if _, err := LoadSessionIndex(sessionsDir); err != nil {
+		t.Fatal(err)
+	}
+	data, _ := os.ReadFile(indexPath(sessionsDir))
+	if lines := strings.Count(string(data), "\n"); lines != 1 {
+		t.Errorf("index has %d lines after compaction, want 1", lines)
+	}
+}
+
+func TestFindSessionByContainer(t *testing.T) {
+	sessionsDir := t.TempDir()
+	saveTestSession(t, sessionsDir, "first", "/work/a", "2026-01-01T10:00:00Z", true)
+	saveTestSession(t, sessionsDir, "second", "/work/a", "2026-01-02T10:00:00Z", false)
+
+	record, err := FindSessionByContainer(sessionsDir, ContainerName("/work/a", 1))
+	if err != nil || record.SessionID != "second" {
+		t.Errorf("FindSessionByContainer() = %+v, %v, want second", record, err)
+	}
+
+	if _, err := FindSessionByContainer(sessionsDir, "coi-missing-1"); err == nil {
+		t.Error("FindSessionByContainer() expected error for unknown container, got nil")
+	}
+}
@@ -0,0 +1,159 @@
+package session
+
+import (
+	"bytes"
+	"encoding/json"
+	"fmt"
+	"unicode/utf8"
+)
+
+// jsonMember is a single top-level member of a JSON object, kept in document order
+type jsonMember struct {
+	key   string
+	value json.RawMessage
+}
+
+// mergeSandboxSettings applies settings on top of the top-level keys of a JSON object
+// and returns the re-encoded document.
+//
+// The output matches what the previous in-container Python merge produced with
+// `d.update(updates); json.dump(d, f, indent=2)`: existing keys keep their position,
+// new keys are appended in sorted order (the order json.Marshal handed them to Python),
+// and non-ASCII characters are written as \u escapes.
+func mergeSandboxSettings(data []byte, settings map[string]interface{}) ([]byte, error) {
+	members, err := decodeJSONObject(data)
+	if err != nil {
+		return nil, fmt.Errorf("failed to parse JSON: %w", err)
+	}
+
+	index := make(map[string]int, len(members))
+	for i, member := range members {
+		index[member.key] = i
+	}
+
+	for _, key := range sortedKeys(settings) {
+		value, err := marshalJSONValue(settings[key])
+		if err != nil {
+			return nil, fmt.Errorf("failed to marshal setting %s: %w", key, err)
+		}
+		if i, ok := index[key]; ok {
+			members[i].value = value
+			continue
+		}
+		index[key] = len(members)
+		members = append(members, jsonMember{key: key, value: value})
+	}
+
+	return encodeJSONObject(members)
+}
+
+// decodeJSONObject splits a JSON object into its top-level members in document order.
+// Duplicate keys keep the position of the first occurrence and the value of the last,
+// like Python's json.load.
+func decodeJSONObject(data []byte) ([]jsonMember, error) {
+	dec := json.NewDecoder(bytes.NewReader(data))
+
+	tok, err := dec.Token()
+	if err != nil {
+		return nil, err
+	}
+	if delim, ok := tok.(json.Delim); !ok || delim != '{' {
+		return nil, fmt.Errorf("top-level value is not an object")
+	}
+
+	members := []jsonMember{}
+	index := map[string]int{}
+	for dec.More() {
+		tok, err := dec.Token()
+		if err != nil {
+			return nil, err
+		}
+		key, ok := tok.(string)
+		if !ok {
+			return nil, fmt.Errorf("unexpected object key %v", tok)
+		}
+
+		var value json.RawMessage
+		if err := dec.Decode(&value); err != nil {
+			return nil, err
+		}
+
+		if i, ok := index[key]; ok {
+			members[i].value = value
+			continue
+		}
+		index[key] = len(members)
+		members = append(members, jsonMember{key: key, value: value})
+	}
+
+	if _, err := dec.Token(); err != nil {
+		return nil, err
+	}
+	if _, err := dec.Token(); err == nil {
+		return nil, fmt.Errorf("unexpected data after top-level object")
+	}
+
+	return members, nil
+}
+
+// marshalJSONValue encodes v without HTML escaping (Python leaves <, > and & alone)
+func marshalJSONValue(v interface{}) (json.RawMessage, error) {
+	var buf bytes.Buffer
+	enc := json.NewEncoder(&buf)
+	enc.SetEscapeHTML(false)
+	if err := enc.Encode(v); err != nil {
+		return nil, err
+	}
+	return bytes.TrimRight(buf.Bytes(), "\n"), nil
+}
+
+// encodeJSONObject writes members as a JSON object indented with two spaces
+func encodeJSONObject(members []jsonMember) ([]byte, error) {
+	if len(members) == 0 {
+		return []byte("{}"), nil
+	}
+
+	var compact bytes.Buffer
+	compact.WriteByte('{')
+	for i, member := range members {
+		if i > 0 {
+			compact.WriteByte(',')
+		}
+		key, err := marshalJSONValue(member.key)
+		if err != nil {
+			return nil, err
+		}
+		compact.Write(key)
+		compact.WriteByte(':')
+		if err := json.Compact(&compact, member.value); err != nil {
+			return nil, err
+		}
+	}
+	compact.WriteByte('}')
+
+	var out bytes.Buffer
+	if err := json.Indent(&out, compact.Bytes(), "", "  "); err != nil {
+		return nil, err
+	}
+	return asciiEscape(out.Bytes()), nil
+}
+
+// asciiEscape replaces non-ASCII characters with \u escapes (Python's ensure_ascii).
+// Outside of strings JSON is pure ASCII, so the replacement only touches string contents.
+func asciiEscape(data []byte) []byte {
+	var out bytes.Buffer
+	for len(data) > 0 {
+		r, size := utf8.DecodeRune(data)
+		switch {
+		case r < utf8.RuneSelf:
+			out.WriteByte(data[0])
+		case r > 0xFFFF:
+			r -= 0x10000
+			fmt.Fprintf(&out, `\u%04x\u%04x`, 0xD800+(r>>10), 0xDC00+(r&0x3FF))
+		default:
+			fmt.Fprintf(&out, `\u%04x`, r)
+		}
+		data = data[size:]
+	}
+	return out.Bytes()
+}
@@ -0,0 +1,67 @@
+package session
+
+import (
+	"testing"
+)
+
+func TestMergeSandboxSettings(t *testing.T) {
+	input := `{"z": 1, "theme": "dark", "nested": {"a": [1, 2], "e": {}}, "name": "café <b>"}`
+	settings := map[string]interface{}{
+		"theme":  "light",
+		"bypass": true,
+		"allow":  "a&b",
+	}
+
+	// Byte-for-byte what python3's d.update(updates); json.dump(d, f, indent=2) writes
+	want := `{
+  "z": 1,
+  "theme": "light",
+  "nested": {
+    "a": [
+      1,
+      2
+    ],
+    "e": {}
+  },
+  "name": "caf\u00e9 <b>",
+  "allow": "a&b",
+  "bypass": true
+}`
+
+	got, err := mergeSandboxSettings([]byte(input), settings)
+	if err != nil {
+		t.Fatalf("mergeSandboxSettings() unexpected error: %v", err)
+	}
+	if string(got) != want {
+		t.Errorf("mergeSandboxSettings() =\n%s\nwant\n%s", got, want)
+	}
+}
+
+func TestMergeSandboxSettingsEdgeCases(t *testing.T) {
+	tests := []struct {
+		name    string
+		input   string
+		want    string
+		wantErr bool
+	}{
+		{"empty object", `{}`, "{\n  \"a\": 1\n}", false},
+		{"duplicate keys keep first position", `{"a": 0, "b": 2, "a": 3}`, "{\n  \"a\": 1,\n  \"b\": 2\n}", false},
+		{"emoji uses surrogate pair", `{"e": "😀"}`, "{\n  \"e\": \"\\ud83d\\ude00\",\n  \"a\": 1\n}", false},
+		{"array", `[1, 2]`, "", true},
+		{"null", `null`, "", true},
+		{"invalid", `{"a":`, "", true},
+		{"trailing data", `{} {}`, "", true},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			got, err := mergeSandboxSettings([]byte(tt.input), map[string]interface{}{"a": 1})
+			if (err != nil) != tt.wantErr {
+				t.Fatalf("mergeSandboxSettings() error = %v, wantErr %v", err, tt.wantErr)
+			}
+			if !tt.wantErr && string(got) != tt.want {
+				t.Errorf("mergeSandboxSettings() = %q, want %q", got, tt.want)
+			}
+		})
+	}
+}
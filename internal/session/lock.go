@@ -0,0 +1,30 @@
+package session
+
+import (
+	"os"
+	"path/filepath"
+	"syscall"
+)
+
+// lockFile takes an exclusive advisory lock on path (created if missing), blocking until
+// it is available. The lock is released by the returned function or when the process exits.
+func lockFile(path string) (func(), error) {
+	if err := os.MkdirAll(filepath.Dir(path), 0o755); err != nil {
+		return nil, err
+	}
+
+	f, err := os.OpenFile(path, os.O_CREATE|os.O_RDWR, 0o644)
+	if err != nil {
+		return nil, err
+	}
+
+	if err := syscall.Flock(int(f.Fd()), syscall.LOCK_EX); err != nil {
+		f.Close()
+		return nil, err
+	}
+
+	return func() {
+		_ = syscall.Flock(int(f.Fd()), syscall.LOCK_UN)
+		f.Close()
+	}, nil
+}
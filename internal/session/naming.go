@@ -2,7 +2,6 @@ package session
 
 import (
 	"crypto/sha256"
-	"encoding/json"
 	"fmt"
 	"os"
 	"path/filepath"
@@ -45,118 +44,32 @@ func ContainerName(workspacePath string, slot int) string {
 	return fmt.Sprintf("%s%s-%d", prefix, hash, slot)
 }
 
+// workspacePrefix returns the container name prefix shared by all slots of a workspace
+func workspacePrefix(workspacePath string) string {
+	return fmt.Sprintf("%s%s-", GetContainerPrefix(), WorkspaceHash(workspacePath))
+}
+
 // AllocateSlot finds the next available slot for a workspace
 // Returns the slot number (1, 2, 3, ...) or 0 if no slots available
 func AllocateSlot(workspacePath string, maxSlots int) (int, error) {
-	if maxSlots == 0 {
-		maxSlots = 10 // Default max 10 parallel sessions
-	}
-
-	hash := WorkspaceHash(workspacePath)
-	prefix := fmt.Sprintf("%s%s-", GetContainerPrefix(), hash)
-
-	// Get all containers matching our workspace
-	output, err := container.IncusOutput("list", "--format=json")
-	if err != nil {
-		return 0, err
-	}
-
-	// Parse running containers using proper JSON parsing
-	runningSlots := make(map[int]bool)
-	re := regexp.MustCompile(fmt.Sprintf(`^%s(\d+)$`, regexp.QuoteMeta(prefix)))
-
-	// Parse JSON array of containers
-	var containers []struct {
-		Name string `json:"name"`
-	}
-	if err := json.Unmarshal([]byte(output), &containers); err != nil {
-		// Fallback: if JSON parsing fails, try regex on raw output
-		nameMatches := regexp.MustCompile(`"name"\s*:\s*"([^"]+)"`).FindAllStringSubmatch(output, -1)
-		for _, match := range nameMatches {
-			if len(match) > 1 {
-				containerName := match[1]
-				if matches := re.FindStringSubmatch(containerName); len(matches) > 1 {
-					if slotNum, err := strconv.Atoi(matches[1]); err == nil {
-						runningSlots[slotNum] = true
-					}
-				}
-			}
-		}
-	} else {
-		for _, c := range containers {
-			if matches := re.FindStringSubmatch(c.Name); len(matches) > 1 {
-				if slotNum, err := strconv.Atoi(matches[1]); err == nil {
-					runningSlots[slotNum] = true
-				}
-			}
-		}
-	}
-
-	// Find first available slot
-	for slot := 1; slot <= maxSlots; slot++ {
-		if !runningSlots[slot] {
-			return slot, nil
-		}
-	}
-
-	return 0, fmt.Errorf("all %d slots are in use", maxSlots)
+	return AllocateSlotFrom(workspacePath, 1, maxSlots)
 }
 
 // AllocateSlotFrom finds the next available slot starting from a specific slot number
-// Returns the slot number or error if no slots available
+// Returns the slot number or error if no slots available.
+// The slot is reserved for this process until its container exists, so parallel
+// coi invocations for the same workspace always get different slots.
 func AllocateSlotFrom(workspacePath string, startSlot, maxSlots int) (int, error) {
 	if maxSlots == 0 {
-		maxSlots = 10 // Default max 10 parallel sessions
+		maxSlots = DefaultMaxSlots
 	}
 
-	hash := WorkspaceHash(workspacePath)
-	prefix := fmt.Sprintf("%s%s-", GetContainerPrefix(), hash)
-
-	// Get all containers matching our workspace
-	output, err := container.IncusOutput("list", "--format=json")
+	prefix := workspacePrefix(workspacePath)
+	allocator, err := newSlotAllocator(prefix)
 	if err != nil {
 		return 0, err
 	}
-
-	// Parse running containers using proper JSON parsing
-	runningSlots := make(map[int]bool)
-	re := regexp.MustCompile(fmt.Sprintf(`^%s(\d+)$`, regexp.QuoteMeta(prefix)))
-
-	// Parse JSON array of containers
-	var containers []struct {
-		Name string `json:"name"`
-	}
-	if err := json.Unmarshal([]byte(output), &containers); err != nil {
-		// Fallback: if JSON parsing fails, try regex on raw output
-		nameMatches := regexp.MustCompile(`"name"\s*:\s*"([^"]+)"`).FindAllStringSubmatch(output, -1)
-		for _, match := range nameMatches {
-			if len(match) > 1 {
-				containerName := match[1]
-				if matches := re.FindStringSubmatch(containerName); len(matches) > 1 {
-					if slotNum, err := strconv.Atoi(matches[1]); err == nil {
-						runningSlots[slotNum] = true
-					}
-				}
-			}
-		}
-	} else {
-		for _, c := range containers {
-			if matches := re.FindStringSubmatch(c.Name); len(matches) > 1 {
-				if slotNum, err := strconv.Atoi(matches[1]); err == nil {
-					runningSlots[slotNum] = true
-				}
-			}
-		}
-	}
-
-	// Find first available slot starting from startSlot
-	for slot := startSlot; slot <= maxSlots; slot++ {
-		if !runningSlots[slot] {
-			return slot, nil
-		}
-	}
-
-	return 0, fmt.Errorf("no available slots from %d to %d", startSlot, maxSlots)
+	return allocator.allocate(prefix, startSlot, maxSlots)
 }
 
 // IsSlotAvailable checks if a specific slot is available
@@ -191,43 +104,17 @@ func ParseContainerName(containerName string) (string, int, error) {
 // ListWorkspaceSessions lists all sessions for a workspace
 // Returns map of slot -> container name
 func ListWorkspaceSessions(workspacePath string) (map[int]string, error) {
-	hash := WorkspaceHash(workspacePath)
-	prefix := fmt.Sprintf("%s%s-", GetContainerPrefix(), hash)
-
-	output, err := container.IncusOutput("list", "--format=json")
+	prefix := workspacePrefix(workspacePath)
+	names, err := container.ListInstanceNamesWithPrefix(prefix)
 	if err != nil {
 		return nil, err
 	}
 
 	sessions := make(map[int]string)
-	re := regexp.MustCompile(fmt.Sprintf(`^%s(\d+)$`, regexp.QuoteMeta(prefix)))
-
-	// Parse JSON array of containers
-	var containers []struct {
-		Name string `json:"name"`
-	}
-	if err := json.Unmarshal([]byte(output), &containers); err != nil {
-		// Fallback: if JSON parsing fails, try regex on raw output
-		nameMatches := regexp.MustCompile(`"name"\s*:\s*"([^"]+)"`).FindAllStringSubmatch(output, -1)
-		for _, match := range nameMatches {
-			if len(match) > 1 {
-				containerName := match[1]
-				if matches := re.FindStringSubmatch(containerName); len(matches) > 1 {
-					if slotNum, err := strconv.Atoi(matches[1]); err == nil {
-						sessions[slotNum] = containerName
-					}
-				}
-			}
-		}
-	} else {
-		for _, c := range containers {
-			if matches := re.FindStringSubmatch(c.Name); len(matches) > 1 {
-				if slotNum, err := strconv.Atoi(matches[1]); err == nil {
-					sessions[slotNum] = c.Name
-				}
-			}
+	for _, name := range names {
+		if slot, ok := parseSlotSuffix(name, prefix); ok {
+			sessions[slot] = name
 		}
 	}
-
 	return sessions, nil
 }
@@ -0,0 +1,129 @@
+package session
+
+import (
+	"archive/tar"
+	"bytes"
+	"fmt"
+	"os"
+	"path"
+	"time"
+
+	"github.com/mensfeld/code-on-incus/internal/container"
+)
+
+// homeOverlay is a set of directories and files staged on the host and written
+// into the container home directory as a single tar archive.
+// Ownership is carried in the tar headers, so no chown pass is needed afterwards.
+type homeOverlay struct {
+	uid     int
+	gid     int
+	entries []overlayEntry
+}
+
+// overlayEntry is a single directory or file in the overlay (path relative to home)
+type overlayEntry struct {
+	path string
+	mode os.FileMode
+	data []byte
+	dir  bool
+}
+
+// newHomeOverlay creates an empty overlay whose entries will be owned by uid:gid
+func newHomeOverlay(uid, gid int) *homeOverlay {
+	return &homeOverlay{uid: uid, gid: gid}
+}
+
+// homeOwner returns the uid owning files under homeDir:
+// everything under a non-root home belongs to the code user
+func homeOwner(homeDir string) int {
+	if homeDir == "/root" {
+		return 0
+	}
+	return container.CodeUID
+}
+
+// AddDir stages a directory
+func (o *homeOverlay) AddDir(relPath string, mode os.FileMode) {
+	o.entries = append(o.entries, overlayEntry{path: relPath, mode: mode, dir: true})
+}
+
+// AddFile stages a file with the given content
+func (o *homeOverlay) AddFile(relPath string, data []byte, mode os.FileMode) {
+	o.entries = append(o.entries, overlayEntry{path: relPath, mode: mode, data: data})
+}
+
+// AddHostFile stages a copy of a host file, keeping its permission bits.
+// Returns false if the host file does not exist.
+func (o *homeOverlay) AddHostFile(relPath, hostPath string) (bool, error) {
+	info, err := os.Stat(hostPath)
+	if os.IsNotExist(err) {
+		return false, nil
+	}
+	if err != nil {
+		return false, err
+	}
+
+	data, err := os.ReadFile(hostPath)
+	if err != nil {
+		return false, err
+	}
+	o.AddFile(relPath, data, info.Mode().Perm())
+	return true, nil
+}
+
+// hostFileMode returns the permission bits of a host file, or 0644 if it cannot be read
+func hostFileMode(hostPath string) os.FileMode {
+	info, err := os.Stat(hostPath)
+	if err != nil {
+		return 0o644
+	}
+	return info.Mode().Perm()
+}
+
+// Archive renders the overlay as a tar archive
+func (o *homeOverlay) Archive() ([]byte, error) {
+	var buf bytes.Buffer
+	tw := tar.NewWriter(&buf)
+	now := time.Now()
+
+	for _, entry := range o.entries {
+		header := &tar.Header{
+			Name:    path.Clean(entry.path),
+			Mode:    int64(entry.mode.Perm()),
+			Uid:     o.uid,
+			Gid:     o.gid,
+			ModTime: now,
+			Format:  tar.FormatPAX,
+		}
+		if entry.dir {
+			header.Typeflag = tar.TypeDir
+			header.Name += "/"
+		} else {
+			header.Typeflag = tar.TypeReg
+			header.Size = int64(len(entry.data))
+		}
+
+		if err := tw.WriteHeader(header); err != nil {
+			return nil, fmt.Errorf("failed to write tar header for %s: %w", entry.path, err)
+		}
+		if !entry.dir {
+			if _, err := tw.Write(entry.data); err != nil {
+				return nil, fmt.Errorf("failed to write %s to archive: %w", entry.path, err)
+			}
+		}
+	}
+
+	if err := tw.Close(); err != nil {
+		return nil, err
+	}
+	return buf.Bytes(), nil
+}
+
+// Push extracts the overlay into homeDir inside the container with a single exec
+func (o *homeOverlay) Push(mgr *container.Manager, homeDir string) error {
+	archive, err := o.Archive()
+	if err != nil {
+		return err
+	}
+	return mgr.ExtractArchive(bytes.NewReader(archive), homeDir)
+}
@@ -0,0 +1,142 @@
+package session
+
+import (
+	"archive/tar"
+	"bytes"
+	"encoding/json"
+	"io"
+	"os"
+	"path/filepath"
+	"testing"
+
+	"github.com/mensfeld/code-on-incus/internal/tool"
+)
+
+// readArchive returns the headers and contents of every entry in a tar archive
+func readArchive(t *testing.T, data []byte) (map[string]*tar.Header, map[string][]byte) {
+	t.Helper()
+
+	headers := map[string]*tar.Header{}
+	contents := map[string][]byte{}
+	tr := tar.NewReader(bytes.NewReader(data))
+	for {
+		header, err := tr.Next()
+		if err == io.EOF {
+			break
+		}
+		if err != nil {
+			t.Fatalf("Failed to read archive: %v", err)
+		}
+		body, _ := io.ReadAll(tr)
+		headers[header.Name] = header
+		contents[header.Name] = body
+	}
+	return headers, contents
+}
+
+func TestHomeOverlayArchive(t *testing.T) {
+	overlay := newHomeOverlay(1000, 1000)
+	overlay.AddDir(".claude", 0o755)
+	overlay.AddFile(".claude/settings.json", []byte(`{"a":1}`), 0o600)
+
+	data, err := overlay.Archive()
+	if err != nil {
+		t.Fatalf("Archive() unexpected error: %v", err)
+	}
+
+	headers, contents := readArchive(t, data)
+
+	dir, ok := headers[".claude/"]
+	if !ok || dir.Typeflag != tar.TypeDir {
+		t.Fatalf("Archive() missing directory entry, got %v", headers)
+	}
+
+	file := headers[".claude/settings.json"]
+	if file == nil {
+		t.Fatal("Archive() missing settings.json entry")
+	}
+	if file.Uid != 1000 || file.Gid != 1000 || dir.Uid != 1000 {
+		t.Errorf("Archive() ownership = %d:%d, want 1000:1000", file.Uid, file.Gid)
+	}
+	if file.Mode != 0o600 {
+		t.Errorf("Archive() mode = %o, want 600", file.Mode)
+	}
+	if string(contents[".claude/settings.json"]) != `{"a":1}` {
+		t.Errorf("Archive() content = %q", contents[".claude/settings.json"])
+	}
+}
+
+func TestBuildCLIConfigOverlay(t *testing.T) {
+	home := t.TempDir()
+	configDir := filepath.Join(home, ".claude")
+	if err := os.MkdirAll(configDir, 0o755); err != nil {
+		t.Fatal(err)
+	}
+	_ = os.WriteFile(filepath.Join(configDir, ".credentials.json"), []byte(`{"token":"x"}`), 0o600)
+	_ = os.WriteFile(filepath.Join(configDir, "settings.json"), []byte(`{"theme":"dark"}`), 0o644)
+	_ = os.WriteFile(filepath.Join(configDir, "debug.log"), []byte("noise"), 0o644)
+	_ = os.WriteFile(filepath.Join(home, ".claude.json"), []byte(`{"numStartups":3}`), 0o600)
+
+	overlay, err := buildCLIConfigOverlay(configDir, "/home/code", tool.NewClaude(), func(string) {})
+	if err != nil {
+		t.Fatalf("buildCLIConfigOverlay() unexpected error: %v", err)
+	}
+	data, err := overlay.Archive()
+	if err != nil {
+		t.Fatalf("Archive() unexpected error: %v", err)
+	}
+	headers, contents := readArchive(t, data)
+
+	for _, name := range []string{".claude/", ".claude/.credentials.json", ".claude/settings.json", ".claude.json"} {
+		if _, ok := headers[name]; !ok {
+			t.Errorf("overlay missing %s", name)
+		}
+	}
+	if _, ok := headers[".claude/debug.log"]; ok {
+		t.Error("overlay should only contain essential files, found debug.log")
+	}
+	if headers[".claude/.credentials.json"].Mode != 0o600 {
+		t.Errorf("credentials mode = %o, want 600", headers[".claude/.credentials.json"].Mode)
+	}
+	if headers[".claude.json"].Uid != 1000 {
+		t.Errorf(".claude.json uid = %d, want 1000", headers[".claude.json"].Uid)
+	}
+
+	var settings map[string]interface{}
+	if err := json.Unmarshal(contents[".claude/settings.json"], &settings); err != nil {
+		t.Fatalf("settings.json is not valid JSON: %v", err)
+	}
+	if settings["theme"] != "dark" || settings["bypassPermissionsModeAccepted"] != true {
+		t.Errorf("settings.json = %v, want original keys plus sandbox settings", settings)
+	}
+
+	var state map[string]interface{}
+	if err := json.Unmarshal(contents[".claude.json"], &state); err != nil {
+		t.Fatalf(".claude.json is not valid JSON: %v", err)
+	}
+	if state["numStartups"] != float64(3) || state["allowDangerouslySkipPermissions"] != true {
+		t.Errorf(".claude.json = %v, want original keys plus sandbox settings", state)
+	}
+}
+
+func TestBuildCLIConfigOverlayRootHome(t *testing.T) {
+	configDir := filepath.Join(t.TempDir(), ".claude")
+	if err := os.MkdirAll(configDir, 0o755); err != nil {
+		t.Fatal(err)
+	}
+
+	overlay, err := buildCLIConfigOverlay(configDir, "/root", tool.NewClaude(), func(string) {})
+	if err != nil {
+		t.Fatalf("buildCLIConfigOverlay() unexpected error: %v", err)
+	}
+	data, _ := overlay.Archive()
+	headers, contents := readArchive(t, data)
+
+	if headers[".claude/"].Uid != 0 {
+		t.Errorf("root home overlay uid = %d, want 0", headers[".claude/"].Uid)
+	}
+	// Missing settings.json is created from the sandbox settings alone
+	if _, ok := contents[".claude/settings.json"]; !ok {
+		t.Error("overlay should create settings.json when the host has none")
+	}
+}
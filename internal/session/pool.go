@@ -0,0 +1,197 @@
+package session
+
+import (
+	"crypto/rand"
+	"crypto/sha256"
+	"errors"
+	"fmt"
+	"sort"
+	"strings"
+
+	"github.com/mensfeld/code-on-incus/internal/container"
+)
+
+// PoolImageKey is the instance config key marking a container as a warm pool
+// member and recording the image alias it was created from
+const PoolImageKey = "user.coi.pool.image"
+
+// GetPoolPrefix returns the name prefix for warm pool containers.
+// It deliberately does not start with the session prefix, so pool members
+// never show up in `coi list` or get removed by `coi clean`.
+func GetPoolPrefix() string {
+	return "pool-" + GetContainerPrefix()
+}
+
+// poolImageHash returns a short hash identifying an image alias in pool container names
+func poolImageHash(image string) string {
+	hash := sha256.Sum256([]byte(image))
+	return fmt.Sprintf("%x", hash)[:8]
+}
+
+// poolContainerName generates a unique name for a new pool container
+// Format: pool-<prefix><image-hash>-<random>
+func poolContainerName(image string) (string, error) {
+	suffix := make([]byte, 3)
+	if _, err := rand.Read(suffix); err != nil {
+		return "", err
+	}
+	return fmt.Sprintf("%s%s-%x", GetPoolPrefix(), poolImageHash(image), suffix), nil
+}
+
+// PoolMember describes a single warm pool container
+type PoolMember struct {
+	Name  string
+	Image string
+	Stale bool // Created from an older build of the image
+}
+
+// ListPool returns the warm pool containers for image (all images if image is empty)
+func ListPool(image string) ([]PoolMember, error) {
+	container.InvalidateCache()
+	instances, err := container.ListInstances()
+	if err != nil {
+		return nil, err
+	}
+
+	fingerprints := map[string]string{}
+	members := []PoolMember{}
+	for _, inst := range instances {
+		poolImage := inst.Config[PoolImageKey]
+		if poolImage == "" || !strings.HasPrefix(inst.Name, GetPoolPrefix()) {
+			continue
+		}
+		if image != "" && poolImage != image {
+			continue
+		}
+		// A running pool member is being claimed or was started by hand
+		if inst.Running() {
+			continue
+		}
+
+		fingerprint, ok := fingerprints[poolImage]
+		if !ok {
+			fingerprint = imageFingerprint(poolImage)
+			fingerprints[poolImage] = fingerprint
+		}
+
+		members = append(members, PoolMember{
+			Name:  inst.Name,
+			Image: poolImage,
+			Stale: fingerprint != "" && !strings.HasPrefix(inst.Config["volatile.base_image"], fingerprint),
+		})
+	}
+
+	sort.Slice(members, func(i, j int) bool { return members[i].Name < members[j].Name })
+	return members, nil
+}
+
+// imageFingerprint returns the fingerprint behind a local image alias,
+// or "" if the alias is not a local image (e.g. "images:ubuntu/22.04")
+func imageFingerprint(alias string) string {
+	images, err := container.ListImages()
+	if err != nil {
+		return ""
+	}
+	for i := range images {
+		if images[i].HasAlias(alias) {
+			return images[i].Fingerprint
+		}
+	}
+	return ""
+}
+
+// poolInstanceSpec returns the spec of a new pool member. It carries no config besides
+// the pool marker: a claimed member gets the session's spec applied before it starts, so
+// it ends up with exactly the config (and security profile) of a freshly created container.
+func poolInstanceSpec(image, name string) *container.InstanceSpec {
+	spec := container.NewInstanceSpec(image, name)
+	spec.Config[PoolImageKey] = image
+	return spec
+}
+
+// FillPool tops up the warm pool for image to size containers.
+// Stale members (created from an older build of the image) are replaced.
+// Returns the number of containers created.
+func FillPool(image string, size int, logger func(string)) (int, error) {
+	members, err := ListPool(image)
+	if err != nil {
+		return 0, err
+	}
+
+	current := 0
+	for _, member := range members {
+		if member.Stale {
+			logger(fmt.Sprintf("Removing stale pool container %s", member.Name))
+			if err := container.DeleteContainer(member.Name); err != nil {
+				logger(fmt.Sprintf("Warning: Failed to remove %s: %v", member.Name, err))
+			}
+			continue
+		}
+		current++
+	}
+
+	created := 0
+	for ; current < size; current++ {
+		name, err := poolContainerName(image)
+		if err != nil {
+			return created, err
+		}
+
+		logger(fmt.Sprintf("Creating pool container %s from %s...", name, image))
+		if err := container.CreateInstance(poolInstanceSpec(image, name), false); err != nil {
+			return created, fmt.Errorf("failed to create pool container: %w", err)
+		}
+		created++
+	}
+
+	return created, nil
+}
+
+// DrainPool deletes the warm pool containers for image (all images if image is empty).
+// Returns the number of containers removed.
+func DrainPool(image string) (int, error) {
+	members, err := ListPool(image)
+	if err != nil {
+		return 0, err
+	}
+
+	removed := 0
+	var errs []error
+	for _, member := range members {
+		if err := container.DeleteContainer(member.Name); err != nil {
+			errs = append(errs, fmt.Errorf("%s: %w", member.Name, err))
+			continue
+		}
+		removed++
+	}
+	return removed, errors.Join(errs...)
+}
+
+// ClaimFromPool takes a stopped pool container for image and renames it to containerName.
+// Returns false (and no error) if the pool has no usable container, in which case
+// the caller should create one the normal way.
+func ClaimFromPool(image, containerName string) (bool, error) {
+	members, err := ListPool(image)
+	if err != nil {
+		return false, err
+	}
+
+	for _, member := range members {
+		if member.Stale {
+			continue
+		}
+
+		// Another coi process may claim the same member concurrently;
+		// only one rename succeeds, the loser moves on to the next one
+		if err := container.RenameContainer(member.Name, containerName); err != nil {
+			continue
+		}
+
+		if err := container.IncusExec("config", "unset", containerName, PoolImageKey); err != nil {
+			return true, fmt.Errorf("failed to unmark claimed pool container: %w", err)
+		}
+		return true, nil
+	}
+
+	return false, nil
+}
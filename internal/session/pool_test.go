@@ -0,0 +1,65 @@
+package session
+
+import (
+	"reflect"
+	"regexp"
+	"strings"
+	"testing"
+)
+
+func TestGetPoolPrefix(t *testing.T) {
+	t.Setenv("COI_CONTAINER_PREFIX", "")
+	if got := GetPoolPrefix(); got != "pool-coi-" {
+		t.Errorf("GetPoolPrefix() = %q, want %q", got, "pool-coi-")
+	}
+
+	t.Setenv("COI_CONTAINER_PREFIX", "coi-test-")
+	if got := GetPoolPrefix(); got != "pool-coi-test-" {
+		t.Errorf("GetPoolPrefix() with COI_CONTAINER_PREFIX = %q, want %q", got, "pool-coi-test-")
+	}
+}
+
+func TestPoolContainerName(t *testing.T) {
+	t.Setenv("COI_CONTAINER_PREFIX", "")
+
+	name, err := poolContainerName("coi")
+	if err != nil {
+		t.Fatalf("poolContainerName() unexpected error: %v", err)
+	}
+
+	re := regexp.MustCompile(`^pool-coi-[a-f0-9]{8}-[a-f0-9]{6}$`)
+	if !re.MatchString(name) {
+		t.Errorf("poolContainerName() = %q, want format pool-coi-<hash>-<random>", name)
+	}
+
+	// Pool members must stay invisible to session listing and cleanup
+	if strings.HasPrefix(name, GetContainerPrefix()) {
+		t.Errorf("poolContainerName() = %q must not start with session prefix %q", name, GetContainerPrefix())
+	}
+	if _, _, err := ParseContainerName(name); err == nil {
+		t.Errorf("ParseContainerName(%q) should reject pool container names", name)
+	}
+
+	other, _ := poolContainerName("coi")
+	if other == name {
+		t.Errorf("poolContainerName() returned the same name twice: %q", name)
+	}
+
+	rust, _ := poolContainerName("coi-rust")
+	if rust[:len("pool-coi-")+8] == name[:len("pool-coi-")+8] {
+		t.Errorf("poolContainerName() uses the same image hash for different images: %q, %q", name, rust)
+	}
+}
+
+func TestPoolInstanceSpec(t *testing.T) {
+	spec := poolInstanceSpec("coi", "pool-coi-abcd1234-000000")
+
+	// Claimed members must not differ from cold-created sessions (e.g. no security.nesting)
+	want := map[string]string{PoolImageKey: "coi"}
+	if !reflect.DeepEqual(spec.Config, want) {
+		t.Errorf("poolInstanceSpec() config = %v, want only %v", spec.Config, want)
+	}
+	if len(spec.Devices) != 0 || spec.Ephemeral {
+		t.Errorf("poolInstanceSpec() = %+v, want a plain non-ephemeral instance", spec)
+	}
+}
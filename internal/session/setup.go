@@ -4,7 +4,9 @@ import (
 	"context"
 	"encoding/json"
 	"fmt"
+	"io"
 	"os"
+	"path"
 	"path/filepath"
 	"strings"
 	"time"
@@ -45,18 +47,8 @@ func isColimaOrLimaEnvironment() bool {
 	return false
 }
 
-// buildJSONFromSettings converts a settings map to a properly escaped JSON string
-// Uses json.Marshal to ensure proper escaping and avoid command injection
-func buildJSONFromSettings(settings map[string]interface{}) (string, error) {
-	jsonBytes, err := json.Marshal(settings)
-	if err != nil {
-		return "", fmt.Errorf("failed to marshal settings: %w", err)
-	}
-	return string(jsonBytes), nil
-}
-
-// setupMounts mounts all configured directories to the container
-func setupMounts(mgr *container.Manager, mountConfig *MountConfig, useShift bool, logger func(string)) error {
+// setupMounts adds all configured directories to the instance spec as disk devices
+func setupMounts(spec *container.InstanceSpec, mountConfig *MountConfig, useShift bool, logger func(string)) error {
 	if mountConfig == nil || len(mountConfig.Mounts) == 0 {
 		return nil
 	}
@@ -70,9 +62,7 @@ func setupMounts(mgr *container.Manager, mountConfig *MountConfig, useShift bool
 		logger(fmt.Sprintf("Adding mount: %s -> %s", mount.HostPath, mount.ContainerPath))
 
 		// Apply shift setting (all mounts use same shift for now)
-		if err := mgr.MountDisk(mount.DeviceName, mount.HostPath, mount.ContainerPath, useShift); err != nil {
-			return fmt.Errorf("failed to add mount '%s': %w", mount.DeviceName, err)
-		}
+		spec.AddDisk(mount.DeviceName, mount.HostPath, mount.ContainerPath, useShift)
 	}
 
 	return nil
@@ -90,7 +80,9 @@ type SetupOptions struct {
 	CLIConfigPath string       // e.g., ~/.claude (host CLI config to copy credentials from)
 	Tool          tool.Tool    // AI coding tool being used
 	NetworkConfig *config.NetworkConfig
-	DisableShift  bool // Disable UID shifting (for Colima/Lima environments)
+	DisableShift  bool        // Disable UID shifting (for Colima/Lima environments)
+	UsePool       bool        // Claim a pre-created container from the warm pool if one is available
+	Timer         *PhaseTimer // Records how long each setup phase takes (optional)
 	Logger        func(string)
 }
 
@@ -130,7 +122,9 @@ func Setup(opts SetupOptions) (*SetupResult, error) {
 	result.Image = image
 
 	// Check if image exists
+	endImageCheck := opts.Timer.Start(PhaseImageCheck)
 	exists, err := container.ImageExists(image)
+	endImageCheck()
 	if err != nil {
 		return nil, fmt.Errorf("failed to check image: %w", err)
 	}
@@ -194,16 +188,10 @@ func Setup(opts SetupOptions) (*SetupResult, error) {
 		}
 	}
 
-	// 5. Create and configure container (but don't start yet if we need to add devices)
+	// 5. Create, configure and start the container in one step
 	// Always launch as non-ephemeral so we can save session data even if container is stopped
 	// (e.g., via 'sudo shutdown 0' from within). Cleanup will delete if not --persistent.
 	if !skipLaunch {
-		opts.Logger(fmt.Sprintf("Creating container from %s...", image))
-		// Create container without starting it (init)
-		if err := container.IncusExec("init", image, result.ContainerName); err != nil {
-			return nil, fmt.Errorf("failed to create container: %w", err)
-		}
-
 		// Configure UID/GID mapping for bind mounts based on environment
 		// Local: Use shift=true (kernel idmap support)
 		// CI: Use raw.idmap (kernel lacks idmap support, runner UID 1001 → container UID 1000)
@@ -219,11 +207,13 @@ func Setup(opts SetupOptions) (*SetupResult, error) {
 		useShift := !disableShift
 		isCI := os.Getenv("CI") == "true" || os.Getenv("GITHUB_ACTIONS") == "true"
 
+		// Everything known up front goes into one instance spec, so config and
+		// devices are applied together with creation instead of one call each
+		spec := container.NewInstanceSpec(image, result.ContainerName)
+
 		if isCI {
 			opts.Logger("Configuring UID/GID mapping for CI environment...")
-			if err := container.IncusExec("config", "set", result.ContainerName, "raw.idmap", "both 1001 1000"); err != nil {
-				opts.Logger(fmt.Sprintf("Warning: Failed to set raw.idmap: %v", err))
-			}
+			spec.Config["raw.idmap"] = "both 1001 1000"
 			useShift = false // Don't use shift=true with raw.idmap
 		} else if disableShift {
 			if !opts.DisableShift {
@@ -234,36 +224,59 @@ func Setup(opts SetupOptions) (*SetupResult, error) {
 			}
 		}
 
-		// Add disk devices BEFORE starting container
+		// Add disk devices so they are present when the container first starts
 		opts.Logger(fmt.Sprintf("Adding workspace mount: %s", opts.WorkspacePath))
-		if err := result.Manager.MountDisk("workspace", opts.WorkspacePath, "/workspace", useShift); err != nil {
-			return nil, fmt.Errorf("failed to add workspace device: %w", err)
-		}
+		spec.AddDisk("workspace", opts.WorkspacePath, "/workspace", useShift)
 
 		// Mount all configured directories
-		if err := setupMounts(result.Manager, opts.MountConfig, useShift, opts.Logger); err != nil {
+		if err := setupMounts(spec, opts.MountConfig, useShift, opts.Logger); err != nil {
 			return nil, err
 		}
 
-		// Now start the container
-		opts.Logger("Starting container...")
-		if err := result.Manager.Start(); err != nil {
-			return nil, fmt.Errorf("failed to start container: %w", err)
+		// Prefer a warm pool container (already initialized, just needs devices)
+		endCreate := opts.Timer.Start(PhaseCreate)
+		claimed := false
+		if opts.UsePool {
+			claimed, err = ClaimFromPool(image, result.ContainerName)
+			if err != nil {
+				opts.Logger(fmt.Sprintf("Warning: Warm pool unavailable: %v", err))
+			}
 		}
+
+		if claimed {
+			opts.Logger(fmt.Sprintf("Claimed warm container from pool for %s", image))
+			if err := container.ApplyInstanceSpec(spec); err != nil {
+				return nil, fmt.Errorf("failed to configure pool container: %w", err)
+			}
+			opts.Logger("Starting container...")
+			if err := result.Manager.Start(); err != nil {
+				return nil, fmt.Errorf("failed to start container: %w", err)
+			}
+		} else {
+			opts.Logger(fmt.Sprintf("Creating and starting container from %s...", image))
+			if err := container.CreateInstance(spec, true); err != nil {
+				return nil, fmt.Errorf("failed to create container: %w", err)
+			}
+		}
+		endCreate()
 	}
 
 	// 6. Wait for ready
 	opts.Logger("Waiting for container to be ready...")
-	if err := waitForReady(result.Manager, 30, opts.Logger); err != nil {
+	endReady := opts.Timer.Start(PhaseReady)
+	if err := waitForReady(result.Manager, 30*time.Second, opts.Logger); err != nil {
 		return nil, err
 	}
+	endReady()
 
 	// 7. Setup network isolation (after container is running and has IP)
 	if opts.NetworkConfig != nil {
+		endNetwork := opts.Timer.Start(PhaseNetwork)
 		result.NetworkManager = network.NewManager(opts.NetworkConfig)
 		if err := result.NetworkManager.SetupForContainer(context.Background(), result.ContainerName); err != nil {
 			return nil, fmt.Errorf("failed to setup network isolation: %w", err)
 		}
+		endNetwork()
 	}
 
 	// 8. When resuming: restore session data if container was recreated, then inject credentials
@@ -299,9 +312,11 @@ func Setup(opts SetupOptions) (*SetupResult, error) {
 				// Only run on first launch, not when restarting persistent container
 				if !skipLaunch {
 					opts.Logger(fmt.Sprintf("Setting up %s config...", opts.Tool.Name()))
+					endConfigPush := opts.Timer.Start(PhaseConfigPush)
 					if err := setupCLIConfig(result.Manager, opts.CLIConfigPath, result.HomeDir, opts.Tool, opts.Logger); err != nil {
 						opts.Logger(fmt.Sprintf("Warning: Failed to setup %s config: %v", opts.Tool.Name(), err))
 					}
+					endConfigPush()
 				} else {
 					opts.Logger(fmt.Sprintf("Reusing existing %s config (persistent container)", opts.Tool.Name()))
 				}
@@ -319,36 +334,30 @@ func Setup(opts SetupOptions) (*SetupResult, error) {
 	return result, nil
 }
 
-// waitForReady waits for container to be ready
-func waitForReady(mgr *container.Manager, maxRetries int, logger func(string)) error {
-	for i := 0; i < maxRetries; i++ {
-		running, err := mgr.Running()
-		if err != nil {
-			return fmt.Errorf("failed to check container status: %w", err)
-		}
-
-		if running {
-			// Additional check: try to execute a simple command
-			_, err := mgr.ExecCommand("echo ready", container.ExecCommandOptions{Capture: true})
-			if err == nil {
-				return nil
-			}
-		}
-
-		time.Sleep(1 * time.Second)
-		if i%5 == 0 && i > 0 {
-			logger(fmt.Sprintf("Still waiting... (%ds)", i))
-		}
+// waitForReady waits for container to be ready and logs how long it took
+func waitForReady(mgr *container.Manager, timeout time.Duration, logger func(string)) error {
+	elapsed, err := mgr.WaitReady(timeout, func(elapsed time.Duration) {
+		logger(fmt.Sprintf("Still waiting... (%ds)", int(elapsed.Seconds())))
+	})
+	if err != nil {
+		return err
 	}
 
-	return fmt.Errorf("container failed to become ready after %d seconds", maxRetries)
+	logger(fmt.Sprintf("Container ready in %dms", elapsed.Milliseconds()))
+	return nil
 }
 
 // restoreSessionData restores tool config directory from a saved session
 // Used when resuming a non-persistent session (container was deleted and recreated)
 func restoreSessionData(mgr *container.Manager, resumeID, homeDir, sessionsDir string, t tool.Tool, logger func(string)) error {
 	configDirName := t.ConfigDirName()
-	sourceConfigDir := filepath.Join(sessionsDir, resumeID, configDirName)
+	sessionDir := filepath.Join(sessionsDir, resumeID)
+	sourceConfigDir := filepath.Join(sessionDir, configDirName)
+
+	// Sessions saved to the compressed store are streamed straight from their chunks
+	if IsPackedSession(sessionDir) {
+		return restorePackedSession(mgr, sessionsDir, resumeID, homeDir, configDirName, logger)
+	}
 
 	// Check if directory exists
 	if info, err := os.Stat(sourceConfigDir); err != nil || !info.IsDir() {
@@ -377,29 +386,48 @@ func restoreSessionData(mgr *container.Manager, resumeID, homeDir, sessionsDir s
 	return nil
 }
 
+// restorePackedSession extracts a session from the compressed store into the container.
+// Ownership is set in the archive, so no chown pass is needed.
+func restorePackedSession(mgr *container.Manager, sessionsDir, resumeID, homeDir, configDirName string, logger func(string)) error {
+	logger(fmt.Sprintf("Restoring session data from %s (compressed store)", resumeID))
+
+	manifest := LoadManifest(filepath.Join(sessionsDir, resumeID, ManifestFilename))
+	store := openBlobStore(sessionsDir)
+	uid := homeOwner(homeDir)
+
+	reader, writer := io.Pipe()
+	go func() {
+		writer.CloseWithError(writePackedArchive(store, manifest, configDirName, uid, writer))
+	}()
+
+	err := mgr.ExtractArchive(reader, homeDir)
+	reader.Close()
+	if err != nil {
+		return fmt.Errorf("failed to restore %s directory: %w", configDirName, err)
+	}
+
+	logger("Session data restored successfully")
+	return nil
+}
+
 // injectCredentials copies credentials and essential config from host to container when resuming
 // This ensures fresh authentication while preserving the session conversation history
 func injectCredentials(mgr *container.Manager, hostCLIConfigPath, homeDir string, t tool.Tool, logger func(string)) error {
 	logger("Injecting fresh credentials and config for session resume...")
 
 	configDirName := t.ConfigDirName()
+	uid := homeOwner(homeDir)
+	overlay := newHomeOverlay(uid, uid)
+	overlay.AddDir(configDirName, 0o755)
 
 	// Copy .credentials.json from host to container
 	credentialsPath := filepath.Join(hostCLIConfigPath, ".credentials.json")
-	if _, err := os.Stat(credentialsPath); err != nil {
-		return fmt.Errorf("credentials file not found: %w", err)
+	found, err := overlay.AddHostFile(path.Join(configDirName, ".credentials.json"), credentialsPath)
+	if err != nil {
+		return fmt.Errorf("failed to read credentials: %w", err)
 	}
-
-	destCredentials := filepath.Join(homeDir, configDirName, ".credentials.json")
-	if err := mgr.PushFile(credentialsPath, destCredentials); err != nil {
-		return fmt.Errorf("failed to push credentials: %w", err)
-	}
-
-	// Fix ownership if running as non-root user
-	if homeDir != "/root" {
-		if err := mgr.Chown(destCredentials, container.CodeUID, container.CodeUID); err != nil {
-			return fmt.Errorf("failed to set credentials ownership: %w", err)
-		}
+	if !found {
+		return fmt.Errorf("credentials file not found: %s", credentialsPath)
 	}
 
 	// Get sandbox settings from tool
@@ -409,120 +437,99 @@ func injectCredentials(mgr *container.Manager, hostCLIConfigPath, homeDir string
 		stateConfigFilename := fmt.Sprintf(".%s.json", t.Name())
 		stateConfigPath := filepath.Join(filepath.Dir(hostCLIConfigPath), stateConfigFilename)
 
-		if _, err := os.Stat(stateConfigPath); err == nil {
+		if stateData, err := os.ReadFile(stateConfigPath); err == nil {
 			logger(fmt.Sprintf("Copying %s for session resume...", stateConfigFilename))
-			stateJsonDest := filepath.Join(homeDir, stateConfigFilename)
-			if err := mgr.PushFile(stateConfigPath, stateJsonDest); err != nil {
-				logger(fmt.Sprintf("Warning: Failed to copy %s: %v", stateConfigFilename, err))
-			} else {
-				// Inject sandbox settings using tool's GetSandboxSettings()
-				logger(fmt.Sprintf("Injecting sandbox settings into %s...", stateConfigFilename))
-				settingsJSON, err := buildJSONFromSettings(sandboxSettings)
-				if err != nil {
-					logger(fmt.Sprintf("Warning: Failed to build JSON from settings: %v", err))
-				} else {
-					// Properly escape the JSON string for shell command
-					escapedJSON := strings.ReplaceAll(settingsJSON, "'", "'\"'\"'")
-					injectCmd := fmt.Sprintf(
-						`python3 -c 'import json; f=open("%s","r+"); d=json.load(f); updates=json.loads('"'"'%s'"'"'); d.update(updates); f.seek(0); json.dump(d,f,indent=2); f.truncate()'`,
-						stateJsonDest,
-						escapedJSON,
-					)
-					if _, err := mgr.ExecCommand(injectCmd, container.ExecCommandOptions{Capture: true}); err != nil {
-						logger(fmt.Sprintf("Warning: Failed to inject settings into %s: %v", stateConfigFilename, err))
-					}
-				}
 
-				// Fix ownership if running as non-root user
-				if homeDir != "/root" {
-					if err := mgr.Chown(stateJsonDest, container.CodeUID, container.CodeUID); err != nil {
-						logger(fmt.Sprintf("Warning: Failed to set %s ownership: %v", stateConfigFilename, err))
-					}
-				}
+			// Inject sandbox settings using tool's GetSandboxSettings()
+			logger(fmt.Sprintf("Injecting sandbox settings into %s...", stateConfigFilename))
+			merged, err := mergeSandboxSettings(stateData, sandboxSettings)
+			if err != nil {
+				logger(fmt.Sprintf("Warning: Failed to inject settings into %s: %v", stateConfigFilename, err))
+				merged = stateData
 			}
+			overlay.AddFile(stateConfigFilename, merged, hostFileMode(stateConfigPath))
 		}
 	}
 
+	if err := overlay.Push(mgr, homeDir); err != nil {
+		return fmt.Errorf("failed to push credentials: %w", err)
+	}
+
 	logger("Credentials and config injected successfully")
 	return nil
 }
 
-// setupCLIConfig copies tool config directory and injects sandbox settings
+// setupCLIConfig copies tool config directory and injects sandbox settings.
+// All files are staged and merged on the host, then written into the container
+// in one tar stream with the right ownership.
 func setupCLIConfig(mgr *container.Manager, hostCLIConfigPath, homeDir string, t tool.Tool, logger func(string)) error {
-	configDirName := t.ConfigDirName()
-	stateDir := filepath.Join(homeDir, configDirName)
+	overlay, err := buildCLIConfigOverlay(hostCLIConfigPath, homeDir, t, logger)
+	if err != nil {
+		return err
+	}
 
-	// Create config directory in container
-	logger(fmt.Sprintf("Creating %s directory in container...", configDirName))
-	mkdirCmd := fmt.Sprintf("mkdir -p %s", stateDir)
-	if _, err := mgr.ExecCommand(mkdirCmd, container.ExecCommandOptions{Capture: true}); err != nil {
-		return fmt.Errorf("failed to create %s directory: %w", configDirName, err)
+	logger(fmt.Sprintf("Pushing %s config to %s in one archive...", t.Name(), homeDir))
+	if err := overlay.Push(mgr, homeDir); err != nil {
+		return fmt.Errorf("failed to push %s config: %w", t.Name(), err)
 	}
 
+	logger(fmt.Sprintf("%s config setup complete", t.Name()))
+	return nil
+}
+
+// buildCLIConfigOverlay stages the tool config directory (essential files only) and the
+// tool state config file (e.g., .claude.json), with sandbox settings already merged
+func buildCLIConfigOverlay(hostCLIConfigPath, homeDir string, t tool.Tool, logger func(string)) (*homeOverlay, error) {
+	configDirName := t.ConfigDirName()
+
+	uid := homeOwner(homeDir)
+	overlay := newHomeOverlay(uid, uid)
+	overlay.AddDir(configDirName, 0o755)
+
 	// Copy only essential files from config directory (skip debug logs with permission issues)
 	essentialFiles := []string{
 		".credentials.json",
 		"config.yml",
-		"settings.json",
 	}
 
 	logger(fmt.Sprintf("Copying essential CLI config files from %s", hostCLIConfigPath))
 	for _, filename := range essentialFiles {
-		srcPath := filepath.Join(hostCLIConfigPath, filename)
-		if _, err := os.Stat(srcPath); err == nil {
-			destPath := filepath.Join(stateDir, filename)
+		found, err := overlay.AddHostFile(path.Join(configDirName, filename), filepath.Join(hostCLIConfigPath, filename))
+		switch {
+		case err != nil:
+			logger(fmt.Sprintf("  - Warning: Failed to copy %s: %v", filename, err))
+		case found:
 			logger(fmt.Sprintf("  - Copying %s", filename))
-			if err := mgr.PushFile(srcPath, destPath); err != nil {
-				logger(fmt.Sprintf("  - Warning: Failed to copy %s: %v", filename, err))
-			}
-		} else {
+		default:
 			logger(fmt.Sprintf("  - Skipping %s (not found)", filename))
 		}
 	}
 
-	// Get sandbox settings from tool and merge into settings.json if needed
+	// settings.json gets the tool's sandbox settings merged in (or is created from them)
 	sandboxSettings := t.GetSandboxSettings()
-	if len(sandboxSettings) > 0 {
-		settingsPath := filepath.Join(stateDir, "settings.json")
-		logger("Merging sandbox settings into settings.json...")
-		settingsJSON, err := buildJSONFromSettings(sandboxSettings)
+	settingsRel := path.Join(configDirName, "settings.json")
+	settingsData, err := os.ReadFile(filepath.Join(hostCLIConfigPath, "settings.json"))
+	switch {
+	case err == nil && len(sandboxSettings) > 0:
+		logger("Merging sandbox settings into settings.json")
+		merged, mergeErr := mergeSandboxSettings(settingsData, sandboxSettings)
+		if mergeErr != nil {
+			logger(fmt.Sprintf("Warning: Failed to inject settings into settings.json: %v", mergeErr))
+			merged = settingsData
+		}
+		overlay.AddFile(settingsRel, merged, hostFileMode(filepath.Join(hostCLIConfigPath, "settings.json")))
+	case err == nil:
+		logger("  - Copying settings.json")
+		overlay.AddFile(settingsRel, settingsData, hostFileMode(filepath.Join(hostCLIConfigPath, "settings.json")))
+	case len(sandboxSettings) > 0:
+		logger("settings.json not found, creating with sandbox settings")
+		settingsBytes, err := json.MarshalIndent(sandboxSettings, "", "  ")
 		if err != nil {
-			logger(fmt.Sprintf("Warning: Failed to build JSON from settings: %v", err))
-		} else {
-			// Check if settings.json exists in container
-			checkCmd := fmt.Sprintf("test -f %s && echo exists || echo missing", settingsPath)
-			checkResult, err := mgr.ExecCommand(checkCmd, container.ExecCommandOptions{Capture: true})
-
-			if err != nil || strings.TrimSpace(checkResult) == "missing" {
-				// File doesn't exist, create it with sandbox settings
-				logger("settings.json not found in container, creating with sandbox settings")
-				settingsBytes, err := json.MarshalIndent(sandboxSettings, "", "  ")
-				if err != nil {
-					return fmt.Errorf("failed to marshal sandbox settings: %w", err)
-				}
-				if err := mgr.CreateFile(settingsPath, string(settingsBytes)+"\n"); err != nil {
-					return fmt.Errorf("failed to create settings.json: %w", err)
-				}
-			} else {
-				// File exists, merge sandbox settings into it
-				logger("Merging sandbox settings into existing settings.json")
-				// Properly escape the JSON string for shell command
-				escapedJSON := strings.ReplaceAll(settingsJSON, "'", "'\"'\"'")
-				injectCmd := fmt.Sprintf(
-					`python3 -c 'import json; f=open("%s","r+"); d=json.load(f); updates=json.loads('"'"'%s'"'"'); d.update(updates); f.seek(0); json.dump(d,f,indent=2); f.truncate()'`,
-					settingsPath,
-					escapedJSON,
-				)
-				if _, err := mgr.ExecCommand(injectCmd, container.ExecCommandOptions{Capture: true}); err != nil {
-					logger(fmt.Sprintf("Warning: Failed to inject settings into settings.json: %v", err))
-				} else {
-					logger("Successfully merged sandbox settings into settings.json")
-				}
-			}
+			return nil, fmt.Errorf("failed to marshal sandbox settings: %w", err)
 		}
-		logger(fmt.Sprintf("%s config copied and sandbox settings merged into settings.json", t.Name()))
-	} else {
-		logger(fmt.Sprintf("%s config copied (no sandbox settings needed)", t.Name()))
+		overlay.AddFile(settingsRel, append(settingsBytes, '\n'), 0o644)
+	default:
+		logger("  - Skipping settings.json (not found)")
 	}
 
 	// Copy and modify tool state config file (e.g., .claude.json, .aider.json)
@@ -531,61 +538,26 @@ func setupCLIConfig(mgr *container.Manager, hostCLIConfigPath, homeDir string, t
 	stateConfigPath := filepath.Join(filepath.Dir(hostCLIConfigPath), stateConfigFilename)
 	logger(fmt.Sprintf("Checking for %s at: %s", stateConfigFilename, stateConfigPath))
 
-	if info, err := os.Stat(stateConfigPath); err == nil {
-		logger(fmt.Sprintf("Found %s (size: %d bytes), copying to container...", stateConfigFilename, info.Size()))
-		stateJsonDest := filepath.Join(homeDir, stateConfigFilename)
-
-		// Push the file to container
-		if err := mgr.PushFile(stateConfigPath, stateJsonDest); err != nil {
-			return fmt.Errorf("failed to copy %s: %w", stateConfigFilename, err)
-		}
-		logger(fmt.Sprintf("%s copied to %s", stateConfigFilename, stateJsonDest))
-
-		// Inject sandbox settings if tool provides them
-		if len(sandboxSettings) > 0 {
-			logger(fmt.Sprintf("Injecting sandbox settings into %s...", stateConfigFilename))
-			settingsJSON, err := buildJSONFromSettings(sandboxSettings)
-			if err != nil {
-				logger(fmt.Sprintf("Warning: Failed to build JSON from settings: %v", err))
-			} else {
-				// Properly escape the JSON string for shell command
-				escapedJSON := strings.ReplaceAll(settingsJSON, "'", "'\"'\"'")
-				injectCmd := fmt.Sprintf(
-					`python3 -c 'import json; f=open("%s","r+"); d=json.load(f); updates=json.loads('"'"'%s'"'"'); d.update(updates); f.seek(0); json.dump(d,f,indent=2); f.truncate()'`,
-					stateJsonDest,
-					escapedJSON,
-				)
-				if _, err := mgr.ExecCommand(injectCmd, container.ExecCommandOptions{Capture: true}); err != nil {
-					logger(fmt.Sprintf("Warning: Failed to inject settings into %s: %v", stateConfigFilename, err))
-				} else {
-					logger(fmt.Sprintf("Successfully injected sandbox settings into %s", stateConfigFilename))
-				}
-			}
-		}
-
-		// Fix ownership if running as non-root user
-		if homeDir != "/root" {
-			logger(fmt.Sprintf("Fixing ownership of %s to %d:%d", stateConfigFilename, container.CodeUID, container.CodeUID))
-			if err := mgr.Chown(stateJsonDest, container.CodeUID, container.CodeUID); err != nil {
-				return fmt.Errorf("failed to set %s ownership: %w", stateConfigFilename, err)
-			}
-		}
+	stateData, err := os.ReadFile(stateConfigPath)
+	if os.IsNotExist(err) {
+		logger(fmt.Sprintf("Warning: %s not found at %s, skipping", stateConfigFilename, stateConfigPath))
+		return overlay, nil
+	}
+	if err != nil {
+		return nil, fmt.Errorf("failed to read %s: %w", stateConfigFilename, err)
+	}
 
-		// Fix ownership of entire config directory recursively
-		if homeDir != "/root" {
-			logger(fmt.Sprintf("Fixing ownership of entire %s directory to %d:%d", configDirName, container.CodeUID, container.CodeUID))
-			chownCmd := fmt.Sprintf("chown -R %d:%d %s", container.CodeUID, container.CodeUID, stateDir)
-			if _, err := mgr.ExecCommand(chownCmd, container.ExecCommandOptions{Capture: true}); err != nil {
-				return fmt.Errorf("failed to set %s directory ownership: %w", configDirName, err)
-			}
+	logger(fmt.Sprintf("Found %s (size: %d bytes)", stateConfigFilename, len(stateData)))
+	if len(sandboxSettings) > 0 {
+		logger(fmt.Sprintf("Injecting sandbox settings into %s...", stateConfigFilename))
+		merged, err := mergeSandboxSettings(stateData, sandboxSettings)
+		if err != nil {
+			logger(fmt.Sprintf("Warning: Failed to inject settings into %s: %v", stateConfigFilename, err))
+		} else {
+			stateData = merged
 		}
-
-		logger(fmt.Sprintf("%s setup complete", stateConfigFilename))
-	} else if os.IsNotExist(err) {
-		logger(fmt.Sprintf("Warning: %s not found at %s, skipping", stateConfigFilename, stateConfigPath))
-	} else {
-		return fmt.Errorf("failed to check %s: %w", stateConfigFilename, err)
 	}
+	overlay.AddFile(stateConfigFilename, stateData, hostFileMode(stateConfigPath))
 
-	return nil
+	return overlay, nil
 }
@@ -0,0 +1,164 @@
+package session
+
+import (
+	"encoding/json"
+	"fmt"
+	"os"
+	"path/filepath"
+	"strconv"
+	"strings"
+	"syscall"
+	"time"
+
+	"github.com/mensfeld/code-on-incus/internal/container"
+)
+
+// DefaultMaxSlots is the number of parallel sessions per workspace when no limit is given
+const DefaultMaxSlots = 10
+
+// slotReservationTTL bounds how long a reservation holds a slot whose container
+// has not shown up yet (covers image launch and a slow first start)
+const slotReservationTTL = 10 * time.Minute
+
+// slotReservation records that a coi process picked a slot and is creating its container
+type slotReservation struct {
+	PID        int       `json:"pid"`
+	ReservedAt time.Time `json:"reserved_at"`
+}
+
+// slotAllocator hands out workspace slots. Allocation happens under an exclusive lock on
+// the workspace's reservation file, so concurrent coi processes never pick the same slot
+// in the window between choosing it and their container appearing in Incus.
+type slotAllocator struct {
+	path      string                                // Reservation file (JSON: slot -> reservation)
+	listNames func(prefix string) ([]string, error) // Existing instance names starting with prefix
+	now       func() time.Time
+	alive     func(pid int) bool
+}
+
+// newSlotAllocator returns the allocator for the container name prefix of a workspace
+func newSlotAllocator(prefix string) (*slotAllocator, error) {
+	homeDir, err := os.UserHomeDir()
+	if err != nil {
+		return nil, fmt.Errorf("failed to get home directory: %w", err)
+	}
+
+	return &slotAllocator{
+		path:      filepath.Join(homeDir, ".coi", "slots", strings.TrimSuffix(prefix, "-")+".json"),
+		listNames: container.ListInstanceNamesWithPrefix,
+		now:       time.Now,
+		alive:     processAlive,
+	}, nil
+}
+
+// allocate reserves the first slot in [startSlot, maxSlots] that has neither a
+// container nor a live reservation
+func (a *slotAllocator) allocate(prefix string, startSlot, maxSlots int) (int, error) {
+	unlock, err := lockFile(a.path + ".lock")
+	if err != nil {
+		return 0, fmt.Errorf("failed to lock slot reservations: %w", err)
+	}
+	defer unlock()
+
+	// List under the lock: a process that reserved before us has released the lock
+	// only after recording its slot, and its container is covered by the reservation
+	names, err := a.listNames(prefix)
+	if err != nil {
+		return 0, err
+	}
+	taken := make(map[int]bool, len(names))
+	for _, name := range names {
+		if slot, ok := parseSlotSuffix(name, prefix); ok {
+			taken[slot] = true
+		}
+	}
+
+	now := a.now()
+	reservations := a.load()
+	for slot, reservation := range reservations {
+		// Once the container exists (or its creator gave up), the reservation has done its job
+		if taken[slot] || !a.alive(reservation.PID) || now.Sub(reservation.ReservedAt) > slotReservationTTL {
+			delete(reservations, slot)
+			continue
+		}
+		taken[slot] = true
+	}
+
+	for slot := startSlot; slot <= maxSlots; slot++ {
+		if taken[slot] {
+			continue
+		}
+		reservations[slot] = slotReservation{PID: os.Getpid(), ReservedAt: now}
+		if err := a.save(reservations); err != nil {
+			return 0, fmt.Errorf("failed to save slot reservation: %w", err)
+		}
+		return slot, nil
+	}
+
+	if startSlot <= 1 {
+		return 0, fmt.Errorf("all %d slots are in use", maxSlots)
+	}
+	return 0, fmt.Errorf("no available slots from %d to %d", startSlot, maxSlots)
+}
+
+// load reads the reservation file; a missing or unreadable file means no reservations
+func (a *slotAllocator) load() map[int]slotReservation {
+	reservations := map[int]slotReservation{}
+	data, err := os.ReadFile(a.path)
+	if err != nil {
+		return reservations
+	}
+
+	var raw map[string]slotReservation
+	if err := json.Unmarshal(data, &raw); err != nil {
+		return reservations
+	}
+	for key, reservation := range raw {
+		if slot, err := strconv.Atoi(key); err == nil {
+			reservations[slot] = reservation
+		}
+	}
+	return reservations
+}
+
+// save atomically replaces the reservation file (caller holds the lock)
+func (a *slotAllocator) save(reservations map[int]slotReservation) error {
+	raw := make(map[string]slotReservation, len(reservations))
+	for slot, reservation := range reservations {
+		raw[strconv.Itoa(slot)] = reservation
+	}
+	data, err := json.Marshal(raw)
+	if err != nil {
+		return err
+	}
+
+	tmpPath := a.path + ".tmp"
+	if err := os.WriteFile(tmpPath, data, 0o644); err != nil {
+		return err
+	}
+	return os.Rename(tmpPath, a.path)
+}
+
+// parseSlotSuffix returns the slot number of a container named <prefix><slot>
+func parseSlotSuffix(name, prefix string) (int, bool) {
+	suffix, ok := strings.CutPrefix(name, prefix)
+	if !ok || suffix == "" {
+		return 0, false
+	}
+	for _, r := range suffix {
+		if r < '0' || r > '9' {
+			return 0, false
+		}
+	}
+	slot, err := strconv.Atoi(suffix)
+	return slot, err == nil
+}
+
+// processAlive reports whether a process with the given PID exists
+func processAlive(pid int) bool {
+	if pid <= 0 {
+		return false
+	}
+	err := syscall.Kill(pid, 0)
+	return err == nil || err == syscall.EPERM
+}
@@ -0,0 +1,171 @@
+package session
+
+import (
+	"path/filepath"
+	"sort"
+	"sync"
+	"testing"
+	"time"
+)
+
+// newTestAllocator returns an allocator over a temp reservation file and a fixed instance list
+func newTestAllocator(t *testing.T, names []string) *slotAllocator {
+	t.Helper()
+	return &slotAllocator{
+		path:      filepath.Join(t.TempDir(), "slots", "coi-abcd1234.json"),
+		listNames: func(string) ([]string, error) { return names, nil },
+		now:       time.Now,
+		alive:     func(int) bool { return true },
+	}
+}
+
+func TestParseSlotSuffix(t *testing.T) {
+	tests := []struct {
+		name     string
+		wantSlot int
+		wantOK   bool
+	}{
+		{"coi-abcd1234-1", 1, true},
+		{"coi-abcd1234-12", 12, true},
+		{"coi-abcd1234-", 0, false},
+		{"coi-abcd1234-+1", 0, false},
+		{"coi-abcd1234-1a", 0, false},
+		{"coi-ffff0000-1", 0, false},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			slot, ok := parseSlotSuffix(tt.name, "coi-abcd1234-")
+			if slot != tt.wantSlot || ok != tt.wantOK {
+				t.Errorf("parseSlotSuffix(%q) = %d, %v, want %d, %v", tt.name, slot, ok, tt.wantSlot, tt.wantOK)
+			}
+		})
+	}
+}
+
+func TestSlotAllocatorSkipsExistingContainers(t *testing.T) {
+	a := newTestAllocator(t, []string{"coi-abcd1234-1", "coi-abcd1234-2", "coi-abcd1234-4"})
+
+	slot, err := a.allocate("coi-abcd1234-", 1, 10)
+	if err != nil {
+		t.Fatalf("allocate() unexpected error: %v", err)
+	}
+	if slot != 3 {
+		t.Errorf("allocate() = %d, want 3", slot)
+	}
+
+	// Slot 3 is now reserved even though its container does not exist yet
+	slot, err = a.allocate("coi-abcd1234-", 1, 10)
+	if err != nil {
+		t.Fatalf("allocate() unexpected error: %v", err)
+	}
+	if slot != 5 {
+		t.Errorf("second allocate() = %d, want 5", slot)
+	}
+}
+
+func TestSlotAllocatorStartSlot(t *testing.T) {
+	a := newTestAllocator(t, nil)
+
+	slot, err := a.allocate("coi-abcd1234-", 4, 10)
+	if err != nil {
+		t.Fatalf("allocate() unexpected error: %v", err)
+	}
+	if slot != 4 {
+		t.Errorf("allocate() = %d, want 4", slot)
+	}
+}
+
+func TestSlotAllocatorExhausted(t *testing.T) {
+	a := newTestAllocator(t, []string{"coi-abcd1234-1", "coi-abcd1234-2"})
+
+	if _, err := a.allocate("coi-abcd1234-", 1, 2); err == nil {
+		t.Error("allocate() expected error when all slots are in use")
+	}
+}
+
+func TestSlotAllocatorDropsStaleReservations(t *testing.T) {
+	a := newTestAllocator(t, nil)
+
+	if _, err := a.allocate("coi-abcd1234-", 1, 10); err != nil {
+		t.Fatalf("allocate() unexpected error: %v", err)
+	}
+
+	// The reserving process exited without creating its container
+	a.alive = func(int) bool { return false }
+	slot, err := a.allocate("coi-abcd1234-", 1, 10)
+	if err != nil {
+		t.Fatalf("allocate() unexpected error: %v", err)
+	}
+	if slot != 1 {
+		t.Errorf("allocate() after dead reservation = %d, want 1", slot)
+	}
+
+	// A reservation past its TTL is dropped even if the process is still running
+	a.alive = func(int) bool { return true }
+	a.now = func() time.Time { return time.Now().Add(slotReservationTTL + time.Minute) }
+	slot, err = a.allocate("coi-abcd1234-", 1, 10)
+	if err != nil {
+		t.Fatalf("allocate() unexpected error: %v", err)
+	}
+	if slot != 1 {
+		t.Errorf("allocate() after expired reservation = %d, want 1", slot)
+	}
+}
+
+func TestSlotAllocatorReleasesReservationOnceContainerExists(t *testing.T) {
+	a := newTestAllocator(t, nil)
+
+	if _, err := a.allocate("coi-abcd1234-", 1, 10); err != nil {
+		t.Fatalf("allocate() unexpected error: %v", err)
+	}
+
+	a.listNames = func(string) ([]string, error) { return []string{"coi-abcd1234-1"}, nil }
+	if _, err := a.allocate("coi-abcd1234-", 1, 10); err != nil {
+		t.Fatalf("allocate() unexpected error: %v", err)
+	}
+
+	reservations := a.load()
+	if _, ok := reservations[1]; ok {
+		t.Error("reservation for slot 1 should be dropped once its container exists")
+	}
+	if _, ok := reservations[2]; !ok {
+		t.Error("reservation for slot 2 should be recorded")
+	}
+}
+
+func TestSlotAllocatorConcurrent(t *testing.T) {
+	dir := t.TempDir()
+	const workers = 10
+
+	var wg sync.WaitGroup
+	slots := make([]int, workers)
+	errs := make([]error, workers)
+	for i := 0; i < workers; i++ {
+		wg.Add(1)
+		go func(i int) {
+			defer wg.Done()
+			// Separate allocators, like separate coi processes sharing the reservation file
+			a := &slotAllocator{
+				path:      filepath.Join(dir, "coi-abcd1234.json"),
+				listNames: func(string) ([]string, error) { return nil, nil },
+				now:       time.Now,
+				alive:     func(int) bool { return true },
+			}
+			slots[i], errs[i] = a.allocate("coi-abcd1234-", 1, workers)
+		}(i)
+	}
+	wg.Wait()
+
+	for i, err := range errs {
+		if err != nil {
+			t.Fatalf("allocate() worker %d unexpected error: %v", i, err)
+		}
+	}
+	sort.Ints(slots)
+	for i, slot := range slots {
+		if slot != i+1 {
+			t.Fatalf("concurrent allocate() slots = %v, want 1..%d without duplicates", slots, workers)
+		}
+	}
+}
@@ -0,0 +1,531 @@
+package session
+
+import (
+	"archive/tar"
+	"bufio"
+	"bytes"
+	"crypto/sha256"
+	"encoding/hex"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"os"
+	"path/filepath"
+	"sort"
+	"strconv"
+	"strings"
+
+	"github.com/mensfeld/code-on-incus/internal/container"
+)
+
+// ManifestFilename is the snapshot manifest stored next to metadata.json
+const ManifestFilename = "manifest.json"
+
+// manifestVersion is bumped when the manifest format changes incompatibly
+const manifestVersion = 1
+
+// SessionManifest records the files of a saved tool config directory, so the next
+// save only transfers files that changed since
+type SessionManifest struct {
+	Version int                      `json:"version"`
+	Packed  bool                     `json:"packed,omitempty"` // File contents live in the compressed store
+	Files   map[string]ManifestEntry `json:"files"`            // Path relative to the config directory
+
+	// Only recorded for packed snapshots, which have no directory tree on disk
+	Dirs     map[string]uint32 `json:"dirs,omitempty"`     // Directory path -> permission bits
+	Symlinks map[string]string `json:"symlinks,omitempty"` // Symlink path -> target
+}
+
+// ManifestEntry describes one regular file in a session snapshot
+type ManifestEntry struct {
+	Size    int64    `json:"size"`
+	ModTime string   `json:"mtime,omitempty"` // Container mtime as printed by find (empty if unknown)
+	Mode    uint32   `json:"mode"`
+	SHA256  string   `json:"sha256"`
+	Chunks  []string `json:"chunks,omitempty"` // Blob hashes in the compressed store (packed snapshots)
+}
+
+// LoadManifest reads a session manifest, returning an empty manifest if it is
+// missing, unreadable or from another format version
+func LoadManifest(path string) *SessionManifest {
+	manifest := &SessionManifest{Version: manifestVersion, Files: map[string]ManifestEntry{}}
+
+	data, err := os.ReadFile(path)
+	if err != nil {
+		return manifest
+	}
+
+	var loaded SessionManifest
+	if err := json.Unmarshal(data, &loaded); err != nil || loaded.Version != manifestVersion || loaded.Files == nil {
+		return manifest
+	}
+	return &loaded
+}
+
+// Save writes the manifest atomically
+func (m *SessionManifest) Save(path string) error {
+	data, err := json.Marshal(m)
+	if err != nil {
+		return err
+	}
+
+	tmpPath := path + ".tmp"
+	if err := os.WriteFile(tmpPath, data, 0o644); err != nil {
+		return err
+	}
+	return os.Rename(tmpPath, path)
+}
+
+// remoteFile is one entry of a container directory listing
+type remoteFile struct {
+	Type    byte // 'f' regular file, 'd' directory, 'l' symlink
+	Mode    os.FileMode
+	Size    int64
+	ModTime string
+	Target  string // Symlink target
+	Path    string // Relative to the listed directory
+}
+
+// snapshotSource reads a directory tree from a container
+type snapshotSource interface {
+	// List returns every entry below dir
+	List(dir string) ([]remoteFile, error)
+	// Hash returns the SHA-256 of the given files (relative to dir)
+	Hash(dir string, paths []string) (map[string]string, error)
+	// Archive writes a tar archive of the given entries (relative to dir) to w
+	Archive(dir string, paths []string, w io.Writer) error
+}
+
+// containerSource implements snapshotSource with `incus exec` (needs a running container)
+type containerSource struct {
+	mgr *container.Manager
+}
+
+// List runs a single find in the container
+func (s containerSource) List(dir string) ([]remoteFile, error) {
+	var out bytes.Buffer
+	err := s.mgr.ExecPipe([]string{
+		"find", dir, "-mindepth", "1", "-printf", `%y\0%m\0%s\0%T@\0%l\0%P\0`,
+	}, container.ExecCommandOptions{}, nil, &out)
+	if err != nil {
+		return nil, err
+	}
+	return parseRemoteListing(out.Bytes())
+}
+
+// Hash runs sha256sum over the files in the container in one exec
+func (s containerSource) Hash(dir string, paths []string) (map[string]string, error) {
+	var out bytes.Buffer
+	err := s.mgr.ExecPipe([]string{
+		"xargs", "-0", "-r", "sha256sum", "-z", "--",
+	}, container.ExecCommandOptions{Cwd: dir}, nulJoin(paths), &out)
+	if err != nil {
+		return nil, err
+	}
+
+	hashes := map[string]string{}
+	for _, line := range strings.Split(out.String(), "\x00") {
+		// Format: "<hash>  <path>"
+		hash, path, ok := strings.Cut(line, "  ")
+		if ok {
+			hashes[path] = hash
+		}
+	}
+	return hashes, nil
+}
+
+// Archive streams the entries out of the container with tar
+func (s containerSource) Archive(dir string, paths []string, w io.Writer) error {
+	return s.mgr.ExecPipe([]string{
+		"tar", "-c", "-f", "-", "--no-recursion", "--null", "-T", "-",
+	}, container.ExecCommandOptions{Cwd: dir}, nulJoin(paths), w)
+}
+
+// nulJoin returns paths as a NUL-separated list for xargs -0 / tar --null
+func nulJoin(paths []string) io.Reader {
+	var buf bytes.Buffer
+	for _, path := range paths {
+		buf.WriteString(path)
+		buf.WriteByte(0)
+	}
+	return &buf
+}
+
+// parseRemoteListing parses the NUL-separated output of the find -printf in containerSource.List
+func parseRemoteListing(data []byte) ([]remoteFile, error) {
+	fields := strings.Split(string(data), "\x00")
+	if len(fields) > 0 && fields[len(fields)-1] == "" {
+		fields = fields[:len(fields)-1]
+	}
+	if len(fields)%6 != 0 {
+		return nil, fmt.Errorf("malformed directory listing")
+	}
+
+	files := make([]remoteFile, 0, len(fields)/6)
+	for i := 0; i < len(fields); i += 6 {
+		mode, err := strconv.ParseUint(fields[i+1], 8, 32)
+		if err != nil {
+			return nil, fmt.Errorf("malformed mode %q: %w", fields[i+1], err)
+		}
+		size, err := strconv.ParseInt(fields[i+2], 10, 64)
+		if err != nil {
+			return nil, fmt.Errorf("malformed size %q: %w", fields[i+2], err)
+		}
+		if fields[i] == "" || !validSnapshotPath(fields[i+5]) {
+			return nil, fmt.Errorf("malformed entry %q", fields[i+5])
+		}
+
+		files = append(files, remoteFile{
+			Type:    fields[i][0],
+			Mode:    os.FileMode(mode).Perm(),
+			Size:    size,
+			ModTime: fields[i+3],
+			Target:  fields[i+4],
+			Path:    fields[i+5],
+		})
+	}
+	return files, nil
+}
+
+// validSnapshotPath reports whether path is relative and stays inside the snapshot
+func validSnapshotPath(path string) bool {
+	return path != "" && filepath.IsLocal(path)
+}
+
+// SyncStats summarizes an incremental snapshot
+type SyncStats struct {
+	Files       int   // Regular files in the snapshot
+	Transferred int   // Files copied out of the container
+	Bytes       int64 // Bytes copied out of the container
+	Linked      int   // Unchanged files hard-linked from the previous snapshot
+}
+
+// snapshotPlan classifies the entries of a container directory against the previous snapshot
+type snapshotPlan struct {
+	dirs      map[string]os.FileMode
+	files     map[string]remoteFile
+	symlinks  []remoteFile
+	unchanged []string // Same content as in the previous snapshot
+	transfer  []string // New or changed, must be copied out of the container
+}
+
+// planSnapshot lists remoteDir and decides which files need to be transferred.
+// have reports whether the previous snapshot still holds a usable copy of a file.
+func planSnapshot(src snapshotSource, remoteDir string, manifest *SessionManifest, have func(path string, size int64) bool) (*snapshotPlan, error) {
+	listing, err := src.List(remoteDir)
+	if err != nil {
+		return nil, fmt.Errorf("failed to list %s: %w", remoteDir, err)
+	}
+
+	plan := &snapshotPlan{
+		dirs:  map[string]os.FileMode{},
+		files: map[string]remoteFile{},
+	}
+	var hashCheck []string
+
+	for _, file := range listing {
+		switch file.Type {
+		case 'd':
+			plan.dirs[file.Path] = file.Mode
+		case 'l':
+			plan.symlinks = append(plan.symlinks, file)
+		case 'f':
+			plan.files[file.Path] = file
+			previous, known := manifest.Files[file.Path]
+			switch {
+			case !known || previous.Size != file.Size || !have(file.Path, previous.Size):
+				plan.transfer = append(plan.transfer, file.Path)
+			case previous.ModTime == file.ModTime:
+				plan.unchanged = append(plan.unchanged, file.Path)
+			default:
+				// Same size but touched since: compare content before copying
+				hashCheck = append(hashCheck, file.Path)
+			}
+		}
+	}
+
+	if len(hashCheck) > 0 {
+		hashes, err := src.Hash(remoteDir, hashCheck)
+		if err != nil {
+			return nil, fmt.Errorf("failed to hash files in %s: %w", remoteDir, err)
+		}
+		for _, path := range hashCheck {
+			if hashes[path] != "" && hashes[path] == manifest.Files[path].SHA256 {
+				plan.unchanged = append(plan.unchanged, path)
+			} else {
+				plan.transfer = append(plan.transfer, path)
+			}
+		}
+	}
+
+	return plan, nil
+}
+
+// makeSnapshotDirs creates the directories of a plan below dir (parents sort before children)
+func makeSnapshotDirs(dir string, plan *snapshotPlan) error {
+	for _, path := range sortedKeys(plan.dirs) {
+		if err := os.MkdirAll(filepath.Join(dir, path), plan.dirs[path]|0o700); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+// syncSnapshot updates localDir to mirror remoteDir, transferring only files whose
+// size, mtime or hash changed since the snapshot described by manifest.
+// The new tree is built next to localDir and swapped in at the end, so an interrupted
+// sync leaves the previous snapshot intact. Returns the manifest of the new snapshot.
+func syncSnapshot(src snapshotSource, remoteDir, localDir string, manifest *SessionManifest) (*SessionManifest, SyncStats, error) {
+	var stats SyncStats
+
+	plan, err := planSnapshot(src, remoteDir, manifest, func(path string, size int64) bool {
+		return snapshotFileExists(localDir, path, size)
+	})
+	if err != nil {
+		return nil, stats, err
+	}
+	next := &SessionManifest{Version: manifestVersion, Files: map[string]ManifestEntry{}}
+	files := plan.files
+	transfer := plan.transfer
+
+	stagingDir := localDir + ".sync"
+	if err := os.RemoveAll(stagingDir); err != nil {
+		return nil, stats, err
+	}
+	if err := os.MkdirAll(stagingDir, 0o755); err != nil {
+		return nil, stats, err
+	}
+	success := false
+	defer func() {
+		if !success {
+			os.RemoveAll(stagingDir)
+		}
+	}()
+
+	// Directories first, so hard links and extraction have a target
+	if err := makeSnapshotDirs(stagingDir, plan); err != nil {
+		return nil, stats, err
+	}
+
+	for _, path := range plan.unchanged {
+		if err := linkOrCopy(filepath.Join(localDir, path), filepath.Join(stagingDir, path)); err != nil {
+			// The previous copy is unusable, fetch it again
+			transfer = append(transfer, path)
+			continue
+		}
+		entry := manifest.Files[path]
+		entry.ModTime = files[path].ModTime
+		entry.Mode = uint32(files[path].Mode)
+		next.Files[path] = entry
+		stats.Linked++
+	}
+
+	if len(transfer) > 0 {
+		received, err := receiveArchive(src, remoteDir, transfer, stagingDir)
+		if err != nil {
+			return nil, stats, err
+		}
+		for _, path := range transfer {
+			hash, ok := received[path]
+			if !ok {
+				// Removed between listing and transfer
+				continue
+			}
+			file := files[path]
+			next.Files[path] = ManifestEntry{
+				Size:    file.Size,
+				ModTime: file.ModTime,
+				Mode:    uint32(file.Mode),
+				SHA256:  hash,
+			}
+			stats.Transferred++
+			stats.Bytes += file.Size
+		}
+	}
+
+	// Symlinks last, so no extracted file can be written through one
+	for _, link := range plan.symlinks {
+		if err := os.Symlink(link.Target, filepath.Join(stagingDir, link.Path)); err != nil {
+			return nil, stats, err
+		}
+	}
+
+	// Swap the new snapshot in
+	oldDir := localDir + ".old"
+	os.RemoveAll(oldDir)
+	if _, err := os.Stat(localDir); err == nil {
+		if err := os.Rename(localDir, oldDir); err != nil {
+			return nil, stats, err
+		}
+	}
+	if err := os.Rename(stagingDir, localDir); err != nil {
+		return nil, stats, err
+	}
+	success = true
+	os.RemoveAll(oldDir)
+
+	stats.Files = len(next.Files)
+	return next, stats, nil
+}
+
+// receiveArchive extracts the regular files of an archive from src into dir.
+// Returns the SHA-256 of every extracted file keyed by relative path.
+func receiveArchive(src snapshotSource, remoteDir string, paths []string, dir string) (map[string]string, error) {
+	reader, writer := io.Pipe()
+	archiveErr := make(chan error, 1)
+	go func() {
+		err := src.Archive(remoteDir, paths, writer)
+		writer.CloseWithError(err)
+		archiveErr <- err
+	}()
+
+	hashes, extractErr := extractSnapshotFiles(reader, dir)
+	if extractErr == nil {
+		// tar pads the archive past the end-of-archive marker; let it finish writing
+		_, _ = io.Copy(io.Discard, reader)
+	} else {
+		// Unblock the producer, extraction stopped early
+		reader.CloseWithError(io.ErrClosedPipe)
+	}
+	if err := <-archiveErr; err != nil && !errors.Is(err, io.ErrClosedPipe) {
+		return nil, fmt.Errorf("failed to archive files in %s: %w", remoteDir, err)
+	}
+	if extractErr != nil {
+		return nil, fmt.Errorf("failed to extract snapshot: %w", extractErr)
+	}
+	return hashes, nil
+}
+
+// extractSnapshotFiles writes the regular files of a tar stream below dir
+func extractSnapshotFiles(r io.Reader, dir string) (map[string]string, error) {
+	hashes := map[string]string{}
+	tr := tar.NewReader(bufio.NewReader(r))
+
+	for {
+		header, err := tr.Next()
+		if err == io.EOF {
+			return hashes, nil
+		}
+		if err != nil {
+			return nil, err
+		}
+		if header.Typeflag != tar.TypeReg {
+			continue
+		}
+
+		name := filepath.Clean(strings.TrimPrefix(header.Name, "./"))
+		if !validSnapshotPath(name) {
+			return nil, fmt.Errorf("invalid path in archive: %s", header.Name)
+		}
+
+		target := filepath.Join(dir, name)
+		if err := os.MkdirAll(filepath.Dir(target), 0o755); err != nil {
+			return nil, err
+		}
+		f, err := os.OpenFile(target, os.O_CREATE|os.O_EXCL|os.O_WRONLY, os.FileMode(header.Mode).Perm()|0o600)
+		if err != nil {
+			return nil, err
+		}
+
+		hasher := sha256.New()
+		_, copyErr := io.Copy(io.MultiWriter(f, hasher), tr) //nolint:gosec // Size is bounded by the container's own files
+		closeErr := f.Close()
+		if copyErr != nil {
+			return nil, copyErr
+		}
+		if closeErr != nil {
+			return nil, closeErr
+		}
+		hashes[name] = hex.EncodeToString(hasher.Sum(nil))
+	}
+}
+
+// snapshotFileExists reports whether the previous snapshot still has path with the given size
+func snapshotFileExists(dir, path string, size int64) bool {
+	info, err := os.Lstat(filepath.Join(dir, path))
+	return err == nil && info.Mode().IsRegular() && info.Size() == size
+}
+
+// linkOrCopy hard-links src to dst, copying when the filesystem does not support links
+func linkOrCopy(src, dst string) error {
+	if err := os.Link(src, dst); err == nil {
+		return nil
+	}
+
+	in, err := os.Open(src)
+	if err != nil {
+		return err
+	}
+	defer in.Close()
+
+	info, err := in.Stat()
+	if err != nil {
+		return err
+	}
+	out, err := os.OpenFile(dst, os.O_CREATE|os.O_EXCL|os.O_WRONLY, info.Mode().Perm())
+	if err != nil {
+		return err
+	}
+	if _, err := io.Copy(out, in); err != nil {
+		out.Close()
+		return err
+	}
+	return out.Close()
+}
+
+// buildLocalManifest hashes every regular file below dir.
+// Used after a full pull, where container mtimes are unknown: the next incremental
+// save then compares those files by hash instead of copying them again.
+func buildLocalManifest(dir string) (*SessionManifest, error) {
+	manifest := &SessionManifest{Version: manifestVersion, Files: map[string]ManifestEntry{}}
+
+	err := filepath.Walk(dir, func(path string, info os.FileInfo, err error) error {
+		if err != nil || !info.Mode().IsRegular() {
+			return err
+		}
+		rel, err := filepath.Rel(dir, path)
+		if err != nil {
+			return err
+		}
+		hash, err := hashFile(path)
+		if err != nil {
+			return err
+		}
+		manifest.Files[filepath.ToSlash(rel)] = ManifestEntry{
+			Size:   info.Size(),
+			Mode:   uint32(info.Mode().Perm()),
+			SHA256: hash,
+		}
+		return nil
+	})
+	if err != nil {
+		return nil, err
+	}
+	return manifest, nil
+}
+
+// hashFile returns the hex SHA-256 of a file
+func hashFile(path string) (string, error) {
+	f, err := os.Open(path)
+	if err != nil {
+		return "", err
+	}
+	defer f.Close()
+
+	hasher := sha256.New()
+	if _, err := io.Copy(hasher, f); err != nil {
+		return "", err
+	}
+	return hex.EncodeToString(hasher.Sum(nil)), nil
+}
+
+// sortedKeys returns the keys of m in sorted order
+func sortedKeys[V any](m map[string]V) []string {
+	keys := make([]string, 0, len(m))
+	for key := range m {
+		keys = append(keys, key)
+	}
+	sort.Strings(keys)
+	return keys
+}
@@ -0,0 +1,258 @@
+package session
+
+import (
+	"archive/tar"
+	"crypto/sha256"
+	"encoding/hex"
+	"fmt"
+	"io"
+	"os"
+	"path/filepath"
+	"strings"
+	"testing"
+	"time"
+)
+
+// dirSource is a snapshotSource backed by a host directory, standing in for a container
+type dirSource struct {
+	root     string
+	archived []string // Paths requested by the last Archive call
+	hashed   []string // Paths requested by the last Hash call
+}
+
+func (s *dirSource) List(dir string) ([]remoteFile, error) {
+	base := filepath.Join(s.root, dir)
+	var files []remoteFile
+	err := filepath.Walk(base, func(path string, info os.FileInfo, err error) error {
+		if err != nil || path == base {
+			return err
+		}
+		rel, _ := filepath.Rel(base, path)
+		file := remoteFile{
+			Path:    rel,
+			Mode:    info.Mode().Perm(),
+			Size:    info.Size(),
+			ModTime: fmt.Sprintf("%d", info.ModTime().UnixNano()),
+		}
+		switch {
+		case info.Mode()&os.ModeSymlink != 0:
+			file.Type = 'l'
+			file.Target, _ = os.Readlink(path)
+		case info.IsDir():
+			file.Type = 'd'
+		default:
+			file.Type = 'f'
+		}
+		files = append(files, file)
+		return nil
+	})
+	return files, err
+}
+
+func (s *dirSource) Hash(dir string, paths []string) (map[string]string, error) {
+	s.hashed = paths
+	hashes := map[string]string{}
+	for _, path := range paths {
+		data, err := os.ReadFile(filepath.Join(s.root, dir, path))
+		if err != nil {
+			return nil, err
+		}
+		sum := sha256.Sum256(data)
+		hashes[path] = hex.EncodeToString(sum[:])
+	}
+	return hashes, nil
+}
+
+func (s *dirSource) Archive(dir string, paths []string, w io.Writer) error {
+	s.archived = paths
+	tw := tar.NewWriter(w)
+	for _, path := range paths {
+		data, err := os.ReadFile(filepath.Join(s.root, dir, path))
+		if err != nil {
+			return err
+		}
+		header := &tar.Header{Name: path, Mode: 0o600, Size: int64(len(data)), Typeflag: tar.TypeReg}
+		if err := tw.WriteHeader(header); err != nil {
+			return err
+		}
+		if _, err := tw.Write(data); err != nil {
+			return err
+		}
+	}
+	return tw.Close()
+}
+
+func writeTestFile(t *testing.T, path, content string) {
+	t.Helper()
+	if err := os.MkdirAll(filepath.Dir(path), 0o755); err != nil {
+		t.Fatal(err)
+	}
+	if err := os.WriteFile(path, []byte(content), 0o644); err != nil {
+		t.Fatal(err)
+	}
+}
+
+func TestSyncSnapshotIncremental(t *testing.T) {
+	remote := t.TempDir()
+	writeTestFile(t, filepath.Join(remote, ".claude", "projects", "a.jsonl"), "history a")
+	writeTestFile(t, filepath.Join(remote, ".claude", "projects", "b.jsonl"), "history b")
+	writeTestFile(t, filepath.Join(remote, ".claude", "settings.json"), "{}")
+	if err := os.Symlink("settings.json", filepath.Join(remote, ".claude", "link.json")); err != nil {
+		t.Fatal(err)
+	}
+
+	src := &dirSource{root: remote}
+	local := filepath.Join(t.TempDir(), ".claude")
+
+	// First save copies everything
+	manifest, stats, err := syncSnapshot(src, ".claude", local, LoadManifest(filepath.Join(t.TempDir(), "missing.json")))
+	if err != nil {
+		t.Fatalf("syncSnapshot() unexpected error: %v", err)
+	}
+	if stats.Files != 3 || stats.Transferred != 3 || stats.Linked != 0 {
+		t.Errorf("first syncSnapshot() stats = %+v, want 3 files all transferred", stats)
+	}
+	if target, err := os.Readlink(filepath.Join(local, "link.json")); err != nil || target != "settings.json" {
+		t.Errorf("symlink not restored: %q, %v", target, err)
+	}
+
+	// Change one file, add one, remove one
+	writeTestFile(t, filepath.Join(remote, ".claude", "projects", "a.jsonl"), "history a, continued")
+	writeTestFile(t, filepath.Join(remote, ".claude", "projects", "c.jsonl"), "history c")
+	if err := os.Remove(filepath.Join(remote, ".claude", "projects", "b.jsonl")); err != nil {
+		t.Fatal(err)
+	}
+
+	unchangedBefore, _ := os.Stat(filepath.Join(local, "settings.json"))
+	manifest, stats, err = syncSnapshot(src, ".claude", local, manifest)
+	if err != nil {
+		t.Fatalf("syncSnapshot() unexpected error: %v", err)
+	}
+	if stats.Transferred != 2 || stats.Linked != 1 {
+		t.Errorf("incremental syncSnapshot() stats = %+v, want 2 transferred, 1 linked", stats)
+	}
+	if strings.Join(src.archived, ",") != "projects/a.jsonl,projects/c.jsonl" && strings.Join(src.archived, ",") != "projects/c.jsonl,projects/a.jsonl" {
+		t.Errorf("archived %v, want only the changed and new files", src.archived)
+	}
+
+	data, _ := os.ReadFile(filepath.Join(local, "projects", "a.jsonl"))
+	if string(data) != "history a, continued" {
+		t.Errorf("changed file content = %q", data)
+	}
+	if _, err := os.Stat(filepath.Join(local, "projects", "b.jsonl")); !os.IsNotExist(err) {
+		t.Error("removed file still present in snapshot")
+	}
+	if _, ok := manifest.Files["projects/b.jsonl"]; ok {
+		t.Error("removed file still present in manifest")
+	}
+	unchangedAfter, _ := os.Stat(filepath.Join(local, "settings.json"))
+	if !os.SameFile(unchangedBefore, unchangedAfter) {
+		t.Error("unchanged file was not hard-linked from the previous snapshot")
+	}
+	if _, err := os.Stat(local + ".sync"); !os.IsNotExist(err) {
+		t.Error("staging directory left behind")
+	}
+}
+
+func TestSyncSnapshotHashCheck(t *testing.T) {
+	remote := t.TempDir()
+	remoteFile := filepath.Join(remote, ".claude", "settings.json")
+	writeTestFile(t, remoteFile, "same")
+
+	src := &dirSource{root: remote}
+	local := filepath.Join(t.TempDir(), ".claude")
+	writeTestFile(t, filepath.Join(local, "settings.json"), "same")
+
+	// A manifest from a full pull has no mtimes, only hashes
+	manifest, err := buildLocalManifest(local)
+	if err != nil {
+		t.Fatalf("buildLocalManifest() unexpected error: %v", err)
+	}
+
+	_, stats, err := syncSnapshot(src, ".claude", local, manifest)
+	if err != nil {
+		t.Fatalf("syncSnapshot() unexpected error: %v", err)
+	}
+	if stats.Transferred != 0 || stats.Linked != 1 || len(src.hashed) != 1 {
+		t.Errorf("syncSnapshot() stats = %+v (hashed %v), want the file verified by hash and linked", stats, src.hashed)
+	}
+
+	// Same size, different content: must be copied
+	writeTestFile(t, remoteFile, "diff")
+	future := time.Now().Add(time.Hour)
+	_ = os.Chtimes(remoteFile, future, future)
+	_, stats, err = syncSnapshot(src, ".claude", local, manifest)
+	if err != nil {
+		t.Fatalf("syncSnapshot() unexpected error: %v", err)
+	}
+	if stats.Transferred != 1 {
+		t.Errorf("syncSnapshot() stats = %+v, want the modified file transferred", stats)
+	}
+}
+
+func TestParseRemoteListing(t *testing.T) {
+	data := "f\x00644\x0012\x001700000000.5\x00\x00projects/a b.jsonl\x00" +
+		"l\x00777\x007\x001700000000.0\x00target\x00link\x00"
+
+	files, err := parseRemoteListing([]byte(data))
+	if err != nil {
+		t.Fatalf("parseRemoteListing() unexpected error: %v", err)
+	}
+	if len(files) != 2 {
+		t.Fatalf("parseRemoteListing() returned %d entries, want 2", len(files))
+	}
+	if files[0].Type != 'f' || files[0].Size != 12 || files[0].Mode != 0o644 || files[0].Path != "projects/a b.jsonl" {
+		t.Errorf("parseRemoteListing()[0] = %+v", files[0])
+	}
+	if files[1].Type != 'l' || files[1].Target != "target" {
+		t.Errorf("parseRemoteListing()[1] = %+v", files[1])
+	}
+
+	for _, bad := range []string{
+		"f\x00644\x0012\x00",                           // Truncated
+		"f\x00644\x0012\x001.0\x00\x00../escape\x00",   // Path traversal
+		"f\x00abc\x0012\x001.0\x00\x00file\x00",        // Bad mode
+		"f\x00644\x0012\x001.0\x00\x00/etc/passwd\x00", // Absolute path
+	} {
+		if _, err := parseRemoteListing([]byte(bad)); err == nil {
+			t.Errorf("parseRemoteListing(%q) expected error, got nil", bad)
+		}
+	}
+}
+
+func TestExtractSnapshotFilesRejectsTraversal(t *testing.T) {
+	pr, pw := io.Pipe()
+	go func() {
+		tw := tar.NewWriter(pw)
+		_ = tw.WriteHeader(&tar.Header{Name: "../evil", Mode: 0o644, Size: 1, Typeflag: tar.TypeReg})
+		_, _ = tw.Write([]byte("x"))
+		_ = tw.Close()
+		pw.Close()
+	}()
+
+	if _, err := extractSnapshotFiles(pr, t.TempDir()); err == nil {
+		t.Error("extractSnapshotFiles() expected error for path traversal, got nil")
+	}
+}
+
+func TestLoadManifestMissingOrInvalid(t *testing.T) {
+	dir := t.TempDir()
+	path := filepath.Join(dir, ManifestFilename)
+
+	if m := LoadManifest(path); len(m.Files) != 0 {
+		t.Errorf("LoadManifest(missing) = %v, want empty", m.Files)
+	}
+
+	_ = os.WriteFile(path, []byte(`{"version": 99, "files": {"a": {"size": 1}}}`), 0o644)
+	if m := LoadManifest(path); len(m.Files) != 0 {
+		t.Errorf("LoadManifest(other version) = %v, want empty", m.Files)
+	}
+
+	saved := &SessionManifest{Version: manifestVersion, Files: map[string]ManifestEntry{"a": {Size: 1, SHA256: "x"}}}
+	if err := saved.Save(path); err != nil {
+		t.Fatalf("Save() unexpected error: %v", err)
+	}
+	if m := LoadManifest(path); m.Files["a"].SHA256 != "x" {
+		t.Errorf("LoadManifest() = %v, want saved manifest", m.Files)
+	}
+}
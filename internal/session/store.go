@@ -0,0 +1,573 @@
+package session
+
+import (
+	"archive/tar"
+	"bufio"
+	"bytes"
+	"compress/gzip"
+	"crypto/sha256"
+	"encoding/hex"
+	"encoding/json"
+	"fmt"
+	"io"
+	"os"
+	"path"
+	"path/filepath"
+	"time"
+)
+
+// Session store backends (the [sessions] store config setting)
+const (
+	// StoreDirectory keeps one plain copy of the tool config directory per session
+	StoreDirectory = "directory"
+	// StoreCompressed keeps file contents as compressed, deduplicated chunks shared by all sessions
+	StoreCompressed = "compressed"
+)
+
+// StoreDirName is the shared blob store inside a sessions directory.
+// It starts with a dot so it is never mistaken for a session.
+const StoreDirName = ".store"
+
+// Chunk boundaries are placed at the first newline after chunkMinSize bytes (or at
+// chunkMaxSize for data without newlines). Boundaries only depend on the content
+// before them, so append-only JSONL histories that share a prefix share its chunks.
+const (
+	chunkMinSize = 64 << 10
+	chunkMaxSize = 1 << 20
+)
+
+// blobStore is a content-addressed store of gzip-compressed chunks with reference counts
+type blobStore struct {
+	dir string
+}
+
+// openBlobStore returns the blob store of a sessions directory
+func openBlobStore(sessionsDir string) *blobStore {
+	return &blobStore{dir: filepath.Join(sessionsDir, StoreDirName)}
+}
+
+// lock serializes store updates across coi processes
+func (s *blobStore) lock() (func(), error) {
+	return lockFile(filepath.Join(s.dir, "lock"))
+}
+
+// blobPath returns the path of a chunk, fanned out by the first two hex digits
+func (s *blobStore) blobPath(hash string) string {
+	return filepath.Join(s.dir, "blobs", hash[:2], hash+".gz")
+}
+
+// put stores a chunk unless an identical one is already present and returns its hash
+func (s *blobStore) put(chunk []byte) (string, error) {
+	sum := sha256.Sum256(chunk)
+	hash := hex.EncodeToString(sum[:])
+
+	blobPath := s.blobPath(hash)
+	if _, err := os.Stat(blobPath); err == nil {
+		return hash, nil
+	}
+	if err := os.MkdirAll(filepath.Dir(blobPath), 0o755); err != nil {
+		return "", err
+	}
+
+	var buf bytes.Buffer
+	zw := gzip.NewWriter(&buf)
+	if _, err := zw.Write(chunk); err != nil {
+		return "", err
+	}
+	if err := zw.Close(); err != nil {
+		return "", err
+	}
+
+	tmpPath := blobPath + ".tmp"
+	if err := os.WriteFile(tmpPath, buf.Bytes(), 0o644); err != nil {
+		return "", err
+	}
+	return hash, os.Rename(tmpPath, blobPath)
+}
+
+// writeBlob decompresses a chunk into w
+func (s *blobStore) writeBlob(hash string, w io.Writer) error {
+	f, err := os.Open(s.blobPath(hash))
+	if err != nil {
+		return err
+	}
+	defer f.Close()
+
+	zr, err := gzip.NewReader(f)
+	if err != nil {
+		return fmt.Errorf("corrupt blob %s: %w", hash, err)
+	}
+	defer zr.Close()
+
+	_, err = io.Copy(w, zr) //nolint:gosec // Chunks are at most chunkMaxSize plus one read buffer
+	return err
+}
+
+// refsPath is the reference count file
+func (s *blobStore) refsPath() string {
+	return filepath.Join(s.dir, "refs.json")
+}
+
+// loadRefs reads the reference counts (caller holds the lock)
+func (s *blobStore) loadRefs() (map[string]int, error) {
+	refs := map[string]int{}
+	data, err := os.ReadFile(s.refsPath())
+	if os.IsNotExist(err) {
+		return refs, nil
+	}
+	if err != nil {
+		return nil, err
+	}
+	if err := json.Unmarshal(data, &refs); err != nil {
+		return nil, fmt.Errorf("corrupt reference counts: %w", err)
+	}
+	return refs, nil
+}
+
+// saveRefs writes the reference counts atomically (caller holds the lock)
+func (s *blobStore) saveRefs(refs map[string]int) error {
+	data, err := json.Marshal(refs)
+	if err != nil {
+		return err
+	}
+	tmpPath := s.refsPath() + ".tmp"
+	if err := os.WriteFile(tmpPath, data, 0o644); err != nil {
+		return err
+	}
+	return os.Rename(tmpPath, s.refsPath())
+}
+
+// swapRefs adds references for every chunk of next and drops those of previous,
+// deleting chunks no session refers to anymore (caller holds the lock).
+// Either manifest may be nil or unpacked.
+func (s *blobStore) swapRefs(next, previous *SessionManifest) error {
+	refs, err := s.loadRefs()
+	if err != nil {
+		return err
+	}
+
+	for _, hash := range manifestChunks(next) {
+		refs[hash]++
+	}
+	for _, hash := range manifestChunks(previous) {
+		refs[hash]--
+		if refs[hash] <= 0 {
+			delete(refs, hash)
+			if err := os.Remove(s.blobPath(hash)); err != nil && !os.IsNotExist(err) {
+				return err
+			}
+		}
+	}
+
+	return s.saveRefs(refs)
+}
+
+// manifestChunks returns every chunk reference of a packed manifest
+func manifestChunks(manifest *SessionManifest) []string {
+	if manifest == nil || !manifest.Packed {
+		return nil
+	}
+	var chunks []string
+	for _, entry := range manifest.Files {
+		chunks = append(chunks, entry.Chunks...)
+	}
+	return chunks
+}
+
+// putFile splits a file into chunks and stores them.
+// Returns the chunk hashes and the SHA-256 of the whole file.
+func (s *blobStore) putFile(filePath string) ([]string, string, error) {
+	f, err := os.Open(filePath)
+	if err != nil {
+		return nil, "", err
+	}
+	defer f.Close()
+
+	fileHash := sha256.New()
+	var chunks []string
+	err = splitChunks(io.TeeReader(f, fileHash), func(chunk []byte) error {
+		hash, err := s.put(chunk)
+		if err == nil {
+			chunks = append(chunks, hash)
+		}
+		return err
+	})
+	if err != nil {
+		return nil, "", err
+	}
+	return chunks, hex.EncodeToString(fileHash.Sum(nil)), nil
+}
+
+// splitChunks cuts r into chunks at content-defined boundaries (see chunkMinSize)
+func splitChunks(r io.Reader, emit func([]byte) error) error {
+	br := bufio.NewReaderSize(r, chunkMinSize)
+	var chunk []byte
+
+	for {
+		line, err := br.ReadSlice('\n')
+		chunk = append(chunk, line...)
+
+		atBoundary := len(chunk) >= chunkMinSize && len(line) > 0 && line[len(line)-1] == '\n'
+		if atBoundary || len(chunk) >= chunkMaxSize {
+			if emitErr := emit(chunk); emitErr != nil {
+				return emitErr
+			}
+			chunk = nil
+		}
+
+		switch err {
+		case nil, bufio.ErrBufferFull:
+			continue
+		case io.EOF:
+			if len(chunk) > 0 {
+				return emit(chunk)
+			}
+			return nil
+		default:
+			return err
+		}
+	}
+}
+
+// packDirectory moves a snapshot directory into the store and returns its packed manifest.
+// Modification times are taken from mtimes (the manifest the directory was synced with)
+// when it has them. The caller holds the store lock and removes the directory afterwards.
+func packDirectory(store *blobStore, dir string, mtimes *SessionManifest) (*SessionManifest, error) {
+	packed := newPackedManifest()
+
+	err := filepath.Walk(dir, func(filePath string, info os.FileInfo, err error) error {
+		if err != nil || filePath == dir {
+			return err
+		}
+		rel, err := filepath.Rel(dir, filePath)
+		if err != nil {
+			return err
+		}
+		rel = filepath.ToSlash(rel)
+
+		switch {
+		case info.Mode()&os.ModeSymlink != 0:
+			target, err := os.Readlink(filePath)
+			if err != nil {
+				return err
+			}
+			packed.Symlinks[rel] = target
+		case info.IsDir():
+			packed.Dirs[rel] = uint32(info.Mode().Perm())
+		case info.Mode().IsRegular():
+			chunks, hash, err := store.putFile(filePath)
+			if err != nil {
+				return err
+			}
+			var modTime string
+			if mtimes != nil {
+				modTime = mtimes.Files[rel].ModTime
+			}
+			packed.Files[rel] = ManifestEntry{
+				Size:    info.Size(),
+				ModTime: modTime,
+				Mode:    uint32(info.Mode().Perm()),
+				SHA256:  hash,
+				Chunks:  chunks,
+			}
+		}
+		return nil
+	})
+	if err != nil {
+		return nil, err
+	}
+	return packed, nil
+}
+
+// newPackedManifest returns an empty manifest for a packed snapshot
+func newPackedManifest() *SessionManifest {
+	return &SessionManifest{
+		Version:  manifestVersion,
+		Packed:   true,
+		Files:    map[string]ManifestEntry{},
+		Dirs:     map[string]uint32{},
+		Symlinks: map[string]string{},
+	}
+}
+
+// syncPackedSnapshot is syncSnapshot for packed sessions: unchanged files keep their
+// chunks in the store, only new or changed files are copied out of the container
+// (through stagingDir) and chunked. Returns the packed manifest of the new snapshot.
+func syncPackedSnapshot(src snapshotSource, remoteDir string, store *blobStore, stagingDir string, manifest *SessionManifest) (*SessionManifest, SyncStats, error) {
+	var stats SyncStats
+
+	plan, err := planSnapshot(src, remoteDir, manifest, func(string, int64) bool {
+		return manifest.Packed
+	})
+	if err != nil {
+		return nil, stats, err
+	}
+
+	if err := os.RemoveAll(stagingDir); err != nil {
+		return nil, stats, err
+	}
+	if err := os.MkdirAll(stagingDir, 0o755); err != nil {
+		return nil, stats, err
+	}
+	defer os.RemoveAll(stagingDir)
+
+	if err := makeSnapshotDirs(stagingDir, plan); err != nil {
+		return nil, stats, err
+	}
+	received := map[string]string{}
+	if len(plan.transfer) > 0 {
+		if received, err = receiveArchive(src, remoteDir, plan.transfer, stagingDir); err != nil {
+			return nil, stats, err
+		}
+	}
+
+	unlock, err := store.lock()
+	if err != nil {
+		return nil, stats, err
+	}
+	defer unlock()
+
+	next := newPackedManifest()
+	for dir, mode := range plan.dirs {
+		next.Dirs[dir] = uint32(mode)
+	}
+	for _, link := range plan.symlinks {
+		next.Symlinks[link.Path] = link.Target
+	}
+
+	for _, filePath := range plan.unchanged {
+		entry := manifest.Files[filePath]
+		entry.ModTime = plan.files[filePath].ModTime
+		entry.Mode = uint32(plan.files[filePath].Mode)
+		next.Files[filePath] = entry
+		stats.Linked++
+	}
+
+	for _, filePath := range plan.transfer {
+		if _, ok := received[filePath]; !ok {
+			// Removed between listing and transfer
+			continue
+		}
+		chunks, hash, err := store.putFile(filepath.Join(stagingDir, filePath))
+		if err != nil {
+			return nil, stats, err
+		}
+		file := plan.files[filePath]
+		next.Files[filePath] = ManifestEntry{
+			Size:    file.Size,
+			ModTime: file.ModTime,
+			Mode:    uint32(file.Mode),
+			SHA256:  hash,
+			Chunks:  chunks,
+		}
+		stats.Transferred++
+		stats.Bytes += file.Size
+	}
+
+	if err := store.swapRefs(next, manifest); err != nil {
+		return nil, stats, err
+	}
+
+	stats.Files = len(next.Files)
+	return next, stats, nil
+}
+
+// packSession replaces the snapshot directory of a session with chunks in the store.
+// mtimes is the manifest the directory was synced with, previous the manifest the
+// session had before this save (its chunk references are released).
+func packSession(sessionsDir, localConfigDir string, mtimes, previous *SessionManifest) (*SessionManifest, error) {
+	store := openBlobStore(sessionsDir)
+	unlock, err := store.lock()
+	if err != nil {
+		return nil, err
+	}
+	defer unlock()
+
+	packed, err := packDirectory(store, localConfigDir, mtimes)
+	if err != nil {
+		return nil, err
+	}
+	if err := store.swapRefs(packed, previous); err != nil {
+		return nil, err
+	}
+	return packed, nil
+}
+
+// releaseSession drops the chunk references of a packed manifest that is being replaced
+// by a plain snapshot directory
+func releaseSession(sessionsDir string, previous *SessionManifest) error {
+	if !previous.Packed {
+		return nil
+	}
+	store := openBlobStore(sessionsDir)
+	unlock, err := store.lock()
+	if err != nil {
+		return err
+	}
+	defer unlock()
+	return store.swapRefs(nil, previous)
+}
+
+// writePackedArchive writes a packed snapshot as a tar archive rooted at root,
+// owned by uid:uid, ready for container.Manager.ExtractArchive
+func writePackedArchive(store *blobStore, manifest *SessionManifest, root string, uid int, w io.Writer) error {
+	tw := tar.NewWriter(w)
+	now := time.Now()
+
+	header := func(name string, typeflag byte, mode uint32) *tar.Header {
+		return &tar.Header{
+			Name:     path.Join(root, name),
+			Typeflag: typeflag,
+			Mode:     int64(mode),
+			Uid:      uid,
+			Gid:      uid,
+			ModTime:  now,
+			Format:   tar.FormatPAX,
+		}
+	}
+
+	rootHeader := header("", tar.TypeDir, 0o755)
+	rootHeader.Name += "/"
+	if err := tw.WriteHeader(rootHeader); err != nil {
+		return err
+	}
+
+	for _, dir := range sortedKeys(manifest.Dirs) {
+		h := header(dir, tar.TypeDir, manifest.Dirs[dir])
+		h.Name += "/"
+		if err := tw.WriteHeader(h); err != nil {
+			return err
+		}
+	}
+
+	for _, filePath := range sortedKeys(manifest.Files) {
+		entry := manifest.Files[filePath]
+		h := header(filePath, tar.TypeReg, entry.Mode)
+		h.Size = entry.Size
+		if err := tw.WriteHeader(h); err != nil {
+			return err
+		}
+		for _, hash := range entry.Chunks {
+			if err := store.writeBlob(hash, tw); err != nil {
+				return fmt.Errorf("failed to read %s from session store: %w", filePath, err)
+			}
+		}
+	}
+
+	for _, link := range sortedKeys(manifest.Symlinks) {
+		h := header(link, tar.TypeSymlink, 0o777)
+		h.Linkname = manifest.Symlinks[link]
+		if err := tw.WriteHeader(h); err != nil {
+			return err
+		}
+	}
+
+	return tw.Close()
+}
+
+// IsPackedSession reports whether a session's data lives in the compressed store.
+// Only the first manifest fields are decoded, so this stays cheap for large manifests.
+func IsPackedSession(sessionDir string) bool {
+	f, err := os.Open(filepath.Join(sessionDir, ManifestFilename))
+	if err != nil {
+		return false
+	}
+	defer f.Close()
+
+	var head struct {
+		Version int  `json:"version"`
+		Packed  bool `json:"packed"`
+	}
+	dec := json.NewDecoder(bufio.NewReader(f))
+	if tok, err := dec.Token(); err != nil || tok != json.Delim('{') {
+		return false
+	}
+	// Version and Packed are the first two fields written by SessionManifest.Save
+	for i := 0; i < 2 && dec.More(); i++ {
+		key, err := dec.Token()
+		if err != nil {
+			return false
+		}
+		switch key {
+		case "version":
+			err = dec.Decode(&head.Version)
+		case "packed":
+			err = dec.Decode(&head.Packed)
+		default:
+			return false
+		}
+		if err != nil {
+			return false
+		}
+	}
+	return head.Version == manifestVersion && head.Packed
+}
+
+// RemoveSession deletes a saved session, releasing its chunks in the compressed store
+func RemoveSession(sessionsDir, sessionID string) error {
+	sessionDir := filepath.Join(sessionsDir, sessionID)
+
+	if IsPackedSession(sessionDir) {
+		store := openBlobStore(sessionsDir)
+		unlock, err := store.lock()
+		if err != nil {
+			return err
+		}
+		err = store.swapRefs(nil, LoadManifest(filepath.Join(sessionDir, ManifestFilename)))
+		if err == nil {
+			// Drop the manifest under the lock, so a failed RemoveAll cannot release twice
+			err = os.Remove(filepath.Join(sessionDir, ManifestFilename))
+		}
+		unlock()
+		if err != nil {
+			return fmt.Errorf("failed to release session store references: %w", err)
+		}
+	}
+
+	if err := os.RemoveAll(sessionDir); err != nil {
+		return err
+	}
+	removeFromSessionIndex(sessionsDir, sessionID)
+	return nil
+}
+
+// SessionDataSize returns the size of a session's saved files and the bytes they occupy
+// on disk (smaller than size for packed sessions, whose chunks are compressed and shared).
+// Uses the manifest when present instead of walking the snapshot directory.
+func SessionDataSize(sessionsDir, sessionID, configDirName string) (size, stored int64, err error) {
+	sessionDir := filepath.Join(sessionsDir, sessionID)
+	manifest := LoadManifest(filepath.Join(sessionDir, ManifestFilename))
+
+	if len(manifest.Files) == 0 {
+		err = filepath.Walk(filepath.Join(sessionDir, configDirName), func(_ string, info os.FileInfo, err error) error {
+			if err != nil {
+				return err
+			}
+			if !info.IsDir() {
+				size += info.Size()
+			}
+			return nil
+		})
+		return size, size, err
+	}
+
+	for _, entry := range manifest.Files {
+		size += entry.Size
+	}
+	if !manifest.Packed {
+		return size, size, nil
+	}
+
+	store := openBlobStore(sessionsDir)
+	seen := map[string]bool{}
+	for _, hash := range manifestChunks(manifest) {
+		if seen[hash] {
+			continue
+		}
+		seen[hash] = true
+		if info, err := os.Stat(store.blobPath(hash)); err == nil {
+			stored += info.Size()
+		}
+	}
+	return size, stored, nil
+}
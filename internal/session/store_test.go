@@ -0,0 +1,250 @@
+package session
+
+import (
+	"archive/tar"
+	"bytes"
+	"fmt"
+	"io"
+	"os"
+	"path/filepath"
+	"strings"
+	"testing"
+
+	"github.com/mensfeld/code-on-incus/internal/tool"
+)
+
+// jsonlHistory returns n lines of fake conversation history
+func jsonlHistory(n int) string {
+	var b strings.Builder
+	for i := 0; i < n; i++ {
+		fmt.Fprintf(&b, `{"type":"message","index":%d,"text":"%s"}`+"\n", i, strings.Repeat("x", 100))
+	}
+	return b.String()
+}
+
+func TestSplitChunksSharedPrefix(t *testing.T) {
+	collect := func(data string) []string {
+		var chunks []string
+		err := splitChunks(strings.NewReader(data), func(chunk []byte) error {
+			chunks = append(chunks, string(chunk))
+			return nil
+		})
+		if err != nil {
+			t.Fatalf("splitChunks() unexpected error: %v", err)
+		}
+		return chunks
+	}
+
+	short := jsonlHistory(2000)
+	long := short + jsonlHistory(500)
+
+	shortChunks := collect(short)
+	longChunks := collect(long)
+
+	if strings.Join(longChunks, "") != long {
+		t.Fatal("splitChunks() chunks do not reassemble the input")
+	}
+	if len(shortChunks) < 3 {
+		t.Fatalf("splitChunks() produced %d chunks, want several", len(shortChunks))
+	}
+	// Every complete chunk of the shorter history is shared with the longer one
+	for i := 0; i < len(shortChunks)-1; i++ {
+		if shortChunks[i] != longChunks[i] {
+			t.Errorf("chunk %d differs between histories sharing a prefix", i)
+		}
+		if !strings.HasSuffix(shortChunks[i], "\n") {
+			t.Errorf("chunk %d does not end at a line boundary", i)
+		}
+	}
+}
+
+func TestSplitChunksWithoutNewlines(t *testing.T) {
+	data := bytes.Repeat([]byte("a"), chunkMaxSize*2+10)
+	var sizes []int
+	err := splitChunks(bytes.NewReader(data), func(chunk []byte) error {
+		sizes = append(sizes, len(chunk))
+		return nil
+	})
+	if err != nil {
+		t.Fatalf("splitChunks() unexpected error: %v", err)
+	}
+	if len(sizes) != 3 || sizes[0] != chunkMaxSize || sizes[2] != 10 {
+		t.Errorf("splitChunks() sizes = %v, want two max-size chunks and the rest", sizes)
+	}
+}
+
+// packTestSession creates a plain snapshot for sessionID and packs it
+func packTestSession(t *testing.T, sessionsDir, sessionID string, files map[string]string) *SessionManifest {
+	t.Helper()
+	configDir := filepath.Join(sessionsDir, sessionID, ".claude")
+	for name, content := range files {
+		writeTestFile(t, filepath.Join(configDir, name), content)
+	}
+
+	packed, err := packSession(sessionsDir, configDir, nil, LoadManifest(""))
+	if err != nil {
+		t.Fatalf("packSession() unexpected error: %v", err)
+	}
+	if err := packed.Save(filepath.Join(sessionsDir, sessionID, ManifestFilename)); err != nil {
+		t.Fatal(err)
+	}
+	if err := os.RemoveAll(configDir); err != nil {
+		t.Fatal(err)
+	}
+	return packed
+}
+
+func TestPackedSessionRoundTrip(t *testing.T) {
+	sessionsDir := t.TempDir()
+	history := jsonlHistory(1500)
+	packed := packTestSession(t, sessionsDir, "s1", map[string]string{
+		"projects/-workspace/abc.jsonl": history,
+		"settings.json":                 "{}",
+		"empty":                         "",
+	})
+
+	if !packed.Packed || len(packed.Files) != 3 {
+		t.Fatalf("packSession() = %+v, want 3 packed files", packed)
+	}
+	if !SessionExists(sessionsDir, "s1") || !IsPackedSession(filepath.Join(sessionsDir, "s1")) {
+		t.Error("packed session should exist without a .claude directory")
+	}
+	if got := GetCLISessionID(sessionsDir, "s1"); got != "abc" {
+		t.Errorf("GetCLISessionID() = %q, want abc", got)
+	}
+	if got := DiscoverCLISessionID(tool.NewClaude(), sessionsDir, "s1"); got != "abc" {
+		t.Errorf("DiscoverCLISessionID() = %q, want abc from the packed manifest", got)
+	}
+
+	size, stored, err := SessionDataSize(sessionsDir, "s1", ".claude")
+	if err != nil {
+		t.Fatalf("SessionDataSize() unexpected error: %v", err)
+	}
+	if size != int64(len(history)+2) || stored == 0 || stored >= size {
+		t.Errorf("SessionDataSize() = %d, %d, want %d logical bytes stored compressed", size, stored, len(history)+2)
+	}
+
+	var buf bytes.Buffer
+	if err := writePackedArchive(openBlobStore(sessionsDir), packed, ".claude", 1000, &buf); err != nil {
+		t.Fatalf("writePackedArchive() unexpected error: %v", err)
+	}
+
+	tr := tar.NewReader(&buf)
+	contents := map[string]string{}
+	for {
+		header, err := tr.Next()
+		if err == io.EOF {
+			break
+		}
+		if err != nil {
+			t.Fatalf("invalid archive: %v", err)
+		}
+		if header.Uid != 1000 {
+			t.Errorf("%s uid = %d, want 1000", header.Name, header.Uid)
+		}
+		data, _ := io.ReadAll(tr)
+		contents[header.Name] = string(data)
+	}
+	if contents[".claude/projects/-workspace/abc.jsonl"] != history {
+		t.Error("restored history does not match the saved one")
+	}
+	if _, ok := contents[".claude/projects/"]; !ok {
+		t.Errorf("archive missing directory entries: %v", len(contents))
+	}
+}
+
+func TestRemoveSessionKeepsSharedChunks(t *testing.T) {
+	sessionsDir := t.TempDir()
+	shared := jsonlHistory(1500)
+
+	first := packTestSession(t, sessionsDir, "s1", map[string]string{"h.jsonl": shared})
+	packTestSession(t, sessionsDir, "s2", map[string]string{"h.jsonl": shared + jsonlHistory(10)})
+
+	store := openBlobStore(sessionsDir)
+	sharedChunk := first.Files["h.jsonl"].Chunks[0]
+
+	if err := RemoveSession(sessionsDir, "s1"); err != nil {
+		t.Fatalf("RemoveSession() unexpected error: %v", err)
+	}
+	if _, err := os.Stat(filepath.Join(sessionsDir, "s1")); !os.IsNotExist(err) {
+		t.Error("RemoveSession() left the session directory")
+	}
+	if _, err := os.Stat(store.blobPath(sharedChunk)); err != nil {
+		t.Error("chunk still referenced by s2 was deleted")
+	}
+
+	if err := RemoveSession(sessionsDir, "s2"); err != nil {
+		t.Fatalf("RemoveSession() unexpected error: %v", err)
+	}
+	if _, err := os.Stat(store.blobPath(sharedChunk)); !os.IsNotExist(err) {
+		t.Error("unreferenced chunk was not deleted")
+	}
+	refs, _ := store.loadRefs()
+	if len(refs) != 0 {
+		t.Errorf("reference counts = %v, want empty", refs)
+	}
+}
+
+func TestSyncPackedSnapshot(t *testing.T) {
+	sessionsDir := t.TempDir()
+	remote := t.TempDir()
+	writeTestFile(t, filepath.Join(remote, ".claude", "a.jsonl"), jsonlHistory(100))
+	writeTestFile(t, filepath.Join(remote, ".claude", "b.json"), "{}")
+
+	src := &dirSource{root: remote}
+	store := openBlobStore(sessionsDir)
+	staging := filepath.Join(sessionsDir, "s1", ".claude.sync")
+
+	// Syncing against an empty packed manifest copies everything into the store
+	manifest, stats, err := syncPackedSnapshot(src, ".claude", store, staging, newPackedManifest())
+	if err != nil {
+		t.Fatalf("syncPackedSnapshot() unexpected error: %v", err)
+	}
+	if stats.Transferred != 2 || !manifest.Packed {
+		t.Errorf("syncPackedSnapshot() stats = %+v, want 2 transferred", stats)
+	}
+
+	writeTestFile(t, filepath.Join(remote, ".claude", "b.json"), `{"changed": true}`)
+	manifest, stats, err = syncPackedSnapshot(src, ".claude", store, staging, manifest)
+	if err != nil {
+		t.Fatalf("syncPackedSnapshot() unexpected error: %v", err)
+	}
+	if stats.Transferred != 1 || stats.Linked != 1 || len(src.archived) != 1 {
+		t.Errorf("syncPackedSnapshot() stats = %+v (archived %v), want only b.json copied", stats, src.archived)
+	}
+	if _, err := os.Stat(staging); !os.IsNotExist(err) {
+		t.Error("staging directory left behind")
+	}
+
+	// The old version of b.json is no longer referenced
+	refs, _ := store.loadRefs()
+	if len(refs) != len(manifestChunks(manifest)) {
+		t.Errorf("reference counts = %d, want %d (stale chunks released)", len(refs), len(manifestChunks(manifest)))
+	}
+}
+
+func TestIsPackedSessionPlainManifest(t *testing.T) {
+	dir := t.TempDir()
+	manifest := &SessionManifest{Version: manifestVersion, Files: map[string]ManifestEntry{"a": {Size: 1}}}
+	if err := manifest.Save(filepath.Join(dir, ManifestFilename)); err != nil {
+		t.Fatal(err)
+	}
+	if IsPackedSession(dir) {
+		t.Error("IsPackedSession() = true for a plain snapshot manifest")
+	}
+	if IsPackedSession(t.TempDir()) {
+		t.Error("IsPackedSession() = true without a manifest")
+	}
+}
+
+func TestDiscoverCLISessionIDPlain(t *testing.T) {
+	sessionsDir := t.TempDir()
+	writeTestFile(t, filepath.Join(sessionsDir, "s1", ".claude", "projects", "-workspace", "def.jsonl"), "{}")
+
+	if got := DiscoverCLISessionID(tool.NewClaude(), sessionsDir, "s1"); got != "def" {
+		t.Errorf("DiscoverCLISessionID() = %q, want def from the plain snapshot", got)
+	}
+	if got := DiscoverCLISessionID(tool.NewClaude(), sessionsDir, "missing"); got != "" {
+		t.Errorf("DiscoverCLISessionID() for a missing session = %q, want empty", got)
+	}
+}
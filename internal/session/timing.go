@@ -0,0 +1,64 @@
+package session
+
+import (
+	"sync"
+	"time"
+)
+
+// Setup phases recorded by a PhaseTimer, in the order they run
+const (
+	PhaseImageCheck = "image_check"
+	PhaseCreate     = "create" // init, devices and start in one call (or pool claim + start)
+	PhaseReady      = "ready"
+	PhaseNetwork    = "network"
+	PhaseConfigPush = "config_push"
+)
+
+// PhaseTiming is how long one named phase took
+type PhaseTiming struct {
+	Name     string
+	Duration time.Duration
+}
+
+// PhaseTimer records how long each setup phase takes. A nil timer records nothing,
+// so callers can time phases unconditionally.
+type PhaseTimer struct {
+	mu     sync.Mutex
+	phases []PhaseTiming
+}
+
+// NewPhaseTimer creates an empty timer
+func NewPhaseTimer() *PhaseTimer {
+	return &PhaseTimer{}
+}
+
+// Start begins timing a phase and returns the function that ends it
+func (t *PhaseTimer) Start(name string) func() {
+	if t == nil {
+		return func() {}
+	}
+	start := time.Now()
+	return func() {
+		t.Record(name, time.Since(start))
+	}
+}
+
+// Record adds a phase duration measured elsewhere
+func (t *PhaseTimer) Record(name string, d time.Duration) {
+	if t == nil {
+		return
+	}
+	t.mu.Lock()
+	defer t.mu.Unlock()
+	t.phases = append(t.phases, PhaseTiming{Name: name, Duration: d})
+}
+
+// Phases returns the recorded phases in the order they finished
+func (t *PhaseTimer) Phases() []PhaseTiming {
+	if t == nil {
+		return nil
+	}
+	t.mu.Lock()
+	defer t.mu.Unlock()
+	return append([]PhaseTiming(nil), t.phases...)
+}
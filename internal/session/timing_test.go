@@ -0,0 +1,37 @@
+package session
+
+import (
+	"testing"
+	"time"
+)
+
+func TestPhaseTimer(t *testing.T) {
+	timer := NewPhaseTimer()
+
+	end := timer.Start(PhaseCreate)
+	time.Sleep(5 * time.Millisecond)
+	end()
+	timer.Record(PhaseReady, 20*time.Millisecond)
+
+	phases := timer.Phases()
+	if len(phases) != 2 {
+		t.Fatalf("Phases() returned %d phases, want 2", len(phases))
+	}
+	if phases[0].Name != PhaseCreate || phases[0].Duration < 5*time.Millisecond {
+		t.Errorf("Phases()[0] = %+v, want %s of at least 5ms", phases[0], PhaseCreate)
+	}
+	if phases[1] != (PhaseTiming{Name: PhaseReady, Duration: 20 * time.Millisecond}) {
+		t.Errorf("Phases()[1] = %+v, want %s of 20ms", phases[1], PhaseReady)
+	}
+}
+
+func TestPhaseTimerNil(t *testing.T) {
+	var timer *PhaseTimer
+
+	// A nil timer is a no-op so Setup can time phases unconditionally
+	timer.Start(PhaseCreate)()
+	timer.Record(PhaseReady, time.Second)
+	if phases := timer.Phases(); phases != nil {
+		t.Errorf("Phases() = %v, want nil", phases)
+	}
+}
@@ -0,0 +1,694 @@
+#!/usr/bin/env python3
+"""
+Fake incus - a stand-in for the incus CLI so coi can run without an Incus daemon.
+
+Implements the subset of `incus` that coi and the test suite use: info, list, launch,
+init, start, stop, delete, rename, config, file, exec, snapshot, publish, image, profile
+and network. State lives under $FAKE_INCUS_DIR (one directory per instance, with a rootfs
+directory standing in for the container filesystem). Commands given to `incus exec` run on the
+host with the instance's disk devices and rootfs mapped in place of container paths,
+guest/ first on PATH (whoami, id, sudo, poweroff, ... as they behave in the coi image),
+and a tmux socket directory of their own so sessions never touch the host tmux server.
+
+Environment:
+    FAKE_INCUS_DIR     State directory (required)
+    FAKE_INCUS_IMAGES  Comma-separated image aliases to seed (default: coi)
+    FAKE_INCUS_DELAY   Seconds to sleep per invocation, to simulate daemon latency
+
+Run coi with COI_INCUS_TRANSPORT=cli and bin/ first on PATH (see README.md).
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+# Container paths outside disk devices that are backed by the instance rootfs when they
+# appear in exec arguments
+ROOTFS_PATHS = ("/home", "/root", "/tmp")
+
+# Commands that behave inside exec as they would in the coi image
+GUEST_BIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "guest")
+
+# Users known to the coi image, by UID
+USERS = {0: "root", 1000: "code"}
+
+
+class IncusError(Exception):
+    """A user-facing incus error (printed as "Error: ..." with exit status 1)."""
+
+
+def state_dir():
+    path = os.environ.get("FAKE_INCUS_DIR")
+    if not path:
+        raise IncusError("FAKE_INCUS_DIR is not set")
+    os.makedirs(os.path.join(path, "instances"), exist_ok=True)
+    return path
+
+
+@contextlib.contextmanager
+def locked():
+    """Serialize state changes between concurrent fake incus processes."""
+    with open(os.path.join(state_dir(), "lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def read_json(path, default):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def now():
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def write_json(path, data):
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+# Images
+
+
+def images_path():
+    return os.path.join(state_dir(), "images.json")
+
+
+def load_images():
+    images = read_json(images_path(), None)
+    if images is None:
+        aliases = os.environ.get("FAKE_INCUS_IMAGES", "coi").split(",")
+        images = [new_image(alias.strip()) for alias in aliases if alias.strip()]
+        write_json(images_path(), images)
+    return images
+
+
+def new_image(alias, seed=None, description=""):
+    fingerprint = hashlib.sha256((seed or alias).encode()).hexdigest()
+    return {
+        "fingerprint": fingerprint,
+        "aliases": [{"name": alias, "description": ""}] if alias else [],
+        "properties": {"description": description},
+        "created_at": now(),
+        "size": 0,
+    }
+
+
+def find_image(images, ref):
+    for image in images:
+        if image["fingerprint"].startswith(ref) or any(a["name"] == ref for a in image["aliases"]):
+            return image
+    return None
+
+
+def image_rootfs(image):
+    return os.path.join(state_dir(), "images", image["fingerprint"], "rootfs")
+
+
+# Instances
+
+
+def instance_dir(name):
+    return os.path.join(state_dir(), "instances", name)
+
+
+def load_instance(name):
+    instance = read_json(os.path.join(instance_dir(name), "instance.json"), None)
+    if instance is None:
+        raise IncusError("Instance not found")
+    return instance
+
+
+def save_instance(instance):
+    write_json(os.path.join(instance_dir(instance["name"]), "instance.json"), instance)
+
+
+def all_instances():
+    root = os.path.join(state_dir(), "instances")
+    instances = []
+    for name in sorted(os.listdir(root)):
+        instance = read_json(os.path.join(root, name, "instance.json"), None)
+        if instance is not None:
+            instances.append(instance)
+    return instances
+
+
+def next_address():
+    """Hand out deterministic addresses: 10.47.0.2, 10.47.0.3, ..."""
+    counter_path = os.path.join(state_dir(), "next_ip")
+    n = read_json(counter_path, 2)
+    write_json(counter_path, n + 1)
+    return f"10.47.{n // 256}.{n % 256}"
+
+
+def listed(instance):
+    """Render an instance the way `incus list --format=json` does."""
+    running = instance["status"] == "Running"
+    network = None
+    if running:
+        network = {
+            "eth0": {"addresses": [{"family": "inet", "address": instance["address"]}]},
+            "lo": {"addresses": [{"family": "inet", "address": "127.0.0.1"}]},
+        }
+    return {
+        "name": instance["name"],
+        "status": instance["status"],
+        "created_at": instance["created_at"],
+        "ephemeral": instance["ephemeral"],
+        "profiles": instance["profiles"],
+        "config": instance["config"],
+        "devices": instance["devices"],
+        "state": {"status": instance["status"], "network": network},
+    }
+
+
+def stopped_instance(name):
+    instance = load_instance(name)
+    if instance["status"] == "Running":
+        raise IncusError("The instance is currently running, stop it first")
+    return instance
+
+
+def kill_tmux(instance):
+    """Stop the instance's tmux server, as stopping a real container would."""
+    if shutil.which("tmux"):
+        subprocess.run(
+            ["tmux", "kill-server"],
+            env=exec_env(instance, {}),
+            capture_output=True,
+            check=False,
+        )
+
+
+def remove_instance(instance):
+    kill_tmux(instance)
+    shutil.rmtree(instance_dir(instance["name"]), ignore_errors=True)
+
+
+# Path mapping
+
+
+def disk_devices(instance):
+    return {
+        dev["path"]: dev["source"]
+        for dev in instance["devices"].values()
+        if dev.get("type") == "disk" and "path" in dev and "source" in dev
+    }
+
+
+def host_path(instance, path):
+    """Map an absolute container path to the host path backing it."""
+    for mount in sorted(disk_devices(instance), key=len, reverse=True):
+        prefix = mount.rstrip("/")
+        if path == prefix or path.startswith(prefix + "/"):
+            return disk_devices(instance)[mount] + path[len(prefix) :]
+    return os.path.join(instance_dir(instance["name"]), "rootfs", path.lstrip("/"))
+
+
+def rewrite_paths(instance, text):
+    """Rewrite container paths under disk devices or the rootfs inside a command string."""
+    roots = sorted(list(disk_devices(instance)) + list(ROOTFS_PATHS), key=len, reverse=True)
+    alternatives = "|".join(re.escape(root.rstrip("/")) for root in roots)
+    pattern = re.compile(r"(?<![\w./~-])(" + alternatives + r")(?=/|\b|$)[^\s'\";|&)]*")
+    return pattern.sub(lambda m: host_path(instance, m.group(0)), text)
+
+
+def exec_env(instance, extra, uid=0):
+    env = {k: v for k, v in os.environ.items() if k not in ("TMUX", "TMUX_PANE")}
+    tmux_dir = os.path.join(instance_dir(instance["name"]), "tmux")
+    os.makedirs(tmux_dir, exist_ok=True)
+    user = USERS.get(uid, str(uid))
+    env.update(
+        {
+            "PATH": os.pathsep.join(
+                [GUEST_BIN, host_path(instance, "/usr/local/bin"), env.get("PATH", "")]
+            ),
+            "TMUX_TMPDIR": tmux_dir,
+            "HOME": host_path(instance, "/root" if uid == 0 else f"/home/{user}"),
+            "USER": user,
+            "FAKE_INCUS_INSTANCE": instance["name"],
+            "FAKE_INCUS_UID": str(uid),
+        }
+    )
+    env.update({key: rewrite_paths(instance, value) for key, value in extra.items()})
+    return env
+
+
+# Commands
+
+
+def parse_flags(args, flags_with_value=(), bool_flags=()):
+    """Split args into positionals and {flag: [values]}; everything after -- is positional."""
+    positional, flags = [], {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == "--":
+            positional.extend(args[i + 1 :])
+            break
+        name, _, value = arg.partition("=")
+        if name in flags_with_value:
+            if not value:
+                i += 1
+                value = args[i] if i < len(args) else ""
+            flags.setdefault(name, []).append(value)
+        elif name in bool_flags:
+            flags.setdefault(name, []).append(value or "true")
+        else:
+            positional.append(arg)
+        i += 1
+    return positional, flags
+
+
+def cmd_info(args):
+    if not args:
+        print("config: {}\nenvironment:\n  server: fake-incus")
+        return
+    instance = load_instance(args[0])
+    print(f"Name: {instance['name']}\nStatus: {instance['status'].upper()}")
+    print(f"Type: container{' (ephemeral)' if instance['ephemeral'] else ''}")
+    print(f"Created: {instance['created_at']}")
+
+
+def cmd_image(args):
+    action, rest = (args[0], args[1:]) if args else ("", [])
+    if action in ("list", "ls"):
+        positional, flags = parse_flags(rest, flags_with_value=("--format", "-f"))
+        images = load_images()
+        if positional:
+            ref = positional[0]
+            images = [
+                image
+                for image in images
+                if image["fingerprint"].startswith(ref)
+                or any(alias["name"].startswith(ref) for alias in image["aliases"])
+            ]
+        if (flags.get("--format") or flags.get("-f") or ["table"])[-1] == "json":
+            print(json.dumps(images))
+        else:
+            for image in images:
+                print(",".join(a["name"] for a in image["aliases"]), image["fingerprint"][:12])
+    elif action == "delete":
+        with locked():
+            images = load_images()
+            for ref in rest:
+                image = find_image(images, ref)
+                if image is None:
+                    raise IncusError("Image not found")
+                images.remove(image)
+                shutil.rmtree(os.path.dirname(image_rootfs(image)), ignore_errors=True)
+            write_json(images_path(), images)
+    elif action == "alias" and rest[:1] == ["create"] and len(rest) == 3:
+        with locked():
+            images = load_images()
+            if find_image(images, rest[1]) is not None:
+                raise IncusError("Alias already exists")
+            image = find_image(images, rest[2])
+            if image is None:
+                raise IncusError("Image not found")
+            image["aliases"].append({"name": rest[1], "description": ""})
+            write_json(images_path(), images)
+    elif action == "alias" and rest[:1] == ["delete"] and len(rest) == 2:
+        with locked():
+            images = load_images()
+            for image in images:
+                image["aliases"] = [a for a in image["aliases"] if a["name"] != rest[1]]
+            write_json(images_path(), images)
+    else:
+        raise IncusError(f"unsupported image command: {' '.join(args)}")
+
+
+def cmd_publish(args):
+    positional, flags = parse_flags(
+        args, flags_with_value=("--alias",), bool_flags=("--force", "-f")
+    )
+    name, properties = positional[0], dict(p.split("=", 1) for p in positional[1:] if "=" in p)
+    with locked():
+        instance = load_instance(name)
+        if instance["status"] == "Running" and not flags.get("--force") and not flags.get("-f"):
+            raise IncusError("The instance is currently running, use --force to stop it first")
+        images = load_images()
+        alias = flags.get("--alias", [""])[-1]
+        if alias and find_image(images, alias) is not None:
+            raise IncusError("Alias already exists")
+        image = new_image(
+            alias,
+            seed=f"{name}-{time.time_ns()}",
+            description=properties.get("description", ""),
+        )
+        rootfs = os.path.join(instance_dir(name), "rootfs")
+        shutil.copytree(rootfs, image_rootfs(image), symlinks=True)
+        images.append(image)
+        write_json(images_path(), images)
+    print(f"Instance published with fingerprint: {image['fingerprint']}")
+
+
+def cmd_rename(args):
+    old, new = args[0], args[1]
+    with locked():
+        instance = stopped_instance(old)
+        if os.path.exists(instance_dir(new)):
+            raise IncusError(f'Instance "{new}" already exists')
+        os.rename(instance_dir(old), instance_dir(new))
+        instance["name"] = new
+        save_instance(instance)
+
+
+def snapshot_dir(name, snapshot):
+    return os.path.join(instance_dir(name), "snapshots", snapshot)
+
+
+def cmd_snapshot(args):
+    """snapshot create/restore/delete NAME SNAPSHOT: rootfs, config and devices."""
+    if len(args) != 3 or args[0] not in ("create", "restore", "delete"):
+        raise IncusError(f"unsupported snapshot command: {' '.join(args)}")
+    action, name, snapshot = args
+    with locked():
+        instance = load_instance(name)
+        path = snapshot_dir(name, snapshot)
+        rootfs = os.path.join(instance_dir(name), "rootfs")
+        if action == "create":
+            if os.path.exists(path):
+                raise IncusError(f'Snapshot "{snapshot}" already exists')
+            shutil.copytree(rootfs, os.path.join(path, "rootfs"), symlinks=True)
+            saved = {key: instance[key] for key in ("config", "devices")}
+            write_json(os.path.join(path, "snapshot.json"), saved)
+            return
+        if not os.path.exists(path):
+            raise IncusError(f'Snapshot "{snapshot}" not found')
+        if action == "delete":
+            shutil.rmtree(path)
+            return
+        # Restoring restarts a running instance, which ends its tmux sessions
+        kill_tmux(instance)
+        shutil.rmtree(rootfs)
+        shutil.copytree(os.path.join(path, "rootfs"), rootfs, symlinks=True)
+        instance.update(read_json(os.path.join(path, "snapshot.json"), {}))
+        save_instance(instance)
+
+
+def cmd_profile(args):
+    if args[:3] != ["device", "show", "default"] and args[:2] != ["show", "default"]:
+        raise IncusError(f"unsupported profile command: {' '.join(args)}")
+    devices = (
+        "eth0:\n  name: eth0\n  network: incusbr0\n  type: nic\n"
+        "root:\n  path: /\n  pool: default\n  type: disk"
+    )
+    if args[0] == "show":
+        devices = "config: {}\ndescription: Default profile\ndevices:\n" + "\n".join(
+            "  " + line for line in devices.splitlines()
+        )
+    print(devices)
+
+
+def cmd_network(args):
+    if args[:1] != ["show"] or len(args) < 2:
+        raise IncusError(f"unsupported network command: {' '.join(args)}")
+    print('config:\n  ipv4.address: 10.47.0.1/16\n  ipv4.nat: "true"')
+    print(f"name: {args[1]}\ntype: bridge")
+
+
+def cmd_list(args):
+    positional, flags = parse_flags(args, flags_with_value=("--format", "--columns", "-c", "-f"))
+    prefix = positional[0] if positional else ""
+    fmt = (flags.get("--format") or flags.get("-f") or ["table"])[-1]
+    instances = [listed(i) for i in all_instances() if i["name"].startswith(prefix)]
+
+    if fmt == "json":
+        print(json.dumps(instances))
+        return
+    columns = (flags.get("--columns") or flags.get("-c") or ["ns4"])[-1]
+    for instance in instances:
+        fields = []
+        for column in columns:
+            if column == "n":
+                fields.append(instance["name"])
+            elif column == "s":
+                fields.append(instance["status"].upper())
+            elif column == "4":
+                network = instance["state"]["network"] or {}
+                addresses = network.get("eth0", {}).get("addresses", [])
+                fields.append(f"{addresses[0]['address']} (eth0)" if addresses else "")
+        print(",".join(fields) if fmt == "csv" else " | ".join(fields))
+
+
+def cmd_create(args, start):
+    positional, flags = parse_flags(
+        args,
+        flags_with_value=("--profile", "-p", "--config", "-c"),
+        bool_flags=("--ephemeral", "-e"),
+    )
+    if len(positional) < 2:
+        raise IncusError("usage: incus launch IMAGE NAME")
+    image_ref, name = positional[0], positional[1]
+
+    spec = {}
+    if not sys.stdin.isatty():
+        data = sys.stdin.read().strip()
+        if data:
+            spec = json.loads(data)
+
+    with locked():
+        image = find_image(load_images(), image_ref.split(":")[-1])
+        if image is None:
+            raise IncusError("Image not found")
+        if os.path.exists(instance_dir(name)):
+            raise IncusError(f'Instance "{name}" already exists')
+
+        config = dict(spec.get("config") or {})
+        for value in flags.get("--config", []) + flags.get("-c", []):
+            key, _, val = value.partition("=")
+            config[key] = val
+
+        rootfs = os.path.join(instance_dir(name), "rootfs")
+        if os.path.isdir(image_rootfs(image)):
+            shutil.copytree(image_rootfs(image), rootfs, symlinks=True)
+        for path in ("home/code", "root", "tmp", "usr/local/bin"):
+            os.makedirs(os.path.join(rootfs, path), exist_ok=True)
+        save_instance(
+            {
+                "name": name,
+                "image": image["aliases"][0]["name"] if image["aliases"] else image_ref,
+                "status": "Running" if start else "Stopped",
+                "created_at": now(),
+                "ephemeral": bool(flags.get("--ephemeral") or flags.get("-e")),
+                "profiles": flags.get("--profile", []) + flags.get("-p", []) or ["default"],
+                "config": config,
+                "devices": dict(spec.get("devices") or {}),
+                "address": next_address(),
+            }
+        )
+    if start:
+        print(f"Launching {name}")
+    else:
+        print(f"Creating {name}")
+
+
+def cmd_start(args):
+    with locked():
+        for name in args:
+            instance = load_instance(name)
+            if instance["status"] == "Running":
+                raise IncusError("The instance is already running")
+            instance["status"] = "Running"
+            save_instance(instance)
+
+
+def cmd_stop(args):
+    positional, _ = parse_flags(args, bool_flags=("--force", "-f"))
+    with locked():
+        for name in positional:
+            instance = load_instance(name)
+            if instance["status"] != "Running":
+                raise IncusError("The instance is already stopped")
+            if instance["ephemeral"]:
+                remove_instance(instance)
+                continue
+            kill_tmux(instance)
+            instance["status"] = "Stopped"
+            save_instance(instance)
+
+
+def cmd_delete(args):
+    positional, flags = parse_flags(args, bool_flags=("--force", "-f"))
+    with locked():
+        for name in positional:
+            instance = load_instance(name)
+            if instance["status"] == "Running" and not flags:
+                raise IncusError("The instance is currently running, stop it first or use --force")
+            remove_instance(instance)
+
+
+def cmd_config(args):
+    if args[:2] == ["device", "add"]:
+        name, device, dev_type, *pairs = args[2:]
+        with locked():
+            instance = load_instance(name)
+            if device in instance["devices"]:
+                raise IncusError(f"The device already exists: {device}")
+            instance["devices"][device] = {"type": dev_type, **dict(p.split("=", 1) for p in pairs)}
+            save_instance(instance)
+        print(f"Device {device} added to {name}")
+    elif args[:2] == ["device", "remove"]:
+        name, *devices = args[2:]
+        with locked():
+            instance = load_instance(name)
+            for device in devices:
+                if instance["devices"].pop(device, None) is None:
+                    raise IncusError(f"Device {device} doesn't exist")
+            save_instance(instance)
+    elif args[:1] == ["set"]:
+        name, *pairs = args[1:]
+        with locked():
+            instance = load_instance(name)
+            instance["config"].update(dict(p.split("=", 1) for p in pairs))
+            save_instance(instance)
+    elif args[:1] == ["unset"]:
+        name, *keys = args[1:]
+        with locked():
+            instance = load_instance(name)
+            for key in keys:
+                instance["config"].pop(key, None)
+            save_instance(instance)
+    elif args[:1] == ["get"]:
+        print(load_instance(args[1])["config"].get(args[2], ""))
+    else:
+        raise IncusError(f"unsupported config command: {' '.join(args)}")
+
+
+def cmd_file(args):
+    positional, flags = parse_flags(
+        args,
+        flags_with_value=("--uid", "--gid", "--mode"),
+        bool_flags=("-r", "--recursive", "-p", "--create-dirs"),
+    )
+    if len(positional) < 3 or positional[0] not in ("push", "pull"):
+        raise IncusError(f"unsupported file command: {' '.join(args)}")
+    action, paths = positional[0], positional[1:]
+    recursive = "-r" in flags or "--recursive" in flags
+
+    def split_remote(ref):
+        name, _, path = ref.partition("/")
+        return load_instance(name), "/" + path
+
+    if action == "push":
+        instance, target = split_remote(paths[-1])
+        for source in paths[:-1]:
+            dest = host_path(instance, target)
+            if target.endswith("/") or os.path.isdir(dest):
+                dest = os.path.join(dest, os.path.basename(source.rstrip("/")))
+            copy(source, dest, recursive)
+    else:
+        dest = paths[-1]
+        for ref in paths[:-1]:
+            instance, source = split_remote(ref)
+            target = dest
+            if os.path.isdir(dest):
+                target = os.path.join(dest, os.path.basename(source.rstrip("/")))
+            copy(host_path(instance, source), target, recursive)
+
+
+def copy(source, dest, recursive):
+    if os.path.isdir(source):
+        if not recursive:
+            raise IncusError(f"'{source}' is a directory")
+        shutil.copytree(source, dest, dirs_exist_ok=True)
+        return
+    if not os.path.exists(source):
+        raise IncusError(f"Not Found: {source}")
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    shutil.copy2(source, dest)
+
+
+def cmd_exec(args):
+    positional, flags = parse_flags(
+        args,
+        flags_with_value=("--env", "--cwd", "--user", "--group"),
+        bool_flags=("--force-interactive", "-t", "--force-noninteractive", "-T"),
+    )
+    if len(positional) < 2:
+        raise IncusError("usage: incus exec NAME -- COMMAND")
+    instance = load_instance(positional[0])
+    if instance["status"] != "Running":
+        raise IncusError("Instance is not running")
+
+    env = dict(value.split("=", 1) for value in flags.get("--env", []))
+    uid = int(flags.get("--user", ["0"])[-1])
+    cwd = host_path(instance, flags.get("--cwd", ["/root" if uid == 0 else "/home/code"])[-1])
+    os.makedirs(cwd, exist_ok=True)
+
+    command = [rewrite_paths(instance, arg) for arg in positional[1:]]
+    if command[0] == "tar" and os.geteuid() != 0:
+        # Ownership from the archive can only be kept by root
+        command = [arg for arg in command if arg not in ("--same-owner", "--numeric-owner")]
+    if command[0] == "tar" and "-C" in command:
+        os.makedirs(command[command.index("-C") + 1], exist_ok=True)
+
+    try:
+        result = subprocess.run(command, cwd=cwd, env=exec_env(instance, env, uid), check=False)
+        return result.returncode
+    except FileNotFoundError:
+        print(f"{command[0]}: command not found", file=sys.stderr)
+        return 127
+
+
+COMMANDS = {
+    "info": cmd_info,
+    "image": cmd_image,
+    "list": cmd_list,
+    "ls": cmd_list,
+    "launch": lambda args: cmd_create(args, start=True),
+    "init": lambda args: cmd_create(args, start=False),
+    "start": cmd_start,
+    "stop": cmd_stop,
+    "delete": cmd_delete,
+    "rm": cmd_delete,
+    "rename": cmd_rename,
+    "move": cmd_rename,
+    "config": cmd_config,
+    "file": cmd_file,
+    "exec": cmd_exec,
+    "publish": cmd_publish,
+    "snapshot": cmd_snapshot,
+    "profile": cmd_profile,
+    "network": cmd_network,
+}
+
+
+def main(argv):
+    # Global flags come before the subcommand
+    while argv and argv[0].startswith("--project"):
+        argv = argv[1:] if "=" in argv[0] else argv[2:]
+
+    delay = float(os.environ.get("FAKE_INCUS_DELAY") or 0)
+    if delay:
+        time.sleep(delay)
+
+    if not argv or argv[0] not in COMMANDS:
+        print(f"Error: unknown command: {' '.join(argv[:1])}", file=sys.stderr)
+        return 1
+    try:
+        return COMMANDS[argv[0]](argv[1:]) or 0
+    except IncusError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
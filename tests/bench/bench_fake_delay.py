@@ -0,0 +1,35 @@
+"""
+Test for coi bench - phase timings reflect incus latency.
+
+Tests that:
+1. Run coi bench against the fake incus with FAKE_INCUS_DELAY set
+2. Verify phases that call incus take at least the injected delay
+"""
+
+import json
+import subprocess
+
+
+def test_bench_fake_delay(coi_binary, fake_incus_env):
+    """
+    Test that injected incus latency shows up in the phases that call incus.
+
+    Flow:
+    1. Run coi bench --format=json with a 200ms delay per incus call
+    2. Verify create, exec and delete each take at least 200ms
+    """
+    env = {**fake_incus_env, "FAKE_INCUS_DELAY": "0.2"}
+
+    result = subprocess.run(
+        [coi_binary, "bench", "--format=json", "--iterations=1", "--network=open"],
+        capture_output=True,
+        text=True,
+        timeout=120,
+        env=env,
+    )
+
+    assert result.returncode == 0, f"Bench should succeed. stderr: {result.stderr}"
+
+    phases = json.loads(result.stdout)["runs"][0]["phases_ms"]
+    for phase in ["create", "exec", "delete"]:
+        assert phases[phase] >= 200, f"{phase} should include the incus delay: {phases}"
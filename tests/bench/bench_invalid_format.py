@@ -0,0 +1,34 @@
+"""
+Test for coi bench --format - invalid format is rejected.
+
+Tests that:
+1. Run coi bench --format=xml
+2. Verify it fails with a clear error before touching incus
+"""
+
+import subprocess
+
+
+def test_bench_invalid_format(coi_binary, fake_incus_env):
+    """
+    Test that coi bench rejects unknown output formats.
+
+    Flow:
+    1. Run coi bench --format=xml
+    2. Verify a non-zero exit and the error message
+    """
+    result = subprocess.run(
+        [coi_binary, "bench", "--format=xml"],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        env=fake_incus_env,
+    )
+
+    assert result.returncode != 0, "Bench should fail with an invalid format"
+    assert "invalid format 'xml'" in result.stderr, (
+        f"Should explain the error. stderr: {result.stderr}"
+    )
+
+    # Nothing should have been created
+    assert "Iteration" not in result.stderr
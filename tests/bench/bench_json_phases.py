@@ -0,0 +1,63 @@
+"""
+Test for coi bench --format=json - per-phase timings against the fake incus.
+
+Tests that:
+1. Run coi bench --format=json --iterations=3 against the fake incus
+2. Verify every run reports each lifecycle phase
+3. Verify the summary has ordered percentiles for every phase and the total
+"""
+
+import json
+import subprocess
+
+EXPECTED_PHASES = [
+    "image_check",
+    "create",
+    "ready",
+    "network",
+    "config_push",
+    "exec",
+    "tmux",
+    "delete",
+]
+
+
+def test_bench_json_phases(coi_binary, fake_incus_env):
+    """
+    Test that coi bench reports timings for every phase of each iteration.
+
+    Flow:
+    1. Run coi bench --format=json --iterations=3 --network=open
+    2. Parse the JSON report
+    3. Verify runs, phases and percentile summary
+    """
+    result = subprocess.run(
+        [coi_binary, "bench", "--format=json", "--iterations=3", "--network=open"],
+        capture_output=True,
+        text=True,
+        timeout=120,
+        env=fake_incus_env,
+    )
+
+    assert result.returncode == 0, f"Bench should succeed. stderr: {result.stderr}"
+
+    report = json.loads(result.stdout)
+
+    assert report["image"] == "coi"
+    assert report["iterations"] == 3
+    assert report["phases"] == EXPECTED_PHASES, f"Unexpected phases: {report['phases']}"
+
+    assert len(report["runs"]) == 3
+    for run in report["runs"]:
+        assert set(run["phases_ms"]) == set(EXPECTED_PHASES), f"Run missing phases: {run}"
+        assert all(ms >= 0 for ms in run["phases_ms"].values())
+        assert run["total_ms"] >= sum(run["phases_ms"].values()) * 0.99, (
+            f"Total should cover all phases: {run}"
+        )
+
+    for name in [*EXPECTED_PHASES, "total"]:
+        stats = report["summary"][name]
+        assert stats["count"] == 3
+        assert stats["min"] <= stats["p50"] <= stats["p90"] <= stats["p99"] <= stats["max"], (
+            f"Percentiles for {name} should be ordered: {stats}"
+        )
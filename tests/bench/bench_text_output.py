@@ -0,0 +1,39 @@
+"""
+Test for coi bench - default text output against the fake incus.
+
+Tests that:
+1. Run coi bench --iterations=1 against the fake incus
+2. Verify the table lists every phase with percentile columns
+"""
+
+import subprocess
+
+
+def test_bench_text_output(coi_binary, fake_incus_env):
+    """
+    Test that coi bench prints a per-phase percentile table by default.
+
+    Flow:
+    1. Run coi bench --iterations=1 --network=open
+    2. Verify the header and a row per phase plus the total
+    """
+    result = subprocess.run(
+        [coi_binary, "bench", "--iterations=1", "--network=open"],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        env=fake_incus_env,
+    )
+
+    assert result.returncode == 0, f"Bench should succeed. stderr: {result.stderr}"
+
+    output = result.stdout
+    assert "Image: coi, iterations: 1" in output, f"Should show the image. Got:\n{output}"
+    for column in ["PHASE", "MIN", "P50", "P90", "P99", "MAX"]:
+        assert column in output, f"Should show {column} column. Got:\n{output}"
+
+    rows = [line.split()[0] for line in output.splitlines() if line.strip()]
+    for phase in ["image_check", "create", "ready", "exec", "tmux", "delete", "total"]:
+        assert phase in rows, f"Should show a row for {phase}. Got:\n{output}"
+
+    assert "Iteration 1/1" in result.stderr, f"Should report progress. stderr: {result.stderr}"
@@ -2,9 +2,12 @@
 Pytest configuration and fixtures for CLI integration tests.
 """
 
+import fcntl
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 
 import pytest
 
@@ -13,6 +16,108 @@ tests_dir = os.path.dirname(os.path.abspath(__file__))
 if tests_dir not in sys.path:
     sys.path.insert(0, tests_dir)
 
+# Fake incus stand-in (see testdata/fakeincus/README.md)
+FAKE_INCUS_BIN = os.path.abspath(os.path.join(tests_dir, "..", "testdata", "fakeincus", "bin"))
+
+# Test directories that need a real Incus daemon (image builds, firewalld, nested Docker)
+FAKE_INCUS_UNSUPPORTED = ("build", "network", "docker")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--fake-incus",
+        action="store_true",
+        default=False,
+        help="Run against the fake incus in testdata/fakeincus instead of an Incus daemon",
+    )
+
+
+def fake_incus_enabled(config):
+    """Whether the session runs against the fake incus (--fake-incus or COI_FAKE_INCUS=1)."""
+    return config.getoption("--fake-incus") or os.environ.get("COI_FAKE_INCUS") == "1"
+
+
+def fake_incus_environ(state_dir):
+    """Return the variables that point coi and `sg incus-admin -c incus ...` at the fake."""
+    return {
+        "PATH": FAKE_INCUS_BIN + os.pathsep + os.environ.get("PATH", ""),
+        "FAKE_INCUS_DIR": str(state_dir),
+        "COI_INCUS_TRANSPORT": "cli",
+    }
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests that need a real Incus daemon when running against the fake."""
+    if not fake_incus_enabled(config):
+        return
+
+    skip = pytest.mark.skip(reason="needs a real Incus daemon (not supported with --fake-incus)")
+    for item in items:
+        if os.path.relpath(str(item.path), tests_dir).split(os.sep)[0] in FAKE_INCUS_UNSUPPORTED:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_incus(request, tmp_path_factory):
+    """Run the whole session against the fake incus when opted in.
+
+    Opt in with `pytest --fake-incus` or COI_FAKE_INCUS=1. The fake's bin directory is put
+    first on PATH for the session, so coi_binary and helpers that call `sg incus-admin -c
+    "incus ..."` reach it without changes. The coi and coi-test-dummy images are seeded,
+    so no image is built. Yields the fake's state directory, or None when not opted in.
+    """
+    if not fake_incus_enabled(request.config):
+        yield None
+        return
+
+    state_dir = tmp_path_factory.mktemp("fake-incus")
+    saved = os.environ.copy()
+    os.environ.update(fake_incus_environ(state_dir))
+    os.environ["FAKE_INCUS_IMAGES"] = "coi,coi-test-dummy"
+    yield str(state_dir)
+
+    os.environ.clear()
+    os.environ.update(saved)
+
+
+def xdist_worker_id():
+    """Return the pytest-xdist worker id (e.g. "gw3"), or None when not running under xdist."""
+    return os.environ.get("PYTEST_XDIST_WORKER")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def worker_isolation():
+    """Give this test process its own container prefix and tmux socket.
+
+    Under pytest-xdist (`pytest -n auto`) every worker runs with COI_CONTAINER_PREFIX set to
+    "<prefix><worker>-" (e.g. "coi-test-gw3-"), so calculate_container_name() and the cleanup
+    helpers only ever see that worker's containers. Every process also gets a private
+    TMUX_TMPDIR, so `tmux kill-server` in cleanup never reaches another worker's (or the
+    user's) tmux server.
+    """
+    saved = {key: os.environ.get(key) for key in ("COI_CONTAINER_PREFIX", "TMUX_TMPDIR", "TMUX")}
+
+    worker = xdist_worker_id()
+    if worker:
+        base = os.environ.get("COI_CONTAINER_PREFIX") or "coi-test-"
+        os.environ["COI_CONTAINER_PREFIX"] = f"{base}{worker}-"
+
+    # Short path under /tmp: tmux socket paths are limited to ~100 characters
+    tmux_dir = tempfile.mkdtemp(prefix=f"coi-tmux-{worker or 'main'}-")
+    os.environ["TMUX_TMPDIR"] = tmux_dir
+    os.environ.pop("TMUX", None)  # Otherwise tmux talks to the server we are running inside
+
+    yield
+
+    if shutil.which("tmux"):
+        subprocess.run(["tmux", "kill-server"], capture_output=True, timeout=5, check=False)
+    shutil.rmtree(tmux_dir, ignore_errors=True)
+    for key, value in saved.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
 
 @pytest.fixture(scope="session")
 def coi_binary():
@@ -66,7 +171,8 @@ def cleanup_containers(workspace_dir, coi_binary):
             )
 
     # Kill any orphaned tmux sessions to prevent test pollution
-    # This ensures clean state between tests, especially after tmux command tests
+    # This ensures clean state between tests, especially after tmux command tests.
+    # TMUX_TMPDIR is per worker (see worker_isolation), so other workers are unaffected.
     subprocess.run(
         ["tmux", "kill-server"],
         capture_output=True,
@@ -75,6 +181,50 @@ def cleanup_containers(workspace_dir, coi_binary):
     )
 
 
+@pytest.fixture(scope="session")
+def container_pool(coi_binary, worker_isolation):
+    """Session-scoped pool of launched containers (see ContainerPool in support/helpers.py).
+
+    Containers are named "testpool-<pid>-<n>", unique per test process (and so per xdist
+    worker), and are deleted when the session ends. The name is deliberately outside
+    COI_CONTAINER_PREFIX, so `coi kill --all` and the cleanup helpers leave them alone.
+    """
+    from support.helpers import ContainerPool
+
+    pool = ContainerPool(coi_binary, prefix=f"testpool-{os.getpid()}-")
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def pooled_container(container_pool):
+    """Lease a running container from the session pool for the duration of one test.
+
+    For tests that only exec into, query or mount into a container. The container is
+    reset to a clean snapshot afterwards, so mounts, files and environment changes do
+    not leak into the next test. Tests that stop, delete or rename the container must
+    launch their own.
+    """
+    name = container_pool.lease()
+    yield name
+    container_pool.release(name)
+
+
+@pytest.fixture
+def fake_incus_env(tmp_path):
+    """Return an environment that runs coi against the fake incus in testdata/fakeincus.
+
+    The fake keeps its state in a per-test directory, so no Incus daemon is needed.
+    Pass the result as env= to subprocess calls of coi_binary.
+    """
+    state_dir = tmp_path / "fake-incus"
+    state_dir.mkdir()
+    home_dir = tmp_path / "home"
+    home_dir.mkdir()
+
+    return {**os.environ, **fake_incus_environ(state_dir), "HOME": str(home_dir)}
+
+
 @pytest.fixture(scope="session")
 def dummy_path():
     """Return path to dummy CLI for testing.
@@ -90,16 +240,28 @@ def dummy_path():
 
 
 @pytest.fixture(scope="session")
-def dummy_image(coi_binary):
+def dummy_image(coi_binary, tmp_path_factory):
     """Build and return a test image with dummy pre-installed.
 
     This image includes dummy at /usr/local/bin/dummy, allowing
     tests to run 10x+ faster without requiring actual software licenses.
 
     The image is built once per test session and reused across all tests.
+    Under pytest-xdist, workers take a lock in the shared base temp directory
+    so only the first one builds it.
     """
     image_name = "coi-test-dummy"
 
+    lock_dir = tmp_path_factory.getbasetemp()
+    if xdist_worker_id():
+        lock_dir = lock_dir.parent  # Shared by all workers of this run
+    with open(lock_dir / "dummy-image.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return _build_dummy_image(coi_binary, image_name)
+
+
+def _build_dummy_image(coi_binary, image_name):
+    """Build the dummy image unless it already exists."""
     # Check if image already exists
     result = subprocess.run([coi_binary, "image", "exists", image_name], capture_output=True)
 
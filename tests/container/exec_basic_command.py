@@ -2,45 +2,24 @@
 Test for coi container exec - basic command execution.
 
 Tests that:
-1. Launch a container
-2. Execute a simple command
-3. Verify output
+1. Execute a simple command
+2. Verify output
 """
 
 import subprocess
-import time
 
-from support.helpers import (
-    calculate_container_name,
-)
 
-
-def test_exec_basic_command(coi_binary, cleanup_containers, workspace_dir):
+def test_exec_basic_command(coi_binary, pooled_container):
     """
     Test basic command execution in container.
 
     Flow:
-    1. Launch a container
-    2. Execute echo command
-    3. Verify output contains expected text
-    4. Cleanup
+    1. Execute echo command
+    2. Verify output contains expected text
     """
-    container_name = calculate_container_name(workspace_dir, 1)
-
-    # === Phase 1: Launch container ===
-
-    result = subprocess.run(
-        [coi_binary, "container", "launch", "coi", container_name],
-        capture_output=True,
-        text=True,
-        timeout=120,
-    )
+    container_name = pooled_container
 
-    assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
-
-    time.sleep(3)
-
-    # === Phase 2: Execute command ===
+    # === Phase 1: Execute command ===
 
     result = subprocess.run(
         [coi_binary, "container", "exec", container_name, "--", "echo", "hello-test-123"],
@@ -51,17 +30,9 @@ def test_exec_basic_command(coi_binary, cleanup_containers, workspace_dir):
 
     assert result.returncode == 0, f"Exec should succeed. stderr: {result.stderr}"
 
-    # === Phase 3: Verify output ===
+    # === Phase 2: Verify output ===
 
     combined_output = result.stdout + result.stderr
     assert "hello-test-123" in combined_output, (
         f"Output should contain echo text. Got:\n{combined_output}"
     )
-
-    # === Phase 4: Cleanup ===
-
-    subprocess.run(
-        [coi_binary, "container", "delete", container_name, "--force"],
-        capture_output=True,
-        timeout=30,
-    )
@@ -3,21 +3,10 @@
 import json
 import subprocess
 
-from support.helpers import calculate_container_name
 
-
-def test_exec_capture_format_json(coi_binary, cleanup_containers, workspace_dir):
+def test_exec_capture_format_json(coi_binary, pooled_container):
     """Test that --capture outputs JSON by default."""
-    container_name = calculate_container_name(workspace_dir, 1)
-
-    # Launch container
-    result = subprocess.run(
-        [coi_binary, "container", "launch", "coi", container_name],
-        capture_output=True,
-        text=True,
-        timeout=120,
-    )
-    assert result.returncode == 0
+    container_name = pooled_container
 
     # Execute command with capture (no format flag)
     result = subprocess.run(
@@ -49,10 +38,3 @@ def test_exec_capture_format_json(coi_binary, cleanup_containers, workspace_dir)
     # Verify values
     assert data["stdout"] == "test output\n", f"Unexpected stdout: {data['stdout']}"
     assert data["exit_code"] == 0, "Exit code should be 0"
-
-    # Cleanup
-    subprocess.run(
-        [coi_binary, "container", "delete", container_name, "--force"],
-        capture_output=True,
-        timeout=30,
-    )
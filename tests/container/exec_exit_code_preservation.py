@@ -2,21 +2,10 @@
 
 import subprocess
 
-from support.helpers import calculate_container_name
 
-
-def test_exec_exit_code_preservation_raw(coi_binary, cleanup_containers, workspace_dir):
+def test_exec_exit_code_preservation_raw(coi_binary, pooled_container):
     """Test that actual exit codes are preserved in raw format."""
-    container_name = calculate_container_name(workspace_dir, 1)
-
-    # Launch container
-    result = subprocess.run(
-        [coi_binary, "container", "launch", "coi", container_name],
-        capture_output=True,
-        text=True,
-        timeout=120,
-    )
-    assert result.returncode == 0
+    container_name = pooled_container
 
     # Test exit code 2
     result = subprocess.run(
@@ -78,26 +67,10 @@ def test_exec_exit_code_preservation_raw(coi_binary, cleanup_containers, workspa
         f"Expected exit code 127 (command not found), got {result.returncode}"
     )
 
-    # Cleanup
-    subprocess.run(
-        [coi_binary, "container", "delete", container_name, "--force"],
-        capture_output=True,
-        timeout=30,
-    )
-
 
-def test_exec_exit_code_preservation_json(coi_binary, cleanup_containers, workspace_dir):
+def test_exec_exit_code_preservation_json(coi_binary, pooled_container):
     """Test that actual exit codes are preserved in JSON format."""
-    container_name = calculate_container_name(workspace_dir, 1)
-
-    # Launch container
-    result = subprocess.run(
-        [coi_binary, "container", "launch", "coi", container_name],
-        capture_output=True,
-        text=True,
-        timeout=120,
-    )
-    assert result.returncode == 0
+    container_name = pooled_container
 
     # Test exit code 2 in JSON format
     result = subprocess.run(
@@ -145,10 +118,3 @@ def test_exec_exit_code_preservation_json(coi_binary, cleanup_containers, worksp
     )
     data = json.loads(result.stdout)
     assert data["exit_code"] == 42, f"Expected exit_code 42 in JSON, got {data['exit_code']}"
-
-    # Cleanup
-    subprocess.run(
-        [coi_binary, "container", "delete", container_name, "--force"],
-        capture_output=True,
-        timeout=30,
-    )
@@ -2,45 +2,24 @@
 Test for coi container exec - propagates exit code from failed command.
 
 Tests that:
-1. Launch a container
-2. Execute a command that fails
-3. Verify exit code is propagated
+1. Execute a command that fails
+2. Verify exit code is propagated
 """
 
 import subprocess
-import time
 
-from support.helpers import (
-    calculate_container_name,
-)
 
-
-def test_exec_failed_command(coi_binary, cleanup_containers, workspace_dir):
+def test_exec_failed_command(coi_binary, pooled_container):
     """
     Test that exit codes from failed commands are propagated.
 
     Flow:
-    1. Launch a container
-    2. Execute a command that will fail (exit 42)
-    3. Verify exit code is returned
-    4. Cleanup
+    1. Execute a command that will fail (exit 42)
+    2. Verify exit code is returned
     """
-    container_name = calculate_container_name(workspace_dir, 1)
-
-    # === Phase 1: Launch container ===
-
-    result = subprocess.run(
-        [coi_binary, "container", "launch", "coi", container_name],
-        capture_output=True,
-        text=True,
-        timeout=120,
-    )
+    container_name = pooled_container
 
-    assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
-
-    time.sleep(3)
-
-    # === Phase 2: Execute failing command ===
+    # === Phase 1: Execute failing command ===
 
     result = subprocess.run(
         [coi_binary, "container", "exec", container_name, "--", "sh", "-c", "exit 42"],
@@ -49,11 +28,11 @@ def test_exec_failed_command(coi_binary, cleanup_containers, workspace_dir):
         timeout=30,
     )
 
-    # === Phase 3: Verify non-zero exit code ===
+    # === Phase 2: Verify non-zero exit code ===
 
     assert result.returncode != 0, "Failed command should return non-zero exit code"
 
-    # === Phase 4: Test command not found ===
+    # === Phase 3: Test command not found ===
 
     result = subprocess.run(
         [coi_binary, "container", "exec", container_name, "--", "nonexistent-command-12345"],
@@ -63,11 +42,3 @@ def test_exec_failed_command(coi_binary, cleanup_containers, workspace_dir):
     )
 
     assert result.returncode != 0, "Non-existent command should return non-zero exit code"
-
-    # === Phase 5: Cleanup ===
-
-    subprocess.run(
-        [coi_binary, "container", "delete", container_name, "--force"],
-        capture_output=True,
-        timeout=30,
-    )
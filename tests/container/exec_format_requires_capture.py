@@ -2,21 +2,10 @@
 
 import subprocess
 
-from support.helpers import calculate_container_name
 
-
-def test_exec_format_requires_capture(coi_binary, cleanup_containers, workspace_dir):
+def test_exec_format_requires_capture(coi_binary, pooled_container):
     """Test that --format flag requires --capture flag."""
-    container_name = calculate_container_name(workspace_dir, 1)
-
-    # Launch container
-    result = subprocess.run(
-        [coi_binary, "container", "launch", "coi", container_name],
-        capture_output=True,
-        text=True,
-        timeout=120,
-    )
-    assert result.returncode == 0
+    container_name = pooled_container
 
     # Try to use --format without --capture (should fail)
     result = subprocess.run(
@@ -38,10 +27,3 @@ def test_exec_format_requires_capture(coi_binary, cleanup_containers, workspace_
     # Should fail with error about --format requiring --capture
     assert result.returncode != 0, "Should fail when --format used without --capture"
     assert "--format flag requires --capture" in result.stderr, "Should show validation error"
-
-    # Cleanup
-    subprocess.run(
-        [coi_binary, "container", "delete", container_name, "--force"],
-        capture_output=True,
-        timeout=30,
-    )
@@ -2,45 +2,24 @@
 Test for coi container exec --env - passes environment variables.
 
 Tests that:
-1. Launch a container
-2. Execute command with --env flag
-3. Verify environment variable is set
+1. Execute command with --env flag
+2. Verify environment variable is set
 """
 
 import subprocess
-import time
 
-from support.helpers import (
-    calculate_container_name,
-)
 
-
-def test_exec_with_env(coi_binary, cleanup_containers, workspace_dir):
+def test_exec_with_env(coi_binary, pooled_container):
     """
     Test executing command with environment variables.
 
     Flow:
-    1. Launch a container
-    2. Execute printenv with --env MY_VAR=test123
-    3. Verify output contains the variable value
-    4. Cleanup
+    1. Execute printenv with --env MY_VAR=test123
+    2. Verify output contains the variable value
     """
-    container_name = calculate_container_name(workspace_dir, 1)
-
-    # === Phase 1: Launch container ===
-
-    result = subprocess.run(
-        [coi_binary, "container", "launch", "coi", container_name],
-        capture_output=True,
-        text=True,
-        timeout=120,
-    )
+    container_name = pooled_container
 
-    assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
-
-    time.sleep(3)
-
-    # === Phase 2: Execute with --env ===
+    # === Phase 1: Execute with --env ===
 
     result = subprocess.run(
         [
@@ -61,14 +40,14 @@ def test_exec_with_env(coi_binary, cleanup_containers, workspace_dir):
 
     assert result.returncode == 0, f"Exec with --env should succeed. stderr: {result.stderr}"
 
-    # === Phase 3: Verify environment variable ===
+    # === Phase 2: Verify environment variable ===
 
     combined_output = result.stdout + result.stderr
     assert "test123" in combined_output.strip(), (
         f"Environment variable should be set. Got:\n{combined_output}"
     )
 
-    # === Phase 4: Test multiple env vars ===
+    # === Phase 3: Test multiple env vars ===
 
     result = subprocess.run(
         [
@@ -98,11 +77,3 @@ def test_exec_with_env(coi_binary, cleanup_containers, workspace_dir):
     assert "value1-value2" in combined_output.strip(), (
         f"Both env vars should be set. Got:\n{combined_output}"
     )
-
-    # === Phase 5: Cleanup ===
-
-    subprocess.run(
-        [coi_binary, "container", "delete", container_name, "--force"],
-        capture_output=True,
-        timeout=30,
-    )
@@ -2,9 +2,8 @@
 Test for coi container mount - mounts directory into container.
 
 Tests that:
-1. Launch a container
-2. Mount a directory
-3. Verify mount is accessible
+1. Mount a directory
+2. Verify mount is accessible
 """
 
 import os
@@ -12,23 +11,17 @@ import subprocess
 import tempfile
 import time
 
-from support.helpers import (
-    calculate_container_name,
-)
 
-
-def test_mount_basic(coi_binary, cleanup_containers, workspace_dir):
+def test_mount_basic(coi_binary, pooled_container):
     """
     Test basic directory mount into container.
 
     Flow:
     1. Create a temp directory with a file
-    2. Launch a container
-    3. Mount the directory
-    4. Verify file is accessible inside container
-    5. Cleanup
+    2. Mount the directory
+    3. Verify file is accessible inside container
     """
-    container_name = calculate_container_name(workspace_dir, 1)
+    container_name = pooled_container
 
     # === Phase 1: Create temp directory with test file ===
 
@@ -37,20 +30,7 @@ def test_mount_basic(coi_binary, cleanup_containers, workspace_dir):
         with open(test_file, "w") as f:
             f.write("mount-test-content-123")
 
-        # === Phase 2: Launch container ===
-
-        result = subprocess.run(
-            [coi_binary, "container", "launch", "coi", container_name],
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-
-        assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
-
-        time.sleep(3)
-
-        # === Phase 3: Mount directory ===
+        # === Phase 2: Mount directory ===
         # Syntax: coi container mount <name> <device-name> <source> <path>
 
         mount_name = "test-mount"
@@ -65,7 +45,7 @@ def test_mount_basic(coi_binary, cleanup_containers, workspace_dir):
 
         time.sleep(2)
 
-        # === Phase 4: Verify file accessible ===
+        # === Phase 3: Verify file accessible ===
 
         result = subprocess.run(
             [
@@ -90,11 +70,3 @@ def test_mount_basic(coi_binary, cleanup_containers, workspace_dir):
         assert "mount-test-content-123" in combined_output, (
             f"Mounted file should contain expected content. Got:\n{combined_output}"
         )
-
-        # === Phase 5: Cleanup ===
-
-        subprocess.run(
-            [coi_binary, "container", "delete", container_name, "--force"],
-            capture_output=True,
-            timeout=30,
-        )
@@ -2,45 +2,24 @@
 Test for coi container mount - fails for nonexistent source directory.
 
 Tests that:
-1. Launch a container
-2. Try to mount nonexistent directory
-3. Verify command fails
+1. Try to mount nonexistent directory
+2. Verify command fails
 """
 
 import subprocess
-import time
 
-from support.helpers import (
-    calculate_container_name,
-)
 
-
-def test_mount_nonexistent_source(coi_binary, cleanup_containers, workspace_dir):
+def test_mount_nonexistent_source(coi_binary, pooled_container):
     """
     Test that mounting nonexistent source directory fails.
 
     Flow:
-    1. Launch a container
-    2. Try to mount a nonexistent source directory
-    3. Verify command fails with appropriate error
-    4. Cleanup
+    1. Try to mount a nonexistent source directory
+    2. Verify command fails with appropriate error
     """
-    container_name = calculate_container_name(workspace_dir, 1)
-
-    # === Phase 1: Launch container ===
-
-    result = subprocess.run(
-        [coi_binary, "container", "launch", "coi", container_name],
-        capture_output=True,
-        text=True,
-        timeout=120,
-    )
+    container_name = pooled_container
 
-    assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
-
-    time.sleep(3)
-
-    # === Phase 2: Try to mount nonexistent source ===
+    # === Phase 1: Try to mount nonexistent source ===
     # Syntax: coi container mount <name> <device-name> <source> <path>
 
     nonexistent_source = "/nonexistent/path/12345"
@@ -60,7 +39,7 @@ def test_mount_nonexistent_source(coi_binary, cleanup_containers, workspace_dir)
         timeout=60,
     )
 
-    # === Phase 3: Verify failure ===
+    # === Phase 2: Verify failure ===
 
     assert result.returncode != 0, "Mounting nonexistent source should fail"
 
@@ -74,11 +53,3 @@ def test_mount_nonexistent_source(coi_binary, cleanup_containers, workspace_dir)
     )
 
     assert has_error, f"Should indicate source not found. Got:\n{combined_output}"
-
-    # === Phase 4: Cleanup ===
-
-    subprocess.run(
-        [coi_binary, "container", "delete", container_name, "--force"],
-        capture_output=True,
-        timeout=30,
-    )
@@ -2,9 +2,8 @@
 Test for coi container mount --shift - mounts with UID shifting.
 
 Tests that:
-1. Launch a container
-2. Mount a directory with --shift flag
-3. Verify file ownership appears correct inside container
+1. Mount a directory with --shift flag
+2. Verify file ownership appears correct inside container
 """
 
 import os
@@ -12,23 +11,17 @@ import subprocess
 import tempfile
 import time
 
-from support.helpers import (
-    calculate_container_name,
-)
 
-
-def test_mount_with_shift_flag(coi_binary, cleanup_containers, workspace_dir):
+def test_mount_with_shift_flag(coi_binary, pooled_container):
     """
     Test mount with --shift flag for UID/GID shifting.
 
     Flow:
     1. Create a temp directory with a file
-    2. Launch a container
-    3. Mount with --shift flag
-    4. Verify file is accessible and ownership is shifted
-    5. Cleanup
+    2. Mount with --shift flag
+    3. Verify file is accessible and ownership is shifted
     """
-    container_name = calculate_container_name(workspace_dir, 1)
+    container_name = pooled_container
 
     # === Phase 1: Create temp directory with test file ===
 
@@ -37,20 +30,7 @@ def test_mount_with_shift_flag(coi_binary, cleanup_containers, workspace_dir):
         with open(test_file, "w") as f:
             f.write("shift-test-content")
 
-        # === Phase 2: Launch container ===
-
-        result = subprocess.run(
-            [coi_binary, "container", "launch", "coi", container_name],
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-
-        assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
-
-        time.sleep(3)
-
-        # === Phase 3: Mount with --shift ===
+        # === Phase 2: Mount with --shift ===
         # Syntax: coi container mount <name> <device-name> <source> <path>
 
         mount_name = "shift-mount"
@@ -74,7 +54,7 @@ def test_mount_with_shift_flag(coi_binary, cleanup_containers, workspace_dir):
 
         time.sleep(2)
 
-        # === Phase 4: Verify file accessible ===
+        # === Phase 3: Verify file accessible ===
 
         result = subprocess.run(
             [
@@ -118,11 +98,3 @@ def test_mount_with_shift_flag(coi_binary, cleanup_containers, workspace_dir):
         )
 
         assert result.returncode == 0, f"ls -la should succeed. stderr: {result.stderr}"
-
-        # === Phase 5: Cleanup ===
-
-        subprocess.run(
-            [coi_binary, "container", "delete", container_name, "--force"],
-            capture_output=True,
-            timeout=30,
-        )
@@ -0,0 +1,62 @@
+"""
+Test for coi attach with warm pool members present.
+
+Tests that:
+1. Pool members (pool-<prefix>...) are not listed as sessions by coi attach
+2. With no real session and one pool member, coi attach does not auto-attach to it
+"""
+
+import subprocess
+
+from support.helpers import get_container_list, worker_container_prefix
+
+
+def test_fake_attach_ignores_pool(coi_binary, fake_incus_env, monkeypatch):
+    """
+    Test that coi attach only considers session containers.
+
+    Flow:
+    1. Point the process at the fake incus with the worker's container prefix
+    2. Launch a pool member named like coi pool fill does and stop it
+    3. Run coi attach and verify it reports no active sessions
+    4. Start the pool member and verify coi attach still ignores it
+    """
+    for key in ("PATH", "FAKE_INCUS_DIR", "COI_INCUS_TRANSPORT", "HOME"):
+        monkeypatch.setenv(key, fake_incus_env[key])
+    prefix = worker_container_prefix()
+    monkeypatch.setenv("COI_CONTAINER_PREFIX", prefix)
+
+    def coi(*args):
+        return subprocess.run(
+            [coi_binary, *args],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+
+    # === Phase 1: A stopped pool member ===
+
+    pool_member = f"pool-{prefix}deadbeef-abc123"
+    result = coi("container", "launch", "coi", pool_member)
+    assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
+    result = coi("container", "stop", pool_member)
+    assert result.returncode == 0, f"Container stop should succeed. stderr: {result.stderr}"
+    assert pool_member in get_container_list()
+
+    # === Phase 2: coi attach does not see it ===
+
+    result = coi("attach")
+    output = result.stdout + result.stderr
+    assert result.returncode == 0, f"coi attach should succeed. Output:\n{output}"
+    assert "No active sessions" in output, f"Pool member listed as a session. Output:\n{output}"
+    assert pool_member not in output
+
+    # === Phase 3: Not even when running ===
+
+    result = coi("container", "start", pool_member)
+    assert result.returncode == 0, f"Container start should succeed. stderr: {result.stderr}"
+
+    result = coi("attach")
+    output = result.stdout + result.stderr
+    assert "No active sessions" in output, f"Pool member listed as a session. Output:\n{output}"
+    assert pool_member not in output
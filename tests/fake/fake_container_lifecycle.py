@@ -0,0 +1,72 @@
+"""
+Test for the fake incus - container lifecycle without an Incus daemon.
+
+Tests that:
+1. Launch a container with coi against the fake incus
+2. Verify get_container_list() sees it through `sg incus-admin -c "incus list"`
+3. Execute commands as root and as the code user
+4. Delete the container and verify it is gone
+"""
+
+import subprocess
+
+from support.helpers import calculate_container_name, get_container_list
+
+
+def test_fake_container_lifecycle(coi_binary, fake_incus_env, workspace_dir):
+    """
+    Test launch, exec and delete against the fake incus.
+
+    Flow:
+    1. Launch a container
+    2. Verify it is listed
+    3. Run whoami as root and as UID 1000
+    4. Delete it and verify it is no longer listed
+    """
+    container_name = calculate_container_name(workspace_dir, 1)
+
+    # === Phase 1: Launch container ===
+
+    result = subprocess.run(
+        [coi_binary, "container", "launch", "coi", container_name],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        env=fake_incus_env,
+    )
+    assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
+
+    # === Phase 2: Verify listing ===
+
+    assert container_name in get_container_list(env=fake_incus_env), (
+        "Launched container should be listed"
+    )
+
+    # === Phase 3: Exec as root and as code ===
+
+    for user, expected in [("0", "root"), ("1000", "code")]:
+        result = subprocess.run(
+            [coi_binary, "container", "exec", container_name, "--user", user, "--", "whoami"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            env=fake_incus_env,
+        )
+        assert result.returncode == 0, f"Exec should succeed. stderr: {result.stderr}"
+        assert expected in result.stdout + result.stderr, (
+            f"Should run as {expected}. Got:\n{result.stdout + result.stderr}"
+        )
+
+    # === Phase 4: Delete ===
+
+    result = subprocess.run(
+        [coi_binary, "container", "delete", container_name, "--force"],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        env=fake_incus_env,
+    )
+    assert result.returncode == 0, f"Delete should succeed. stderr: {result.stderr}"
+    assert container_name not in get_container_list(env=fake_incus_env), (
+        "Deleted container should not be listed"
+    )
@@ -0,0 +1,82 @@
+"""
+Test for the container pool - leased containers are reused and reset.
+
+Tests that:
+1. Leasing twice in a row reuses one container (a single launch)
+2. Files written during a lease are gone after it is released
+3. Devices added during a lease (mounts) are removed on release
+4. A pool container deleted behind the pool's back is replaced on the next lease
+"""
+
+import json
+import subprocess
+
+from support.helpers import ContainerPool, get_container_list
+
+
+def test_fake_container_pool(coi_binary, fake_incus_env, workspace_dir, monkeypatch):
+    """
+    Test lease, reset and reuse of pooled containers against the fake incus.
+
+    Flow:
+    1. Lease a container, write a file and mount a directory into it
+    2. Release it and lease again
+    3. Verify the same container comes back without the file or the mount
+    4. Delete the idle container (as `coi kill --all` might) and verify a new one is leased
+    5. Close the pool and verify its containers are deleted
+    """
+    for key in ("PATH", "FAKE_INCUS_DIR", "COI_INCUS_TRANSPORT", "HOME"):
+        monkeypatch.setenv(key, fake_incus_env[key])
+
+    pool = ContainerPool(coi_binary, prefix="testpool-fake-")
+
+    def coi(*args):
+        return subprocess.run(
+            [coi_binary, *args],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+
+    # === Phase 1: First lease dirties the container ===
+
+    name = pool.lease()
+    result = coi("container", "exec", name, "--", "sh", "-c", "echo dirty > /root/pool-marker")
+    assert result.returncode == 0, f"Exec should succeed. stderr: {result.stderr}"
+    result = coi("container", "mount", name, "pool-mount", workspace_dir, "/mnt/pool")
+    assert result.returncode == 0, f"Mount should succeed. stderr: {result.stderr}"
+    pool.release(name)
+
+    # === Phase 2: Second lease gets the same, clean container ===
+
+    assert pool.lease() == name, "Released container should be leased again"
+    assert pool.launches == 1, "Reusing a pooled container should not launch a new one"
+
+    result = coi("container", "exec", name, "--", "ls", "/root")
+    assert "pool-marker" not in result.stdout, "Files from the previous lease should be gone"
+
+    result = subprocess.run(
+        ["sg", "incus-admin", "-c", f"incus list {name} --format=json"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    devices = json.loads(result.stdout)[0]["devices"]
+    assert "pool-mount" not in devices, "Mounts from the previous lease should be removed"
+    pool.release(name)
+
+    # === Phase 3: A deleted idle container is replaced ===
+
+    result = coi("container", "delete", name, "--force")
+    assert result.returncode == 0, f"Delete should succeed. stderr: {result.stderr}"
+
+    replacement = pool.lease()
+    assert replacement != name, "A deleted pool container should not be leased again"
+    assert replacement in get_container_list(), "The replacement container should exist"
+    assert pool.launches == 2, "The pool should launch exactly one replacement"
+    pool.release(replacement)
+
+    # === Phase 4: Closing deletes pool containers ===
+
+    pool.close()
+    assert replacement not in get_container_list(), "Pool containers should be deleted on close"
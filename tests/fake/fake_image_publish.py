@@ -0,0 +1,52 @@
+"""
+Test for the fake incus - publishing a container as an image.
+
+Tests that:
+1. Launch and stop a container against the fake incus
+2. Publish it as an image
+3. Verify coi image exists reports the new image, then delete it
+"""
+
+import subprocess
+
+from support.helpers import calculate_container_name
+
+
+def test_fake_image_publish(coi_binary, fake_incus_env, workspace_dir):
+    """
+    Test image publish, exists and delete against the fake incus.
+
+    Flow:
+    1. Launch and stop a container
+    2. coi image publish it
+    3. Verify coi image exists, then coi image delete
+    """
+    container_name = calculate_container_name(workspace_dir, 1)
+    image_name = f"fake-publish-{container_name[-12:]}"
+
+    def coi(*args):
+        return subprocess.run(
+            [coi_binary, *args],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            env=fake_incus_env,
+        )
+
+    result = coi("container", "launch", "coi", container_name)
+    assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
+
+    result = coi("container", "stop", container_name)
+    assert result.returncode == 0, f"Container stop should succeed. stderr: {result.stderr}"
+
+    result = coi("image", "publish", container_name, image_name)
+    assert result.returncode == 0, f"Image publish should succeed. stderr: {result.stderr}"
+
+    result = coi("image", "exists", image_name)
+    assert result.returncode == 0, f"Published image should exist. stderr: {result.stderr}"
+
+    result = coi("image", "delete", image_name)
+    assert result.returncode == 0, f"Image delete should succeed. stderr: {result.stderr}"
+
+    result = coi("image", "exists", image_name)
+    assert result.returncode != 0, "Deleted image should not exist"
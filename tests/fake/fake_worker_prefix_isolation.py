@@ -0,0 +1,77 @@
+"""
+Test for pytest-xdist worker isolation - per-worker container prefixes.
+
+Tests that:
+1. With a worker prefix (as worker_isolation sets under xdist), coi names containers with it
+2. calculate_container_name() agrees with coi's naming
+3. cleanup_all_test_containers() deletes only this worker's containers
+"""
+
+import subprocess
+
+from support.helpers import (
+    calculate_container_name,
+    cleanup_all_test_containers,
+    get_container_list,
+    worker_container_prefix,
+)
+
+
+def test_fake_worker_prefix_isolation(coi_binary, fake_incus_env, workspace_dir, monkeypatch):
+    """
+    Test that a worker only sees and cleans up its own containers.
+
+    Flow:
+    1. Point the process at the fake incus with worker prefix coi-test-gw1-
+    2. coi run --persistent and verify the container carries the prefix
+    3. Create a container belonging to another worker (coi-test-gw2-)
+    4. cleanup_all_test_containers() and verify only gw1's container is gone
+    """
+    for key in ("PATH", "FAKE_INCUS_DIR", "COI_INCUS_TRANSPORT", "HOME"):
+        monkeypatch.setenv(key, fake_incus_env[key])
+    monkeypatch.setenv("COI_CONTAINER_PREFIX", "coi-test-gw1-")
+
+    assert worker_container_prefix() == "coi-test-gw1-"
+
+    # === Phase 1: coi names containers with the worker prefix ===
+
+    result = subprocess.run(
+        [
+            coi_binary,
+            "run",
+            "--persistent",
+            "--workspace",
+            workspace_dir,
+            "--network=open",
+            "true",
+        ],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, f"coi run should succeed. stderr: {result.stderr}"
+
+    own_container = calculate_container_name(workspace_dir, 1)
+    assert own_container.startswith("coi-test-gw1-")
+    assert own_container in get_container_list(), (
+        f"coi should have created {own_container} with the worker prefix"
+    )
+
+    # === Phase 2: Another worker's container ===
+
+    other_container = "coi-test-gw2-deadbeef-1"
+    result = subprocess.run(
+        [coi_binary, "container", "launch", "coi", other_container],
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
+
+    # === Phase 3: Cleanup touches only this worker ===
+
+    cleanup_all_test_containers()
+
+    containers = get_container_list()
+    assert own_container not in containers, "This worker's container should be cleaned up"
+    assert other_container in containers, "Another worker's container must be left alone"
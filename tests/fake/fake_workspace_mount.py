@@ -0,0 +1,49 @@
+"""
+Test for the fake incus - workspace files are visible through exec.
+
+Tests that:
+1. Run coi run against the fake incus with a file in the workspace
+2. Verify the command sees the file under /workspace
+3. Verify a file written to /workspace appears on the host
+"""
+
+import os
+import subprocess
+
+
+def test_fake_workspace_mount(coi_binary, fake_incus_env, workspace_dir):
+    """
+    Test that /workspace maps to the host workspace under the fake incus.
+
+    Flow:
+    1. Create a file in the workspace
+    2. coi run a command that reads it and writes another file
+    3. Verify output and the written file
+    """
+    with open(os.path.join(workspace_dir, "input.txt"), "w") as f:
+        f.write("fake-incus-input-42")
+
+    result = subprocess.run(
+        [
+            coi_binary,
+            "run",
+            "--workspace",
+            workspace_dir,
+            "--network=open",
+            "cat /workspace/input.txt && echo written > /workspace/output.txt",
+        ],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        env=fake_incus_env,
+    )
+
+    assert result.returncode == 0, f"coi run should succeed. stderr: {result.stderr}"
+    assert "fake-incus-input-42" in result.stdout + result.stderr, (
+        f"Should read the workspace file. Got:\n{result.stdout + result.stderr}"
+    )
+
+    output_file = os.path.join(workspace_dir, "output.txt")
+    assert os.path.exists(output_file), "File written to /workspace should appear on the host"
+    with open(output_file) as f:
+        assert f.read().strip() == "written"
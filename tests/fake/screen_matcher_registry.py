@@ -0,0 +1,80 @@
+"""
+Test for the screen matcher registry of the test terminal emulator.
+
+Tests that:
+1. A text split across two feeds is matched once the second part arrives
+2. A pattern matches across a line break (Session\\r\\nID vs Session\\s+ID)
+3. Patterns see the whole display, so ^ only anchors at the top of the screen
+4. A matcher already satisfied when registered is matched right away
+5. A waiter blocked in wait_for_matcher is woken by a feed from another thread
+"""
+
+import re
+import threading
+
+import pytest
+
+from support.helpers import HAS_PYTE, ScreenMatcher, TerminalEmulator
+
+pytestmark = pytest.mark.skipif(not HAS_PYTE, reason="pyte is not installed")
+
+
+def test_screen_matcher_registry():
+    """
+    Test that pending screen waits match the rendered screen after each feed.
+
+    Flow:
+    1. Register a text matcher, feed it in two parts and verify it matches
+    2. Register a cross-line pattern, feed it over two lines and verify it matches
+    3. Verify an anchored pattern does not match a later line
+    4. Verify a matcher for text already on screen matches on registration
+    5. Block in wait_for_matcher while another thread feeds the text
+    """
+    # === Phase 1: Text split across feeds ===
+
+    emulator = TerminalEmulator()
+    ready = ScreenMatcher(texts=["READY"])
+    emulator.add_matcher(ready)
+    emulator.feed("REA")
+    assert not ready.matched, "Matcher should not match a partial text"
+    emulator.feed("DY\r\n")
+    assert ready.matched, f"Split text was not matched. Display:\n{emulator.get_display()}"
+    assert ready.result == "READY"
+
+    # === Phase 2: Pattern across a line break ===
+
+    session = ScreenMatcher(pattern=r"Session\s+ID: (\w+)")
+    emulator.add_matcher(session)
+    emulator.feed("Session\r\n")
+    assert not session.matched, "Pattern should not match before the second line"
+    emulator.feed("ID: abc123\r\n")
+    assert session.matched, f"Cross-line pattern not matched. Display:\n{emulator.get_display()}"
+    assert session.result.group(1) == "abc123"
+
+    # === Phase 3: Anchors apply to the whole display ===
+
+    anchored = ScreenMatcher(pattern=re.compile(r"^ID:"))
+    emulator.add_matcher(anchored)
+    emulator.feed("more output\r\n")
+    assert not anchored.matched, "^ without re.MULTILINE should only anchor at the top"
+    emulator.remove_matcher(anchored)
+
+    # === Phase 4: Already on screen ===
+
+    present = ScreenMatcher(texts=["missing", "more output"])
+    emulator.add_matcher(present)
+    assert present.matched, "Matcher for text already on screen should match on registration"
+    assert present.result == "more output"
+
+    # === Phase 5: Waiter woken by a feed ===
+
+    done = ScreenMatcher(pattern=r"[^\w\s]{3}")
+    emulator.add_matcher(done)
+    feeder = threading.Timer(0.2, emulator.feed, args=("done !!!\r\n",))
+    feeder.start()
+    try:
+        assert emulator.wait_for_matcher(done, timeout=5), "Waiter was not woken by the feed"
+    finally:
+        feeder.join()
+        emulator.remove_matcher(done)
+    assert done.result.group(0) == "!!!"
@@ -0,0 +1,45 @@
+"""Test coi list --format=jsonl with active containers"""
+
+import json
+import subprocess
+
+from support.helpers import calculate_container_name
+
+
+def test_list_format_jsonl_active(coi_binary, cleanup_containers, workspace_dir):
+    """Test that coi list --format=jsonl outputs one add record per container."""
+    container_name = calculate_container_name(workspace_dir, 1)
+
+    # Phase 1: Launch container
+    result = subprocess.run(
+        [coi_binary, "container", "launch", "coi", container_name],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, f"Launch failed: {result.stderr}"
+
+    # Phase 2: Run list with JSONL format
+    result = subprocess.run(
+        [coi_binary, "list", "--format=jsonl"],
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert result.returncode == 0, f"List failed: {result.stderr}"
+
+    # Phase 3: Every line is a JSON record
+    records = [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+    record = next((r for r in records if r["name"] == container_name), None)
+    assert record is not None, f"Container {container_name} not found in output"
+
+    assert record["event"] == "add", "Snapshot records should be adds"
+    assert record["status"] == "Running", "Container should be running"
+    assert isinstance(record["persistent"], bool), "persistent should be boolean"
+
+    # Phase 4: Cleanup
+    subprocess.run(
+        [coi_binary, "container", "delete", container_name, "--force"],
+        capture_output=True,
+        timeout=30,
+    )
@@ -0,0 +1,58 @@
+"""Test coi list --watch --format=jsonl reports containers as they come and go"""
+
+import json
+import subprocess
+import time
+
+from support.helpers import calculate_container_name
+
+
+def read_record(proc, name, event, timeout=60):
+    """Read JSONL records from proc until one for name with the given event arrives."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        line = proc.stdout.readline()
+        if not line:
+            break
+        record = json.loads(line)
+        if record["name"] == name and record["event"] == event:
+            return record
+    return None
+
+
+def test_list_watch_reports_changes(coi_binary, cleanup_containers, workspace_dir):
+    """Test that a running watch emits add and remove records for a container."""
+    container_name = calculate_container_name(workspace_dir, 1)
+
+    proc = subprocess.Popen(
+        [coi_binary, "list", "--watch", "--format=jsonl"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        # Phase 1: Launch container while watching
+        result = subprocess.run(
+            [coi_binary, "container", "launch", "coi", container_name],
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, f"Launch failed: {result.stderr}"
+
+        added = read_record(proc, container_name, "add")
+        assert added is not None, "Watch should report the new container"
+        assert "persistent" in added, "Records should carry session metadata"
+
+        # Phase 2: Delete it and expect a remove record
+        subprocess.run(
+            [coi_binary, "container", "delete", container_name, "--force"],
+            capture_output=True,
+            timeout=30,
+        )
+
+        removed = read_record(proc, container_name, "remove")
+        assert removed is not None, "Watch should report the deleted container"
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
@@ -23,6 +23,7 @@ from support.helpers import (
     wait_for_specific_container_deletion,
     wait_for_text_in_monitor,
     with_live_screen,
+    worker_container_prefix,
 )
 
 
@@ -136,7 +137,7 @@ def test_new_session_not_resumed(coi_binary, cleanup_containers, workspace_dir):
     # Force cleanup any remaining
     containers = get_container_list()
     for c in containers:
-        if c.startswith("coi-test-"):
+        if c.startswith(worker_container_prefix()):
             subprocess.run(
                 ["sg", "incus-admin", "-c", f"incus delete --force {c}"],
                 capture_output=True,
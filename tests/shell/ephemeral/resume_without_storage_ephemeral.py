@@ -25,6 +25,7 @@ from support.helpers import (
     wait_for_text_in_monitor,
     wait_for_text_on_screen,
     with_live_screen,
+    worker_container_prefix,
 )
 
 
@@ -185,7 +186,7 @@ def test_resume_does_not_persist_home_files(coi_binary, cleanup_containers, work
     # Force cleanup any remaining
     containers = get_container_list()
     for c in containers:
-        if c.startswith("coi-test-"):
+        if c.startswith(worker_container_prefix()):
             subprocess.run(
                 ["sg", "incus-admin", "-c", f"incus delete --force {c}"],
                 capture_output=True,
@@ -0,0 +1,67 @@
+"""
+Test for coi shutdown - parallel shutdown with one overall timeout.
+
+Tests that:
+1. Launch three containers
+2. Shutdown all of them with --parallel=3
+3. Verify all containers are deleted and each result is reported
+"""
+
+import subprocess
+import time
+
+from support.helpers import calculate_container_name
+
+
+def test_shutdown_parallel(coi_binary, cleanup_containers, workspace_dir):
+    """
+    Test shutting down several containers at once.
+
+    Flow:
+    1. Launch three containers
+    2. Run coi shutdown --force --parallel=3 --timeout=30 <containers>
+    3. Verify every container is reported and deleted
+    """
+    containers = [calculate_container_name(workspace_dir, slot) for slot in (1, 2, 3)]
+
+    for name in containers:
+        result = subprocess.run(
+            [coi_binary, "container", "launch", "coi", name],
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, f"Launch {name} should succeed. stderr: {result.stderr}"
+
+    time.sleep(3)
+
+    # Shutdown all three at once
+    result = subprocess.run(
+        [coi_binary, "shutdown", "--force", "--parallel=3", "--timeout=30", *containers],
+        capture_output=True,
+        text=True,
+        timeout=180,
+    )
+
+    assert result.returncode == 0, f"Shutdown should succeed. stderr: {result.stderr}"
+
+    combined_output = result.stdout + result.stderr
+    for name in containers:
+        assert f"Shutdown {name}" in combined_output, (
+            f"Should report result for {name}. Got:\n{combined_output}"
+        )
+    assert "Shutdown 3 container(s)" in combined_output, (
+        f"Should report total. Got:\n{combined_output}"
+    )
+
+    # Verify containers no longer exist
+    time.sleep(2)
+
+    for name in containers:
+        result = subprocess.run(
+            [coi_binary, "container", "exists", name],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        assert result.returncode != 0, f"{name} should not exist after shutdown"
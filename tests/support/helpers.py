@@ -9,18 +9,74 @@ import subprocess
 import sys
 import threading
 import time
+from collections import deque
 from pathlib import Path
 
 from pexpect import EOF, TIMEOUT, spawn
 
 try:
     import pyte
+    from pyte.screens import wcwidth
 
     HAS_PYTE = True
 except ImportError:
     HAS_PYTE = False
 
 
+class ScreenMatcher:
+    """
+    A pending wait for text or a regex pattern on a TerminalEmulator screen.
+
+    Registered with TerminalEmulator.add_matcher(), it is checked against the
+    whole screen once, then again after each feed() that changes the screen.
+    Patterns are always searched in the whole stripped display (lines joined
+    with \\n), so \\s, [^...] and anchors behave as in a plain re.search() on
+    get_display_stripped(). Plain texts only need to look at the lines that
+    changed; a text containing a newline is searched in the whole display too.
+    """
+
+    def __init__(self, texts=(), pattern=None):
+        self.texts = list(texts)
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.matched = False
+        self.result = None  # The text found, or the match object for a pattern
+
+        self._line_texts = [text for text in self.texts if "\n" not in text]
+        self._display_texts = [text for text in self.texts if "\n" in text]
+
+    def check(self, lines, changed, display):
+        """
+        Check the screen after the line indices in changed were updated.
+
+        display is a callable returning the whole stripped display; it is only
+        called when a pattern or multi-line text needs it. Returns True once matched.
+        """
+        if self.matched:
+            return True
+        if not changed:
+            return False
+
+        for y in changed:
+            line = lines[y].rstrip()
+            for text in self._line_texts:
+                if text in line:
+                    self.matched, self.result = True, text
+                    return True
+
+        if self._display_texts or self.pattern is not None:
+            whole = display()
+            for text in self._display_texts:
+                if text in whole:
+                    self.matched, self.result = True, text
+                    return True
+            if self.pattern is not None:
+                match = self.pattern.search(whole)
+                if match:
+                    self.matched, self.result = True, match
+                    return True
+        return False
+
+
 class TerminalEmulator:
     """
     Terminal emulator using pyte that properly handles ANSI escape sequences.
@@ -30,9 +86,27 @@ class TerminalEmulator:
     - Cursor movements
     - Text overwrites
     - Screen clearing
+
+    The rendered display is cached and only the lines pyte marks dirty are
+    re-rendered, so polling the screen costs nothing while output is idle.
+    Pending screen waits (ScreenMatcher) are checked against the updated screen
+    right after each feed and wake their waiters through a condition variable.
+    Raw output is kept in a ring buffer of at most max_raw_output characters;
+    older output is dropped, or appended to raw_output_file if one is given.
     """
 
-    def __init__(self, columns=80, lines=20, verbose=False, show_screen_updates=None):
+    # Default raw output bound, in characters
+    RAW_OUTPUT_LIMIT = 1_000_000
+
+    def __init__(
+        self,
+        columns=80,
+        lines=20,
+        verbose=False,
+        show_screen_updates=None,
+        max_raw_output=RAW_OUTPUT_LIMIT,
+        raw_output_file=None,
+    ):
         if not HAS_PYTE:
             raise ImportError(
                 "pyte is required for terminal emulation. Install with: pip install pyte"
@@ -40,16 +114,33 @@ class TerminalEmulator:
 
         self.screen = pyte.Screen(columns, lines)
         self.stream = pyte.Stream(self.screen)
-        self.raw_output = []
         self.verbose = verbose
 
+        # Raw output ring buffer (chunks), spilled to raw_output_file when trimmed
+        self.raw_output = deque()
+        self.raw_output_size = 0
+        self.raw_output_dropped = 0
+        self.max_raw_output = max_raw_output
+        self.raw_output_file = raw_output_file
+        self._spill = None
+
+        # Rendered lines, kept in sync with the dirty lines of the pyte screen.
+        # version increases whenever the rendered display changes.
+        self._lock = threading.Lock()
+        self._screen_changed = threading.Condition(self._lock)
+        self._matchers = set()
+        self._lines = []
+        self._display = None
+        self._display_stripped = None
+        self.version = 0
+
         # Whether to show screen updates (defaults to verbose mode)
         if show_screen_updates is None:
             show_screen_updates = verbose
         self.show_screen_updates = show_screen_updates
 
-        # Track last screen state to only print on changes
-        self.last_screen_hash = None
+        # Track last printed screen to only print on changes
+        self.last_printed_version = None
         self.update_counter = 0
         self.feed_counter = 0  # Count feeds for periodic updates
         self.last_print_time = 0  # For debouncing prints
@@ -72,10 +163,16 @@ class TerminalEmulator:
             sys.stderr.write(f"[FEED: {len(data)} bytes]\n")
             sys.stderr.flush()
 
-        self.raw_output.append(data)
+        self._append_raw(data)
 
-        # Feed to terminal emulator FIRST (so screen is updated)
-        self.stream.feed(data)
+        # Feed to terminal emulator FIRST (so screen is updated), then check
+        # pending screen waits against the lines that changed
+        with self._lock:
+            self.stream.feed(data)
+            if self._matchers:
+                changed = self._sync_lines()
+                if changed:
+                    self._check_matchers(changed)
 
         # Print raw data if verbose (after feeding to emulator)
         if self.verbose:
@@ -90,52 +187,181 @@ class TerminalEmulator:
         self.feed(data)
 
     def flush(self):
-        """No-op for file-like interface."""
-        pass
+        """Flush the raw output spill file, if any."""
+        if self._spill is not None:
+            self._spill.flush()
+
+    def close(self):
+        """Close the raw output spill file, if any."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def reset(self):
+        """Clear the screen (raw output is kept)."""
+        with self._lock:
+            self.screen.reset()
 
     def get_display(self):
         """Get the current terminal display as a string."""
-        return "\n".join(self.screen.display)
+        with self._lock:
+            self._sync_lines()
+            if self._display is None:
+                self._display = "\n".join(self._lines)
+            return self._display
 
     def get_display_stripped(self):
         """Get the display with trailing whitespace removed from each line."""
-        return "\n".join(line.rstrip() for line in self.screen.display)
+        with self._lock:
+            self._sync_lines()
+            return self._stripped_display()
+
+    def _stripped_display(self):
+        """Build (or reuse) the cached stripped display. Caller holds the lock."""
+        if self._display_stripped is None:
+            self._display_stripped = "\n".join(line.rstrip() for line in self._lines)
+        return self._display_stripped
 
     def get_raw_output(self):
-        """Get the raw output (with ANSI codes)."""
+        """Get the raw output (with ANSI codes), up to the last max_raw_output characters."""
         return "".join(self.raw_output)
 
+    def add_matcher(self, matcher):
+        """Register a pending screen wait. It is checked against the whole screen right away."""
+        with self._lock:
+            self._sync_lines()
+            if not matcher.check(self._lines, range(len(self._lines)), self._stripped_display):
+                self._matchers.add(matcher)
+
+    def remove_matcher(self, matcher):
+        """Unregister a screen wait (no-op if it already matched)."""
+        with self._lock:
+            self._matchers.discard(matcher)
+
+    def wait_for_matcher(self, matcher, timeout):
+        """
+        Block until a registered matcher matches or timeout passes.
+
+        Only for when another thread reads from the child (e.g. LiveScreenMonitor);
+        the waiter wakes as soon as the feed that matched returns.
+
+        Returns True if it matched.
+        """
+        deadline = time.monotonic() + timeout
+        with self._screen_changed:
+            while not matcher.matched:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._screen_changed.wait(remaining)
+        return matcher.matched
+
+    def _check_matchers(self, changed):
+        """Check pending matchers against changed lines and wake waiters. Caller holds the lock."""
+        matched = [
+            m for m in self._matchers if m.check(self._lines, changed, self._stripped_display)
+        ]
+        if matched:
+            self._matchers.difference_update(matched)
+            self._screen_changed.notify_all()
+
+    def _append_raw(self, data):
+        """Add data to the raw output ring buffer, dropping (or spilling) the oldest output."""
+        self.raw_output.append(data)
+        self.raw_output_size += len(data)
+
+        excess = self.raw_output_size - self.max_raw_output
+        while excess > 0:
+            oldest = self.raw_output.popleft()
+            if len(oldest) > excess:
+                self.raw_output.appendleft(oldest[excess:])
+                oldest = oldest[:excess]
+            self.raw_output_size -= len(oldest)
+            self.raw_output_dropped += len(oldest)
+            excess -= len(oldest)
+
+            if self.raw_output_file is not None:
+                if self._spill is None:
+                    self._spill = open(self.raw_output_file, "a", encoding="utf-8")
+                self._spill.write(oldest)
+
+    def _sync_lines(self):
+        """
+        Re-render the lines pyte marked dirty since the last call. Caller holds the lock.
+
+        Returns the indices of the lines whose rendered text changed.
+        """
+        dirty = self.screen.dirty
+        if len(self._lines) != self.screen.lines:
+            # First call or screen resized: render everything
+            self._lines = [""] * self.screen.lines
+            dirty = range(self.screen.lines)
+        elif not dirty:
+            return []
+
+        changed = []
+        for y in sorted(dirty):
+            if y >= self.screen.lines:
+                continue
+            text = self._render_line(y)
+            if text != self._lines[y]:
+                self._lines[y] = text
+                changed.append(y)
+        self.screen.dirty.clear()
+
+        if changed:
+            self._display = None
+            self._display_stripped = None
+            self.version += 1
+        return changed
+
+    def _render_line(self, y):
+        """Render one screen line the way pyte's Screen.display does."""
+        line = self.screen.buffer[y]
+        chars = []
+        is_wide_char = False
+        for x in range(self.screen.columns):
+            if is_wide_char:  # Skip the stub cell after a wide character
+                is_wide_char = False
+                continue
+            char = line[x].data
+            is_wide_char = bool(char) and wcwidth(char[0]) == 2
+            chars.append(char)
+        return "".join(chars)
+
     def _maybe_print_screen(self):
         """
         Print the current screen state if it has changed meaningfully.
 
-        Uses debouncing to avoid printing too rapidly during data streaming.
+        Uses debouncing to avoid printing too rapidly during data streaming;
+        the screen is only rendered once the debounce interval has passed.
         """
         import time as _time
 
         self.feed_counter += 1
-        current_display = self.get_display_stripped()
-        current_hash = hash(current_display)
 
-        # Check if we should print
-        # Only print if screen changed AND enough time passed (debounce)
+        # Only print if enough time passed (debounce) AND the screen changed
         now = _time.time()
-        time_since_last = now - self.last_print_time
-
-        if current_hash != self.last_screen_hash and time_since_last >= 0.3:
-            # Screen changed and debounce passed
-            self.last_screen_hash = current_hash
-            self.last_print_time = now
-            self.update_counter += 1
-
-            print(f"\n\n{'=' * 80}")
-            print(f"SCREEN UPDATE #{self.update_counter}")
-            print(f"{'=' * 80}")
-            print(current_display)
-            print(f"{'=' * 80}\n")
-            import sys
+        if now - self.last_print_time < 0.3:
+            return
 
-            sys.stdout.flush()
+        current_display = self.get_display_stripped()
+        if self.version == self.last_printed_version:
+            return
+
+        # Screen changed and debounce passed
+        self.last_printed_version = self.version
+        self.last_print_time = now
+        self.update_counter += 1
+
+        print(f"\n\n{'=' * 80}")
+        print(f"SCREEN UPDATE #{self.update_counter}")
+        print(f"{'=' * 80}")
+        print(current_display)
+        print(f"{'=' * 80}\n")
+        import sys
+
+        sys.stdout.flush()
 
 
 def spawn_coi(
@@ -147,6 +373,7 @@ def spawn_coi(
     verbose=None,
     use_terminal_emulator=True,
     show_screen_updates=None,
+    raw_output_file=None,
 ):
     """
     Spawn a coi command with the given arguments.
@@ -160,6 +387,7 @@ def spawn_coi(
         verbose: If True, print all output in real-time. If None, check COI_TEST_VERBOSE env var.
         use_terminal_emulator: If True, use pyte terminal emulator for proper ANSI handling
         show_screen_updates: If True, show rendered screen updates. If None, check COI_TEST_SHOW_SCREEN env var or defaults to verbose.
+        raw_output_file: Optional path that raw output beyond the emulator's in-memory bound is appended to.
 
     Returns:
         pexpect.spawn object
@@ -193,7 +421,11 @@ def spawn_coi(
     # Enable logging with terminal emulator or basic capture
     if use_terminal_emulator and HAS_PYTE:
         child.logfile_read = TerminalEmulator(
-            columns=80, lines=20, verbose=verbose, show_screen_updates=show_screen_updates
+            columns=80,
+            lines=20,
+            verbose=verbose,
+            show_screen_updates=show_screen_updates,
+            raw_output_file=raw_output_file,
         )
     else:
         if use_terminal_emulator:
@@ -470,7 +702,7 @@ def wait_for_specific_container_deletion(container_name, timeout=30, poll_interv
     return False
 
 
-def wait_for_container_deletion(prefix="coi-test-", timeout=30, poll_interval=0.5):
+def wait_for_container_deletion(prefix=None, timeout=30, poll_interval=0.5):
     """
     Wait for all containers matching prefix to be deleted.
 
@@ -482,7 +714,7 @@ def wait_for_container_deletion(prefix="coi-test-", timeout=30, poll_interval=0.
     a seamless visual experience.
 
     Args:
-        prefix: Container name prefix to wait for (default: "coi-test-")
+        prefix: Container name prefix to wait for (default: worker_container_prefix())
         timeout: Maximum time to wait in seconds (default: 30)
         poll_interval: How often to check in seconds (default: 0.5)
 
@@ -496,6 +728,9 @@ def wait_for_container_deletion(prefix="coi-test-", timeout=30, poll_interval=0.
     """
     import sys
 
+    if prefix is None:
+        prefix = worker_container_prefix()
+
     start_time = time.time()
     last_display = None
 
@@ -571,10 +806,13 @@ def assert_clean_exit(clean_exit, child):
     assert child.exitstatus == 0, f"Expected exit code 0, got {child.exitstatus}"
 
 
-def get_container_list():
+def get_container_list(env=None):
     """
     Get list of all running containers.
     Returns list of container names.
+
+    Args:
+        env: Optional environment for the incus call (e.g. the fake_incus_env fixture)
     """
     try:
         result = subprocess.run(
@@ -582,6 +820,7 @@ def get_container_list():
             capture_output=True,
             text=True,
             check=True,
+            env=env,
         )
         containers = [line.strip() for line in result.stdout.strip().split("\n") if line.strip()]
         return containers
@@ -590,14 +829,29 @@ def get_container_list():
         return []
 
 
-def cleanup_all_test_containers(pattern="coi-test-"):
+def worker_container_prefix():
+    """
+    Return the prefix of test containers this test process owns.
+
+    Under pytest-xdist each worker runs with its own COI_CONTAINER_PREFIX
+    (e.g. "coi-test-gw3-", see worker_isolation in conftest.py), so cleanup
+    only touches that worker's containers. Otherwise "coi-test-".
+    """
+    prefix = os.environ.get("COI_CONTAINER_PREFIX", "")
+    return prefix if prefix.startswith("coi-test-") else "coi-test-"
+
+
+def cleanup_all_test_containers(pattern=None):
     """
     Clean up all containers matching pattern.
-    Default cleans coi-test-* containers ONLY (not user's active sessions).
+    Default cleans this worker's coi-test-* containers ONLY (not user's
+    active sessions, not other xdist workers' containers).
 
     IMPORTANT: This should NEVER clean up containers with 'claude-' prefix
     to avoid interfering with user's active sessions.
     """
+    if pattern is None:
+        pattern = worker_container_prefix()
     containers = get_container_list()
     test_containers = [c for c in containers if c.startswith(pattern)]
 
@@ -733,6 +987,36 @@ def expect_and_show(child, pattern, timeout=30, description=None):
     return index
 
 
+def _wait_on_screen(child, matcher, timeout, poll_interval):
+    """
+    Read from child until matcher matches on its TerminalEmulator screen.
+
+    The matcher is checked inside feed() against the lines each chunk changed,
+    so this returns as soon as the matching chunk has been read; poll_interval
+    only bounds how long a single read waits for data.
+
+    Returns True if matched, False on timeout or EOF.
+    """
+    emulator = child.logfile_read
+    emulator.add_matcher(matcher)
+    start_time = time.time()
+    try:
+        while not matcher.matched and time.time() - start_time < timeout:
+            # CRITICAL: Read from child process to trigger data flow
+            # This makes pexpect read from the subprocess and feed it to our TerminalEmulator
+            try:
+                child.read_nonblocking(size=4096, timeout=poll_interval)
+            except TIMEOUT:
+                # No data available right now, that's okay
+                pass
+            except EOF:
+                # Process ended
+                break
+    finally:
+        emulator.remove_matcher(matcher)
+    return matcher.matched
+
+
 def wait_for_text_on_screen(child, text, timeout=30, poll_interval=0.1):
     """
     Wait for text to appear on the rendered terminal screen (not raw output).
@@ -744,7 +1028,7 @@ def wait_for_text_on_screen(child, text, timeout=30, poll_interval=0.1):
         child: pexpect.spawn object with TerminalEmulator as logfile_read
         text: Text to search for in the rendered display
         timeout: Timeout in seconds
-        poll_interval: How often to check the screen (seconds)
+        poll_interval: Longest a single read waits for output (seconds)
 
     Returns:
         True when text is found
@@ -759,7 +1043,6 @@ def wait_for_text_on_screen(child, text, timeout=30, poll_interval=0.1):
         )
 
     verbose = child.logfile_read.verbose
-    start_time = time.time()
 
     if verbose:
         print(f"\n{'=' * 60}")
@@ -769,35 +1052,20 @@ def wait_for_text_on_screen(child, text, timeout=30, poll_interval=0.1):
 
         sys.stdout.flush()
 
-    while time.time() - start_time < timeout:
-        # CRITICAL: Read from child process to trigger data flow
-        # This makes pexpect read from the subprocess and feed it to our TerminalEmulator
-        try:
-            child.read_nonblocking(size=4096, timeout=poll_interval)
-            # Data is automatically fed to logfile_read by pexpect
-        except TIMEOUT:
-            # No data available right now, that's okay
-            pass
-        except EOF:
-            # Process ended
-            break
-
-        # Get the rendered screen display
-        display = child.logfile_read.get_display_stripped()
-
-        if text in display:
-            if verbose:
-                print(f"\n{'=' * 60}")
-                print(">>> TEXT FOUND ON SCREEN!")
-                print(f"{'=' * 60}")
-                print("\n>>> CURRENT SCREEN DISPLAY:")
-                print("--- START DISPLAY ---")
-                print(display)
-                print("--- END DISPLAY ---\n")
-                import sys
-
-                sys.stdout.flush()
-            return True
+    if _wait_on_screen(child, ScreenMatcher(texts=[text]), timeout, poll_interval):
+        if verbose:
+            display = child.logfile_read.get_display_stripped()
+            print(f"\n{'=' * 60}")
+            print(">>> TEXT FOUND ON SCREEN!")
+            print(f"{'=' * 60}")
+            print("\n>>> CURRENT SCREEN DISPLAY:")
+            print("--- START DISPLAY ---")
+            print(display)
+            print("--- END DISPLAY ---\n")
+            import sys
+
+            sys.stdout.flush()
+        return True
 
     # Timeout - show what we did see
     display = child.logfile_read.get_display_stripped()
@@ -823,7 +1091,7 @@ def wait_for_any_text_on_screen(child, texts, timeout=30, poll_interval=0.1):
         child: pexpect.spawn object with TerminalEmulator as logfile_read
         texts: List of text strings to search for
         timeout: Timeout in seconds
-        poll_interval: How often to check the screen (seconds)
+        poll_interval: Longest a single read waits for output (seconds)
 
     Returns:
         The text that was found
@@ -835,21 +1103,9 @@ def wait_for_any_text_on_screen(child, texts, timeout=30, poll_interval=0.1):
     if not isinstance(child.logfile_read, TerminalEmulator):
         raise TypeError("wait_for_any_text_on_screen requires TerminalEmulator.")
 
-    start_time = time.time()
-
-    while time.time() - start_time < timeout:
-        try:
-            child.read_nonblocking(size=4096, timeout=poll_interval)
-        except TIMEOUT:
-            pass
-        except EOF:
-            break
-
-        display = child.logfile_read.get_display_stripped()
-
-        for text in texts:
-            if text in display:
-                return text
+    matcher = ScreenMatcher(texts=texts)
+    if _wait_on_screen(child, matcher, timeout, poll_interval):
+        return matcher.result
 
     display = child.logfile_read.get_display_stripped()
     raise TimeoutError(
@@ -865,7 +1121,7 @@ def wait_for_pattern_on_screen(child, pattern, timeout=30, poll_interval=0.1):
         child: pexpect.spawn object with TerminalEmulator as logfile_read
         pattern: Regex pattern (compiled or string)
         timeout: Timeout in seconds
-        poll_interval: How often to check the screen (seconds)
+        poll_interval: Longest a single read waits for output (seconds)
 
     Returns:
         Match object when pattern is found
@@ -878,7 +1134,6 @@ def wait_for_pattern_on_screen(child, pattern, timeout=30, poll_interval=0.1):
         raise TypeError("wait_for_pattern_on_screen requires TerminalEmulator.")
 
     verbose = child.logfile_read.verbose
-    start_time = time.time()
 
     # Compile pattern if it's a string
     if isinstance(pattern, str):
@@ -892,35 +1147,23 @@ def wait_for_pattern_on_screen(child, pattern, timeout=30, poll_interval=0.1):
 
         sys.stdout.flush()
 
-    while time.time() - start_time < timeout:
-        # CRITICAL: Read from child process to trigger data flow
-        try:
-            child.read_nonblocking(size=4096, timeout=poll_interval)
-            # Data is automatically fed to logfile_read by pexpect
-        except TIMEOUT:
-            # No data available right now, that's okay
-            pass
-        except EOF:
-            # Process ended
-            break
-
-        display = child.logfile_read.get_display_stripped()
-        match = pattern.search(display)
+    matcher = ScreenMatcher(pattern=pattern)
+    if _wait_on_screen(child, matcher, timeout, poll_interval):
+        match = matcher.result
+        if verbose:
+            display = child.logfile_read.get_display_stripped()
+            print(f"\n{'=' * 60}")
+            print(">>> PATTERN MATCHED ON SCREEN!")
+            print(f"{'=' * 60}")
+            print(f">>> Matched text: {match.group(0)}")
+            print("\n>>> CURRENT SCREEN DISPLAY:")
+            print("--- START DISPLAY ---")
+            print(display)
+            print("--- END DISPLAY ---\n")
+            import sys
 
-        if match:
-            if verbose:
-                print(f"\n{'=' * 60}")
-                print(">>> PATTERN MATCHED ON SCREEN!")
-                print(f"{'=' * 60}")
-                print(f">>> Matched text: {match.group(0)}")
-                print("\n>>> CURRENT SCREEN DISPLAY:")
-                print("--- START DISPLAY ---")
-                print(display)
-                print("--- END DISPLAY ---\n")
-                import sys
-
-                sys.stdout.flush()
-            return match
+            sys.stdout.flush()
+        return match
 
     # Timeout
     display = child.logfile_read.get_display_stripped()
@@ -955,7 +1198,7 @@ def refresh_screen(child, timeout=0.5, clear_buffer=False):
     """
     # Clear the pyte screen buffer if requested
     if clear_buffer and isinstance(child.logfile_read, TerminalEmulator):
-        child.logfile_read.screen.reset()
+        child.logfile_read.reset()
 
     # Read whatever is available with a short timeout
     # Timeout or EOF is fine - just means nothing more to read
@@ -1020,24 +1263,24 @@ class LiveScreenMonitor:
         return self.last_display
 
     def _monitor_loop(self):
-        """Background loop that continuously reads and displays screen."""
+        """Background loop that reads from child as output arrives and tracks the screen."""
         while self.running:
             try:
-                # Read from child process
-                # Timeout is fine - suppress all exceptions
-                with contextlib.suppress(BaseException):
-                    self.child.read_nonblocking(size=65536, timeout=0.1)
-
-                # Get current screen
+                # Read from child process. This returns as soon as output arrives
+                # (feeding it to the TerminalEmulator, which wakes pending screen
+                # waits), or after update_interval with nothing to read
+                try:
+                    self.child.read_nonblocking(size=65536, timeout=self.update_interval)
+                except TIMEOUT:
+                    pass
+                except BaseException:
+                    # EOF or closed child - nothing to read, don't spin
+                    time.sleep(self.update_interval)
+
+                # Get current screen (cached by the emulator until lines change)
+                # (screen printing is handled by TerminalEmulator._maybe_print_screen)
                 if isinstance(self.child.logfile_read, TerminalEmulator):
-                    current_display = self.child.logfile_read.get_display_stripped()
-
-                    # Only update last_display if screen changed
-                    # (screen printing is handled by TerminalEmulator._maybe_print_screen)
-                    if current_display != self.last_display:
-                        self.last_display = current_display
-
-                time.sleep(self.update_interval)
+                    self.last_display = self.child.logfile_read.get_display_stripped()
 
             except Exception as e:
                 print(f"\n⚠️ Monitor error: {e}\n", file=sys.stderr)
@@ -1069,16 +1312,18 @@ def with_live_screen(child, update_interval=0.5):
 
 def wait_for_text_in_monitor(monitor, text, timeout=30, poll_interval=0.5):
     """
-    Poll the monitor's display until text appears or timeout occurs.
+    Wait until text appears on the monitor's screen or timeout occurs.
 
     This is useful when you have a LiveScreenMonitor running and want to wait
     for specific text to appear with early exit (doesn't wait full timeout if found).
+    With a TerminalEmulator the wait wakes as soon as the monitor feeds the
+    output that matched; otherwise monitor.last_display is polled.
 
     Args:
         monitor: LiveScreenMonitor instance
-        text: Text string to search for in monitor.last_display
+        text: Text string to search for on the screen
         timeout: Maximum time to wait in seconds (default: 30)
-        poll_interval: How often to check in seconds (default: 0.5)
+        poll_interval: How often to poll without a TerminalEmulator (default: 0.5)
 
     Returns:
         True if text found, False if timeout
@@ -1089,6 +1334,10 @@ def wait_for_text_in_monitor(monitor, text, timeout=30, poll_interval=0.5):
             if wait_for_text_in_monitor(monitor, '4', timeout=20):
                 print("Found answer!")
     """
+    emulator = monitor.child.logfile_read
+    if isinstance(emulator, TerminalEmulator):
+        return _wait_in_monitor(emulator, ScreenMatcher(texts=[text]), timeout)
+
     start_time = time.time()
 
     while time.time() - start_time < timeout:
@@ -1099,17 +1348,27 @@ def wait_for_text_in_monitor(monitor, text, timeout=30, poll_interval=0.5):
     return False
 
 
+def _wait_in_monitor(emulator, matcher, timeout):
+    """Register matcher and block until the monitor thread feeds output that matches it."""
+    emulator.add_matcher(matcher)
+    try:
+        return emulator.wait_for_matcher(matcher, timeout)
+    finally:
+        emulator.remove_matcher(matcher)
+
+
 def wait_for_pattern_in_monitor(monitor, pattern, timeout=30, poll_interval=0.5):
     """
-    Poll the monitor's display until regex pattern matches or timeout occurs.
+    Wait until a regex pattern matches on the monitor's screen or timeout occurs.
 
-    Similar to wait_for_text_in_monitor but uses regex pattern matching.
+    Similar to wait_for_text_in_monitor but uses regex pattern matching
+    (against the whole display, see ScreenMatcher).
 
     Args:
         monitor: LiveScreenMonitor instance
         pattern: Regex pattern (string or compiled) to search for
         timeout: Maximum time to wait in seconds (default: 30)
-        poll_interval: How often to check in seconds (default: 0.5)
+        poll_interval: How often to poll without a TerminalEmulator (default: 0.5)
 
     Returns:
         Match object if found, None if timeout
@@ -1124,6 +1383,11 @@ def wait_for_pattern_in_monitor(monitor, pattern, timeout=30, poll_interval=0.5)
     if isinstance(pattern, str):
         pattern = re.compile(pattern)
 
+    emulator = monitor.child.logfile_read
+    if isinstance(emulator, TerminalEmulator):
+        matcher = ScreenMatcher(pattern=pattern)
+        return matcher.result if _wait_in_monitor(emulator, matcher, timeout) else None
+
     start_time = time.time()
 
     while time.time() - start_time < timeout:
@@ -1177,7 +1441,8 @@ def calculate_container_name(workspace_dir, slot):
     """
     import hashlib
 
-    # Get container prefix from environment (defaults to "coi-" but tests use "coi-test-")
+    # Get container prefix from environment (defaults to "coi-" but tests use "coi-test-";
+    # under pytest-xdist it is per worker, e.g. "coi-test-gw3-")
     prefix = os.environ.get("COI_CONTAINER_PREFIX", "coi-")
 
     # Hash the workspace path (SHA256)
@@ -1191,3 +1456,115 @@ def calculate_container_name(workspace_dir, slot):
 
     # Format: {prefix}{hash}-{slot}
     return f"{prefix}{workspace_id}-{slot}"
+
+
+class ContainerPool:
+    """
+    Session-scoped pool of launched containers that read-only tests lease and return.
+
+    Each container is launched once and snapshotted while clean. When a lease ends the
+    snapshot is restored (filesystem, config and devices, e.g. mounts a test added), so
+    the next test gets an identical container without paying for a launch. Tests that
+    stop, delete or rename their container must launch their own instead.
+
+    Pool containers must be named outside COI_CONTAINER_PREFIX (and outside "coi-"):
+    `coi kill --all`, `coi clean --all` and the cleanup helpers delete everything under
+    it, idle pool containers included. Leasing checks that an idle container still
+    exists and is running, and launches a new one otherwise.
+
+    Used through the container_pool and pooled_container fixtures in conftest.py.
+    """
+
+    SNAPSHOT = "coi-test-clean"
+
+    def __init__(self, coi_binary, prefix, image="coi", ready_timeout=60):
+        self.coi_binary = coi_binary
+        self.prefix = prefix
+        self.image = image
+        self.ready_timeout = ready_timeout
+        self.launches = 0
+        self._idle = []
+        self._all = set()
+
+    def lease(self):
+        """Return the name of a running, clean container from the pool."""
+        while self._idle:
+            name = self._idle.pop()
+            if self._is_running(name):
+                return name
+            # Deleted or stopped behind the pool's back - replace it
+            print(f"Warning: Pool container {name} is gone or stopped, launching another")
+            self._delete(name)
+
+        self.launches += 1
+        name = f"{self.prefix}{self.launches}"
+        result = subprocess.run(
+            [self.coi_binary, "container", "launch", self.image, name],
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to launch pool container {name}: {result.stderr}")
+        self._all.add(name)
+
+        self._wait_ready(name)
+        self._incus(f"snapshot create {name} {self.SNAPSHOT}")
+        return name
+
+    def release(self, name):
+        """Reset a leased container to its clean snapshot and return it to the pool."""
+        try:
+            self._incus(f"snapshot restore {name} {self.SNAPSHOT}")
+            self._wait_ready(name)
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"Warning: Dropping pool container {name}: {e}")
+            self._delete(name)
+            return
+        self._idle.append(name)
+
+    def close(self):
+        """Delete every container the pool launched."""
+        for name in sorted(self._all):
+            self._delete(name)
+        self._idle.clear()
+
+    def _is_running(self, name):
+        result = subprocess.run(
+            [self.coi_binary, "container", "running", name],
+            capture_output=True,
+            timeout=30,
+        )
+        return result.returncode == 0
+
+    def _wait_ready(self, name):
+        deadline = time.time() + self.ready_timeout
+        while time.time() < deadline:
+            result = subprocess.run(
+                [self.coi_binary, "container", "exec", name, "--", "true"],
+                capture_output=True,
+                timeout=30,
+            )
+            if result.returncode == 0:
+                return
+            time.sleep(0.5)
+        raise RuntimeError(f"Container {name} not ready after {self.ready_timeout}s")
+
+    def _incus(self, command):
+        result = subprocess.run(
+            ["sg", "incus-admin", "-c", f"incus {command}"],
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"incus {command} failed: {result.stderr}")
+
+    def _delete(self, name):
+        subprocess.run(
+            [self.coi_binary, "container", "delete", name, "--force"],
+            capture_output=True,
+            timeout=30,
+            check=False,
+        )
+        self._all.discard(name)